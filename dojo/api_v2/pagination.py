@@ -0,0 +1,148 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.fields import DateTimeField
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class DojoPagination(LimitOffsetPagination):
+
+    """
+    Paginates with limit and offset, or with a cursor when the request has the cursor parameter. The cursor walks
+    through the objects by id, after the last object of the previous page, so deep pages are as fast as the first
+    one. With the updated__gt parameter the cursor walks through the objects changed since then, ordered by the
+    time of the change, for the viewsets that define the field holding it in cursor_updated_field. With count=false
+    the objects are not counted in either mode.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = "Start with an empty cursor to page by id, after the cursor of the next link instead of by offset."
+    count_query_param = "count"
+    count_query_description = "Set to false to not count the objects, the count is null then."
+    updated_query_param = "updated__gt"
+    updated_query_description = "With cursor: only objects saved after this time, ordered by the time they were saved."
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor = None
+        self.has_next = False
+        self.with_count = request.query_params.get(self.count_query_param, "").lower() not in {"false", "0"}
+        if self.cursor_query_param in request.query_params and isinstance(queryset, QuerySet):
+            return self.paginate_queryset_by_cursor(queryset, request, view)
+        if self.with_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = None
+        self.offset = self.get_offset(request)
+        return self.get_page(queryset[self.offset:self.offset + self.limit + 1])
+
+    def paginate_queryset_by_cursor(self, queryset, request, view):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.updated_field = None
+        updated_after = request.query_params.get(self.updated_query_param)
+        if updated_after and getattr(view, "cursor_updated_field", None):
+            try:
+                updated_after = DateTimeField().to_internal_value(updated_after)
+            except ValidationError as e:
+                raise ValidationError({self.updated_query_param: e.detail})
+            self.updated_field = view.cursor_updated_field
+            queryset = queryset.filter(**{f"{self.updated_field}__gt": updated_after})
+        self.count = queryset.count() if self.with_count else None
+
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if self.updated_field:
+            if position:
+                updated, pk = position
+                queryset = queryset.filter(
+                    Q(**{f"{self.updated_field}__gt": updated}) | Q(**{self.updated_field: updated, "pk__gt": pk}))
+            queryset = queryset.order_by(self.updated_field, "pk")
+        else:
+            if position:
+                queryset = queryset.filter(pk__gt=position[1])
+            queryset = queryset.order_by("pk")
+        self.cursor = position or (None, None)
+        return self.get_page(queryset[:self.limit + 1])
+
+    def get_page(self, queryset):
+        # one more object is fetched to know if there is a next page without counting
+        page = list(queryset)
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+        if self.cursor and page:
+            last = page[-1]
+            self.cursor = (getattr(last, self.updated_field) if self.updated_field else None, last.pk)
+        return page
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            updated, pk = json.loads(b64decode(encoded.encode("ascii")))
+            return (datetime.fromisoformat(updated) if updated else None, int(pk))
+        except (TypeError, ValueError, UnicodeEncodeError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def encode_cursor(self, cursor):
+        updated, pk = cursor
+        return b64encode(json.dumps([updated.isoformat() if updated else None, pk]).encode()).decode("ascii")
+
+    def get_next_link(self):
+        if self.cursor:
+            if not self.has_next:
+                return None
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(self.cursor))
+        if self.count is None:
+            if not self.has_next:
+                return None
+            url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+            return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        # the cursor only goes forward
+        if self.cursor:
+            return None
+        return super().get_previous_link()
+
+    def get_paginated_response_schema(self, schema):
+        paginated_schema = super().get_paginated_response_schema(schema)
+        paginated_schema["properties"]["count"]["nullable"] = True
+        return paginated_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.count_query_description,
+                "schema": {"type": "boolean"},
+            },
+        ]
+        if getattr(view, "cursor_updated_field", None):
+            parameters.append({
+                "name": self.updated_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.updated_query_description,
+                "schema": {"type": "string", "format": "date-time"},
+            })
+        return parameters
@@ -18,11 +18,9 @@ class PrefetchListMixin(ListModelMixin):
 
         serializer = self.get_serializer()
         # Stores the final JSON object
-        results = []
-
-        for entry in queryset:
-            results.append(serializer.to_representation(entry))
-            prefetcher._prefetch(entry, prefetch_params)
+        results = [serializer.to_representation(entry) for entry in queryset]
+        # The related objects are fetched for the whole page at once
+        prefetcher._prefetch_many(queryset, prefetch_params)
 
         # Done in the original list method so we do it as well
         response = self.get_paginated_response(results)
@@ -1,6 +1,8 @@
+import importlib
 import inspect
-import sys
+from collections import defaultdict
 
+from django.db.models import prefetch_related_objects
 from rest_framework.serializers import ModelSerializer
 
 from dojo.models import FileUpload
@@ -34,7 +36,7 @@ class _Prefetcher:
         # We process all the serializers found in the module SERIALIZER_DEFS_MODULE. We restrict the scope to avoid
         # processing all the classes in the symbol table
         available_serializers = inspect.getmembers(
-            sys.modules[SERIALIZER_DEFS_MODULE], _is_model_serializer,
+            importlib.import_module(SERIALIZER_DEFS_MODULE), _is_model_serializer,
         )
 
         for _, serializer in available_serializers:
@@ -50,8 +52,10 @@ class _Prefetcher:
         return serializers
 
     def __init__(self):
-        self._serializers = _Prefetcher._build_serializers()
+        self._serializers = serializers_by_model
         self._prefetch_data = {}
+        # representations by model and id, so that each object is serialized once
+        self._representations = {}
 
     def _find_serializer(self, field_type):
         """
@@ -84,38 +88,104 @@ class _Prefetcher:
             field_to_fetch (list[string]): fields to prefetch
 
         """
+        self._prefetch_many([entry], fields_to_fetch)
+
+    def _prefetch_many(self, entries, fields_to_fetch):
+        """
+        Apply prefetching for the given fields on all the given entries at once. The related objects of each model
+        are fetched with a single query for all the entries and fields, and each of them is serialized once.
+
+        Args:
+            entries (list[ModelInstance]): Instances of models as returned by a django queryset
+            fields_to_fetch (list[string]): fields to prefetch
+
+        """
+        entries_by_type = self._group_by_type(entries)
+        # (model, field name) -> values of the field of the related objects that have to be fetched
+        ids_to_fetch = defaultdict(set)
+        # field to prefetch -> related objects, or (model, field name, value) of the objects still to fetch
+        related_by_field = {}
+
         for field_to_fetch in fields_to_fetch:
-            # Get the field from the instance
-            field_value = getattr(entry, field_to_fetch, None)
-            if field_value is None:
-                continue
-
-            # Get the model related to the field
-            model_type = getattr(field_value, "model", type(field_value))
-            extra_serializer = self._find_serializer(model_type)
-            if extra_serializer is None:
-                continue
-
-            # Get the concrete field type
-            field_meta = getattr(type(entry), field_to_fetch, None)
-            # Check if the field represents a many-to-many relationship as we need to instantiate
-            # the serializer accordingly
-            many = utils._is_many_to_many_relation(field_meta)
-            field_data = extra_serializer(many=many).to_representation(
-                field_value,
-            )
-            # For convenience in processing we store the field data in a list
-            field_data_list = (
-                field_data if isinstance(field_data, list) else [field_data]
-            )
-
-            if field_to_fetch not in self._prefetch_data:
-                self._prefetch_data[field_to_fetch] = {}
-
-            # Should not fail as django always generate an id field
-            for data in field_data_list:
-                self._prefetch_data[field_to_fetch][data["id"]] = data
+            related = related_by_field.setdefault(field_to_fetch, [])
+            for entry_type, typed_entries in entries_by_type.items():
+                # Get the concrete field type
+                field_meta = getattr(entry_type, field_to_fetch, None)
+                if utils._is_one_to_one_relation(field_meta):
+                    field = field_meta.field
+                    if self._find_serializer(field.related_model) is None:
+                        continue
+                    target_field_name = field.target_field.attname
+                    for entry in typed_entries:
+                        if field_meta.is_cached(entry):
+                            field_value = getattr(entry, field_to_fetch)
+                            if field_value is not None:
+                                related.append(field_value)
+                        elif (value := getattr(entry, field.attname)) is not None:
+                            ids_to_fetch[field.related_model, target_field_name].add(value)
+                            related.append((field.related_model, target_field_name, value))
+                elif utils._is_many_to_many_relation(field_meta):
+                    if self._find_serializer(getattr(typed_entries[0], field_to_fetch).model) is None:
+                        continue
+                    # The field is part of the response even if it has no objects
+                    self._prefetch_data.setdefault(field_to_fetch, {})
+                    # A single query for the field for all the entries, unless the queryset has prefetched it
+                    prefetch_related_objects(typed_entries, field_to_fetch)
+                    for entry in typed_entries:
+                        related += getattr(entry, field_to_fetch).all()
+                else:
+                    for entry in typed_entries:
+                        field_value = getattr(entry, field_to_fetch, None)
+                        if field_value is not None:
+                            related.append(field_value)
+
+        fetched = {
+            (model, field_name): model._base_manager.in_bulk(ids, field_name=field_name)
+            for (model, field_name), ids in ids_to_fetch.items()
+        }
+
+        for field_to_fetch, related in related_by_field.items():
+            for item in related:
+                field_value = item
+                if isinstance(item, tuple):
+                    model, field_name, value = item
+                    field_value = fetched[model, field_name].get(value)
+                    if field_value is None:
+                        continue
+                self._add_representation(field_to_fetch, field_value)
+
+    @staticmethod
+    def _group_by_type(entries):
+        entries_by_type = {}
+        for entry in entries:
+            entries_by_type.setdefault(type(entry), []).append(entry)
+        return entries_by_type
+
+    def _add_representation(self, field_to_fetch, field_value):
+        # Get the model related to the field
+        model_type = getattr(field_value, "model", type(field_value))
+        extra_serializer = self._find_serializer(model_type)
+        if extra_serializer is None:
+            return
+
+        key = (model_type, getattr(field_value, "pk", None))
+        if key[1] is not None and key in self._representations:
+            data = self._representations[key]
+        else:
+            data = extra_serializer().to_representation(field_value)
+            if key[1] is not None:
+                self._representations[key] = data
+
+        if field_to_fetch not in self._prefetch_data:
+            self._prefetch_data[field_to_fetch] = {}
+
+        # Should not fail as django always generate an id field
+        self._prefetch_data[field_to_fetch][data["id"]] = data
 
     @property
     def prefetched_data(self):
         return self._prefetch_data
+
+
+# The map only depends on the serializer definitions, so it is built once
+serializers_by_model = _Prefetcher._build_serializers()
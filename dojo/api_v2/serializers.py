@@ -1251,7 +1251,7 @@ class EndpointSerializer(TaggitSerializer, serializers.ModelSerializer):
 
     class Meta:
         model = Endpoint
-        exclude = ("inherited_tags",)
+        exclude = ("inherited_tags", "canonical_url", "canonical_url_hash")
 
     def validate(self, data):
 
@@ -2942,6 +2942,7 @@ class SLAConfigurationSerializer(serializers.ModelSerializer):
         model = SLA_Configuration
         exclude = (
             "async_updating",
+            "async_updating_progress",
         )
 
     def validate(self, data):
@@ -367,6 +367,7 @@ class EndpointStatusViewSet(
     serializer_class = serializers.EndpointStatusSerializer
     queryset = Endpoint_Status.objects.none()
     filter_backends = (DjangoFilterBackend,)
+    cursor_updated_field = "last_modified"
     filterset_fields = [
         "mitigated",
         "false_positive",
@@ -399,6 +400,7 @@ class EngagementViewSet(
     queryset = Engagement.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiEngagementFilter
+    cursor_updated_field = "updated"
 
     permission_classes = (
         IsAuthenticated,
@@ -866,6 +868,7 @@ class FindingViewSet(
     queryset = Finding.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiFindingFilter
+    cursor_updated_field = "updated"
     permission_classes = (
         IsAuthenticated,
         permissions.UserHasFindingPermission,
@@ -1724,6 +1727,7 @@ class ProductViewSet(
     queryset = Product.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiProductFilter
+    cursor_updated_field = "updated"
     permission_classes = (
         IsAuthenticated,
         permissions.UserHasProductPermission,
@@ -2046,6 +2050,7 @@ class TestsViewSet(
     queryset = Test.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiTestFilter
+    cursor_updated_field = "updated"
     permission_classes = (IsAuthenticated, permissions.UserHasTestPermission)
 
     @property
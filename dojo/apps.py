@@ -1,11 +1,12 @@
 import logging
 
 from django.apps import AppConfig
+from django.conf import settings
 from django.core.checks import register as register_check
 from django.db import models
 from watson import search as watson
 
-from dojo.checks import check_configuration_deduplication
+from dojo.checks import check_configuration_deduplication, check_configuration_shared_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,36 @@ class DojoAppConfig(AppConfig):
         # commented out ^ as it prints in manage.py dumpdata, docker logs and many other places
         # logger doesn't work yet at this stage
 
+        # with the postgres search backend the full-text indexes of the models are used instead
+        if settings.SEARCH_BACKEND == "watson":
+            self.register_watson_models()
+
+        register_check(check_configuration_deduplication, "dojo")
+        register_check(check_configuration_shared_cache, "dojo")
+
+        from dojo.middleware import DojoSystemSettingsCache
+        models.signals.post_save.connect(DojoSystemSettingsCache.invalidate, sender=self.get_model("System_Settings"))
+
+        # Load any signals here that will be ready for runtime
+        # Importing the signals file is good enough if using the reciever decorator
+        import dojo.announcement.signals
+        import dojo.authorization.signals
+        import dojo.benchmark.signals
+        import dojo.cred.signals
+        import dojo.endpoint.signals
+        import dojo.engagement.signals
+        import dojo.finding_group.signals
+        import dojo.notes.signals
+        import dojo.notifications.signals
+        import dojo.product.signals
+        import dojo.product_type.signals
+        import dojo.risk_acceptance.signals
+        import dojo.sla_config.helpers
+        import dojo.tags_signals
+        import dojo.test.signals
+        import dojo.tool_product.signals  # noqa: F401
+
+    def register_watson_models(self):
         # Watson doesn't have a way to let it index extra fields, so we have to explicitly list all the fields
         # to make it easier, we get the charfields/textfields from the model and then add our extra fields.
         # charfields/textfields are the fields that watson indexes by default (but we have to repeat here if we add extra fields)
@@ -59,7 +90,7 @@ class DojoAppConfig(AppConfig):
         # sast_source_file_path = models.CharField(null=True, blank=True, max_length=4000, help_text="Source filepath of the attack vector")
 
         watson.register(self.get_model("Finding_Template"))
-        watson.register(self.get_model("Endpoint"), store=("product__name", ))  # add product name also?
+        watson.register(self.get_model("Endpoint"), exclude=("canonical_url_hash", ), store=("product__name", ))  # add product name also?
         watson.register(self.get_model("Engagement"), fields=get_model_fields_with_extra(self.get_model("Engagement"), ("id", "product__name")), store=("product__name", ))
         watson.register(self.get_model("App_Analysis"))
         watson.register(self.get_model("Vulnerability_Id"), store=("finding__test__engagement__product__name", ))
@@ -67,25 +98,6 @@ class DojoAppConfig(AppConfig):
         # YourModel = self.get_model("YourModel")
         # watson.register(YourModel)
 
-        register_check(check_configuration_deduplication, "dojo")
-
-        # Load any signals here that will be ready for runtime
-        # Importing the signals file is good enough if using the reciever decorator
-        import dojo.announcement.signals
-        import dojo.benchmark.signals
-        import dojo.cred.signals
-        import dojo.endpoint.signals
-        import dojo.engagement.signals
-        import dojo.finding_group.signals
-        import dojo.notes.signals
-        import dojo.product.signals
-        import dojo.product_type.signals
-        import dojo.risk_acceptance.signals
-        import dojo.sla_config.helpers
-        import dojo.tags_signals
-        import dojo.test.signals
-        import dojo.tool_product.signals  # noqa: F401
-
 
 def get_model_fields_with_extra(model, extra_fields=()):
     return get_model_fields(get_model_default_fields(model), extra_fields)
@@ -1,4 +1,11 @@
+from collections import defaultdict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Q
 
 from dojo.authorization.roles_permissions import (
     Permissions,
@@ -6,6 +13,7 @@ from dojo.authorization.roles_permissions import (
     get_global_roles_with_permissions,
     get_roles_with_permissions,
 )
+from dojo.checks import is_shared_cache
 from dojo.models import (
     App_Analysis,
     Cred_Mapping,
@@ -28,6 +36,8 @@ from dojo.models import (
 )
 from dojo.request_cache import cache_for_request
 
+AUTHORIZATION_VERSION_KEY = "dojo_authorization_version"
+
 
 def user_has_configuration_permission(user, permission):
     if not user:
@@ -387,3 +397,87 @@ def get_group_members_dict(user):
     ):
         gu_dict[group_member.group.id] = group_member
     return gu_dict
+
+
+def get_authorized_product_ids(permission, user):
+    """
+    Returns the ids of the products for which the user has the permission through a role in the product or its
+    product type, either directly or through a group. The result is meant to be used as `product_id__in=...`
+    filter by the `get_authorized_*` queries, instead of checking the memberships for every row of the query.
+
+    Global roles are not taken into account, they need to be checked with `user_has_global_permission` first.
+    """
+    roles = get_roles_for_permission(permission)
+
+    if not is_authorization_cache_enabled():
+        # Evaluated as a subquery of the query that is filtered
+        return Product.objects.filter(
+            Q(prod_type__in=Product_Type_Member.objects.filter(user=user, role__in=roles).values("product_type"))
+            | Q(id__in=Product_Member.objects.filter(user=user, role__in=roles).values("product"))
+            | Q(prod_type__in=Product_Type_Group.objects.filter(group__users=user, role__in=roles).values("product_type"))
+            | Q(id__in=Product_Group.objects.filter(group__users=user, role__in=roles).values("product")),
+        ).values("id")
+
+    return sorted(
+        product_id for product_id, product_roles in get_product_roles_dict(user).items()
+        if not product_roles.isdisjoint(roles)
+    )
+
+
+def is_authorization_cache_enabled():
+    # A cache of its own in each process would keep revoked memberships in the other processes,
+    # the misconfiguration is reported by the check_configuration_shared_cache system check
+    return settings.AUTHORIZATION_CACHE_ENABLED and is_shared_cache()
+
+
+def get_product_roles_dict(user):
+    """
+    Returns a dictionary of product id -> ids of the roles the user has for the product. The dictionary is kept
+    in the Django cache under a version that is replaced whenever a membership changes.
+    """
+    cache_key = f"dojo_product_roles_{get_authorization_version()}_{user.id}"
+    product_roles = cache.get(cache_key)
+    if product_roles is not None:
+        return product_roles
+
+    product_roles = defaultdict(set)
+    for product_id, role_id in Product_Member.objects.filter(user=user).values_list("product_id", "role_id"):
+        product_roles[product_id].add(role_id)
+    for product_id, role_id in Product_Group.objects.filter(group__users=user).values_list("product_id", "role_id"):
+        product_roles[product_id].add(role_id)
+
+    product_type_roles = defaultdict(set)
+    for product_type_id, role_id in Product_Type_Member.objects.filter(user=user).values_list("product_type_id", "role_id"):
+        product_type_roles[product_type_id].add(role_id)
+    for product_type_id, role_id in Product_Type_Group.objects.filter(group__users=user).values_list("product_type_id", "role_id"):
+        product_type_roles[product_type_id].add(role_id)
+    if product_type_roles:
+        for product_id, product_type_id in Product.objects.filter(prod_type__in=product_type_roles).values_list("id", "prod_type_id"):
+            product_roles[product_id] |= product_type_roles[product_type_id]
+
+    product_roles = dict(product_roles)
+    cache.set(cache_key, product_roles, timeout=settings.AUTHORIZATION_CACHE_TIMEOUT)
+    return product_roles
+
+
+def get_authorization_version():
+    version = cache.get(AUTHORIZATION_VERSION_KEY)
+    if version is None:
+        # another process might have stamped a version in the meantime, which then wins
+        cache.add(AUTHORIZATION_VERSION_KEY, uuid4().hex, timeout=None)
+        version = cache.get(AUTHORIZATION_VERSION_KEY)
+    return version
+
+
+def invalidate_authorized_product_ids():
+    """Invalidates the cached product roles of all users, after memberships, groups or products changed"""
+    if not is_authorization_cache_enabled():
+        return
+
+    def bump_version():
+        cache.set(AUTHORIZATION_VERSION_KEY, uuid4().hex, timeout=None)
+
+    # Bump right away for the current transaction and again after the commit, so that
+    # no other process can cache the old memberships under the new version
+    bump_version()
+    transaction.on_commit(bump_version)
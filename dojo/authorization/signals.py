@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from fieldsignals import pre_save_changed
+
+from dojo.authorization.authorization import invalidate_authorized_product_ids
+from dojo.models import (
+    Dojo_Group_Member,
+    Product,
+    Product_Group,
+    Product_Member,
+    Product_Type_Group,
+    Product_Type_Member,
+)
+
+
+@receiver(post_save, sender=Product_Member)
+@receiver(post_save, sender=Product_Type_Member)
+@receiver(post_save, sender=Product_Group)
+@receiver(post_save, sender=Product_Type_Group)
+@receiver(post_save, sender=Dojo_Group_Member)
+@receiver(post_delete, sender=Product_Member)
+@receiver(post_delete, sender=Product_Type_Member)
+@receiver(post_delete, sender=Product_Group)
+@receiver(post_delete, sender=Product_Type_Group)
+@receiver(post_delete, sender=Dojo_Group_Member)
+@receiver(post_delete, sender=Product)
+def membership_changed(sender, instance, **kwargs):
+    invalidate_authorized_product_ids()
+
+
+# products inherit the members of their product type
+@receiver(post_save, sender=Product)
+def product_post_save(sender, instance, created, **kwargs):
+    if created:
+        invalidate_authorized_product_ids()
+
+
+@receiver(pre_save_changed, sender=Product, fields=["prod_type"])
+def product_type_changed(sender, instance, changed_fields=None, **kwargs):
+    invalidate_authorized_product_ids()
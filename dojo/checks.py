@@ -1,6 +1,19 @@
 from django.conf import settings
 from django.core.checks import Error
 
+# Cache backends whose entries all processes (uwsgi workers, celery workers, ...) see
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django.core.cache.backends.redis.RedisCache",
+    "django_redis.cache.RedisCache",
+)
+
+
+def is_shared_cache(alias="default"):
+    return settings.CACHES.get(alias, {}).get("BACKEND") in SHARED_CACHE_BACKENDS
+
 
 def check_configuration_deduplication(app_configs, **kwargs):
     errors = []
@@ -13,3 +26,15 @@ def check_configuration_deduplication(app_configs, **kwargs):
             ) for field in settings.HASHCODE_FIELDS_PER_SCANNER.get(scanner)
                 if field not in settings.HASHCODE_ALLOWED_FIELDS)
     return errors
+
+
+def check_configuration_shared_cache(app_configs, **kwargs):
+    if is_shared_cache():
+        return []
+    return [Error(
+            f"Configuration error in {setting}: the cache requires a default cache that is shared by all processes.",
+            hint=f'Configure CACHES["default"] with one of the backends {", ".join(SHARED_CACHE_BACKENDS)}, or disable DD_{setting}',
+            obj=settings.CACHES.get("default", {}).get("BACKEND"),
+            id="dojo.E002",
+        ) for setting in ("AUTHORIZATION_CACHE_ENABLED", "NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED")
+            if getattr(settings, setting)]
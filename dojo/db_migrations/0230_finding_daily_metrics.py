@@ -0,0 +1,33 @@
+# Generated by Django 5.1.8 on 2026-10-18 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0229_alter_finding_unique_id_from_tool'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Finding_Daily_Metrics',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='The date of the findings counted in this row.')),
+                ('severity', models.CharField(help_text='The severity of the findings counted in this row.', max_length=200)),
+                ('total_count', models.PositiveIntegerField(default=0, help_text='Number of findings.')),
+                ('active_count', models.PositiveIntegerField(default=0, help_text='Number of active findings.')),
+                ('mitigated_count', models.PositiveIntegerField(default=0, help_text='Number of mitigated findings.')),
+                ('risk_accepted_count', models.PositiveIntegerField(default=0, help_text='Number of risk accepted findings.')),
+                ('unresolved_count', models.PositiveIntegerField(default=0, help_text='Number of findings that are not mitigated, false positive, out of scope or a duplicate.')),
+                ('unresolved_verified_count', models.PositiveIntegerField(default=0, help_text='Number of unresolved findings that are verified.')),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='dojo.product')),
+            ],
+            options={
+                'unique_together': {('product', 'date', 'severity')},
+            },
+        ),
+    ]
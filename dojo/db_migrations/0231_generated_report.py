@@ -0,0 +1,35 @@
+# Generated by Django 5.1.8 on 2026-10-18 04:23
+
+import django.db.models.deletion
+import dojo.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0230_finding_daily_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Generated_Report',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(db_index=True, editable=False, help_text='Hash of the object, user, options and filters of the report.', max_length=64)),
+                ('data_version', models.CharField(editable=False, help_text='Hash of the state of the findings at the time the report was requested.', max_length=64)),
+                ('name', models.CharField(max_length=400)),
+                ('object_type', models.CharField(editable=False, max_length=50)),
+                ('object_id', models.PositiveIntegerField(editable=False)),
+                ('parameters', models.TextField(blank=True, editable=False, help_text='The options and filters of the report as query string.')),
+                ('host', models.CharField(blank=True, editable=False, max_length=400)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Success', 'Success'), ('Failed', 'Failed')], default='Pending', max_length=20)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Percentage of the rendering that is done.')),
+                ('message', models.TextField(blank=True, null=True)),
+                ('file', models.FileField(blank=True, null=True, upload_to=dojo.models.UniqueUploadNameProvider('reports/%Y/%m/%d'))),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('completed', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='dojo.dojo_user')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0231_generated_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sla_configuration',
+            name='async_updating_progress',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Percentage of the products under this SLA configuration whose findings have been updated'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-18 05:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0232_sla_configuration_async_updating_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jira_instance',
+            name='reconciled_until',
+            field=models.DateTimeField(blank=True, editable=False, help_text='The JIRA issues updated before this time have been reconciled with their findings by the incremental JIRA status reconciliation', null=True, verbose_name='Reconciled until'),
+        ),
+    ]
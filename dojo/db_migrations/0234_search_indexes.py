@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import migrations
+
+from dojo.search.indexes import create_search_indexes, drop_search_indexes
+
+
+def create_search_indexes_for_backend(apps, schema_editor):
+    # the indexes are only built when the PostgreSQL search backend is used, see the search_indexes command
+    if settings.SEARCH_BACKEND == "postgres":
+        create_search_indexes(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    # the indexes of large tables are built without locking them for writes
+    atomic = False
+
+    dependencies = [
+        ('dojo', '0233_jira_instance_reconciled_until'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes_for_backend, drop_search_indexes),
+    ]
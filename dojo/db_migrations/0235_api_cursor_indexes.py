@@ -0,0 +1,25 @@
+# Generated by Django 5.1.8 on 2026-10-18 05:40
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # the indexes of large tables are built without locking them for writes
+    atomic = False
+
+    dependencies = [
+        ('dojo', '0234_search_indexes'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='endpoint_status',
+            index=models.Index(fields=['last_modified', 'id'], name='dojo_endpoi_last_mo_01a40c_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='finding',
+            index=models.Index(fields=['last_status_update', 'id'], name='dojo_findin_last_st_22a430_idx'),
+        ),
+    ]
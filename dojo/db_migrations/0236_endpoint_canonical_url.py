@@ -0,0 +1,34 @@
+# Generated by Django 5.1.8 on 2026-10-18 06:26
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+from dojo.endpoint.utils import store_canonical_urls
+
+
+class Migration(migrations.Migration):
+
+    # the endpoints are updated in batches and the index is built without locking the table for writes
+    atomic = False
+
+    dependencies = [
+        ('dojo', '0235_api_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='endpoint',
+            name='canonical_url',
+            field=models.TextField(blank=True, default='', editable=False, help_text='The normalized URL of the endpoint, kept current on save.'),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='canonical_url_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='The SHA-256 digest of the normalized URL of the endpoint.', max_length=64),
+        ),
+        migrations.RunPython(store_canonical_urls, migrations.RunPython.noop),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='endpoint',
+            index=models.Index(fields=['product', 'canonical_url_hash'], name='dojo_endpoi_product_f9a90b_idx'),
+        ),
+    ]
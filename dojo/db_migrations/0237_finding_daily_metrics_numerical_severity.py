@@ -0,0 +1,32 @@
+# Generated by Django 5.1.8 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+
+def clear_finding_daily_metrics(apps, schema_editor):
+    # the rows have no numerical severity yet, the whole rollup is rebuilt by the next update when it is empty
+    apps.get_model("dojo", "Finding_Daily_Metrics").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0236_endpoint_canonical_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_finding_daily_metrics, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='finding_daily_metrics',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='finding_daily_metrics',
+            name='numerical_severity',
+            field=models.CharField(blank=True, default='', help_text='The numerical severity of the findings counted in this row, as stored on the findings.', max_length=4),
+        ),
+        migrations.AlterUniqueTogether(
+            name='finding_daily_metrics',
+            unique_together={('product', 'date', 'severity', 'numerical_severity')},
+        ),
+    ]
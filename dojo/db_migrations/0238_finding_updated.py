@@ -0,0 +1,42 @@
+# Generated by Django 5.1.8 on 2026-10-18 07:59
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def set_finding_updated(apps, schema_editor):
+    """The findings saved before the field existed get their last status update as the time they were updated"""
+    Finding = apps.get_model('dojo', 'Finding')
+    last_id = Finding.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    batch_size = 10000
+    for start in range(0, last_id + 1, batch_size):
+        Finding.objects.filter(id__gte=start, id__lt=start + batch_size, updated__isnull=True).update(
+            updated=Coalesce('last_status_update', 'created'))
+
+
+class Migration(migrations.Migration):
+
+    # the findings are updated in batches and the index is built without locking the table for writes
+    atomic = False
+
+    dependencies = [
+        ('dojo', '0237_finding_daily_metrics_numerical_severity'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.RemoveIndexConcurrently(
+            model_name='finding',
+            name='dojo_findin_last_st_22a430_idx',
+        ),
+        migrations.AddField(
+            model_name='finding',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, help_text='The date the finding was last saved inside DefectDojo.', null=True, verbose_name='Updated'),
+        ),
+        migrations.RunPython(set_finding_updated, migrations.RunPython.noop),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='finding',
+            index=models.Index(fields=['updated', 'id'], name='dojo_findin_updated_0cb26f_idx'),
+        ),
+    ]
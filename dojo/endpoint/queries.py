@@ -1,14 +1,9 @@
 from crum import get_current_user
-from django.db.models import Exists, OuterRef, Q
 
-from dojo.authorization.authorization import get_roles_for_permission, user_has_global_permission
+from dojo.authorization.authorization import get_authorized_product_ids, user_has_global_permission
 from dojo.models import (
     Endpoint,
     Endpoint_Status,
-    Product_Group,
-    Product_Member,
-    Product_Type_Group,
-    Product_Type_Member,
 )
 
 
@@ -28,31 +23,8 @@ def get_authorized_endpoints(permission, queryset=None, user=None):
     if user_has_global_permission(user, permission):
         return endpoints
 
-    roles = get_roles_for_permission(permission)
-    authorized_product_type_roles = Product_Type_Member.objects.filter(
-        product_type=OuterRef("product__prod_type_id"),
-        user=user,
-        role__in=roles)
-    authorized_product_roles = Product_Member.objects.filter(
-        product=OuterRef("product_id"),
-        user=user,
-        role__in=roles)
-    authorized_product_type_groups = Product_Type_Group.objects.filter(
-        product_type=OuterRef("product__prod_type_id"),
-        group__users=user,
-        role__in=roles)
-    authorized_product_groups = Product_Group.objects.filter(
-        product=OuterRef("product_id"),
-        group__users=user,
-        role__in=roles)
-    endpoints = endpoints.annotate(
-        product__prod_type__member=Exists(authorized_product_type_roles),
-        product__member=Exists(authorized_product_roles),
-        product__prod_type__authorized_group=Exists(authorized_product_type_groups),
-        product__authorized_group=Exists(authorized_product_groups))
-    return endpoints.filter(
-        Q(product__prod_type__member=True) | Q(product__member=True)
-        | Q(product__prod_type__authorized_group=True) | Q(product__authorized_group=True))
+    authorized_product_ids = get_authorized_product_ids(permission, user)
+    return endpoints.filter(product__in=authorized_product_ids)
 
 
 def get_authorized_endpoint_status(permission, queryset=None, user=None):
@@ -71,28 +43,5 @@ def get_authorized_endpoint_status(permission, queryset=None, user=None):
     if user_has_global_permission(user, permission):
         return endpoint_status
 
-    roles = get_roles_for_permission(permission)
-    authorized_product_type_roles = Product_Type_Member.objects.filter(
-        product_type=OuterRef("endpoint__product__prod_type_id"),
-        user=user,
-        role__in=roles)
-    authorized_product_roles = Product_Member.objects.filter(
-        product=OuterRef("endpoint__product_id"),
-        user=user,
-        role__in=roles)
-    authorized_product_type_groups = Product_Type_Group.objects.filter(
-        product_type=OuterRef("endpoint__product__prod_type_id"),
-        group__users=user,
-        role__in=roles)
-    authorized_product_groups = Product_Group.objects.filter(
-        product=OuterRef("endpoint__product_id"),
-        group__users=user,
-        role__in=roles)
-    endpoint_status = endpoint_status.annotate(
-        endpoint__product__prod_type__member=Exists(authorized_product_type_roles),
-        endpoint__product__member=Exists(authorized_product_roles),
-        endpoint__product__prod_type__authorized_group=Exists(authorized_product_type_groups),
-        endpoint__product__authorized_group=Exists(authorized_product_groups))
-    return endpoint_status.filter(
-        Q(endpoint__product__prod_type__member=True) | Q(endpoint__product__member=True)
-        | Q(endpoint__product__prod_type__authorized_group=True) | Q(endpoint__product__authorized_group=True))
+    authorized_product_ids = get_authorized_product_ids(permission, user)
+    return endpoint_status.filter(endpoint__product__in=authorized_product_ids)
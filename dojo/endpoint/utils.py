@@ -72,6 +72,52 @@ def endpoint_get_or_create(**kwargs):
         return qs.order_by("id").first(), False
 
 
+def endpoint_filter_key(endpoint):
+    """
+    Returns a key that is the same for all endpoints that `endpoint_filter` matches with the attributes of the
+    supplied endpoint, so that endpoints can be matched in memory: the protocol and the host are not case
+    sensitive, empty attributes are the same as missing ones and the default port of the protocol is the same
+    as no port
+    """
+    protocol = endpoint.protocol.upper() if endpoint.protocol else None
+    port = endpoint.port or None
+    if protocol and protocol.lower() in SCHEME_PORT_MAP and port == SCHEME_PORT_MAP[protocol.lower()]:
+        port = None
+    return (
+        protocol,
+        endpoint.userinfo or None,
+        endpoint.host.upper() if endpoint.host else None,
+        port,
+        endpoint.path or None,
+        endpoint.query or None,
+        endpoint.fragment or None,
+    )
+
+
+def endpoint_filter_matchable(endpoint):
+    """
+    Returns whether `endpoint_filter` can match the supplied saved endpoint at all. Empty attributes and
+    port 0 are filtered as missing, so endpoints stored with these values are never matched
+    """
+    return endpoint.port != 0 and "" not in {
+        endpoint.protocol, endpoint.userinfo, endpoint.host, endpoint.path, endpoint.query, endpoint.fragment,
+    }
+
+
+def store_canonical_urls(apps, schema_editor):
+    """Stores the canonical URL and its digest of all endpoints, for the endpoints saved before they were kept on save"""
+    from dojo.utils import mass_model_updater
+
+    Endpoint_model = apps.get_model("dojo", "Endpoint")
+
+    def store_canonical_url(endpoint):
+        endpoint.canonical_url = Endpoint.build_canonical_url(*(getattr(endpoint, part) for part in Endpoint.URL_PARTS))
+        endpoint.canonical_url_hash = Endpoint.hash_canonical_url(endpoint.canonical_url)
+
+    mass_model_updater(Endpoint_model, Endpoint_model.objects.all(), store_canonical_url,
+                       fields=["canonical_url", "canonical_url_hash"], log_prefix="storing canonical urls: ")
+
+
 def clean_hosts_run(apps, change):
     def err_log(message, html_log, endpoint_html_log, endpoint):
         error_suffix = "It is not possible to migrate it. Delete or edit this endpoint."
@@ -2615,7 +2615,7 @@ class EndpointFilter(EndpointFilterHelper, DojoFilter):
 
     class Meta:
         model = Endpoint
-        exclude = ["findings", "inherited_tags"]
+        exclude = ["findings", "inherited_tags", "canonical_url", "canonical_url_hash"]
 
 
 class EndpointFilterWithoutObjectLookups(EndpointFilterHelper):
@@ -2756,7 +2756,7 @@ class EndpointFilterWithoutObjectLookups(EndpointFilterHelper):
 
     class Meta:
         model = Endpoint
-        exclude = ["findings", "inherited_tags", "product"]
+        exclude = ["findings", "inherited_tags", "product", "canonical_url", "canonical_url_hash"]
 
 
 class ApiEndpointFilter(DojoFilter):
@@ -3043,7 +3043,7 @@ class EndpointReportFilter(DojoFilter):
 
     class Meta:
         model = Endpoint
-        exclude = ["product"]
+        exclude = ["product", "canonical_url", "canonical_url_hash"]
 
 
 class ReportFindingFilterHelper(FilterSet):
@@ -398,6 +398,81 @@ def post_process_finding_save(finding, dedupe_option=True, rules_option=True, pr
             jira_helper.push_to_jira(finding.finding_group)
 
 
+@dojo_async_task
+@app.task
+def post_process_findings_batch(finding_ids, *args, dedupe_option=True, rules_option=True, product_grading_option=True,
+             issue_updater_option=True, push_to_jira=False, user=None, update_search_index=False, **kwargs):
+    """
+    Same as post_process_finding_save, but for a batch of findings at once. This avoids submitting
+    one celery task per finding, deduplicates the findings of the batch together, calculates the grade
+    of each affected product only once and pushes each finding group to JIRA only once.
+    `update_search_index` must be set for findings that were created with bulk_create
+    """
+    if not finding_ids:
+        return
+
+    system_settings = System_Settings.objects.get()
+    findings = list(
+        Finding.objects.filter(id__in=finding_ids)
+        .select_related("test__engagement__product", "test__test_type")
+        .order_by("id"),
+    )
+    # the full-text indexes of the postgres search backend are kept current by the database itself
+    if update_search_index and settings.SEARCH_BACKEND == "watson":
+        # Findings created with bulk_create bypass the post_save signal used by watson to keep the search index current
+        from watson.search import default_search_engine
+        for finding in findings:
+            default_search_engine.update_obj_index(finding)
+
+    # STEP 1 run all status changing tasks sequentially to avoid race conditions
+    if dedupe_option:
+        if system_settings.enable_deduplication:
+            from dojo.utils import do_dedupe_findings_batch
+            findings_to_dedupe = []
+            for finding in findings:
+                if finding.hash_code is not None:
+                    findings_to_dedupe.append(finding)
+                else:
+                    deduplicationLogger.warning("skipping dedupe because hash_code is None")
+            do_dedupe_findings_batch(findings_to_dedupe, *args, **kwargs)
+        else:
+            deduplicationLogger.debug("skipping dedupe because it's disabled in system settings")
+
+    if system_settings.false_positive_history:
+        # Only perform false positive history if deduplication is disabled
+        if system_settings.enable_deduplication:
+            deduplicationLogger.warning("skipping false positive history because deduplication is also enabled")
+        else:
+            from dojo.utils import do_false_positive_history
+            for finding in findings:
+                do_false_positive_history(finding, *args, **kwargs)
+
+    # STEP 2 run all non-status changing tasks as celery tasks in the background
+    if issue_updater_option:
+        from dojo.tools import tool_issue_updater
+        for finding in findings:
+            tool_issue_updater.async_tool_issue_update(finding)
+
+    if product_grading_option:
+        if system_settings.enable_product_grade:
+            from dojo.utils import calculate_grade
+            for product in {finding.test.engagement.product for finding in findings}:
+                calculate_grade(product)
+        else:
+            deduplicationLogger.debug("skipping product grading because it's disabled in system settings")
+
+    if push_to_jira:
+        pushed_finding_groups = set()
+        for finding in findings:
+            logger.debug("pushing finding %s to jira from post_process_findings_batch()", finding.pk)
+            finding_group = finding.finding_group
+            if finding.has_jira_issue or not finding_group:
+                jira_helper.push_to_jira(finding)
+            elif finding_group.id not in pushed_finding_groups:
+                pushed_finding_groups.add(finding_group.id)
+                jira_helper.push_to_jira(finding_group)
+
+
 @receiver(pre_delete, sender=Finding)
 def finding_pre_delete(sender, instance, **kwargs):
     logger.debug("finding pre_delete: %d", instance.id)
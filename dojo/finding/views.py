@@ -2713,6 +2713,8 @@ def finding_bulk_update_all(request, pid=None):
 
             finds = prefetch_for_findings(finds)
             note = None
+            grade_products = False
+            post_process_findings = False
             if form.cleaned_data["severity"] or form.cleaned_data["status"]:
                 for find in finds:
                     old_find = copy.deepcopy(find)
@@ -2762,8 +2764,7 @@ def finding_bulk_update_all(request, pid=None):
                                     fp.is_mitigated = find.is_mitigated
                                     fp.save_no_options()
 
-                for prod in prods:
-                    calculate_grade(prod)
+                grade_products = True
 
             if form.cleaned_data["date"]:
                 for finding in finds:
@@ -2798,8 +2799,7 @@ def finding_bulk_update_all(request, pid=None):
                         elif form.cleaned_data["risk_unaccept"]:
                             ra_helper.risk_unaccept(request.user, finding)
 
-                for prod in prods:
-                    calculate_grade(prod)
+                grade_products = True
 
             if skipped_risk_accept_count > 0:
                 messages.add_message(
@@ -2943,7 +2943,8 @@ def finding_bulk_update_all(request, pid=None):
                 note.history.add(history)
                 for finding in finds:
                     finding.notes.add(note)
-                    finding.save()
+                    finding.save_no_options()
+                post_process_findings = True
 
             if form.cleaned_data["tags"]:
                 for finding in finds:
@@ -2956,7 +2957,19 @@ def finding_bulk_update_all(request, pid=None):
                     )
                     # currently bulk edit overwrites existing tags
                     finding.tags = tags
-                    finding.save()
+                    finding.save_no_options()
+                post_process_findings = True
+
+            # the findings are post processed together, so that the grade of each product is calculated only once.
+            # the tool issue updater and JIRA are handled separately below
+            if post_process_findings:
+                finding_helper.post_process_findings_batch(
+                    [finding.id for finding in finds],
+                    issue_updater_option=False,
+                )
+            elif grade_products:
+                for prod in prods:
+                    calculate_grade(prod)
 
             error_counts = defaultdict(lambda: 0)
             success_count = 0
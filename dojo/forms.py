@@ -2700,7 +2700,7 @@ class SLAConfigForm(forms.ModelForm):
         # if this sla config has findings being asynchronously updated, disable the days by severity fields
         if self.instance.async_updating:
             msg = (
-                "Finding SLA expiration dates are currently being recalculated. "
+                f"Finding SLA expiration dates are currently being recalculated ({self.instance.async_updating_progress}% done). "
                 "This field cannot be changed until the calculation is complete."
             )
             self.fields["critical"].disabled = True
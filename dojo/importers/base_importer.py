@@ -1,13 +1,19 @@
 import base64
 import logging
+from collections.abc import Iterable, Iterator
+from copy import copy
+from itertools import chain, islice
 
+from cvss import CVSS3
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.timezone import make_aware
+from titlecase import titlecase
 
 import dojo.finding.helper as finding_helper
 from dojo.importers.endpoint_manager import EndpointManager
@@ -21,9 +27,12 @@ from dojo.models import (
     # Finding Severities
     SEVERITIES,
     BurpRawRequestResponse,
+    Dojo_User,
     Endpoint,
     FileUpload,
     Finding,
+    Finding_Group,
+    Notes,
     Test,
     Test_Import,
     Test_Import_Finding_Action,
@@ -31,9 +40,16 @@ from dojo.models import (
     Vulnerability_Id,
 )
 from dojo.notifications.helper import create_notification
+from dojo.tag_utils import bulk_add_tags, reset_tag_manager
 from dojo.tools.factory import get_parser
 from dojo.tools.parser_test import ParserTest
-from dojo.utils import max_safe
+from dojo.utils import (
+    apply_cwe_to_template,
+    bulk_create_audit_log_entries,
+    get_current_user,
+    get_system_setting,
+    max_safe,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +70,14 @@ class Parser:
         TODO once this enforced, this stub class should be removed
         """
 
+    def iter_findings(filehandle: TemporaryUploadedFile, test: Test) -> Iterator[Finding]:
+        """
+        Optional streaming version of `get_findings` that yields the findings while the
+        report is being read. It is only used when `IMPORT_STREAM_FINDINGS` is enabled.
+        Parsers of dynamic test types can also supply `iter_tests`, returning tests whose
+        findings are an iterator
+        """
+
 
 class BaseImporter(ImporterOptions):
 
@@ -162,6 +186,8 @@ class BaseImporter(ImporterOptions):
             msg = "A test must be supplied to parse the file"
             raise ValidationError(msg)
         try:
+            if settings.IMPORT_STREAM_FINDINGS and hasattr(parser, "iter_findings"):
+                return self.stream_parsed_findings(parser.iter_findings(scan, self.test))
             return parser.get_findings(scan, self.test)
         except ValueError as e:
             logger.warning(e)
@@ -174,11 +200,38 @@ class BaseImporter(ImporterOptions):
     ) -> list[Test]:
         """Use the API configuration object to get the tests to be used by the parser"""
         try:
+            if settings.IMPORT_STREAM_FINDINGS and hasattr(parser, "iter_tests"):
+                return parser.iter_tests(self.scan_type, scan)
             return parser.get_tests(self.scan_type, scan)
         except ValueError as e:
             logger.warning(e)
             raise ValidationError(e)
 
+    def stream_parsed_findings(
+        self,
+        parsed_findings: Iterable[Finding],
+    ) -> Iterator[Finding]:
+        """
+        Yields the findings of a streaming parser. As the report is only read while the findings
+        are being processed, any error of the parser is converted here in the same way as when
+        the report is parsed upfront
+        """
+        try:
+            yield from parsed_findings
+        except ValueError as e:
+            logger.warning(e)
+            raise ValidationError(e)
+
+    def chunk_parsed_findings(
+        self,
+        parsed_findings: Iterable[Finding],
+        chunk_size: int,
+    ) -> Iterator[list[Finding]]:
+        """Splits the parsed findings in lists of `chunk_size` findings without consuming them all upfront"""
+        parsed_findings = iter(parsed_findings)
+        while chunk := list(islice(parsed_findings, chunk_size)):
+            yield chunk
+
     def consolidate_dynamic_tests(self, tests: list[Test]) -> list[Finding]:
         parsed_findings = []
         # Make sure we have at least one test returned
@@ -209,6 +262,8 @@ class BaseImporter(ImporterOptions):
         self.update_test_from_internal_test(test_raw)
         self.update_test_type_from_internal_test(test_raw)
         # Aggregate all of the findings into a single place
+        if settings.IMPORT_STREAM_FINDINGS:
+            return self.stream_parsed_findings(chain.from_iterable(test_raw.findings for test_raw in tests))
         parsed_findings = []
         for test_raw in tests:
             parsed_findings.extend(test_raw.findings)
@@ -692,7 +747,25 @@ class BaseImporter(ImporterOptions):
         Parse the `unsaved_vulnerability_ids` field from findings after they are parsed
         to create `Vulnerability_Id` objects with the finding associated correctly
         """
-        # Synchronize the cve field with the unsaved_vulnerability_ids
+        self.sync_unsaved_vulnerability_ids(finding)
+
+        if finding.unsaved_vulnerability_ids:
+            # Remove old vulnerability ids - keeping this call only because of flake8
+            Vulnerability_Id.objects.filter(finding=finding).delete()
+
+            # user the helper function
+            finding_helper.save_vulnerability_ids(finding, finding.unsaved_vulnerability_ids)
+
+        return finding
+
+    def sync_unsaved_vulnerability_ids(
+        self,
+        finding: Finding,
+    ) -> Finding:
+        """
+        Synchronize the cve field with the `unsaved_vulnerability_ids` of the finding
+        without touching the database
+        """
         # We do this to be as flexible as possible to handle the fields until
         # the cve field is not needed anymore and can be removed.
         if finding.unsaved_vulnerability_ids and finding.cve:
@@ -705,13 +778,6 @@ class BaseImporter(ImporterOptions):
             # If there is no list, make one with the value of the cve field
             finding.unsaved_vulnerability_ids = [finding.cve]
 
-        if finding.unsaved_vulnerability_ids:
-            # Remove old vulnerability ids - keeping this call only because of flake8
-            Vulnerability_Id.objects.filter(finding=finding).delete()
-
-            # user the helper function
-            finding_helper.save_vulnerability_ids(finding, finding.unsaved_vulnerability_ids)
-
         return finding
 
     def process_files(
@@ -732,6 +798,202 @@ class BaseImporter(ImporterOptions):
                 file_upload.save()
                 finding.files.add(file_upload)
 
+    def prepare_finding_for_bulk_create(
+        self,
+        finding: Finding,
+        endpoints: list[Endpoint],
+        user: Dojo_User | None,
+    ) -> Finding:
+        """
+        Computes all the fields that `Finding.save` derives for a new finding in memory, so that
+        the finding can be inserted with `bulk_create`. The endpoints are the saved endpoints the
+        finding will be linked to, which are needed to determine the static/dynamic flags and the
+        hash code before the finding itself is saved
+        """
+        # Title Casing
+        finding.title = titlecase(finding.title[:511])
+        # Set the date of the finding if nothing is supplied
+        if finding.date is None:
+            finding.date = timezone.now()
+        # Assign the numerical severity for correct sorting order
+        finding.numerical_severity = Finding.get_numerical_severity(finding.severity)
+        # Synchronize cvssv3 score using cvssv3 vector
+        if finding.cvssv3:
+            try:
+                # use the environmental score, which is the most refined score
+                finding.cvssv3_score = CVSS3(finding.cvssv3).scores()[2]
+            except Exception as ex:
+                logger.error("Can't compute cvssv3 score for finding with title '%s'. Invalid cvssv3 vector found: '%s'. Exception: %s", finding.title, finding.cvssv3, ex)
+        finding = apply_cwe_to_template(finding)
+        if finding.file_path is not None:
+            finding.static_finding = True
+            if len(finding.unsaved_endpoints) == 0:
+                finding.dynamic_finding = False
+        finding_helper.update_finding_status(finding, user, changed_fields={"id": (None, None)})
+        # The hash code is computed from the endpoints the finding is going to be linked with
+        unsaved_endpoints = finding.unsaved_endpoints
+        finding.unsaved_endpoints = endpoints
+        try:
+            finding.set_hash_code(True)
+        finally:
+            finding.unsaved_endpoints = unsaved_endpoints
+        # update the SLA expiration date last, after all other finding fields have been updated
+        finding.set_sla_expiration_date()
+        return finding
+
+    def bulk_create_findings(
+        self,
+        findings: list[Finding],
+        endpoint_cache: dict | None = None,
+    ) -> list[Finding]:
+        """
+        Persists a chunk of unsaved findings along with their endpoint statuses, vulnerability IDs,
+        `found_by` relations, tags and request/response pairs using bulk inserts. None of the
+        `Finding.save` post processing is triggered, so the caller is responsible for scheduling
+        deduplication, product grading and pushing to JIRA for the returned findings
+        """
+        if not findings:
+            return []
+        user = get_current_user()
+        product = self.test.engagement.product
+        endpoints_per_finding = self.endpoint_manager.get_or_create_endpoints_in_bulk(
+            [finding.unsaved_endpoints + self.endpoints_to_add for finding in findings],
+            product,
+            endpoint_cache=endpoint_cache,
+        )
+        findings_and_endpoints = list(zip(findings, endpoints_per_finding, strict=True))
+        for finding, endpoints in findings_and_endpoints:
+            self.sync_unsaved_vulnerability_ids(finding)
+            self.prepare_finding_for_bulk_create(finding, endpoints, user)
+        # Collect the tags before inserting as parsers may have set them directly on the unsaved finding
+        tag_names_per_finding = []
+        for finding in findings:
+            if finding.unsaved_tags:
+                finding.tags = finding.unsaved_tags
+            tag_names_per_finding.append(finding.tags.get_tag_list())
+
+        findings = Finding.objects.bulk_create(findings)
+        self.endpoint_manager.bulk_create_endpoint_statuses(findings_and_endpoints)
+        self.bulk_create_vulnerability_ids(findings)
+        Finding.found_by.through.objects.bulk_create([
+            Finding.found_by.through(finding_id=finding.id, test_type_id=self.test.test_type_id)
+            for finding in findings
+        ])
+        self.bulk_create_tags(findings, tag_names_per_finding)
+        # Drop the tag managers cached before the insert so that tags are reloaded from the database
+        for finding in findings:
+            reset_tag_manager(finding, "tags")
+            reset_tag_manager(finding, "inherited_tags")
+        self.bulk_create_request_response_pairs(findings)
+        self.bulk_create_audit_log_entries(findings, user)
+        return findings
+
+    def bulk_create_vulnerability_ids(
+        self,
+        findings: list[Finding],
+    ) -> None:
+        """Creates the `Vulnerability_Id` objects of saved findings with a single bulk insert"""
+        vulnerability_ids = []
+        for finding in findings:
+            if finding.unsaved_vulnerability_ids:
+                # Remove duplicates
+                finding_vulnerability_ids = list(dict.fromkeys(finding.unsaved_vulnerability_ids))
+                finding.cve = finding_vulnerability_ids[0]
+                vulnerability_ids.extend(
+                    Vulnerability_Id(finding=finding, vulnerability_id=vulnerability_id)
+                    for vulnerability_id in finding_vulnerability_ids
+                )
+        Vulnerability_Id.objects.bulk_create(vulnerability_ids)
+
+    def bulk_create_tags(
+        self,
+        findings: list[Finding],
+        tag_names_per_finding: list[list[str]],
+    ) -> None:
+        """
+        Adds the tags of saved findings with bulk inserts, including the tags inherited
+        from the product when product tag inheritance is enabled
+        """
+        findings_to_tags = dict(zip(findings, tag_names_per_finding, strict=True))
+        product = self.test.engagement.product
+        if product.enable_product_tag_inheritance or get_system_setting("enable_product_tag_inheritance"):
+            if inherited_tags := [tag.name for tag in product.tags.all()]:
+                bulk_add_tags(Finding, dict.fromkeys(findings, inherited_tags), tag_field_name="inherited_tags")
+                findings_to_tags = {
+                    finding: tag_names + inherited_tags
+                    for finding, tag_names in findings_to_tags.items()
+                }
+        bulk_add_tags(Finding, findings_to_tags)
+
+    def bulk_create_request_response_pairs(
+        self,
+        findings: list[Finding],
+    ) -> None:
+        """Bulk version of `process_request_response_pairs` for saved findings"""
+        request_response_pairs = []
+        for finding in findings:
+            request_response_pairs.extend(
+                BurpRawRequestResponse(
+                    finding=finding,
+                    burpRequestBase64=base64.b64encode(req_resp["req"].encode("utf-8")),
+                    burpResponseBase64=base64.b64encode(req_resp["resp"].encode("utf-8")))
+                for req_resp in getattr(finding, "unsaved_req_resp", [])
+            )
+            unsaved_request = getattr(finding, "unsaved_request", None)
+            unsaved_response = getattr(finding, "unsaved_response", None)
+            if unsaved_request is not None and unsaved_response is not None:
+                request_response_pairs.append(BurpRawRequestResponse(
+                    finding=finding,
+                    burpRequestBase64=base64.b64encode(unsaved_request.encode()),
+                    burpResponseBase64=base64.b64encode(unsaved_response.encode())))
+        for burp_rr in request_response_pairs:
+            burp_rr.clean()
+        BurpRawRequestResponse.objects.bulk_create(request_response_pairs)
+
+    def bulk_create_audit_log_entries(
+        self,
+        findings: list[Finding],
+        user: Dojo_User | None,
+        findings_before: dict[int, Finding] | None = None,
+    ) -> None:
+        """
+        Findings inserted with `bulk_create` do not trigger the auditlog signals,
+        so the "create" log entries are written here in bulk instead. When the state
+        of the findings before a bulk update is supplied, "update" entries are written
+        """
+        bulk_create_audit_log_entries(findings, user, instances_before=findings_before)
+
+    def save_finding_without_post_processing(
+        self,
+        finding: Finding,
+    ) -> Finding:
+        """
+        Saves a finding without scheduling its post processing, which is done for all findings
+        of the import at once by `post_process_findings_in_batches`. The hash code is computed
+        here, as `Finding.save` only does so when deduplication is requested
+        """
+        finding.set_hash_code(True)
+        finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
+        return finding
+
+    def post_process_findings_in_batches(
+        self,
+        finding_ids: Iterable[int],
+        *,
+        push_to_jira: bool,
+    ) -> None:
+        """
+        Schedules the deduplication, product grading and pushing to JIRA of the saved findings
+        with one task per `POST_PROCESS_FINDINGS_BATCH_SIZE` findings, rather than one task per finding
+        """
+        # A finding can be matched more than once in the same report
+        finding_ids = dict.fromkeys(finding_ids)
+        for finding_ids_chunk in self.chunk_parsed_findings(finding_ids, settings.POST_PROCESS_FINDINGS_BATCH_SIZE):
+            finding_helper.post_process_findings_batch(
+                finding_ids_chunk,
+                push_to_jira=push_to_jira,
+            )
+
     def mitigate_finding(
         self,
         finding: Finding,
@@ -763,6 +1025,56 @@ class BaseImporter(ImporterOptions):
         else:
             finding.save(dedupe_option=False, push_to_jira=self.push_to_jira)
 
+    def mitigate_findings_in_bulk(
+        self,
+        findings: Iterable[Finding],
+        note_message: str,
+        *,
+        finding_groups_enabled: bool,
+    ) -> None:
+        """
+        Same as `mitigate_finding`, but for many findings at once. The findings are mitigated
+        in chunks, each with a single update of the findings and their endpoint statuses and
+        bulk inserts of the notes. The post processing of each chunk is done by one task
+        """
+        for chunk in self.chunk_parsed_findings(findings, settings.IMPORT_BULK_CREATE_CHUNK_SIZE):
+            finding_ids = [finding.id for finding in chunk]
+            findings_before = {finding.id: copy(finding) for finding in chunk} if settings.ENABLE_AUDITLOG else None
+            now = timezone.now()
+            for finding in chunk:
+                finding.active = False
+                finding.is_mitigated = True
+                if not finding.mitigated:
+                    finding.mitigated = self.scan_date
+                finding.mitigated_by = self.user
+                finding.last_status_update = now
+            with transaction.atomic():
+                # the findings can have status changes in memory that were made earlier in the process
+                Finding.objects.bulk_update(
+                    chunk,
+                    ["active", "is_mitigated", "mitigated", "mitigated_by", "verified", "last_status_update"],
+                )
+                notes = Notes.objects.bulk_create([Notes(author=self.user, entry=note_message) for _ in chunk])
+                Finding.notes.through.objects.bulk_create([
+                    Finding.notes.through(finding_id=finding.id, notes_id=note.id)
+                    for finding, note in zip(chunk, notes, strict=True)
+                ])
+                # Mitigate the endpoint statuses
+                self.endpoint_manager.mitigate_endpoint_statuses_of_findings(finding_ids, self.user)
+                self.bulk_create_audit_log_entries(chunk, self.user, findings_before=findings_before)
+            # to avoid pushing a finding group multiple times, the callers push those after all chunks
+            grouped_finding_ids = set()
+            if finding_groups_enabled:
+                grouped_finding_ids = set(
+                    Finding_Group.findings.through.objects.filter(finding_id__in=finding_ids)
+                    .values_list("finding_id", flat=True),
+                )
+            # don't try to dedupe findings that we are closing
+            if ungrouped_finding_ids := [finding_id for finding_id in finding_ids if finding_id not in grouped_finding_ids]:
+                finding_helper.post_process_findings_batch(ungrouped_finding_ids, dedupe_option=False, push_to_jira=self.push_to_jira)
+            if grouped_finding_ids:
+                finding_helper.post_process_findings_batch(sorted(grouped_finding_ids), dedupe_option=False)
+
     def notify_scan_added(
         self,
         test,
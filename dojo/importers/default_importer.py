@@ -1,7 +1,10 @@
 import logging
+from collections.abc import Iterable, Iterator
 
+from django.conf import settings
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.serializers import serialize
+from django.db import transaction
 from django.db.models.query_utils import Q
 from django.urls import reverse
 
@@ -161,8 +164,12 @@ class DefaultImporter(BaseImporter, DefaultImporterOptions):
         the finding may be appended to a new or existing group based upon user selection
         at import time
         """
+        if settings.IMPORT_BULK_CREATE:
+            return self.process_findings_in_bulk(parsed_findings, **kwargs)
+
         new_findings = []
-        logger.debug("starting import of %i parsed findings.", len(parsed_findings) if parsed_findings else 0)
+        # parsed findings can be streamed from the parser, so they are not necessarily a list
+        logger.debug("starting import of %s parsed findings.", len(parsed_findings) if isinstance(parsed_findings, list) else "streamed")
         group_names_to_findings_dict = {}
 
         for non_clean_unsaved_finding in parsed_findings:
@@ -173,28 +180,9 @@ class DefaultImporter(BaseImporter, DefaultImporterOptions):
                 # finding's severity is below the configured threshold : ignoring the finding
                 continue
 
-            # Some parsers provide "mitigated" field but do not set timezone (because they are probably not available in the report)
-            # Finding.mitigated is DateTimeField and it requires timezone
-            if unsaved_finding.mitigated and not unsaved_finding.mitigated.tzinfo:
-                unsaved_finding.mitigated = unsaved_finding.mitigated.replace(tzinfo=self.now.tzinfo)
-            # Set some explicit fields on the finding
-            unsaved_finding.test = self.test
-            unsaved_finding.reporter = self.user
-            unsaved_finding.last_reviewed_by = self.user
-            unsaved_finding.last_reviewed = self.now
-            logger.debug("process_parsed_findings: active from report: %s, verified from report: %s", unsaved_finding.active, unsaved_finding.verified)
-            # indicates an override. Otherwise, do not change the value of unsaved_finding.active
-            if self.active is not None:
-                unsaved_finding.active = self.active
-            # indicates an override. Otherwise, do not change the value of verified
-            if self.verified is not None:
-                unsaved_finding.verified = self.verified
-            # scan_date was provided, override value from parser
-            if self.scan_date_override:
-                unsaved_finding.date = self.scan_date.date()
-            if self.service is not None:
-                unsaved_finding.service = self.service
-            unsaved_finding.save(dedupe_option=False)
+            unsaved_finding = self.apply_import_options_to_finding(unsaved_finding)
+            # The finding is post processed once it is complete, in the batches below
+            unsaved_finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
             finding = unsaved_finding
             # Determine how the finding should be grouped
             self.process_finding_groups(
@@ -214,11 +202,13 @@ class DefaultImporter(BaseImporter, DefaultImporterOptions):
             finding = self.process_vulnerability_ids(finding)
             # Categorize this finding as a new one
             new_findings.append(finding)
-            # to avoid pushing a finding group multiple times, we push those outside of the loop
-            if self.findings_groups_enabled and self.group_by:
-                finding.save()
-            else:
-                finding.save(push_to_jira=self.push_to_jira)
+            self.save_finding_without_post_processing(finding)
+
+        # to avoid pushing a finding group multiple times, we push those outside of the loop
+        self.post_process_findings_in_batches(
+            (finding.id for finding in new_findings),
+            push_to_jira=self.push_to_jira and not (self.findings_groups_enabled and self.group_by),
+        )
 
         for (group_name, findings) in group_names_to_findings_dict.items():
             finding_helper.add_findings_to_auto_group(
@@ -239,6 +229,115 @@ class DefaultImporter(BaseImporter, DefaultImporterOptions):
             return [serialize("json", [finding]) for finding in new_findings]
         return new_findings
 
+    def process_findings_in_bulk(
+        self,
+        parsed_findings: list[Finding],
+        **kwargs: dict,
+    ) -> list[Finding]:
+        """
+        Bulk version of `process_findings`. The findings are persisted in chunks of
+        `IMPORT_BULK_CREATE_CHUNK_SIZE`, where all fields normally derived by `Finding.save`
+        are computed in memory and the findings and their related objects are written with
+        bulk inserts. Deduplication, product grading and pushing to JIRA are scheduled once
+        per chunk rather than once per finding
+        """
+        new_findings = []
+        logger.debug("starting bulk import of %s parsed findings.", len(parsed_findings) if isinstance(parsed_findings, list) else "streamed")
+        group_names_to_findings_dict = {}
+
+        # to avoid pushing a finding group multiple times, we push those outside of the loop
+        push_to_jira = self.push_to_jira and not (self.findings_groups_enabled and self.group_by)
+        # Endpoints are shared across the chunks of the same import
+        endpoint_cache = {}
+        # The findings are only pulled from the parser one chunk at a time, so that a streamed
+        # report never has to be held in memory as a whole
+        unsaved_findings = self.iter_findings_to_import(parsed_findings)
+        for unsaved_findings_chunk in self.chunk_parsed_findings(unsaved_findings, settings.IMPORT_BULK_CREATE_CHUNK_SIZE):
+            with transaction.atomic():
+                findings = self.bulk_create_findings(
+                    unsaved_findings_chunk,
+                    endpoint_cache=endpoint_cache,
+                )
+            for finding in findings:
+                # Determine how the finding should be grouped
+                self.process_finding_groups(
+                    finding,
+                    group_names_to_findings_dict,
+                )
+                # Process any files
+                self.process_files(finding)
+            new_findings.extend(findings)
+            finding_helper.post_process_findings_batch(
+                [finding.id for finding in findings],
+                push_to_jira=push_to_jira,
+                update_search_index=True,
+            )
+
+        for (group_name, findings) in group_names_to_findings_dict.items():
+            finding_helper.add_findings_to_auto_group(
+                group_name,
+                findings,
+                self.group_by,
+                create_finding_groups_for_all_findings=self.create_finding_groups_for_all_findings,
+                **kwargs,
+            )
+            if self.push_to_jira:
+                if findings[0].finding_group is not None:
+                    jira_helper.push_to_jira(findings[0].finding_group)
+                else:
+                    jira_helper.push_to_jira(findings[0])
+
+        sync = kwargs.get("sync", True)
+        if not sync:
+            return [serialize("json", [finding]) for finding in new_findings]
+        return new_findings
+
+    def iter_findings_to_import(
+        self,
+        parsed_findings: Iterable[Finding],
+    ) -> Iterator[Finding]:
+        """Yields the parsed findings that meet the minimum severity, with the import options applied"""
+        for non_clean_unsaved_finding in parsed_findings:
+            # make sure the severity is something is digestible
+            unsaved_finding = self.sanitize_severity(non_clean_unsaved_finding)
+            # Filter on minimum severity if applicable
+            if Finding.SEVERITIES[unsaved_finding.severity] > Finding.SEVERITIES[self.minimum_severity]:
+                # finding's severity is below the configured threshold : ignoring the finding
+                continue
+            yield self.apply_import_options_to_finding(unsaved_finding)
+
+    def apply_import_options_to_finding(
+        self,
+        unsaved_finding: Finding,
+    ) -> Finding:
+        """
+        Set the fields on a parsed finding that are dictated by the import itself
+        rather than by the report, such as the test, reporter and any overrides
+        supplied by the user at import time
+        """
+        # Some parsers provide "mitigated" field but do not set timezone (because they are probably not available in the report)
+        # Finding.mitigated is DateTimeField and it requires timezone
+        if unsaved_finding.mitigated and not unsaved_finding.mitigated.tzinfo:
+            unsaved_finding.mitigated = unsaved_finding.mitigated.replace(tzinfo=self.now.tzinfo)
+        # Set some explicit fields on the finding
+        unsaved_finding.test = self.test
+        unsaved_finding.reporter = self.user
+        unsaved_finding.last_reviewed_by = self.user
+        unsaved_finding.last_reviewed = self.now
+        logger.debug("process_parsed_findings: active from report: %s, verified from report: %s", unsaved_finding.active, unsaved_finding.verified)
+        # indicates an override. Otherwise, do not change the value of unsaved_finding.active
+        if self.active is not None:
+            unsaved_finding.active = self.active
+        # indicates an override. Otherwise, do not change the value of verified
+        if self.verified is not None:
+            unsaved_finding.verified = self.verified
+        # scan_date was provided, override value from parser
+        if self.scan_date_override:
+            unsaved_finding.date = self.scan_date.date()
+        if self.service is not None:
+            unsaved_finding.service = self.service
+        return unsaved_finding
+
     def close_old_findings(
         self,
         findings: list[Finding],
@@ -303,15 +402,21 @@ class DefaultImporter(BaseImporter, DefaultImporterOptions):
         else:
             old_findings = old_findings.filter(Q(service__isnull=True) | Q(service__exact=""))
         # Update the status of the findings and any endpoints
-        for old_finding in old_findings:
-            self.mitigate_finding(
-                old_finding,
-                (
-                    "This finding has been automatically closed "
-                    "as it is not present anymore in recent scans."
-                ),
-                finding_groups_enabled=self.findings_groups_enabled,
-            )
+        note_message = (
+            "This finding has been automatically closed "
+            "as it is not present anymore in recent scans."
+        )
+        if settings.IMPORT_BULK_CLOSE_OLD_FINDINGS:
+            # evaluate the queryset before the update so that it keeps the closed findings
+            len(old_findings)
+            self.mitigate_findings_in_bulk(old_findings, note_message, finding_groups_enabled=self.findings_groups_enabled)
+        else:
+            for old_finding in old_findings:
+                self.mitigate_finding(
+                    old_finding,
+                    note_message,
+                    finding_groups_enabled=self.findings_groups_enabled,
+                )
         # push finding groups to jira since we only only want to push whole groups
         if self.findings_groups_enabled and self.push_to_jira:
             for finding_group in {finding.finding_group for finding in old_findings if finding.finding_group is not None}:
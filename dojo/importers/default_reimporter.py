@@ -1,7 +1,9 @@
 import logging
 
+from django.conf import settings
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.serializers import serialize
+from django.db.models import QuerySet
 from django.db.models.query_utils import Q
 
 import dojo.finding.helper as finding_helper
@@ -163,12 +165,17 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         """
         self.deduplication_algorithm = self.determine_deduplication_algorithm()
         self.original_items = list(self.test.finding_set.all())
+        # The candidates are separate instances from the original items, as the latter must keep
+        # the state from before the reimport to determine which findings to close afterwards
+        self.build_candidate_dictionaries(self.test.finding_set.all())
         self.new_items = []
         self.reactivated_items = []
         self.unchanged_items = []
         self.group_names_to_findings_dict = {}
+        findings_to_post_process = []
 
-        logger.debug(f"starting reimport of {len(parsed_findings) if parsed_findings else 0} items.")
+        # parsed findings can be streamed from the parser, so they are not necessarily a list
+        logger.debug(f"starting reimport of {len(parsed_findings) if isinstance(parsed_findings, list) else 'streamed'} items.")
         logger.debug("STEP 1: looping over findings from the reimported report and trying to match them to existing findings")
         deduplicationLogger.debug(f"Algorithm used for matching new findings to existing findings: {self.deduplication_algorithm}")
 
@@ -228,11 +235,17 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
                     unsaved_finding,
                 )
                 # finding = new finding or existing finding still in the upload report
-                # to avoid pushing a finding group multiple times, we push those outside of the loop
-                if self.findings_groups_enabled and self.group_by:
-                    finding.save()
-                else:
-                    finding.save(push_to_jira=self.push_to_jira)
+                self.save_finding_without_post_processing(finding)
+                findings_to_post_process.append(finding.id)
+                # Make sure findings later in the report are matched against the current state of this finding
+                self.add_finding_to_candidates(finding)
+                self.processed_candidate_ids.add(finding.id)
+
+        # to avoid pushing a finding group multiple times, we push those outside of the loop
+        self.post_process_findings_in_batches(
+            findings_to_post_process,
+            push_to_jira=self.push_to_jira and not (self.findings_groups_enabled and self.group_by),
+        )
 
         self.to_mitigate = (set(self.original_items) - set(self.reactivated_items) - set(self.unchanged_items))
         # due to #3958 we can have duplicates inside the same report
@@ -261,25 +274,28 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
             return []
         logger.debug("REIMPORT_SCAN: Closing findings no longer present in scan report")
         # Determine if pushing to jira or if the finding groups are enabled
-        mitigated_findings = []
-        for finding in findings:
-            # Get any status changes that could have occurred earlier in the process
-            # for special statuses only.
-            # An example of such is a finding being reported as false positive, and
-            # reimport makes this change in the database. However, the findings here
-            # are calculated based from the original values before the reimport, so
-            # any updates made during reimport are discarded without first getting the
-            # state of the finding as it stands at this moment
-            finding.refresh_from_db(fields=["false_p", "risk_accepted", "out_of_scope"])
-            # Ensure the finding is not already closed
-            if not finding.mitigated or not finding.is_mitigated:
-                logger.debug("mitigating finding: %i:%s", finding.id, finding)
-                self.mitigate_finding(
-                    finding,
-                    f"Mitigated by {self.test.test_type} re-upload.",
-                    finding_groups_enabled=self.findings_groups_enabled,
-                )
-                mitigated_findings.append(finding)
+        if settings.IMPORT_BULK_CLOSE_OLD_FINDINGS:
+            mitigated_findings = self.close_old_findings_in_bulk(findings)
+        else:
+            mitigated_findings = []
+            for finding in findings:
+                # Get any status changes that could have occurred earlier in the process
+                # for special statuses only.
+                # An example of such is a finding being reported as false positive, and
+                # reimport makes this change in the database. However, the findings here
+                # are calculated based from the original values before the reimport, so
+                # any updates made during reimport are discarded without first getting the
+                # state of the finding as it stands at this moment
+                finding.refresh_from_db(fields=["false_p", "risk_accepted", "out_of_scope"])
+                # Ensure the finding is not already closed
+                if not finding.mitigated or not finding.is_mitigated:
+                    logger.debug("mitigating finding: %i:%s", finding.id, finding)
+                    self.mitigate_finding(
+                        finding,
+                        f"Mitigated by {self.test.test_type} re-upload.",
+                        finding_groups_enabled=self.findings_groups_enabled,
+                    )
+                    mitigated_findings.append(finding)
         # push finding groups to jira since we only only want to push whole groups
         if self.findings_groups_enabled and self.push_to_jira:
             for finding_group in {finding.finding_group for finding in findings if finding.finding_group is not None}:
@@ -287,6 +303,34 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
 
         return mitigated_findings
 
+    def close_old_findings_in_bulk(
+        self,
+        findings: list[Finding],
+    ) -> list[Finding]:
+        """
+        Same as the loop of `close_old_findings`, but the special statuses of the findings
+        are refreshed with one query per chunk and the findings are mitigated in bulk
+        """
+        findings_to_mitigate = []
+        for chunk in self.chunk_parsed_findings(findings, settings.IMPORT_BULK_CREATE_CHUNK_SIZE):
+            special_statuses = {
+                finding_id: statuses
+                for finding_id, *statuses in Finding.objects.filter(id__in=[finding.id for finding in chunk])
+                .values_list("id", "false_p", "risk_accepted", "out_of_scope")
+            }
+            for finding in chunk:
+                finding.false_p, finding.risk_accepted, finding.out_of_scope = special_statuses[finding.id]
+                # Ensure the finding is not already closed
+                if not finding.mitigated or not finding.is_mitigated:
+                    findings_to_mitigate.append(finding)
+        logger.debug("mitigating %i findings in bulk", len(findings_to_mitigate))
+        self.mitigate_findings_in_bulk(
+            findings_to_mitigate,
+            f"Mitigated by {self.test.test_type} re-upload.",
+            finding_groups_enabled=self.findings_groups_enabled,
+        )
+        return findings_to_mitigate
+
     def parse_findings_static_test_type(
         self,
         scan: TemporaryUploadedFile,
@@ -313,6 +357,79 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         logger.debug("REIMPORT_SCAN parser v2: Create parse findings")
         return super().parse_findings_dynamic_test_type(scan, parser)
 
+    def build_candidate_dictionaries(
+        self,
+        findings: QuerySet[Finding],
+    ) -> None:
+        """
+        Index the findings that are already present in the test by the fields used for
+        matching, so that each finding in the report can be matched without querying
+        the database
+        """
+        self.candidates_by_hash_code = {}
+        self.candidates_by_unique_id_from_tool = {}
+        self.candidates_by_title_and_severity = {}
+        self.candidate_keys = {}
+        self.processed_candidate_ids = set()
+        for finding in findings.order_by("id"):
+            self.add_finding_to_candidates(finding)
+
+    def get_candidate_keys(
+        self,
+        finding: Finding,
+    ) -> tuple:
+        """Returns the keys used to index the finding in each of the candidate dictionaries"""
+        title = finding.title.lower() if finding.title else finding.title
+        return (
+            finding.hash_code,
+            finding.unique_id_from_tool,
+            (title, finding.severity, Finding.get_numerical_severity(finding.severity)),
+        )
+
+    def add_finding_to_candidates(
+        self,
+        finding: Finding,
+    ) -> None:
+        """
+        Add a saved finding to the candidate dictionaries. If the finding was added before,
+        it is replaced to account for any changes to the fields used for matching
+        """
+        dictionaries = (
+            self.candidates_by_hash_code,
+            self.candidates_by_unique_id_from_tool,
+            self.candidates_by_title_and_severity,
+        )
+        previous_keys = self.candidate_keys.get(finding.id)
+        if previous_keys is not None:
+            for dictionary, key in zip(dictionaries, previous_keys, strict=True):
+                dictionary[key] = [candidate for candidate in dictionary[key] if candidate.id != finding.id]
+        keys = self.get_candidate_keys(finding)
+        for dictionary, key in zip(dictionaries, keys, strict=True):
+            candidates = dictionary.setdefault(key, [])
+            candidates.append(finding)
+            # Keep the same order as the database based matching did
+            candidates.sort(key=lambda candidate: candidate.id)
+        self.candidate_keys[finding.id] = keys
+
+    def reload_previously_matched_candidates(
+        self,
+        candidates: list[Finding],
+    ) -> list[Finding]:
+        """
+        A candidate that was matched or saved before during this reimport may have been
+        updated outside of this process since (i.e. by the deduplication running in the
+        background), so a fresh copy is loaded from the database before it is used again
+        """
+        reload_ids = [candidate.id for candidate in candidates if candidate.id in self.processed_candidate_ids]
+        self.processed_candidate_ids.update(candidate.id for candidate in candidates)
+        if not reload_ids:
+            return candidates
+        reloaded = {finding.id: finding for finding in Finding.objects.filter(id__in=reload_ids)}
+        for finding in reloaded.values():
+            self.add_finding_to_candidates(finding)
+        # Leave out any candidate that has been deleted in the meantime
+        return [reloaded.get(candidate.id, candidate) for candidate in candidates if candidate.id not in reload_ids or candidate.id in reloaded]
+
     def match_new_finding_to_existing_finding(
         self,
         unsaved_finding: Finding,
@@ -320,36 +437,31 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         """Matches a single new finding to N existing findings and then returns those matches"""
         # This code should match the logic used for deduplication out of the re-import feature.
         # See utils.py deduplicate_* functions
+        # The existing findings of the test are indexed in memory beforehand, see build_candidate_dictionaries
         deduplicationLogger.debug("return findings bases on algorithm: %s", self.deduplication_algorithm)
+        hash_code, unique_id_from_tool, title_and_severity = self.get_candidate_keys(unsaved_finding)
         if self.deduplication_algorithm == "hash_code":
-            return Finding.objects.filter(
-                test=self.test,
-                hash_code=unsaved_finding.hash_code,
-            ).exclude(hash_code=None).order_by("id")
+            if hash_code is None:
+                return []
+            return self.reload_previously_matched_candidates(self.candidates_by_hash_code.get(hash_code, []))
         if self.deduplication_algorithm == "unique_id_from_tool":
-            return Finding.objects.filter(
-                test=self.test,
-                unique_id_from_tool=unsaved_finding.unique_id_from_tool,
-            ).exclude(unique_id_from_tool=None).order_by("id")
+            if unique_id_from_tool is None:
+                return []
+            return self.reload_previously_matched_candidates(self.candidates_by_unique_id_from_tool.get(unique_id_from_tool, []))
         if self.deduplication_algorithm == "unique_id_from_tool_or_hash_code":
-            query = Finding.objects.filter(
-                Q(test=self.test),
-                (Q(hash_code__isnull=False) & Q(hash_code=unsaved_finding.hash_code))
-                | (Q(unique_id_from_tool__isnull=False) & Q(unique_id_from_tool=unsaved_finding.unique_id_from_tool)),
-            ).order_by("id")
-            deduplicationLogger.debug(query.query)
-            return query
+            candidates = {}
+            if hash_code is not None:
+                candidates.update({finding.id: finding for finding in self.candidates_by_hash_code.get(hash_code, [])})
+            if unique_id_from_tool is not None:
+                candidates.update({finding.id: finding for finding in self.candidates_by_unique_id_from_tool.get(unique_id_from_tool, [])})
+            return self.reload_previously_matched_candidates([candidates[finding_id] for finding_id in sorted(candidates)])
         if self.deduplication_algorithm == "legacy":
             # This is the legacy reimport behavior. Although it's pretty flawed and doesn't match the legacy algorithm for deduplication,
             # this is left as is for simplicity.
             # Re-writing the legacy deduplication here would be complicated and counter-productive.
             # If you have use cases going through this section, you're advised to create a deduplication configuration for your parser
             logger.warning("Legacy reimport. In case of issue, you're advised to create a deduplication configuration in order not to go through this section")
-            return Finding.objects.filter(
-                    title__iexact=unsaved_finding.title,
-                    test=self.test,
-                    severity=unsaved_finding.severity,
-                    numerical_severity=Finding.get_numerical_severity(unsaved_finding.severity)).order_by("id")
+            return self.reload_previously_matched_candidates(self.candidates_by_title_and_severity.get(title_and_severity, []))
         logger.error(f'Internal error: unexpected deduplication_algorithm: "{self.deduplication_algorithm}"')
         return None
 
@@ -489,9 +601,9 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         component_version = getattr(unsaved_finding, "component_version", None)
         existing_finding.component_name = existing_finding.component_name or component_name
         existing_finding.component_version = existing_finding.component_version or component_version
-        existing_finding.save(dedupe_option=False)
-        # don't dedupe before endpoints are added
-        existing_finding.save(dedupe_option=False)
+        existing_finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
+        # don't dedupe before endpoints are added, the finding is post processed once it is complete
+        existing_finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
         note = Notes(entry=f"Re-activated by {self.scan_type} re-upload.", author=self.user)
         note.save()
         endpoint_statuses = existing_finding.status_finding.exclude(
@@ -563,7 +675,7 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         ):
             existing_finding.component_name = existing_finding.component_name or component_name
             existing_finding.component_version = existing_finding.component_version or component_version
-            existing_finding.save(dedupe_option=False)
+            existing_finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
         # Return False here to make sure further processing happens
         return existing_finding, False
 
@@ -585,8 +697,8 @@ class DefaultReImporter(BaseImporter, DefaultReImporterOptions):
         # scan_date was provided, override value from parser
         if self.scan_date_override:
             unsaved_finding.date = self.scan_date.date()
-        # Save it. Don't dedupe before endpoints are added.
-        unsaved_finding.save(dedupe_option=False)
+        # Save it. Don't dedupe before endpoints are added, the finding is post processed once it is complete.
+        unsaved_finding.save(dedupe_option=False, product_grading_option=False, issue_updater_option=False)
         finding = unsaved_finding
         logger.debug(
             "Reimport created new finding as no existing finding match: "
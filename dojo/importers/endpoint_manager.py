@@ -1,23 +1,33 @@
 import logging
+from collections.abc import Iterable
 
-from django.core.exceptions import MultipleObjectsReturned, ValidationError
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils import timezone
 
 from dojo.celery import app
 from dojo.decorators import dojo_async_task
-from dojo.endpoint.utils import endpoint_get_or_create
+from dojo.endpoint.utils import endpoint_filter_key, endpoint_filter_matchable
 from dojo.models import (
     Dojo_User,
     Endpoint,
     Endpoint_Status,
     Finding,
+    Product,
 )
+from dojo.tag_utils import bulk_add_tags, reset_tag_manager
+from dojo.utils import bulk_create_audit_log_entries, get_current_user, get_system_setting
 
 logger = logging.getLogger(__name__)
 
 
 class EndpointManager:
+    # The number of distinct digests or hosts whose endpoints are fetched with a single query
+    ENDPOINTS_PER_QUERY = 1000
+
     @dojo_async_task
     @app.task()
     def add_endpoints_to_unsaved_finding(
@@ -28,33 +38,173 @@ class EndpointManager:
     ) -> None:
         """Creates Endpoint objects for a single finding and creates the link via the endpoint status"""
         logger.debug(f"IMPORT_SCAN: Adding {len(endpoints)} endpoints to finding: {finding}")
-        self.clean_unsaved_endpoints(endpoints)
-        for endpoint in endpoints:
-            ep = None
-            try:
-                ep, _ = endpoint_get_or_create(
-                    protocol=endpoint.protocol,
-                    userinfo=endpoint.userinfo,
-                    host=endpoint.host,
-                    port=endpoint.port,
-                    path=endpoint.path,
-                    query=endpoint.query,
-                    fragment=endpoint.fragment,
-                    product=finding.test.engagement.product)
-            except (MultipleObjectsReturned):
-                msg = (
-                    f"Endpoints in your database are broken. "
-                    f"Please access {reverse('endpoint_migrate')} and migrate them to new format or remove them."
-                )
-                raise Exception(msg)
-
-            Endpoint_Status.objects.get_or_create(
-                finding=finding,
-                endpoint=ep,
-                defaults={"date": finding.date})
+        [saved_endpoints] = self.get_or_create_endpoints_in_bulk([endpoints], finding.test.engagement.product)
+        linked_endpoint_ids = set(
+            finding.status_finding.filter(endpoint__in=saved_endpoints).values_list("endpoint_id", flat=True),
+        )
+        self.bulk_create_endpoint_statuses([
+            (finding, [endpoint for endpoint in saved_endpoints if endpoint.id not in linked_endpoint_ids]),
+        ])
         logger.debug(f"IMPORT_SCAN: {len(endpoints)} imported")
         return
 
+    def get_or_create_endpoints_in_bulk(
+        self,
+        endpoints_per_finding: list[list[Endpoint]],
+        product: Product,
+        endpoint_cache: dict | None = None,
+    ) -> list[list[Endpoint]]:
+        """
+        Resolves the supplied unsaved endpoints of many findings to saved Endpoint objects of the product
+        without creating any link to a finding. The endpoints are matched in memory with the same rules as
+        `endpoint_filter`, the existing ones are fetched by the digests of their canonical URLs and then by
+        their hosts in chunks, and the missing ones are created with a single bulk insert. Endpoints already resolved earlier are looked up in the
+        supplied cache, so that endpoints shared by many chunks of an import are only fetched once
+        """
+        if endpoint_cache is None:
+            endpoint_cache = {}
+        keys_per_finding = []
+        unresolved_endpoints = {}
+        for endpoints in endpoints_per_finding:
+            self.clean_unsaved_endpoints(endpoints)
+            keys = [endpoint_filter_key(endpoint) for endpoint in endpoints]
+            keys_per_finding.append(keys)
+            for key, endpoint in zip(keys, endpoints, strict=True):
+                if key not in endpoint_cache:
+                    unresolved_endpoints.setdefault(key, endpoint)
+        if unresolved_endpoints:
+            endpoint_cache.update(self.get_existing_endpoints(unresolved_endpoints, product))
+            endpoints_to_create = {
+                key: endpoint for key, endpoint in unresolved_endpoints.items() if key not in endpoint_cache
+            }
+            endpoint_cache.update(zip(
+                endpoints_to_create.keys(),
+                self.bulk_create_endpoints(endpoints_to_create.values(), product),
+                strict=True,
+            ))
+        # The same endpoint can only be linked once to a finding
+        return [
+            list({endpoint_cache[key].id: endpoint_cache[key] for key in keys}.values())
+            for keys in keys_per_finding
+        ]
+
+    def get_existing_endpoints(
+        self,
+        endpoints_by_key: dict[tuple, Endpoint],
+        product: Product,
+    ) -> dict[tuple, Endpoint]:
+        """
+        Fetches the saved endpoints of the product that match the supplied endpoints, by their key.
+        When several saved endpoints match the same key, the oldest one is used as `endpoint_get_or_create` does
+        """
+        # the endpoints are looked up by the indexed digest of their canonical URL first
+        url_hashes = sorted({endpoint.get_canonical_url_hash() for endpoint in endpoints_by_key.values()})
+        existing_endpoints = self.match_existing_endpoints(
+            endpoints_by_key,
+            product,
+            [
+                Q(canonical_url_hash__in=url_hashes[i:i + self.ENDPOINTS_PER_QUERY])
+                for i in range(0, len(url_hashes), self.ENDPOINTS_PER_QUERY)
+            ],
+        )
+        # endpoint_filter can still match endpoints with another canonical URL, when hyperlink cannot normalize
+        # the URL of hosts that only differ in case or when the endpoint was stored without its canonical URL
+        hosts = {key[2] for key in endpoints_by_key if key not in existing_endpoints}
+        named_hosts = sorted(host for host in hosts if host is not None)
+        queries = [
+            Q(host_upper__in=named_hosts[i:i + self.ENDPOINTS_PER_QUERY])
+            for i in range(0, len(named_hosts), self.ENDPOINTS_PER_QUERY)
+        ]
+        if None in hosts:
+            queries.append(Q(host__isnull=True))
+        remaining_endpoints_by_key = {
+            key: endpoint for key, endpoint in endpoints_by_key.items() if key not in existing_endpoints
+        }
+        existing_endpoints.update(self.match_existing_endpoints(remaining_endpoints_by_key, product, queries))
+        return existing_endpoints
+
+    def match_existing_endpoints(
+        self,
+        endpoints_by_key: dict[tuple, Endpoint],
+        product: Product,
+        queries: list[Q],
+    ) -> dict[tuple, Endpoint]:
+        """Fetches the saved endpoints of the product selected by the queries, and keeps those that match a key"""
+        existing_endpoints = {}
+        for query in queries:
+            for endpoint in Endpoint.objects.filter(product=product).annotate(host_upper=Upper("host")).filter(query).order_by("id"):
+                if not endpoint_filter_matchable(endpoint):
+                    continue
+                key = endpoint_filter_key(endpoint)
+                if key not in endpoints_by_key:
+                    continue
+                if key in existing_endpoints:
+                    logger.warning(
+                        f"Endpoints in your database are broken. "
+                        f"Please access {reverse('endpoint_migrate')} and migrate them to new format or remove them.",
+                    )
+                    continue
+                existing_endpoints[key] = endpoint
+        return existing_endpoints
+
+    def bulk_create_endpoints(
+        self,
+        endpoints: Iterable[Endpoint],
+        product: Product,
+    ) -> list[Endpoint]:
+        """
+        Creates the supplied endpoints for the product with a single bulk insert. As `bulk_create` does not
+        trigger the signals, the tags inherited from the product, the search index and the audit log are
+        updated here
+        """
+        new_endpoints = []
+        for endpoint in endpoints:
+            new_endpoint = Endpoint(
+                protocol=endpoint.protocol,
+                userinfo=endpoint.userinfo,
+                host=endpoint.host,
+                port=endpoint.port,
+                path=endpoint.path,
+                query=endpoint.query,
+                fragment=endpoint.fragment,
+                canonical_url=endpoint.get_canonical_url(),
+                canonical_url_hash=endpoint.canonical_url_hash,
+                product=product,
+            )
+            # the canonical URL is not built again on first use, as it would be for an endpoint without it
+            new_endpoint._canonical_url_parts = new_endpoint.get_url_parts()
+            new_endpoints.append(new_endpoint)
+        # bulk_create does not call save, which keeps the canonical URL
+        endpoints = Endpoint.objects.bulk_create(new_endpoints)
+        if not endpoints:
+            return endpoints
+        if product.enable_product_tag_inheritance or get_system_setting("enable_product_tag_inheritance"):
+            if inherited_tags := [tag.name for tag in product.tags.all()]:
+                for tag_field_name in ("inherited_tags", "tags"):
+                    bulk_add_tags(Endpoint, dict.fromkeys(endpoints, inherited_tags), tag_field_name=tag_field_name)
+                for endpoint in endpoints:
+                    reset_tag_manager(endpoint, "tags")
+                    reset_tag_manager(endpoint, "inherited_tags")
+        # the full-text indexes of the postgres search backend are kept current by the database itself
+        if settings.SEARCH_BACKEND == "watson":
+            from watson.search import default_search_engine
+            for endpoint in endpoints:
+                default_search_engine.update_obj_index(endpoint)
+        bulk_create_audit_log_entries(endpoints, get_current_user())
+        return endpoints
+
+    def bulk_create_endpoint_statuses(
+        self,
+        findings_and_endpoints: list[tuple[Finding, list[Endpoint]]],
+    ) -> list[Endpoint_Status]:
+        """Creates the links between saved findings and their endpoints with a single bulk insert"""
+        endpoint_statuses = [
+            Endpoint_Status(finding=finding, endpoint=endpoint, date=finding.date)
+            for finding, endpoints in findings_and_endpoints
+            for endpoint in endpoints
+        ]
+        return Endpoint_Status.objects.bulk_create(endpoint_statuses)
+
     @dojo_async_task
     @app.task()
     def mitigate_endpoint_status(
@@ -75,6 +225,20 @@ class EndpointManager:
                 endpoint_status.save()
         return
 
+    def mitigate_endpoint_statuses_of_findings(
+        self,
+        finding_ids: list[int],
+        user: Dojo_User,
+    ) -> int:
+        """Mitigates the active endpoint statuses of all the supplied findings with a single update"""
+        now = timezone.now()
+        return Endpoint_Status.objects.filter(finding_id__in=finding_ids, mitigated=False).update(
+            mitigated_time=now,
+            last_modified=now,
+            mitigated_by=user,
+            mitigated=True,
+        )
+
     @dojo_async_task
     @app.task()
     def reactivate_endpoint_status(
@@ -146,8 +310,9 @@ class EndpointManager:
         # New endpoints are already added in serializers.py / views.py (see comment "# for existing findings: make sure endpoints are present or created")
         # So we only need to mitigate endpoints that are no longer present
         # using `.all()` will mark as mitigated also `endpoint_status` with flags `false_positive`, `out_of_scope` and `risk_accepted`. This is a known issue. This is not a bug. This is a future.
-        existing_finding_endpoint_status_list = existing_finding.status_finding.all()
-        new_finding_endpoints_list = new_finding.unsaved_endpoints
+        existing_finding_endpoint_status_list = existing_finding.status_finding.select_related("endpoint")
+        # endpoints are compared by the digest of their canonical URL, so a set is enough to look them up
+        new_finding_endpoints_list = set(new_finding.unsaved_endpoints)
         if new_finding.is_mitigated:
             # New finding is mitigated, so mitigate all old endpoints
             endpoint_status_to_mitigate = existing_finding_endpoint_status_list
@@ -1,12 +1,16 @@
+import hashlib
 import io
 import json
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
 import requests
 from django.conf import settings
 from django.contrib import messages
+from django.core.cache import cache
 from django.template import TemplateDoesNotExist
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -58,6 +62,13 @@ OPEN_STATUS = [
     "Verified",
 ]
 
+# The issues of this many JIRA_Issues are fetched per search request
+JIRA_SEARCH_BATCH_SIZE = 100
+
+# The JIRA clients reused by get_jira_connection, by server and credentials, see JIRA_CONNECTION_MAX_AGE
+jira_connections = {}
+jira_connections_lock = threading.Lock()
+
 
 def is_jira_enabled():
     if not get_system_setting("enable_jira"):
@@ -448,10 +459,53 @@ def get_jira_connection(obj):
         jira_instance = get_jira_instance(obj)
 
     if jira_instance is not None:
+        if settings.JIRA_CONNECTION_MAX_AGE > 0:
+            return get_pooled_jira_connection(jira_instance.url, jira_instance.username, jira_instance.password)
         return get_jira_connection_raw(jira_instance.url, jira_instance.username, jira_instance.password)
     return None
 
 
+def get_pooled_jira_connection(jira_server, jira_username, jira_password):
+    """
+    Returns the client connected to the JIRA server with these credentials by an earlier call in this process,
+    as long as it is not older than JIRA_CONNECTION_MAX_AGE seconds. Its session keeps the connections to the
+    server alive, and the server info and field metadata it has fetched are not fetched again.
+    """
+    key = (jira_server, jira_username, hashlib.sha256((jira_password or "").encode()).hexdigest())
+    now = time.monotonic()
+    with jira_connections_lock:
+        # the clients of changed credentials are dropped once they expire
+        for expired_key in [k for k, (_, connected) in jira_connections.items() if now - connected >= settings.JIRA_CONNECTION_MAX_AGE]:
+            del jira_connections[expired_key]
+        if key in jira_connections:
+            return jira_connections[key][0]
+
+    jira = get_jira_connection_raw(jira_server, jira_username, jira_password)
+    with jira_connections_lock:
+        jira_connections[key] = (jira, now)
+    return jira
+
+
+def clear_jira_connections():
+    with jira_connections_lock:
+        jira_connections.clear()
+
+
+def get_jira_issues_from_jira(jira, jira_ids):
+    """
+    Returns the JIRA issues with these ids by id, fetched with one search request per JIRA_SEARCH_BATCH_SIZE
+    issues instead of one request per issue. Issues that do not exist anymore are left out.
+    """
+    jira_ids = list(dict.fromkeys(str(jira_id) for jira_id in jira_ids))
+    issues = {}
+    for start in range(0, len(jira_ids), JIRA_SEARCH_BATCH_SIZE):
+        batch_ids = jira_ids[start:start + JIRA_SEARCH_BATCH_SIZE]
+        # without validation JIRA ignores the ids of deleted issues, instead of failing the whole search
+        for issue in jira.search_issues(f"id in ({','.join(batch_ids)})", maxResults=len(batch_ids), validate_query=False):
+            issues[str(issue.id)] = issue
+    return issues
+
+
 def jira_get_resolution_id(jira, issue, status):
     transitions = jira.transitions(issue)
     resolution_id = None
@@ -1122,8 +1176,26 @@ def push_status_to_jira(obj, jira_instance, jira, issue, *, save=False):
         obj.jira_issue.save()
 
 
-# gets the metadata for the provided issue type in the provided jira project
+# gets the metadata for the provided issue type in the provided jira project, cached for JIRA_METADATA_CACHE_TIMEOUT seconds
 def get_issuetype_fields(
+        jira,
+        project_key,
+        issuetype_name,
+        *,
+        use_cache=True):
+
+    if not use_cache or settings.JIRA_METADATA_CACHE_TIMEOUT <= 0:
+        return fetch_issuetype_fields(jira, project_key, issuetype_name)
+
+    cache_key = "jira_issuetype_fields_" + hashlib.sha256(f"{jira.server_url}|{project_key}|{issuetype_name}".encode()).hexdigest()
+    issuetype_fields = cache.get(cache_key)
+    if issuetype_fields is None:
+        issuetype_fields = list(fetch_issuetype_fields(jira, project_key, issuetype_name))
+        cache.set(cache_key, issuetype_fields, settings.JIRA_METADATA_CACHE_TIMEOUT)
+    return issuetype_fields
+
+
+def fetch_issuetype_fields(
         jira,
         project_key,
         issuetype_name):
@@ -1196,7 +1268,8 @@ def get_issuetype_fields(
 def is_jira_project_valid(jira_project):
     try:
         jira = get_jira_connection(jira_project)
-        get_issuetype_fields(jira, jira_project.project_key, jira_project.jira_instance.default_issue_type)
+        # the configuration is validated against JIRA itself, not against what it returned before
+        get_issuetype_fields(jira, jira_project.project_key, jira_project.jira_instance.default_issue_type, use_cache=False)
     except JIRAError:
         logger.debug("invalid JIRA Project Config, can't retrieve metadata for '%s'", jira_project)
         return False
@@ -3,9 +3,9 @@ import logging
 from django.core.management.base import BaseCommand
 from pytz import timezone
 
-from dojo.models import Finding, Product
+from dojo.models import Finding
 from dojo.utils import (
-    calculate_grade,
+    calculate_grades,
     do_dedupe_finding,
     do_dedupe_finding_task,
     get_system_setting,
@@ -83,8 +83,7 @@ class Command(BaseCommand):
 
                 # update the grading (if enabled)
                 logger.debug("Updating grades for products...")
-                for product in Product.objects.all():
-                    calculate_grade(product)
+                calculate_grades()
 
                 logger.info("######## Done deduplicating (%s) ########", ("foreground" if dedupe_sync else "tasks submitted to celery"))
             else:
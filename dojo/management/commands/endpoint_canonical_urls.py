@@ -0,0 +1,17 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from dojo.endpoint.utils import store_canonical_urls
+
+"""
+This command builds the canonical URL and its digest of all endpoints again and stores them. The stored values are
+trusted when endpoints are loaded, so run it after an upgrade that changes how URLs are normalized.
+"""
+
+
+class Command(BaseCommand):
+    help = "Store the canonical URL and its digest of all endpoints again"
+
+    def handle(self, *args, **options):
+        store_canonical_urls(apps, None)
+        self.stdout.write("Stored the canonical URLs of the endpoints")
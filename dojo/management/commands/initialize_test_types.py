@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from dojo.models import Test_Type, Tool_Type
-from dojo.tools.factory import PARSERS
+from dojo.tools.factory import PARSERS, requires_tool_type
 
 
 class Command(BaseCommand):
@@ -11,8 +11,6 @@ class Command(BaseCommand):
         # called by the initializer to fill the table with test_types
         for scan_type in PARSERS:
             Test_Type.objects.get_or_create(name=scan_type)
-            parser = PARSERS[scan_type]
-            if hasattr(parser, "requires_tool_type"):
-                tool_type = parser.requires_tool_type(scan_type)
-                if tool_type:
-                    Tool_Type.objects.get_or_create(name=tool_type)
+            tool_type = requires_tool_type(scan_type)
+            if tool_type:
+                Tool_Type.objects.get_or_create(name=tool_type)
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 
 from django.core.management.base import BaseCommand
 from jira.exceptions import JIRAError
@@ -28,41 +29,52 @@ class Command(BaseCommand):
             findings = findings.filter(active=True)
 
         findings = findings.prefetch_related("jira_issue")
-        # finding = Finding.objects.get(id=1)
+        findings_by_jira_instance = defaultdict(list)
         for finding in findings:
-            #    try:
+            findings_by_jira_instance[jira_helper.get_jira_instance(finding)].append(finding)
+
+        for jira_instance, instance_findings in findings_by_jira_instance.items():
+            if jira_instance is None:
+                continue
             JIRAError.log_to_tempfile = False
-            jira = jira_helper.get_jira_connection(finding)
-            j_issue = finding.jira_issue
-            issue = jira.issue(j_issue.jira_id)
-
-            # Issue Cloned
-            logger.info(issue.fields.issuelinks[0])
-
-            logger.info("Jira Issue: " + str(issue))
-            logger.info("Resolution: " + str(issue.fields.resolution))
-
-            if issue.fields.resolution is not None \
-                    and not finding.under_defect_review:
-                logger.info("Jira Issue: " + str(issue) + " changed status")
-
-                # Create Jira Note
-                now = timezone.now()
-                new_note = Notes()
-                new_note.entry = "Please Review Jira Request: " + str(
-                    issue) + ". Review status has changed to " + str(
-                    issue.fields.resolution) + "."
-                new_note.author = User.objects.get(username="JIRA")
-                new_note.date = now
-                new_note.save()
-                finding.notes.add(new_note)
-                finding.under_defect_review = True
-                dojo_user = Dojo_User.objects.get(username="JIRA")
-                finding.defect_review_requested_by = dojo_user
-
-                # Create alert to notify user
-                jira_helper.log_jira_message("Jira issue status change, please review.",
-                                 finding)
-                finding.save()
-            else:
-                logger.info("No update necessary")
+            jira = jira_helper.get_jira_connection(jira_instance)
+            # the issues are fetched with a search per batch, not one by one
+            issues = jira_helper.get_jira_issues_from_jira(jira, [finding.jira_issue.jira_id for finding in instance_findings])
+            for finding in instance_findings:
+                self.update_finding(finding, issues.get(str(finding.jira_issue.jira_id)))
+
+    def update_finding(self, finding, issue):
+        if issue is None:
+            logger.info("Jira Issue %s of finding %i not found", finding.jira_issue.jira_key, finding.id)
+            return
+
+        # Issue Cloned
+        logger.info(issue.fields.issuelinks[0])
+
+        logger.info("Jira Issue: " + str(issue))
+        logger.info("Resolution: " + str(issue.fields.resolution))
+
+        if issue.fields.resolution is not None \
+                and not finding.under_defect_review:
+            logger.info("Jira Issue: " + str(issue) + " changed status")
+
+            # Create Jira Note
+            now = timezone.now()
+            new_note = Notes()
+            new_note.entry = "Please Review Jira Request: " + str(
+                issue) + ". Review status has changed to " + str(
+                issue.fields.resolution) + "."
+            new_note.author = User.objects.get(username="JIRA")
+            new_note.date = now
+            new_note.save()
+            finding.notes.add(new_note)
+            finding.under_defect_review = True
+            dojo_user = Dojo_User.objects.get(username="JIRA")
+            finding.defect_review_requested_by = dojo_user
+
+            # Create alert to notify user
+            jira_helper.log_jira_message("Jira issue status change, please review.",
+                             finding)
+            finding.save()
+        else:
+            logger.info("No update necessary")
@@ -1,16 +1,30 @@
 import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from zoneinfo import ZoneInfo
 
+import requests
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
+from jira.exceptions import JIRAError
 
 import dojo.jira_link.helper as jira_helper
-from dojo.models import Engagement, Finding, Product
+from dojo.models import Engagement, Finding, JIRA_Instance, JIRA_Project, Product
 
 logger = logging.getLogger(__name__)
 
+# The issues updated this long before the high-water mark of a JIRA instance are reconciled again, so that
+# the clocks of JIRA and DefectDojo do not have to match to the second
+JIRA_RECONCILIATION_OVERLAP = timedelta(minutes=5)
+
+# The fields of the issues reconcile_finding uses
+JIRA_RECONCILIATION_FIELDS = "assignee,resolution,updated"
+
 
 def jira_status_reconciliation(*args, **kwargs):
     mode = kwargs["mode"]
@@ -18,8 +32,9 @@ def jira_status_reconciliation(*args, **kwargs):
     engagement = kwargs["engagement"]
     daysback = kwargs["daysback"]
     dryrun = kwargs["dryrun"]
+    incremental = kwargs.get("incremental", False)
 
-    logger.debug("mode: %s product:%s engagement: %s dryrun: %s", mode, product, engagement, dryrun)
+    logger.debug("mode: %s product:%s engagement: %s dryrun: %s incremental: %s", mode, product, engagement, dryrun, incremental)
 
     if mode and mode not in {"push_status_to_jira", "import_status_from_jira", "reconcile"}:
         logger.info("mode must be one of reconcile, push_status_to_jira or import_status_from_jira")
@@ -28,6 +43,11 @@ def jira_status_reconciliation(*args, **kwargs):
     if not mode:
         mode = "reconcile"
 
+    # the high-water marks only cover the findings of all products
+    scoped = bool(product or engagement or daysback)
+    if incremental and scoped:
+        logger.info("the high-water marks of the JIRA instances are only moved by runs without product, engagement or daysback")
+
     findings = Finding.objects.all()
     if product:
         product = Product.objects.filter(name=product).first()
@@ -53,138 +73,240 @@ def jira_status_reconciliation(*args, **kwargs):
     logger.debug(findings.query)
 
     messages = ["jira_key;finding_url;resolution_or_status;find.jira_issue.jira_change;issue_from_jira.fields.updated;find.last_status_update;issue_from_jira.fields.updated;find.last_reviewed;issue_from_jira.fields.updated;flag1;flag2;flag3;action;change_made"]
-    for find in findings:
-        logger.debug("jira status reconciliation for: %i:%s", find.id, find)
 
-        issue_from_jira = jira_helper.get_jira_issue_from_jira(find)
+    outcomes = Counter()
+    started = time.monotonic()
+    if incremental:
+        for jira_instance in JIRA_Instance.objects.order_by("id"):
+            reconcile_jira_instance(jira_instance, findings, mode, dryrun, messages, outcomes, move_mark=not scoped)
+    else:
+        for find in findings:
+            issue_from_jira = jira_helper.get_jira_issue_from_jira(find)
+            outcomes[reconcile_finding(find, issue_from_jira, mode, dryrun, messages)] += 1
+
+    logger.info("results (semicolon seperated)")
+    for message in messages:
+        logger.info(message)
+    logger.info("jira status reconciliation%s of %i findings done in %.1f seconds: %s", " (dryrun)" if dryrun else "",
+        sum(outcomes.values()), time.monotonic() - started, format_outcomes(outcomes))
+    return None
+
+
+def format_outcomes(outcomes):
+    return ", ".join(f"{outcome}: {count}" for outcome, count in sorted(outcomes.items())) or "nothing to reconcile"
 
-        if not issue_from_jira:
-            message = "{};{}/finding/{};{};{};{};{};{};{};{};{};{};{};{};unable to retrieve JIRA Issue;{}".format(
-                find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), None, None, None, None,
-                            find.jira_issue.jira_change, None, find.last_status_update, None, find.last_reviewed, None, "error")
-            messages.append(message)
-            logger.info(message)
-            continue
 
-        assignee = issue_from_jira.fields.assignee if hasattr(issue_from_jira.fields, "assignee") else None
-        assignee_name = assignee.displayName if assignee else None
-        resolution = issue_from_jira.fields.resolution if issue_from_jira.fields.resolution and issue_from_jira.fields.resolution != "None" else None
-        resolution_id = resolution.id if resolution else None
-        resolution_name = resolution.name if resolution else None
+def search_issues_in_pages(jira, project_keys, jql_filter=""):
+    """
+    Yields the pages of the issues of the projects that match the JQL filter, ordered by key. The pages of a project
+    are searched one after the other, each for the issues after the last key of the previous page rather than at an
+    offset, as issues that start or stop matching during the search would move the later issues between the pages.
+    The projects are searched in parallel, ahead of the pages being reconciled.
+    """
+    def search_project(project_key):
+        pages = []
+        last_key = None
+        while True:
+            jql = f'project = "{project_key}"{jql_filter}'
+            if last_key:
+                jql += f' AND key > "{last_key}"'
+            page = jira.search_issues(f"{jql} ORDER BY key ASC", maxResults=jira_helper.JIRA_SEARCH_BATCH_SIZE, fields=JIRA_RECONCILIATION_FIELDS)
+            if not page:
+                return pages
+            pages.append(page)
+            # JIRA can return fewer issues per page than requested, the total is that of the issues after last_key
+            if len(page) >= page.total:
+                return pages
+            last_key = page[-1].key
+
+    with ThreadPoolExecutor(max_workers=settings.JIRA_RECONCILIATION_THREADS) as executor:
+        for pages in executor.map(search_project, project_keys):
+            yield from pages
+
+
+def format_jql_datetime(jira, value):
+    """Formats the time for JQL, which reads it in the time zone of the JIRA user, rounded down to the minute"""
+    time_zone = ZoneInfo(jira.myself().get("timeZone") or "UTC")
+    return value.astimezone(time_zone).strftime("%Y/%m/%d %H:%M")
+
+
+def reconcile_jira_instance(jira_instance, findings, mode, dryrun, messages, outcomes, *, move_mark=True):
+    """
+    Reconciles the findings linked to the issues of the JIRA instance that have been updated since its high-water
+    mark, all of them the first time. The issues are searched for page by page instead of being fetched one by one.
+    The mark is not moved when the search fails, nor when move_mark is False because the findings are only a part
+    of those of the instance.
+    """
+    project_keys = sorted(set(JIRA_Project.objects.filter(jira_instance=jira_instance).exclude(project_key="").values_list("project_key", flat=True)))
+    if not project_keys:
+        return
+
+    started = timezone.now()
+    instance_outcomes = Counter()
+    issue_count = 0
+    search_started = time.monotonic()
+    try:
+        jira = jira_helper.get_jira_connection(jira_instance)
+        jql_filter = ""
+        if jira_instance.reconciled_until:
+            # a fixed time, as JIRA would work out a relative one again for each page and the issues updated at
+            # the start of the window would drop out of the later pages
+            jql_filter = f' AND updated >= "{format_jql_datetime(jira, jira_instance.reconciled_until - JIRA_RECONCILIATION_OVERLAP)}"'
+        logger.debug("jira status reconciliation for %s: projects %s%s", jira_instance, ", ".join(project_keys), jql_filter)
+
+        for page in search_issues_in_pages(jira, project_keys, jql_filter):
+            issues = {str(issue.id): issue for issue in page}
+            issue_count += len(issues)
+            for find in findings.filter(jira_issue__jira_id__in=list(issues)):
+                # jira ids are only unique within a JIRA instance
+                if jira_helper.get_jira_instance(find) != jira_instance:
+                    continue
+                instance_outcomes[reconcile_finding(find, issues[str(find.jira_issue.jira_id)], mode, dryrun, messages, jira=jira)] += 1
+    except (JIRAError, requests.exceptions.RequestException):
+        logger.exception("jira status reconciliation for %s failed after %i updated issues, its issues are searched again from the same time on the next run",
+            jira_instance, issue_count)
+        outcomes.update(instance_outcomes)
+        return
+
+    logger.info("jira status reconciliation%s for %s: %i updated issues, %i findings reconciled in %.1f seconds: %s",
+        " (dryrun)" if dryrun else "", jira_instance, issue_count, sum(instance_outcomes.values()),
+        time.monotonic() - search_started, format_outcomes(instance_outcomes))
+    outcomes.update(instance_outcomes)
+
+    if move_mark and not dryrun:
+        JIRA_Instance.objects.filter(id=jira_instance.id).update(reconciled_until=started)
+
+
+def reconcile_finding(find, issue_from_jira, mode, dryrun, messages, jira=None):
+    """
+    Reconciles the status of the finding with the issue fetched from JIRA, adds a line about it to the messages
+    and returns what has been done: error, skipped, equal, import_status_from_jira, push_status_to_jira or unknown
+    """
+    logger.debug("jira status reconciliation for: %i:%s", find.id, find)
 
-        # convert from str to datetime
-        issue_from_jira.fields.updated = parse_datetime(issue_from_jira.fields.updated)
+    if not issue_from_jira:
+        message = "{};{}/finding/{};{};{};{};{};{};{};{};{};{};{};{};unable to retrieve JIRA Issue;{}".format(
+            find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), None, None, None, None,
+                        find.jira_issue.jira_change, None, find.last_status_update, None, find.last_reviewed, None, "error")
+        messages.append(message)
+        logger.info(message)
+        return "error"
+
+    assignee = issue_from_jira.fields.assignee if hasattr(issue_from_jira.fields, "assignee") else None
+    assignee_name = assignee.displayName if assignee else None
+    resolution = issue_from_jira.fields.resolution if issue_from_jira.fields.resolution and issue_from_jira.fields.resolution != "None" else None
+    resolution_id = resolution.id if resolution else None
+    resolution_name = resolution.name if resolution else None
+
+    # convert from str to datetime
+    issue_from_jira.fields.updated = parse_datetime(issue_from_jira.fields.updated)
 
-        flag1, flag2, flag3 = None, None, None
+    flag1, flag2, flag3 = None, None, None
+    action, status_changed = None, None
 
-        if mode == "reconcile" and not find.last_status_update:
-            message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};skipping finding with no last_status_update;{}".format(
-                find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), None, None, None, None,
-                find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "skipped")
+    if mode == "reconcile" and not find.last_status_update:
+        message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};skipping finding with no last_status_update;{}".format(
+            find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), None, None, None, None,
+            find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "skipped")
+        messages.append(message)
+        logger.info(message)
+        return "skipped"
+    if find.risk_accepted:
+        message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{}skipping risk accepted findings;{}".format(
+            find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
+            find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "skipped")
+        messages.append(message)
+        logger.info(message)
+        return "skipped"
+    if jira_helper.issue_from_jira_is_active(issue_from_jira) and find.active:
+        message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};no action both sides are active/open;{}".format(
+            find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
+                find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "equal")
+        messages.append(message)
+        logger.info(message)
+        return "equal"
+    if not jira_helper.issue_from_jira_is_active(issue_from_jira) and not find.active:
+        message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};no action both sides are inactive/closed;{}".format(
+            find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
+            find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "equal")
+        messages.append(message)
+        logger.info(message)
+        return "equal"
+    # statuses are different
+    if mode in {"push_status_to_jira", "import_status_from_jira"}:
+        action = mode
+    else:
+        # reconcile
+        # Status is JIRA is newer if:
+        # dojo.jira_change < jira.updated, and
+        # dojo.last_status_update < jira.updated, and
+        # dojo.last_reviewed < jira.update,
+
+        flag1 = (not find.jira_issue.jira_change or (find.jira_issue.jira_change < issue_from_jira.fields.updated))
+        flag2 = not find.last_status_update or (find.last_status_update < issue_from_jira.fields.updated)
+        flag3 = (not find.last_reviewed or (find.last_reviewed < issue_from_jira.fields.updated))
+
+        logger.debug("%s,%s,%s,%s", resolution_name, flag1, flag2, flag3)
+
+        if flag1 and flag2 and flag3:
+            action = "import_status_from_jira"
+
+        else:
+            # Status is DOJO is newer if:
+            # dojo.jira_change > jira.updated or # can't happen
+            # dojo.last_status_update > jira.updated or
+            # dojo.last_reviewed > jira.updated
+            # dojo.mitigated > dojo.jira_change
+
+            flag1 = not find.jira_issue.jira_change or (find.jira_issue.jira_change > issue_from_jira.fields.updated)
+            flag2 = find.last_status_update > issue_from_jira.fields.updated
+            flag3 = find.is_mitigated and find.mitigated and find.jira_issue.jira_change and find.mitigated > find.jira_issue.jira_change
+
+            logger.debug("%s,%s,%s,%s", resolution_name, flag1, flag2, flag3)
+
+            if flag1 or flag2 or flag3:
+                action = "push_status_to_jira"
+
+    if action == "import_status_from_jira":
+        message_action = "deactivating" if find.active else "reactivating"
+
+        status_changed = jira_helper.process_resolution_from_jira(find, resolution_id, resolution_name, assignee_name, issue_from_jira.fields.updated, find.jira_issue) if not dryrun else "dryrun"
+        if status_changed:
+            message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};{message_action} finding in defectdojo;{status_changed}"
             messages.append(message)
             logger.info(message)
-            continue
-        if find.risk_accepted:
-            message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{}skipping risk accepted findings;{}".format(
-                find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
-                find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "skipped")
+        else:
+            message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};no changes made from jira resolution;{status_changed}"
             messages.append(message)
             logger.info(message)
-        elif jira_helper.issue_from_jira_is_active(issue_from_jira) and find.active:
-            message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};no action both sides are active/open;{}".format(
-                find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
-                    find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "equal")
+
+    elif action == "push_status_to_jira":
+        jira_instance = jira_helper.get_jira_instance(find)
+        if jira is None:
+            jira = jira_helper.get_jira_connection(jira_instance)
+
+        message_action = "reopening" if find.active else "closing"
+
+        status_changed = jira_helper.push_status_to_jira(find, jira_instance, jira, issue_from_jira, save=True) if not dryrun else "dryrun"
+
+        if status_changed:
+            message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{message_action};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated} jira issue;{status_changed};"
             messages.append(message)
             logger.info(message)
-        elif not jira_helper.issue_from_jira_is_active(issue_from_jira) and not find.active:
-            message = "{}; {}/finding/{};{};{};{};{};{};{};{};{};{};{};{};no action both sides are inactive/closed;{}".format(
-                find.jira_issue.jira_key, settings.SITE_URL, find.id, find.status(), resolution_name, None, None, None,
-                find.jira_issue.jira_change, issue_from_jira.fields.updated, find.last_status_update, issue_from_jira.fields.updated, find.last_reviewed, issue_from_jira.fields.updated, "equal")
+        else:
+            if status_changed is None:
+                status_changed = "Error"
+            message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};no changes made while pushing status to jira;{status_changed}"
             messages.append(message)
-            logger.info(message)
 
-        else:
-            # statuses are different
-            if mode in {"push_status_to_jira", "import_status_from_jira"}:
-                action = mode
-            else:
-                # reconcile
-                # Status is JIRA is newer if:
-                # dojo.jira_change < jira.updated, and
-                # dojo.last_status_update < jira.updated, and
-                # dojo.last_reviewed < jira.update,
-
-                flag1 = (not find.jira_issue.jira_change or (find.jira_issue.jira_change < issue_from_jira.fields.updated))
-                flag2 = not find.last_status_update or (find.last_status_update < issue_from_jira.fields.updated)
-                flag3 = (not find.last_reviewed or (find.last_reviewed < issue_from_jira.fields.updated))
-
-                logger.debug("%s,%s,%s,%s", resolution_name, flag1, flag2, flag3)
-
-                if flag1 and flag2 and flag3:
-                    action = "import_status_from_jira"
-
-                else:
-                    # Status is DOJO is newer if:
-                    # dojo.jira_change > jira.updated or # can't happen
-                    # dojo.last_status_update > jira.updated or
-                    # dojo.last_reviewed > jira.updated
-                    # dojo.mitigated > dojo.jira_change
-
-                    flag1 = not find.jira_issue.jira_change or (find.jira_issue.jira_change > issue_from_jira.fields.updated)
-                    flag2 = find.last_status_update > issue_from_jira.fields.updated
-                    flag3 = find.is_mitigated and find.mitigated and find.jira_issue.jira_change and find.mitigated > find.jira_issue.jira_change
-
-                    logger.debug("%s,%s,%s,%s", resolution_name, flag1, flag2, flag3)
-
-                    if flag1 or flag2 or flag3:
-                        action = "push_status_to_jira"
-
-            prev_jira_instance, jira = None, None
-
-            if action == "import_status_from_jira":
-                message_action = "deactivating" if find.active else "reactivating"
-
-                status_changed = jira_helper.process_resolution_from_jira(find, resolution_id, resolution_name, assignee_name, issue_from_jira.fields.updated, find.jira_issue) if not dryrun else "dryrun"
-                if status_changed:
-                    message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};{message_action} finding in defectdojo;{status_changed}"
-                    messages.append(message)
-                    logger.info(message)
-                else:
-                    message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};no changes made from jira resolution;{status_changed}"
-                    messages.append(message)
-                    logger.info(message)
-
-            elif action == "push_status_to_jira":
-                jira_instance = jira_helper.get_jira_instance(find)
-                if not prev_jira_instance or (jira_instance.id != prev_jira_instance.id):
-                    # only reconnect to jira if the instance if different from the previous finding
-                    jira = jira_helper.get_jira_connection(jira_instance)
-
-                message_action = "reopening" if find.active else "closing"
-
-                status_changed = jira_helper.push_status_to_jira(find, jira_instance, jira, issue_from_jira, save=True) if not dryrun else "dryrun"
-
-                if status_changed:
-                    message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{message_action};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated} jira issue;{status_changed};"
-                    messages.append(message)
-                    logger.info(message)
-                else:
-                    if status_changed is None:
-                        status_changed = "Error"
-                    message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};no changes made while pushing status to jira;{status_changed}"
-                    messages.append(message)
-
-                    logger.info(message)
-            else:
-                message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};unable to determine source of truth;{status_changed}"
-                messages.append(message)
-
-                logger.info(message)
+            logger.info(message)
+    else:
+        message = f"{find.jira_issue.jira_key}; {settings.SITE_URL}/finding/{find.id};{find.status()};{resolution_name};{flag1};{flag2};{flag3};{find.jira_issue.jira_change};{issue_from_jira.fields.updated};{find.last_status_update};{issue_from_jira.fields.updated};{find.last_reviewed};{issue_from_jira.fields.updated};unable to determine source of truth;{status_changed}"
+        messages.append(message)
 
-    logger.info("results (semicolon seperated)")
-    for message in messages:
         logger.info(message)
-    return None
+
+    return action or "unknown"
 
 
 class Command(BaseCommand):
@@ -214,6 +336,7 @@ class Command(BaseCommand):
         parser.add_argument("--engagement", help="Only process findings in this product (name)")
         parser.add_argument("--daysback", type=int, help="Only process findings created in the last 'daysback' days")
         parser.add_argument("--dryrun", action="store_true", help="Only print actions to be performed, but make no modifications.")
+        parser.add_argument("--incremental", action="store_true", help="Only process findings whose JIRA issue has been updated since the last incremental run for its JIRA instance, searching JIRA page by page. The first run processes all of them. Runs limited by product, engagement or daysback do not move the high-water mark.")
 
     def handle(self, *args, **options):
         # mode = options['mode']
@@ -221,5 +344,6 @@ class Command(BaseCommand):
         # engagement = options['engagement']
         # daysback = options['daysback']
         # dryrun = options['dryrun']
+        # incremental = options['incremental']
 
         return jira_status_reconciliation(*args, **options)
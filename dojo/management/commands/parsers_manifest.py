@@ -0,0 +1,65 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dojo.tools.factory import MANIFEST_PATH, build_parsers_manifest
+
+"""
+This command generates dojo/tools/parsers_manifest.json, which lists the scan types of all the parsers so that they can
+be imported on first use. It has to be run again whenever a parser is added or its scan types, labels, descriptions or
+requirements change.
+"""
+
+STARTUP_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import django
+django.setup()
+import dojo.tools.factory
+parsers = sum(name.startswith("dojo.tools.") and name.endswith(".parser") for name in sys.modules)
+print(time.perf_counter() - start, parsers)
+"""
+
+
+class Command(BaseCommand):
+    help = "Generate the manifest of the parsers, check that it is up to date or measure the startup time with and without it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Fail if the manifest is not up to date instead of writing it")
+        parser.add_argument("--benchmark", type=int, metavar="RUNS", help="Compare the time to start with and without the manifest")
+
+    def handle(self, *args, **options):
+        if options["benchmark"]:
+            self.benchmark(options["benchmark"])
+            return
+
+        manifest = build_parsers_manifest()
+        content = json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
+        if options["check"]:
+            if not MANIFEST_PATH.is_file() or MANIFEST_PATH.read_text(encoding="utf-8") != content:
+                msg = f"{MANIFEST_PATH} is not up to date, run 'manage.py parsers_manifest'"
+                raise CommandError(msg)
+            self.stdout.write(f"{MANIFEST_PATH} is up to date")
+            return
+
+        MANIFEST_PATH.write_text(content, encoding="utf-8")
+        self.stdout.write(f"Wrote {len(manifest['scan_types'])} scan types of {len(manifest['modules'])} modules to {MANIFEST_PATH}")
+
+    def benchmark(self, runs):
+        for enabled in (False, True):
+            env = os.environ | {"DD_PARSERS_MANIFEST_ENABLED": str(enabled)}
+            env.setdefault("DJANGO_SETTINGS_MODULE", "dojo.settings.settings")
+            timings = []
+            for _ in range(runs):
+                # a new interpreter each time, as a worker starting up
+                output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], env=env, capture_output=True, text=True, check=True).stdout
+                seconds, parsers = output.split()[-2:]
+                timings.append(float(seconds))
+            self.stdout.write(
+                f"manifest {'enabled' if enabled else 'disabled'}: median startup {statistics.median(timings):.3f}s "
+                f"over {runs} runs, {parsers} parser modules imported")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from dojo.utils import calculate_grades, get_system_setting
+
+"""
+This command recalculates the grade of all products with a single aggregate query over the findings,
+instead of calculating the grade of each product separately
+"""
+
+
+class Command(BaseCommand):
+    help = "Recalculate the grade of all products"
+
+    def handle(self, *args, **options):
+        if not get_system_setting("enable_product_grade"):
+            self.stdout.write("Product grading is disabled in the system settings")
+            return
+
+        changed = calculate_grades()
+        self.stdout.write(f"Updated the grade of {changed} products")
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from dojo.search.indexes import create_search_indexes, drop_search_indexes
+
+"""
+This command creates the full-text search indexes of the PostgreSQL search backend, which are not created for the
+default watson backend. Run it when switching DD_SEARCH_BACKEND to postgres, or with --drop when switching back.
+"""
+
+
+class Command(BaseCommand):
+    help = "Create or drop the full-text search indexes of the PostgreSQL search backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--drop", action="store_true", help="Drop the indexes instead of creating them")
+        parser.add_argument("--recreate", action="store_true", help="Drop and create the indexes that exist already, after the indexed fields have changed")
+
+    def handle(self, *args, **options):
+        # the indexes are built concurrently, which is not possible in a transaction
+        with connection.schema_editor(atomic=False) as schema_editor:
+            if options["drop"]:
+                drop_search_indexes(schema_editor=schema_editor)
+                self.stdout.write("Dropped the search indexes")
+                return
+            create_search_indexes(schema_editor=schema_editor, recreate=options["recreate"])
+        self.stdout.write("Created the search indexes")
+        if settings.SEARCH_BACKEND != "postgres":
+            self.stdout.write("Set DD_SEARCH_BACKEND to postgres to search with them")
@@ -0,0 +1,76 @@
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+from dojo.models import Finding, Finding_Daily_Metrics
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED_FINDINGS_QUERY = Q(false_p=False, duplicate=False, out_of_scope=False, mitigated__isnull=True)
+
+# The counts stored per product, date, severity and numerical severity, computed from the findings of that combination
+FINDING_DAILY_METRICS_COUNTS = {
+    "total_count": Count("id"),
+    "active_count": Count("id", filter=Q(active=True)),
+    "mitigated_count": Count("id", filter=Q(is_mitigated=True)),
+    "risk_accepted_count": Count("id", filter=Q(risk_accepted=True)),
+    "unresolved_count": Count("id", filter=UNRESOLVED_FINDINGS_QUERY),
+    "unresolved_verified_count": Count("id", filter=UNRESOLVED_FINDINGS_QUERY & Q(verified=True)),
+}
+
+
+def refresh_finding_daily_metrics(findings: QuerySet[Finding], daily_metrics: QuerySet[Finding_Daily_Metrics]) -> int:
+    """
+    Recomputes the rollup rows covered by `daily_metrics` from `findings`, which must be the findings
+    of exactly the same products and dates. Rows for which no findings are left are removed.
+    Returns the number of rows written.
+    """
+    rows = findings.order_by().values("test__engagement__product_id", "date", "severity", "numerical_severity").annotate(**FINDING_DAILY_METRICS_COUNTS)
+    objs = [
+        Finding_Daily_Metrics(product_id=row.pop("test__engagement__product_id"), **row)
+        for row in rows
+    ]
+    refresh_started = timezone.now()
+    with transaction.atomic():
+        # Upsert so that overlapping runs do not trip over the unique constraint
+        Finding_Daily_Metrics.objects.bulk_create(
+            objs,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["product", "date", "severity", "numerical_severity"],
+            update_fields=[*FINDING_DAILY_METRICS_COUNTS, "updated"],
+        )
+        # Every row that is still current has just been touched by the upsert
+        daily_metrics.filter(updated__lt=refresh_started).delete()
+    return len(objs)
+
+
+def update_finding_daily_metrics(changed_since: datetime | None = None) -> int:
+    """
+    Maintains the daily metrics rollup. When `changed_since` is given, only the products and dates of
+    findings whose status changed since then are recomputed, otherwise the whole rollup is rebuilt.
+    A full rebuild is also done when the rollup is still empty. Returns the number of rows written.
+    """
+    if changed_since is None or not Finding_Daily_Metrics.objects.exists():
+        logger.info("rebuilding the finding daily metrics")
+        return refresh_finding_daily_metrics(Finding.objects.all(), Finding_Daily_Metrics.objects.all())
+
+    # last_status_update is also set when a finding is created
+    changed = Finding.objects.filter(last_status_update__gte=changed_since).order_by() \
+        .values_list("test__engagement__product_id", "date").distinct()
+    dates_by_product = defaultdict(set)
+    for product_id, finding_date in changed:
+        dates_by_product[product_id].add(finding_date)
+
+    rows_written = 0
+    for product_id, dates in dates_by_product.items():
+        rows_written += refresh_finding_daily_metrics(
+            Finding.objects.filter(test__engagement__product_id=product_id, date__in=dates),
+            Finding_Daily_Metrics.objects.filter(product_id=product_id, date__in=dates),
+        )
+    logger.debug("refreshed the finding daily metrics of %i products", len(dates_by_product))
+    return rows_written
@@ -7,6 +7,7 @@ from functools import partial
 from typing import Any, NamedTuple, TypeVar
 
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.contrib import messages
 from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
 from django.db.models.functions import Coalesce, ExtractDay, Now, TruncMonth, TruncWeek
@@ -25,7 +26,7 @@ from dojo.filters import (
 )
 from dojo.finding.helper import ACCEPTED_FINDINGS_QUERY, CLOSED_FINDINGS_QUERY, OPEN_FINDINGS_QUERY
 from dojo.finding.queries import get_authorized_findings
-from dojo.models import Endpoint_Status, Finding, Product_Type
+from dojo.models import Endpoint_Status, Finding, Finding_Daily_Metrics, Product_Type
 from dojo.product.queries import get_authorized_products
 from dojo.utils import (
     get_system_setting,
@@ -90,18 +91,31 @@ def finding_queries(
             test__engagement__product__prod_type__in=prod_type)
         active_filtered_findings = active_filtered_findings.filter(test__engagement__product__prod_type__in=prod_type)
 
-    # Get the severity counts of risk accepted findings
-    accepted_findings_counts = severity_count(accepted_filtered_findings, "aggregate", "severity")
-
     weeks_between, months_between = period_deltas(start_date, end_date)
 
-    query_counts_for_period = query_counts(
-        all_findings_within_date_range,
-        active_filtered_findings,
-        accepted_filtered_findings,
-        start_date,
-        MetricsType.FINDING,
-    )
+    if settings.METRICS_DAILY_ROLLUP:
+        # The counts only depend on the authorized products, the product types and the date range, so they can
+        # be read from the daily rollup instead of being aggregated over all the findings
+        daily_metrics = Finding_Daily_Metrics.objects.filter(
+            product__in=get_authorized_products(Permissions.Finding_View, user=request.user),
+            date__range=[start_date, end_date],
+        )
+        if len(prod_type) > 0:
+            daily_metrics = daily_metrics.filter(product__prod_type__in=prod_type)
+
+        accepted_findings_counts = daily_metrics_severity_count(daily_metrics, "aggregate", "risk_accepted_count")
+        query_counts_for_period = daily_metrics_query_counts(daily_metrics, start_date)
+    else:
+        # Get the severity counts of risk accepted findings
+        accepted_findings_counts = severity_count(accepted_filtered_findings, "aggregate", "severity")
+
+        query_counts_for_period = query_counts(
+            all_findings_within_date_range,
+            active_filtered_findings,
+            accepted_filtered_findings,
+            start_date,
+            MetricsType.FINDING,
+        )
 
     monthly_counts = query_counts_for_period(MetricsPeriod.MONTH, months_between)
     weekly_counts = query_counts_for_period(MetricsPeriod.WEEK, weeks_between)
@@ -319,6 +333,34 @@ def query_counts(
     return _aggregates_for_period
 
 
+def daily_metrics_query_counts(
+    daily_metrics: QuerySet[Finding_Daily_Metrics],
+    start_date: date,
+) -> Callable[[MetricsPeriod, int], dict[str, list[dict]]]:
+    """
+    Counterpart of `query_counts` for Findings that reads the counts from the daily metrics rollup.
+
+    :param daily_metrics: QuerySet of the daily metrics rows to generate statistics for
+    :param start_date: The start date for statistics generation
+    :return: A method that takes period information to generate statistics for the given QuerySet
+    """
+    def _aggregates_for_period(period: MetricsPeriod, period_count: int) -> dict[str, list[dict]]:
+        def _aggregate_data(count_field: str, *, include_closed: bool = False) -> list[dict]:
+            return get_charting_data(
+                aggregate_daily_metrics_by_period(daily_metrics, period, count_field, include_closed=include_closed),
+                start_date=start_date,
+                period=period,
+                period_count=period_count,
+                include_closed=include_closed,
+            )
+        return {
+            "opened_per_period": _aggregate_data("total_count", include_closed=True),
+            "active_per_period": _aggregate_data("active_count"),
+            "accepted_per_period": _aggregate_data("risk_accepted_count"),
+        }
+    return _aggregates_for_period
+
+
 def get_date_range(
     qs: QuerySet,
 ) -> tuple[datetime, datetime]:
@@ -367,6 +409,34 @@ def severity_count(
     )
 
 
+def daily_metrics_severity_count(
+    queryset: QuerySet,
+    method: str,
+    count_field: str,
+    expression: str = "severity",
+) -> QuerySet | dict[str, int]:
+    """
+    Counterpart of `severity_count` that sums a count field of daily metrics rows by severity.
+
+    :param queryset: The queryset to aggregate
+    :param method: The method to use for aggregation, either 'annotate' or 'aggregate' depending on use case.
+    :param count_field: The field of the daily metrics rows to sum, for example 'total_count' or 'active_count'
+    :param expression: The lookup expression for severity, relative to the queryset model type
+    :return: A queryset containing aggregated counts of severities
+    """
+    def _sum(severities):
+        return Coalesce(Sum(count_field, filter=Q(**{expression + "__in": severities})), 0)
+
+    return getattr(queryset, method)(
+        total=_sum(("Critical", "High", "Medium", "Low", "Info")),
+        critical=_sum(("Critical",)),
+        high=_sum(("High",)),
+        medium=_sum(("Medium",)),
+        low=_sum(("Low",)),
+        info=_sum(("Info",)),
+    )
+
+
 def identify_view(
     request: HttpRequest,
 ) -> str:
@@ -508,6 +578,38 @@ def aggregate_counts_by_period(
     return severities_by_period.order_by("grouped_date").values(*desired_values)
 
 
+def aggregate_daily_metrics_by_period(
+    daily_metrics: QuerySet[Finding_Daily_Metrics],
+    period: MetricsPeriod,
+    count_field: str,
+    *,
+    include_closed: bool,
+) -> QuerySet:
+    """
+    Counterpart of `aggregate_counts_by_period` for Findings that sums a count field of the daily metrics rollup.
+
+    :param daily_metrics: The queryset of daily metrics rows to aggregate
+    :param period: A MetricsPeriod to aggregate across
+    :param count_field: The field of the daily metrics rows to sum, for example 'total_count' or 'active_count'
+    :param include_closed: A boolean dictating whether 'closed' finding aggregates should be included
+    :return: A queryset with aggregate severity counts grouped by period
+    """
+    desired_values = ("grouped_date", "critical", "high", "medium", "low", "info", "total")
+
+    severities_by_period = daily_metrics_severity_count(
+        # Group by desired period
+        daily_metrics.annotate(grouped_date=period.db_method("date")).values("grouped_date"),
+        "annotate",
+        count_field,
+    )
+    if include_closed:
+        # Include 'closed' counts
+        severities_by_period = severities_by_period.annotate(closed=Coalesce(Sum("mitigated_count"), 0))
+        desired_values += ("closed",)
+
+    return severities_by_period.order_by("grouped_date").values(*desired_values)
+
+
 def findings_by_product(
     findings: QuerySet[Finding],
 ) -> QuerySet[Finding]:
@@ -1,14 +1,17 @@
+import copy
 import logging
 import re
 import time
 from contextlib import suppress
-from threading import local
+from threading import Lock, local
 from urllib.parse import quote
+from uuid import uuid4
 
 from auditlog.context import set_actor
 from auditlog.middleware import AuditlogMiddleware as _AuditlogMiddleware
 from django.conf import settings
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from django.utils.functional import SimpleLazyObject
@@ -110,6 +113,66 @@ class DojoSytemSettingsMiddleware:
         return system_settings
 
 
+class DojoSystemSettingsCache:
+
+    """
+    Caches the system settings across requests, processes and celery workers. The settings are stored in the
+    Django cache together with a version stamp that is replaced whenever the settings are saved. Each process
+    keeps the version it loaded last and only compares it with the stamp in the Django cache every
+    SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL seconds, so most lookups do not leave the process.
+
+    When no shared cache backend is configured, Django falls back to a local-memory cache per process. Changes
+    made in another process are then picked up once the cached version expires after SYSTEM_SETTINGS_CACHE_TIMEOUT.
+    """
+
+    version_key = "dojo_system_settings_version"
+    settings_key = "dojo_system_settings"
+    _lock = Lock()
+    _system_settings = None
+    _version = None
+    _checked_at = 0.0
+
+    @classmethod
+    def get_system_settings(cls):
+        if not settings.SYSTEM_SETTINGS_CACHE_ENABLED:
+            return None
+
+        with cls._lock:
+            now = time.monotonic()
+            if cls._system_settings is None or now - cls._checked_at >= settings.SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL:
+                version = cache.get(cls.version_key)
+                if version is None or version != cls._version:
+                    cls._system_settings, cls._version = cls.load(version)
+                cls._checked_at = now
+            # hand out a copy, as callers are free to modify the settings they get
+            return copy.copy(cls._system_settings)
+
+    @classmethod
+    def load(cls, version):
+        from dojo.models import System_Settings
+        cached = cache.get(cls.settings_key)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1], version
+
+        system_settings = System_Settings.objects.get(no_cache=True)
+        if version is None:
+            # another process might have stamped a version in the meantime, which then wins
+            cache.add(cls.version_key, uuid4().hex, timeout=settings.SYSTEM_SETTINGS_CACHE_TIMEOUT)
+            version = cache.get(cls.version_key)
+        cache.set(cls.settings_key, (version, system_settings), timeout=settings.SYSTEM_SETTINGS_CACHE_TIMEOUT)
+        return system_settings, version
+
+    @classmethod
+    def invalidate(cls, *args, **kwargs):  # noqa: ARG003
+        def bump_version():
+            cache.set(cls.version_key, uuid4().hex, timeout=settings.SYSTEM_SETTINGS_CACHE_TIMEOUT)
+            with cls._lock:
+                cls._system_settings = cls._version = None
+
+        # Only bump after the commit, so that no process can cache the old settings under the new version
+        transaction.on_commit(bump_version)
+
+
 class System_Settings_Manager(models.Manager):
 
     def get_from_db(self, *args, **kwargs):
@@ -131,6 +194,10 @@ class System_Settings_Manager(models.Manager):
 
         from_cache = DojoSytemSettingsMiddleware.get_system_settings()
 
+        if not from_cache:
+            # outside of a request
+            from_cache = DojoSystemSettingsCache.get_system_settings()
+
         if not from_cache:
             # logger.debug('no cached value found, loading system settings from db')
             return self.get_from_db(*args, **kwargs)
@@ -1005,6 +1005,9 @@ class SLA_Configuration(models.Model):
     async_updating = models.BooleanField(
         default=False,
         help_text=_("Findings under this SLA configuration are asynchronously being updated"))
+    async_updating_progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=_("Percentage of the products under this SLA configuration whose findings have been updated"))
 
     class Meta:
         ordering = ["name"]
@@ -1046,6 +1049,7 @@ class SLA_Configuration(models.Model):
             if severities:
                 # set the async updating flag to true for this sla config
                 self.async_updating = True
+                self.async_updating_progress = 0
                 super().save(*args, **kwargs)
                 # set the async updating flag to true for all products using this sla config
                 products = Product.objects.filter(sla_configuration=self)
@@ -1213,6 +1217,7 @@ class Product(models.Model):
                 sla_config = getattr(self, "sla_configuration", None)
                 if sla_config:
                     sla_config.async_updating = True
+                    sla_config.async_updating_progress = 0
                     super(SLA_Configuration, sla_config).save()
                 # launch the async task to update all finding sla expiration dates
                 from dojo.sla_config.helpers import update_sla_expiration_dates_product_async
@@ -1653,6 +1658,7 @@ class Endpoint_Status(models.Model):
         indexes = [
             models.Index(fields=["finding", "mitigated"]),
             models.Index(fields=["endpoint", "mitigated"]),
+            models.Index(fields=["last_modified", "id"]),
         ]
         constraints = [
             models.UniqueConstraint(fields=["finding", "endpoint"], name="endpoint-finding relation"),
@@ -1707,55 +1713,111 @@ class Endpoint(models.Model):
 
     tags = TagField(blank=True, force_lowercase=True, help_text=_("Add tags that help describe this endpoint. Choose from the list or add new tags. Press Enter key to add."))
     inherited_tags = TagField(blank=True, force_lowercase=True, help_text=_("Internal use tags sepcifically for maintaining parity with product. This field will be present as a subset in the tags field"))
+    canonical_url = models.TextField(blank=True, default="", editable=False,
+                                     help_text=_("The normalized URL of the endpoint, kept current on save."))
+    canonical_url_hash = models.CharField(blank=True, default="", editable=False, max_length=64,
+                                          help_text=_("The SHA-256 digest of the normalized URL of the endpoint."))
+
+    URL_PARTS = ("protocol", "userinfo", "host", "port", "path", "query", "fragment")
+    # the parts of the URL that canonical_url was built from, to know when it has to be built again
+    _canonical_url_parts = None
 
     class Meta:
         ordering = ["product", "host", "protocol", "port", "userinfo", "path", "query", "fragment"]
         indexes = [
             models.Index(fields=["product"]),
+            models.Index(fields=["product", "canonical_url_hash"]),
         ]
 
     def __hash__(self):
-        return self.__str__().__hash__()
+        return self.get_canonical_url().__hash__()
 
     def __eq__(self, other):
         if isinstance(other, Endpoint):
             # Check if the contents of the endpoint match
-            contents_match = str(self) == str(other)
-            # Determine if products should be used in the equation
-            if self.product is not None and other.product is not None:
-                # Check if the products are the same
-                products_match = (self.product) == other.product
-                # Check if the contents match
-                return products_match and contents_match
+            contents_match = self.get_canonical_url_hash() == other.get_canonical_url_hash()
+            # Determine if products should be used in the equation, without fetching them
+            self_product, other_product = (
+                endpoint.product_id or (endpoint.product if Endpoint.product.is_cached(endpoint) else None)
+                for endpoint in (self, other)
+            )
+            if self_product is not None and other_product is not None:
+                # Check if the products are the same and the contents match
+                return self_product == other_product and contents_match
             return contents_match
 
         return NotImplemented
 
     def __str__(self):
+        return self.get_canonical_url()
+
+    def save(self, *args, **kwargs):
+        self.get_canonical_url()
+        if (update_fields := kwargs.get("update_fields")) is not None and set(update_fields) & set(self.URL_PARTS):
+            kwargs["update_fields"] = {*update_fields, "canonical_url", "canonical_url_hash"}
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        from django.urls import reverse
+        return reverse("view_endpoint", args=[str(self.id)])
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the stored canonical URL is only used when it was loaded along with all the parts of the URL
+        if {*cls.URL_PARTS, "canonical_url", "canonical_url_hash"} <= set(field_names) and instance.canonical_url_hash:
+            instance._canonical_url_parts = instance.get_url_parts()
+        return instance
+
+    def get_url_parts(self):
+        return tuple(getattr(self, part) for part in self.URL_PARTS)
+
+    def get_canonical_url(self):
+        """
+        Returns the normalized URL of the endpoint. It is stored in canonical_url along with its digest,
+        and only built again when the parts of the URL changed since it was built or loaded
+        """
+        url_parts = self.get_url_parts()
+        if url_parts != self._canonical_url_parts:
+            self.canonical_url = self.build_canonical_url(*url_parts)
+            self.canonical_url_hash = self.hash_canonical_url(self.canonical_url)
+            self._canonical_url_parts = url_parts
+        return self.canonical_url
+
+    def get_canonical_url_hash(self):
+        self.get_canonical_url()
+        return self.canonical_url_hash
+
+    @staticmethod
+    def hash_canonical_url(canonical_url):
+        return hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def build_canonical_url(protocol, userinfo, host, port, path, query, fragment):
         try:
-            if self.host:
+            if host:
                 dummy_scheme = "dummy-scheme"  # workaround for https://github.com/python-hyper/hyperlink/blob/b8c9152cd826bbe8e6cc125648f3738235019705/src/hyperlink/_url.py#L988
                 url = hyperlink.EncodedURL(
-                    scheme=self.protocol or dummy_scheme,
-                    userinfo=self.userinfo or "",
-                    host=self.host,
-                    port=self.port,
-                    path=tuple(self.path.split("/")) if self.path else (),
+                    scheme=protocol or dummy_scheme,
+                    userinfo=userinfo or "",
+                    host=host,
+                    port=port,
+                    path=tuple(path.split("/")) if path else (),
                     query=tuple(
                         (
                             qe.split("=", 1)
                             if "=" in qe
                             else (qe, None)
                         )
-                        for qe in self.query.split("&")
-                    ) if self.query else (),  # inspired by https://github.com/python-hyper/hyperlink/blob/b8c9152cd826bbe8e6cc125648f3738235019705/src/hyperlink/_url.py#L1427
-                    fragment=self.fragment or "",
+                        for qe in query.split("&")
+                    ) if query else (),  # inspired by https://github.com/python-hyper/hyperlink/blob/b8c9152cd826bbe8e6cc125648f3738235019705/src/hyperlink/_url.py#L1427
+                    fragment=fragment or "",
                 )
                 # Return a normalized version of the URL to avoid differences where there shouldn't be any difference.
                 # Example: https://google.com and https://google.com:443
-                normalize_path = self.path  # it used to add '/' at the end of host
+                normalize_path = path  # it used to add '/' at the end of host
                 clean_url = url.normalize(scheme=True, host=True, path=normalize_path, query=True, fragment=True, userinfo=True, percents=True).to_uri().to_text()
-                if not self.protocol:
+                if not protocol:
                     if clean_url[:len(dummy_scheme) + 3] == (dummy_scheme + "://"):
                         clean_url = clean_url[len(dummy_scheme) + 3:]
                     else:
@@ -1766,26 +1828,22 @@ class Endpoint(models.Model):
             raise ValueError(msg)
         except:
             url = ""
-            if self.protocol:
-                url += f"{self.protocol}://"
-            if self.userinfo:
-                url += f"{self.userinfo}@"
-            if self.host:
-                url += self.host
-            if self.port:
-                url += f":{self.port}"
-            if self.path:
-                url += "{}{}".format("/" if self.path[0] != "/" else "", self.path)
-            if self.query:
-                url += f"?{self.query}"
-            if self.fragment:
-                url += f"#{self.fragment}"
+            if protocol:
+                url += f"{protocol}://"
+            if userinfo:
+                url += f"{userinfo}@"
+            if host:
+                url += host
+            if port:
+                url += f":{port}"
+            if path:
+                url += "{}{}".format("/" if path[0] != "/" else "", path)
+            if query:
+                url += f"?{query}"
+            if fragment:
+                url += f"#{fragment}"
             return url
 
-    def get_absolute_url(self):
-        from django.urls import reverse
-        return reverse("view_endpoint", args=[str(self.id)])
-
     def clean(self):
         errors = []
         null_char_list = ["0x00", "\x00"]
@@ -2543,6 +2601,10 @@ class Finding(models.Model):
                                    null=True,
                                    verbose_name=_("Created"),
                                    help_text=_("The date the finding was created inside DefectDojo."))
+    updated = models.DateTimeField(auto_now=True,
+                                   null=True,
+                                   verbose_name=_("Updated"),
+                                   help_text=_("The date the finding was last saved inside DefectDojo."))
     scanner_confidence = models.IntegerField(null=True,
                                              blank=True,
                                              default=None,
@@ -2660,6 +2722,7 @@ class Finding(models.Model):
             models.Index(fields=["duplicate"]),
             models.Index(fields=["is_mitigated"]),
             models.Index(fields=["duplicate_finding", "id"]),
+            models.Index(fields=["updated", "id"]),
         ]
 
     def __init__(self, *args, **kwargs):
@@ -3877,6 +3940,7 @@ class JIRA_Instance(models.Model):
     false_positive_mapping_resolution = models.CharField(null=True, blank=True, max_length=300, help_text=_("JIRA resolution names (comma-separated values) that maps to a False Positive Finding"))
     global_jira_sla_notification = models.BooleanField(default=True, blank=False, verbose_name=_("Globally send SLA notifications as comment?"), help_text=_("This setting can be overidden at the Product level"))
     finding_jira_sync = models.BooleanField(default=False, blank=False, verbose_name=_("Automatically sync Findings with JIRA?"), help_text=_("If enabled, this will sync changes to a Finding automatically to JIRA"))
+    reconciled_until = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Reconciled until"), help_text=_("The JIRA issues updated before this time have been reconciled with their findings by the incremental JIRA status reconciliation"))
 
     def __str__(self):
         return self.configuration_name + " | " + self.url + " | " + self.username
@@ -4449,6 +4513,57 @@ class Benchmark_Product_Summary(models.Model):
         return self.product.name + ": " + self.benchmark_type.name
 
 
+class Finding_Daily_Metrics(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    date = models.DateField(help_text=_("The date of the findings counted in this row."))
+    severity = models.CharField(max_length=200, help_text=_("The severity of the findings counted in this row."))
+    numerical_severity = models.CharField(max_length=4, blank=True, default="", help_text=_("The numerical severity of the findings counted in this row, as stored on the findings."))
+    total_count = models.PositiveIntegerField(default=0, help_text=_("Number of findings."))
+    active_count = models.PositiveIntegerField(default=0, help_text=_("Number of active findings."))
+    mitigated_count = models.PositiveIntegerField(default=0, help_text=_("Number of mitigated findings."))
+    risk_accepted_count = models.PositiveIntegerField(default=0, help_text=_("Number of risk accepted findings."))
+    unresolved_count = models.PositiveIntegerField(default=0, help_text=_("Number of findings that are not mitigated, false positive, out of scope or a duplicate."))
+    unresolved_verified_count = models.PositiveIntegerField(default=0, help_text=_("Number of unresolved findings that are verified."))
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("product", "date", "severity", "numerical_severity")]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.date} {self.severity} ({self.numerical_severity})"
+
+
+class Generated_Report(models.Model):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    SUCCESS = "Success"
+    FAILED = "Failed"
+    STATUS_CHOICES = (
+        (PENDING, PENDING),
+        (RUNNING, RUNNING),
+        (SUCCESS, SUCCESS),
+        (FAILED, FAILED),
+    )
+
+    key = models.CharField(max_length=64, db_index=True, editable=False, help_text=_("Hash of the object, user, options and filters of the report."))
+    data_version = models.CharField(max_length=64, editable=False, help_text=_("Hash of the state of the findings at the time the report was requested."))
+    name = models.CharField(max_length=400)
+    user = models.ForeignKey(Dojo_User, on_delete=models.CASCADE)
+    object_type = models.CharField(max_length=50, editable=False)
+    object_id = models.PositiveIntegerField(editable=False)
+    parameters = models.TextField(blank=True, editable=False, help_text=_("The options and filters of the report as query string."))
+    host = models.CharField(max_length=400, blank=True, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    progress = models.PositiveSmallIntegerField(default=0, help_text=_("Percentage of the rendering that is done."))
+    message = models.TextField(null=True, blank=True)
+    file = models.FileField(upload_to=UniqueUploadNameProvider("reports/%Y/%m/%d"), null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    completed = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
 # ==========================
 # Defect Dojo Engaegment Surveys
 # ==============================
@@ -4620,7 +4735,7 @@ if settings.ENABLE_AUDITLOG:
     # Register for automatic logging to database
     logger.info("enabling audit logging")
     auditlog.register(Dojo_User, exclude_fields=["password"])
-    auditlog.register(Endpoint)
+    auditlog.register(Endpoint, exclude_fields=["canonical_url", "canonical_url_hash"])
     auditlog.register(Engagement)
     auditlog.register(Finding, m2m_fields={"reviewers"})
     auditlog.register(Finding_Group)
@@ -4655,6 +4770,12 @@ admin.site.register(Benchmark_Category)
 admin.site.register(Benchmark_Product)
 admin.site.register(Benchmark_Product_Summary)
 
+# Metrics
+admin.site.register(Finding_Daily_Metrics)
+
+# Reports
+admin.site.register(Generated_Report)
+
 # Testing
 admin.site.register(Testing_Guide_Category)
 admin.site.register(Testing_Guide)
@@ -1,14 +1,21 @@
 import importlib
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import timedelta
+from uuid import uuid4
 
 import requests
 import yaml
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
 from django.db.models import Count, Prefetch, Q, QuerySet
 from django.template import TemplateDoesNotExist
 from django.template.loader import render_to_string
@@ -18,6 +25,7 @@ from django.utils.translation import gettext as _
 from dojo import __version__ as dd_version
 from dojo.authorization.roles_permissions import Permissions
 from dojo.celery import app
+from dojo.checks import is_shared_cache
 from dojo.decorators import dojo_async_task, we_want_async
 from dojo.models import (
     Alerts,
@@ -40,6 +48,77 @@ from dojo.user.queries import (
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_RECIPIENTS_VERSION_KEY = "dojo_notification_recipients_version"
+
+
+def is_notification_recipients_cache_enabled():
+    # A cache of its own in each process would keep notifying removed members from the other processes,
+    # the misconfiguration is reported by the check_configuration_shared_cache system check
+    return settings.NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED and is_shared_cache()
+
+
+def get_notification_recipients_version():
+    version = cache.get(NOTIFICATION_RECIPIENTS_VERSION_KEY)
+    if version is None:
+        # another process might have stamped a version in the meantime, which then wins
+        cache.add(NOTIFICATION_RECIPIENTS_VERSION_KEY, uuid4().hex, timeout=None)
+        version = cache.get(NOTIFICATION_RECIPIENTS_VERSION_KEY)
+    return version
+
+
+def invalidate_notification_recipients():
+    """Invalidates the cached notification recipients of all products, after memberships or notification settings changed"""
+    if not is_notification_recipients_cache_enabled():
+        return
+
+    def bump_version():
+        cache.set(NOTIFICATION_RECIPIENTS_VERSION_KEY, uuid4().hex, timeout=None)
+
+    # Bump right away for the current transaction and again after the commit, so that
+    # no other process can cache the old recipients under the new version
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+class RateLimiter:
+
+    """Spaces out the calls to wait() of all threads, so that at most `rate` calls per second pass."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_call = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def deliver_in_threads(function, items: list, rate_limit: float) -> list:
+    """
+    Calls function for each of the items on a pool of NOTIFICATIONS_DELIVERY_THREADS threads, with at most
+    rate_limit calls per second. Returns the results in the order of the items, with the exception instead of
+    the result for failed calls. The function must not use the database, the threads have their own connection
+    that does not see the transaction of the caller.
+    """
+    rate_limiter = RateLimiter(rate_limit)
+
+    def deliver(item):
+        rate_limiter.wait()
+        try:
+            return function(item)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.NOTIFICATIONS_DELIVERY_THREADS)) as executor:
+        return list(executor.map(deliver, items))
+
 
 def create_notification(
     event: str | None = None,
@@ -252,6 +331,54 @@ class SlackNotificationManger(NotificationManagerHelpers):
                 url=kwargs.get("url"),
             )
 
+    @dojo_async_task
+    @app.task
+    def send_slack_notifications(
+        self,
+        event: str,
+        users: list[Dojo_User],
+        **kwargs: dict,
+    ):
+        """Sends the personal Slack messages of many users, delivered by a pool of threads"""
+        messages = []
+        for user in users:
+            if hasattr(user, "usercontactinfo") and user.usercontactinfo.slack_username is not None:
+                try:
+                    messages.append((user, self._create_notification_message(event, user, "slack", dict(kwargs))))
+                except Exception as exception:
+                    self._log_slack_exception(exception, kwargs)
+            else:
+                logger.info(
+                    "The user %s does not have a email address informed for Slack in profile.",
+                    user,
+                )
+
+        def deliver(message):
+            user, text = message
+            # Lookup the slack userid the first time, then save it.
+            slack_user_id = user.usercontactinfo.slack_user_id or self._get_slack_user_id(user.usercontactinfo.slack_username)
+            # only send notification if we managed to find the slack_user_id
+            if slack_user_id:
+                self._post_slack_text(f"@{slack_user_id}", text)
+            return slack_user_id
+
+        logger.debug("sending %i personal Slack notifications", len(messages))
+        for (user, _text), result in zip(messages, deliver_in_threads(deliver, messages, settings.NOTIFICATIONS_SLACK_RATE_LIMIT), strict=True):
+            if isinstance(result, Exception):
+                self._log_slack_exception(result, kwargs)
+            elif result and result != user.usercontactinfo.slack_user_id:
+                UserContactInfo.objects.filter(user_id=user.id).update(slack_user_id=result)
+
+    def _log_slack_exception(self, exception: Exception, kwargs: dict) -> None:
+        logger.error("Unable to send Slack notification", exc_info=exception)
+        self._log_alert(
+            exception,
+            "Slack Notification",
+            title=kwargs["title"],
+            description=str(exception),
+            url=kwargs.get("url"),
+        )
+
     def _get_slack_user_id(self, user_email: str) -> str:
         user_id = None
         res = requests.request(
@@ -291,6 +418,9 @@ class SlackNotificationManger(NotificationManagerHelpers):
         channel: str,
         **kwargs: dict,
     ) -> None:
+        self._post_slack_text(channel, self._create_notification_message(event, user, "slack", kwargs))
+
+    def _post_slack_text(self, channel: str, text: str) -> None:
         res = requests.request(
             method="POST",
             url="https://slack.com/api/chat.postMessage",
@@ -298,7 +428,7 @@ class SlackNotificationManger(NotificationManagerHelpers):
                 "token": self.system_settings.slack_token,
                 "channel": channel,
                 "username": self.system_settings.slack_username,
-                "text": self._create_notification_message(event, user, "slack", kwargs),
+                "text": text,
             },
             timeout=settings.REQUESTS_TIMEOUT,
         )
@@ -371,6 +501,49 @@ class EmailNotificationManger(NotificationManagerHelpers):
         user: Dojo_User | None = None,
         **kwargs: dict,
     ):
+        try:
+            email = self._create_email_message(event, user, kwargs)
+            logger.debug("sending email alert")
+            email.send(fail_silently=False)
+
+        except Exception as exception:
+            self._log_mail_exception(exception, kwargs)
+
+    @dojo_async_task
+    @app.task
+    def send_mail_notifications(
+        self,
+        event: str,
+        users: list[Dojo_User],
+        **kwargs: dict,
+    ):
+        """Sends the personal emails of many users over a single connection to the mail server"""
+        emails = []
+        for user in users:
+            try:
+                emails.append(self._create_email_message(event, user, dict(kwargs)))
+            except Exception as exception:
+                self._log_mail_exception(exception, kwargs)
+
+        logger.debug("sending %i email alerts", len(emails))
+        try:
+            with get_connection(fail_silently=False) as connection:
+                # one by one, so that a refused recipient does not keep the others from getting their email
+                for email in emails:
+                    try:
+                        connection.send_messages([email])
+                    except Exception as exception:
+                        logger.error("Unable to send Email Notification to %s", ", ".join(email.to))
+                        self._log_mail_exception(exception, kwargs)
+        except Exception as exception:
+            self._log_mail_exception(exception, kwargs)
+
+    def _create_email_message(
+        self,
+        event: str,
+        user: Dojo_User | None,
+        kwargs: dict,
+    ) -> EmailMessage:
         # Attempt to get the "to" address
         if (recipient := kwargs.get("recipient")) is not None:
             address = recipient
@@ -381,31 +554,29 @@ class EmailNotificationManger(NotificationManagerHelpers):
 
         logger.debug("notification email for user %s to %s", user, address)
 
-        try:
-            subject = f"{self.system_settings.team_name} notification"
-            if (title := kwargs.get("title")) is not None:
-                subject += f": {title}"
-
-            email = EmailMessage(
-                subject,
-                self._create_notification_message(event, user, "mail", kwargs),
-                self.system_settings.email_from,
-                [address],
-                headers={"From": f"{self.system_settings.email_from}"},
-            )
-            email.content_subtype = "html"
-            logger.debug("sending email alert")
-            email.send(fail_silently=False)
+        subject = f"{self.system_settings.team_name} notification"
+        if (title := kwargs.get("title")) is not None:
+            subject += f": {title}"
 
-        except Exception as exception:
-            logger.exception("Unable to send Email Notification")
-            self._log_alert(
-                exception,
-                "Email Notification",
-                title=kwargs["title"],
-                description=str(exception),
-                url=kwargs["url"],
-            )
+        email = EmailMessage(
+            subject,
+            self._create_notification_message(event, user, "mail", kwargs),
+            self.system_settings.email_from,
+            [address],
+            headers={"From": f"{self.system_settings.email_from}"},
+        )
+        email.content_subtype = "html"
+        return email
+
+    def _log_mail_exception(self, exception: Exception, kwargs: dict) -> None:
+        logger.error("Unable to send Email Notification", exc_info=exception)
+        self._log_alert(
+            exception,
+            "Email Notification",
+            title=kwargs["title"],
+            description=str(exception),
+            url=kwargs["url"],
+        )
 
 
 class WebhookNotificationManger(NotificationManagerHelpers):
@@ -424,69 +595,122 @@ class WebhookNotificationManger(NotificationManagerHelpers):
         **kwargs: dict,
     ):
         for endpoint in self._get_webhook_endpoints(user=user):
-            error = None
-            if endpoint.status not in {
-                Notification_Webhooks.Status.STATUS_ACTIVE,
-                Notification_Webhooks.Status.STATUS_ACTIVE_TMP,
-            }:
-                logger.info(
-                    f"URL for Webhook '{endpoint.name}' is not active: {endpoint.get_status_display()} ({endpoint.status})",
-                )
+            if not self._is_webhook_active(endpoint):
                 continue
 
             try:
                 logger.debug(f"Sending webhook message to endpoint '{endpoint.name}'")
                 res = self._webhooks_notification_request(endpoint, event, **kwargs)
-                if 200 <= res.status_code < 300:
-                    logger.debug(
-                        f"Message sent to endpoint '{endpoint.name}' successfully.",
-                    )
-                    continue
-                # HTTP request passed successfully but we still need to check status code
-                if 500 <= res.status_code < 600 or res.status_code == 429:
-                    error = self.ERROR_TEMPORARY
-                else:
-                    error = self.ERROR_PERMANENT
+            except Exception as exception:
+                self._update_webhook_status(endpoint, exception)
+            else:
+                self._update_webhook_status(endpoint, res)
 
-                endpoint.note = f"Response status code: {res.status_code}"
-                logger.error(
-                    f"Error when sending message to Webhooks '{endpoint.name}' (status: {res.status_code}): {res.text}",
+    @dojo_async_task
+    @app.task
+    def send_webhooks_notifications(
+        self,
+        event: str,
+        users: list[Dojo_User],
+        **kwargs: dict,
+    ):
+        """Calls the personal webhooks of many users, delivered by a pool of threads"""
+        endpoints_by_owner = defaultdict(list)
+        for endpoint in Notification_Webhooks.objects.filter(owner__in=users).select_related("owner"):
+            endpoints_by_owner[endpoint.owner_id].append(endpoint)
+
+        requests_details = []
+        for user in users:
+            if not endpoints_by_owner[user.id]:
+                logger.info(
+                    f"URLs for Webhooks not configured for user '{user}': skipping user notification",
                 )
-            except requests.exceptions.Timeout as e:
-                error = self.ERROR_TEMPORARY
-                endpoint.note = f"Requests exception: {e}"
-                logger.error(
-                    f"Timeout when sending message to Webhook '{endpoint.name}'",
+            for endpoint in filter(self._is_webhook_active, endpoints_by_owner[user.id]):
+                try:
+                    requests_details.append((endpoint, *self._generate_request_details(endpoint, event=event, **kwargs)))
+                except Exception as exception:
+                    self._update_webhook_status(endpoint, exception)
+
+        def deliver(request_details):
+            endpoint, headers, data = request_details
+            logger.debug(f"Sending webhook message to endpoint '{endpoint.name}'")
+            return self._post_webhook(endpoint, headers, data)
+
+        for (endpoint, _headers, _data), result in zip(
+            requests_details,
+            deliver_in_threads(deliver, requests_details, settings.NOTIFICATIONS_WEBHOOKS_RATE_LIMIT),
+            strict=True,
+        ):
+            self._update_webhook_status(endpoint, result)
+
+    def _is_webhook_active(self, endpoint: Notification_Webhooks) -> bool:
+        if endpoint.status not in {
+            Notification_Webhooks.Status.STATUS_ACTIVE,
+            Notification_Webhooks.Status.STATUS_ACTIVE_TMP,
+        }:
+            logger.info(
+                f"URL for Webhook '{endpoint.name}' is not active: {endpoint.get_status_display()} ({endpoint.status})",
+            )
+            return False
+        return True
+
+    def _update_webhook_status(
+        self,
+        endpoint: Notification_Webhooks,
+        result: requests.Response | Exception,
+    ) -> None:
+        """Deactivates the endpoint if the response is an error or the request raised an exception"""
+        if isinstance(result, requests.exceptions.Timeout):
+            error = self.ERROR_TEMPORARY
+            endpoint.note = f"Requests exception: {result}"
+            logger.error(
+                f"Timeout when sending message to Webhook '{endpoint.name}'",
+            )
+        elif isinstance(result, Exception):
+            error = self.ERROR_PERMANENT
+            endpoint.note = f"Exception: {result}"[:1000]
+            logger.error("Unable to send Webhooks Notification", exc_info=result)
+            self._log_alert(result, "Webhooks Notification")
+        else:
+            if 200 <= result.status_code < 300:
+                logger.debug(
+                    f"Message sent to endpoint '{endpoint.name}' successfully.",
                 )
-            except Exception as exception:
-                error = self.ERROR_PERMANENT
-                endpoint.note = f"Exception: {exception}"[:1000]
-                logger.exception("Unable to send Webhooks Notification")
-                self._log_alert(exception, "Webhooks Notification")
-
-            now = get_current_datetime()
-            if error == self.ERROR_TEMPORARY:
-                # If endpoint is unstable for more then one day, it needs to be deactivated
-                if endpoint.first_error is not None and (now - endpoint.first_error).total_seconds() > 60 * 60 * 24:
-                    endpoint.status = Notification_Webhooks.Status.STATUS_INACTIVE_PERMANENT
-                else:
-                    # We need to monitor when outage started
-                    if endpoint.status == Notification_Webhooks.Status.STATUS_ACTIVE:
-                        endpoint.first_error = now
-                    endpoint.status = Notification_Webhooks.Status.STATUS_INACTIVE_TMP
-                    # In case of failure within one day, endpoint can be deactivated temporally only for one minute
-                    self._webhook_reactivation.apply_async(
-                        args=[self],
-                        kwargs={"endpoint_id": endpoint.pk},
-                        countdown=60,
-                    )
-            # There is no reason to keep endpoint active if it is returning 4xx errors
+                return
+            # HTTP request passed successfully but we still need to check status code
+            if 500 <= result.status_code < 600 or result.status_code == 429:
+                error = self.ERROR_TEMPORARY
             else:
+                error = self.ERROR_PERMANENT
+
+            endpoint.note = f"Response status code: {result.status_code}"
+            logger.error(
+                f"Error when sending message to Webhooks '{endpoint.name}' (status: {result.status_code}): {result.text}",
+            )
+
+        now = get_current_datetime()
+        if error == self.ERROR_TEMPORARY:
+            # If endpoint is unstable for more then one day, it needs to be deactivated
+            if endpoint.first_error is not None and (now - endpoint.first_error).total_seconds() > 60 * 60 * 24:
                 endpoint.status = Notification_Webhooks.Status.STATUS_INACTIVE_PERMANENT
-                endpoint.first_error = now
+            else:
+                # We need to monitor when outage started
+                if endpoint.status == Notification_Webhooks.Status.STATUS_ACTIVE:
+                    endpoint.first_error = now
+                endpoint.status = Notification_Webhooks.Status.STATUS_INACTIVE_TMP
+                # In case of failure within one day, endpoint can be deactivated temporally only for one minute
+                self._webhook_reactivation.apply_async(
+                    args=[self],
+                    kwargs={"endpoint_id": endpoint.pk},
+                    countdown=60,
+                )
+        # There is no reason to keep endpoint active if it is returning 4xx errors
+        else:
+            endpoint.status = Notification_Webhooks.Status.STATUS_INACTIVE_PERMANENT
+            endpoint.first_error = now
 
-            endpoint.last_error = now
-            endpoint.save()
+        endpoint.last_error = now
+        endpoint.save()
 
     def _get_webhook_endpoints(
         self,
@@ -536,6 +760,14 @@ class WebhookNotificationManger(NotificationManagerHelpers):
         **kwargs: dict,
     ) -> requests.Response:
         headers, data = self._generate_request_details(endpoint, event=event, **kwargs)
+        return self._post_webhook(endpoint, headers, data)
+
+    def _post_webhook(
+        self,
+        endpoint: Notification_Webhooks,
+        headers: dict,
+        data: dict,
+    ) -> requests.Response:
         return requests.request(
             method="POST",
             url=endpoint.url,
@@ -579,45 +811,77 @@ class AlertNotificationManger(NotificationManagerHelpers):
     ):
         logger.debug("sending alert notification to %s", user)
         try:
-            # no need to differentiate between user/no user
-            icon = kwargs.get("icon", "info-circle")
-            try:
-                source = Notifications._meta.get_field(event).verbose_name.title()[:100]
-            except FieldDoesNotExist:
-                source = event.replace("_", " ").title()[:100]
-            alert = Alerts(
-                user_id=user,
-                title=kwargs.get("title")[:250],
-                description=self._create_notification_message(
-                    event,
-                    user,
-                    "alert",
-                    kwargs,
-                )[:2000],
-                url=kwargs.get("url", reverse("alerts")),
-                icon=icon[:25],
-                source=source,
-            )
-            # relative urls will fail validation
-            alert.clean_fields(exclude=["url"])
-            alert.save()
+            self._create_alert(event, user, kwargs).save()
         except Exception as exception:
-            logger.exception("Unable to create Alert Notification")
-            self._log_alert(
-                exception,
-                "Alert Notification",
-                title=kwargs["title"],
-                description=str(exception),
-                url=kwargs["url"],
-            )
+            self._log_alert_exception(exception, kwargs)
+
+    def send_alert_notifications(
+        self,
+        event: str,
+        users: list[Dojo_User],
+        **kwargs: dict,
+    ):
+        """Creates the alerts of many users with a single insert"""
+        alerts = []
+        for user in users:
+            try:
+                alerts.append(self._create_alert(event, user, dict(kwargs)))
+            except Exception as exception:
+                self._log_alert_exception(exception, kwargs)
+        logger.debug("sending %i alert notifications", len(alerts))
+        Alerts.objects.bulk_create(alerts)
+
+    def _create_alert(
+        self,
+        event: str,
+        user: Dojo_User | None,
+        kwargs: dict,
+    ) -> Alerts:
+        # no need to differentiate between user/no user
+        icon = kwargs.get("icon", "info-circle")
+        try:
+            source = Notifications._meta.get_field(event).verbose_name.title()[:100]
+        except FieldDoesNotExist:
+            source = event.replace("_", " ").title()[:100]
+        alert = Alerts(
+            user_id=user,
+            title=kwargs.get("title")[:250],
+            description=self._create_notification_message(
+                event,
+                user,
+                "alert",
+                kwargs,
+            )[:2000],
+            url=kwargs.get("url", reverse("alerts")),
+            icon=icon[:25],
+            source=source,
+        )
+        # relative urls will fail validation
+        alert.clean_fields(exclude=["url"])
+        return alert
+
+    def _log_alert_exception(self, exception: Exception, kwargs: dict) -> None:
+        logger.error("Unable to create Alert Notification", exc_info=exception)
+        self._log_alert(
+            exception,
+            "Alert Notification",
+            title=kwargs["title"],
+            description=str(exception),
+            url=kwargs["url"],
+        )
 
 
 class NotificationManager(NotificationManagerHelpers):
 
     """Manage the construction and dispatch of notifications."""
 
+    # The channels whose personal notifications are collected and sent for all users at once
+    BATCHED_ALERT_TYPES = ("alert", "slack", "mail", "webhooks")
+
     def __init__(self, *args: list, **kwargs: dict) -> None:
         NotificationManagerHelpers.__init__(self, *args, **kwargs)
+        # users per alert type, while the personal notifications of an event are collected
+        self.batched_users: dict[str, list[Dojo_User]] | None = None
 
     def create_notification(self, event: str | None = None, **kwargs: dict) -> None:
         # Process the notifications for a given list of recipients
@@ -642,8 +906,13 @@ class NotificationManager(NotificationManagerHelpers):
             if kwargs.get("no_users", False) is False:
                 # get users with either global notifications, or a product specific notification
                 # and all admin/superuser, they will always be notified
-                for user in self._get_user_to_send_notifications_to():
-                    self._send_single_notification_to_user(user, event=event, **kwargs)
+                self.batched_users = defaultdict(list)
+                try:
+                    for user in self._get_user_to_send_notifications_to():
+                        self._send_single_notification_to_user(user, event=event, **kwargs)
+                    self._send_batched_notifications(event, **kwargs)
+                finally:
+                    self.batched_users = None
 
     def _process_recipients(self, event: str | None = None, **kwargs: dict) -> None:
         # mimic existing code so that when recipients is specified, no other system or personal notifications are sent.
@@ -703,18 +972,44 @@ class NotificationManager(NotificationManagerHelpers):
     def _get_user_to_send_notifications_to(
         self,
     ) -> QuerySet[Dojo_User]:
-        """Determine the users we should send notifications to based on product and product type permissions."""
+        """
+        Determine the users we should send notifications to based on product and product type permissions.
+        The ids of the users can be cached per product or product type, they do not depend on the event.
+        """
+        if not is_notification_recipients_cache_enabled():
+            return self._get_users_with_applicable_notifications(self._get_authorized_users_to_notify())
+
+        cache_key = "dojo_notification_recipients_{}_{}_{}".format(
+            get_notification_recipients_version(),
+            getattr(self.product, "id", None),
+            # the product type only matters when there is no product
+            None if self.product is not None else getattr(self.product_type, "id", None),
+        )
+        user_ids = cache.get(cache_key)
+        if user_ids is None:
+            user_ids = list(self._get_authorized_users_to_notify().values_list("id", flat=True))
+            cache.set(cache_key, user_ids, timeout=settings.NOTIFICATIONS_RECIPIENTS_CACHE_TIMEOUT)
+        return self._get_users_with_applicable_notifications(Dojo_User.objects.filter(id__in=user_ids))
+
+    def _get_users_with_applicable_notifications(
+        self,
+        users: QuerySet[Dojo_User],
+    ) -> QuerySet[Dojo_User]:
+        return users.select_related("usercontactinfo").prefetch_related(
+            Prefetch(
+                "notifications_set",
+                queryset=Notifications.objects.filter(
+                    Q(product_id=self.product) | Q(product__isnull=True),
+                ),
+                to_attr="applicable_notifications",
+            ),
+        )
+
+    def _get_authorized_users_to_notify(
+        self,
+    ) -> QuerySet[Dojo_User]:
         users = (
             Dojo_User.objects.filter(is_active=True)
-            .prefetch_related(
-                Prefetch(
-                    "notifications_set",
-                    queryset=Notifications.objects.filter(
-                        Q(product_id=self.product) | Q(product__isnull=True),
-                    ),
-                    to_attr="applicable_notifications",
-                ),
-            )
             .annotate(
                 applicable_notifications_count=Count(
                     "notifications__id",
@@ -787,6 +1082,32 @@ class NotificationManager(NotificationManagerHelpers):
         msg = f"Unsupported alert type: {alert_type}"
         raise TypeError(msg)
 
+    def _send_notification(
+        self,
+        alert_type: str,
+        event: str | None,
+        user: Dojo_User | None,
+        **kwargs: dict,
+    ) -> None:
+        """Sends the notification to the channel right away, or adds the user to the batch of the channel"""
+        if self.batched_users is not None and user is not None:
+            if alert_type in self.BATCHED_ALERT_TYPES:
+                self.batched_users[alert_type].append(user)
+                return
+            if alert_type == "msteams":
+                # Microsoft Teams has no direct messages, see send_msteams_notification
+                return
+        manager = self._get_manager_instance(alert_type)
+        getattr(manager, f"send_{alert_type}_notification")(event, user=user, **kwargs)
+
+    def _send_batched_notifications(self, event: str | None, **kwargs: dict) -> None:
+        """Sends the collected personal notifications, with one call per channel for all its users"""
+        for alert_type, users in self.batched_users.items():
+            logger.debug("Sending %s notifications to %i users", alert_type, len(users))
+            manager = self._get_manager_instance(alert_type)
+            getattr(manager, f"send_{alert_type}_notifications")(event, users=users, **kwargs)
+        self.batched_users.clear()
+
     def _process_notifications(
         self,
         event: str | None,
@@ -809,9 +1130,10 @@ class NotificationManager(NotificationManagerHelpers):
 
         if "alert" in getattr(notifications, event, notifications.other):
             logger.debug(f"Sending Alert to {notifications.user}")
-            self._get_manager_instance("alert").send_alert_notification(
+            self._send_notification(
+                "alert",
                 event,
-                user=notifications.user,
+                notifications.user,
                 **kwargs,
             )
 
@@ -824,9 +1146,10 @@ class NotificationManager(NotificationManagerHelpers):
                 notifications.other,
             ):
                 logger.debug("Sending Slack Notification")
-                self._get_manager_instance("slack").send_slack_notification(
+                self._send_notification(
+                    "slack",
                     event,
-                    user=notifications.user,
+                    notifications.user,
                     **kwargs,
                 )
 
@@ -836,9 +1159,10 @@ class NotificationManager(NotificationManagerHelpers):
                 notifications.other,
             ):
                 logger.debug("Sending MSTeams Notification")
-                self._get_manager_instance("msteams").send_msteams_notification(
+                self._send_notification(
+                    "msteams",
                     event,
-                    user=notifications.user,
+                    notifications.user,
                     **kwargs,
                 )
 
@@ -848,9 +1172,10 @@ class NotificationManager(NotificationManagerHelpers):
                 notifications.other,
             ):
                 logger.debug("Sending Mail Notification")
-                self._get_manager_instance("mail").send_mail_notification(
+                self._send_notification(
+                    "mail",
                     event,
-                    user=notifications.user,
+                    notifications.user,
                     **kwargs,
                 )
 
@@ -860,9 +1185,10 @@ class NotificationManager(NotificationManagerHelpers):
                 notifications.other,
             ):
                 logger.debug("Sending Webhooks Notification")
-                self._get_manager_instance("webhooks").send_webhooks_notification(
+                self._send_notification(
+                    "webhooks",
                     event,
-                    user=notifications.user,
+                    notifications.user,
                     **kwargs,
                 )
 
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from fieldsignals import pre_save_changed
+
+from dojo.models import (
+    Dojo_Group_Member,
+    Dojo_User,
+    Global_Role,
+    Notifications,
+    Product,
+    Product_Group,
+    Product_Member,
+    Product_Type_Group,
+    Product_Type_Member,
+)
+from dojo.notifications.helper import invalidate_notification_recipients
+
+
+@receiver(post_save, sender=Notifications)
+@receiver(post_save, sender=Product_Member)
+@receiver(post_save, sender=Product_Type_Member)
+@receiver(post_save, sender=Product_Group)
+@receiver(post_save, sender=Product_Type_Group)
+@receiver(post_save, sender=Dojo_Group_Member)
+@receiver(post_save, sender=Global_Role)
+@receiver(post_delete, sender=Notifications)
+@receiver(post_delete, sender=Product_Member)
+@receiver(post_delete, sender=Product_Type_Member)
+@receiver(post_delete, sender=Product_Group)
+@receiver(post_delete, sender=Product_Type_Group)
+@receiver(post_delete, sender=Dojo_Group_Member)
+@receiver(post_delete, sender=Global_Role)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Dojo_User)
+def recipients_changed(sender, instance, **kwargs):
+    invalidate_notification_recipients()
+
+
+# inactive users are not notified, superusers always are
+@receiver(pre_save_changed, sender=User, fields=["is_active", "is_superuser"])
+@receiver(pre_save_changed, sender=Dojo_User, fields=["is_active", "is_superuser"])
+def user_changed(sender, instance, changed_fields=None, **kwargs):
+    invalidate_notification_recipients()
+
+
+# products inherit the members of their product type
+@receiver(pre_save_changed, sender=Product, fields=["prod_type"])
+def product_type_changed(sender, instance, changed_fields=None, **kwargs):
+    invalidate_notification_recipients()
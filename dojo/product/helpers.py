@@ -1,5 +1,9 @@
 import contextlib
 import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
 
 from dojo.celery import app
 from dojo.decorators import dojo_async_task
@@ -7,6 +11,9 @@ from dojo.models import Endpoint, Engagement, Finding, Product, Test
 
 logger = logging.getLogger(__name__)
 
+# The tags of this many objects are compared and written per transaction
+PROPAGATE_TAGS_BATCH_SIZE = 1000
+
 
 @dojo_async_task
 @app.task
@@ -17,22 +24,106 @@ def propagate_tags_on_product(product_id, *args, **kwargs):
 
 
 def propagate_tags_on_product_sync(product):
+    product_tags = [tag.name for tag in product.tags.all()]
     # enagagements
     logger.debug(f"Propagating tags from {product} to all engagements")
-    propagate_tags_on_object_list(Engagement.objects.filter(product=product))
+    propagate_tags_on_object_list(Engagement.objects.filter(product=product), product_tags)
     # tests
     logger.debug(f"Propagating tags from {product} to all tests")
-    propagate_tags_on_object_list(Test.objects.filter(engagement__product=product))
+    propagate_tags_on_object_list(Test.objects.filter(engagement__product=product), product_tags)
     # findings
     logger.debug(f"Propagating tags from {product} to all findings")
-    propagate_tags_on_object_list(Finding.objects.filter(test__engagement__product=product))
+    propagate_tags_on_object_list(Finding.objects.filter(test__engagement__product=product), product_tags)
     # endpoints
     logger.debug(f"Propagating tags from {product} to all endpoints")
-    propagate_tags_on_object_list(Endpoint.objects.filter(product=product))
+    propagate_tags_on_object_list(Endpoint.objects.filter(product=product), product_tags)
+
+
+class TagRelation:
+
+    """The rows of the through table of a tag field, with the tag counts kept by tagulous"""
+
+    def __init__(self, model, field_name):
+        field = model._meta.get_field(field_name)
+        self.through = field.remote_field.through
+        self.tag_model = field.related_model
+        self.object_field = field.m2m_field_name()
+        self.tag_field = field.m2m_reverse_field_name()
+
+    def get_tag_names(self, object_ids):
+        tag_names = defaultdict(set)
+        for object_id, tag_name in self.through.objects.filter(**{f"{self.object_field}__in": object_ids}).values_list(
+            self.object_field, f"{self.tag_field}__name",
+        ):
+            tag_names[object_id].add(tag_name)
+        return tag_names
+
+    def get_tag_ids(self, tag_names):
+        tag_ids = dict(self.tag_model.objects.filter(name__in=tag_names).values_list("name", "id"))
+        for tag_name in set(tag_names) - set(tag_ids):
+            tag_ids[tag_name] = self.tag_model.objects.create(name=tag_name).id
+        return tag_ids
+
+    def add(self, object_ids_by_tag):
+        tag_ids = self.get_tag_ids(list(object_ids_by_tag))
+        self.through.objects.bulk_create([
+            self.through(**{f"{self.object_field}_id": object_id, f"{self.tag_field}_id": tag_ids[tag_name]})
+            for tag_name, object_ids in object_ids_by_tag.items()
+            for object_id in object_ids
+        ])
+        for tag_name, object_ids in object_ids_by_tag.items():
+            self.tag_model.objects.filter(id=tag_ids[tag_name]).update(count=F("count") + len(object_ids))
+
+    def remove(self, object_ids_by_tag):
+        for tag_name, object_ids in object_ids_by_tag.items():
+            self.through.objects.filter(**{
+                f"{self.object_field}__in": object_ids,
+                f"{self.tag_field}__name": tag_name,
+            }).delete()
+            self.tag_model.objects.filter(name=tag_name).update(count=F("count") - len(object_ids))
+        # tags that are no longer used are deleted, just like tagulous does when they are removed one by one
+        for tag in self.tag_model.objects.filter(name__in=list(object_ids_by_tag), count=0):
+            tag.try_delete()
+
+
+def propagate_tags_on_object_list(object_list, product_tags):
+    """
+    Makes the inherited tags of the objects match the product tags, with the same outcome as
+    _manage_inherited_tags has for each object. Only the rows of the tag through tables that change are
+    written, in bulk, so neither save() nor the m2m_changed and post_save receivers of the objects run
+    """
+    model = object_list.model
+    tags = TagRelation(model, "tags")
+    inherited_tags = TagRelation(model, "inherited_tags")
+    product_tags = set(product_tags)
+
+    object_ids = list(object_list.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(object_ids), PROPAGATE_TAGS_BATCH_SIZE):
+        batch_ids = object_ids[start:start + PROPAGATE_TAGS_BATCH_SIZE]
+        current_tags = tags.get_tag_names(batch_ids)
+        current_inherited_tags = inherited_tags.get_tag_names(batch_ids)
 
+        tags_to_add, tags_to_remove = defaultdict(list), defaultdict(list)
+        inherited_tags_to_add, inherited_tags_to_remove = defaultdict(list), defaultdict(list)
+        for object_id in batch_ids:
+            object_tags = current_tags[object_id]
+            object_inherited_tags = current_inherited_tags[object_id]
+            for tag_name in product_tags - object_inherited_tags:
+                inherited_tags_to_add[tag_name].append(object_id)
+            for tag_name in object_inherited_tags - product_tags:
+                inherited_tags_to_remove[tag_name].append(object_id)
+            # the tags are left as they are when the product has no tags anymore
+            if product_tags:
+                for tag_name in product_tags - object_tags:
+                    tags_to_add[tag_name].append(object_id)
+                for tag_name in (object_tags & object_inherited_tags) - product_tags:
+                    tags_to_remove[tag_name].append(object_id)
 
-def propagate_tags_on_object_list(object_list):
-    for obj in object_list:
-        if obj and obj.id is not None:
-            logger.debug(f"\tPropagating tags to {type(obj)} - {obj}")
-            obj.save()
+        if not (tags_to_add or tags_to_remove or inherited_tags_to_add or inherited_tags_to_remove):
+            continue
+        logger.debug(f"\tPropagating tags to {len(batch_ids)} objects of type {model.__name__}")
+        with transaction.atomic():
+            tags.remove(tags_to_remove)
+            inherited_tags.remove(inherited_tags_to_remove)
+            tags.add(tags_to_add)
+            inherited_tags.add(inherited_tags_to_add)
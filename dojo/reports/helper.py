@@ -0,0 +1,145 @@
+import hashlib
+import logging
+from datetime import timedelta
+
+from crum import impersonate
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Count, Max
+from django.http import QueryDict
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.text import slugify
+
+from dojo.celery import app
+from dojo.decorators import dojo_async_task
+from dojo.models import Engagement, Finding, Generated_Report, Product, Product_Type, Test
+from dojo.utils import get_system_setting
+
+logger = logging.getLogger(__name__)
+
+# The reports that are rendered in the background, with the lookup of the findings in their scope
+GENERATED_REPORT_MODELS = {
+    "Product_Type": (Product_Type, "test__engagement__product__prod_type"),
+    "Product": (Product, "test__engagement__product"),
+    "Engagement": (Engagement, "test__engagement"),
+    "Test": (Test, "test"),
+}
+
+
+def get_report_parameters(params):
+    """Returns the options and filters of a report request as query string, independent of their order"""
+    parameters = QueryDict(mutable=True)
+    for key, values in sorted(params.lists()):
+        if key != "_generate":
+            parameters.setlist(key, sorted(values))
+    return parameters.urlencode()
+
+
+def get_report_key(obj, parameters, user):
+    key = "|".join((
+        type(obj).__name__,
+        str(obj.id),
+        str(user.id),
+        parameters,
+        # the disclaimer is part of the report, but not of the request
+        str(get_system_setting("disclaimer_reports_forced", 0)),
+        get_system_setting("disclaimer_reports") or "",
+    ))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_report_data_version(obj):
+    """
+    Returns a hash that changes when findings are added to or removed from the scope of the report, or
+    change status. Other changes are picked up when the stored report is older than REPORTS_ASYNC_MAX_AGE
+    """
+    _, lookup = GENERATED_REPORT_MODELS[type(obj).__name__]
+    version = Finding.objects.filter(**{lookup: obj}).aggregate(
+        count=Count("id"),
+        created=Max("created"),
+        last_status_update=Max("last_status_update"),
+        last_reviewed=Max("last_reviewed"),
+    )
+    version["updated"] = getattr(obj, "updated", None)
+    return hashlib.sha256(str(sorted(version.items())).encode("utf-8")).hexdigest()
+
+
+def request_generated_report(obj, params, user, host):
+    """
+    Returns the stored report of obj with the options and filters in params. If there is no up to date
+    report, a new one is created and queued for rendering
+    """
+    parameters = get_report_parameters(params)
+    key = get_report_key(obj, parameters, user)
+    data_version = get_report_data_version(obj)
+    report = Generated_Report.objects.filter(
+        key=key,
+        data_version=data_version,
+        created__gte=timezone.now() - timedelta(seconds=settings.REPORTS_ASYNC_MAX_AGE),
+    ).exclude(status=Generated_Report.FAILED).order_by("-created").first()
+    if report is not None:
+        logger.debug("serving stored report %i for %s", report.id, obj)
+        return report
+
+    report = Generated_Report.objects.create(
+        key=key,
+        data_version=data_version,
+        name=str(obj),
+        user=user,
+        object_type=type(obj).__name__,
+        object_id=obj.id,
+        parameters=parameters,
+        host=host,
+    )
+    generate_report(report.id)
+    return report
+
+
+def set_report_progress(report, status, progress, message=None):
+    report.status = status
+    report.progress = progress
+    report.message = message
+    report.save(update_fields=["status", "progress", "message"])
+
+
+@dojo_async_task
+@app.task
+def generate_report(report_id, *args, **kwargs):
+    # avoid circular imports, the report views use the helper to queue reports
+    from dojo.reports.views import get_report_data, get_report_html_context
+
+    report = Generated_Report.objects.filter(id=report_id).select_related("user").first()
+    if report is None:
+        logger.warning("report %i has been deleted before it was rendered", report_id)
+        return
+    model, _ = GENERATED_REPORT_MODELS[report.object_type]
+    obj = model.objects.filter(id=report.object_id).first()
+    if obj is None:
+        set_report_progress(report, Generated_Report.FAILED, 0, f"{report.name} no longer exists")
+        return
+
+    set_report_progress(report, Generated_Report.RUNNING, 10)
+    try:
+        # the findings of the report are limited to those the user is authorized for
+        with impersonate(report.user):
+            report_data = get_report_data(QueryDict(report.parameters), obj, report.user, report.host)
+            set_report_progress(report, Generated_Report.RUNNING, 30)
+            html = render_to_string(report_data["template"], get_report_html_context(report_data))
+    except Exception as e:
+        logger.exception("error rendering report %i of %s", report.id, report.name)
+        set_report_progress(report, Generated_Report.FAILED, report.progress, str(e))
+        return
+
+    set_report_progress(report, Generated_Report.RUNNING, 90)
+    report.file.save(f"{slugify(report.name)}.html", ContentFile(html.encode("utf-8")), save=False)
+    report.status = Generated_Report.SUCCESS
+    report.progress = 100
+    report.completed = timezone.now()
+    report.save()
+
+    # earlier renderings of the same report are outdated now
+    for outdated_report in Generated_Report.objects.filter(key=report.key, created__lt=report.created):
+        outdated_report.file.delete(save=False)
+        outdated_report.delete()
+    logger.debug("rendered report %i of %s", report.id, report.name)
@@ -32,6 +32,10 @@ urlpatterns = [
         views.CustomReport.as_view(), name="custom_report"),
     re_path(r"^reports/quick$",
         views.QuickReportView.as_view(), name="quick_report"),
+    re_path(r"^reports/generated/(?P<rid>\d+)$",
+        views.generated_report, name="generated_report"),
+    re_path(r"^reports/generated/(?P<rid>\d+)/file$",
+        views.generated_report_file, name="generated_report_file"),
     re_path(r"^reports/csv_export$",
         views.CSVExportView.as_view(), name="csv_export"),
     re_path(r"^reports/excel_export$",
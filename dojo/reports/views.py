@@ -7,11 +7,14 @@ from tempfile import NamedTemporaryFile
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpRequest, HttpResponse, QueryDict
-from django.shortcuts import get_object_or_404, render
+from django.db.models import QuerySet
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, QueryDict, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views import View
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 
 from dojo.authorization.authorization import user_has_permission_or_403
@@ -27,7 +30,8 @@ from dojo.filters import (
 from dojo.finding.queries import get_authorized_findings
 from dojo.finding.views import BaseListFindings
 from dojo.forms import ReportOptionsForm
-from dojo.models import Dojo_User, Endpoint, Engagement, Finding, Product, Product_Type, Test
+from dojo.models import Dojo_User, Endpoint, Engagement, Finding, Generated_Report, Product, Product_Type, Test
+from dojo.reports.helper import GENERATED_REPORT_MODELS, request_generated_report
 from dojo.reports.widgets import (
     CoverPage,
     CustomReportJsonForm,
@@ -52,6 +56,8 @@ from dojo.utils import (
 logger = logging.getLogger(__name__)
 
 EXCEL_CHAR_LIMIT = 32767
+# The number of findings that are loaded at once by the csv and excel exports
+EXPORT_CHUNK_SIZE = 1000
 
 
 def down(request):
@@ -270,6 +276,32 @@ def endpoint_host_report(request, eid):
     return generate_report(request, endpoint, host_view=True)
 
 
+def get_generated_report_or_403(request, rid):
+    generated_report = get_object_or_404(Generated_Report, id=rid)
+    # reports contain the findings their user was authorized for at the time
+    if generated_report.user_id != request.user.id and not request.user.is_superuser:
+        raise PermissionDenied
+    return generated_report
+
+
+def generated_report(request, rid):
+    generated_report = get_generated_report_or_403(request, rid)
+    add_breadcrumb(title="Generate Report", top_level=False, request=request)
+    return render(request, "dojo/generated_report.html", {"generated_report": generated_report})
+
+
+def generated_report_file(request, rid):
+    generated_report = get_generated_report_or_403(request, rid)
+    if generated_report.status != Generated_Report.SUCCESS or not generated_report.file:
+        raise Http404
+    return FileResponse(
+        generated_report.file.open("rb"),
+        as_attachment="download" in request.GET,
+        filename=generated_report.file.name.rsplit("/", 1)[-1],
+        content_type="text/html",
+    )
+
+
 @user_is_authorized(Product, Permissions.Product_View, "pid")
 def product_endpoint_report(request, pid):
     product = get_object_or_404(Product.objects.all().prefetch_related("engagement_set__test_set__test_type", "engagement_set__test_set__environment"), id=pid)
@@ -337,13 +369,6 @@ def product_endpoint_report(request, pid):
 
 def generate_report(request, obj, *, host_view=False):
     user = Dojo_User.objects.get(id=request.user.id)
-    product_type = None
-    product = None
-    engagement = None
-    test = None
-    endpoint = None
-    endpoints = None
-    report_title = None
 
     if type(obj).__name__ == "Product_Type":
         user_has_permission_or_403(request.user, obj, Permissions.Product_Type_View)
@@ -366,26 +391,95 @@ def generate_report(request, obj, *, host_view=False):
         raise Exception(msg)
 
     report_format = request.GET.get("report_type", "HTML")
-    include_finding_notes = int(request.GET.get("include_finding_notes", 0))
-    include_finding_images = int(request.GET.get("include_finding_images", 0))
-    include_executive_summary = int(request.GET.get("include_executive_summary", 0))
-    include_table_of_contents = int(request.GET.get("include_table_of_contents", 0))
-    include_disclaimer = int(request.GET.get("include_disclaimer", 0)) or (get_system_setting("disclaimer_reports_forced", 0))
+    generate = "_generate" in request.GET
+    add_breadcrumb(title="Generate Report", top_level=False, request=request)
+
+    if generate and report_format == "HTML" and settings.REPORTS_ASYNC and type(obj).__name__ in GENERATED_REPORT_MODELS:
+        # rendered by a celery worker, so none of the findings are loaded here
+        generated_report = request_generated_report(obj, request.GET, user, report_url_resolver(request))
+        if generated_report.status == Generated_Report.SUCCESS:
+            return redirect("generated_report_file", generated_report.id)
+        return redirect("generated_report", generated_report.id)
+
+    report = get_report_data(request.GET, obj, user, report_url_resolver(request), host_view=host_view)
+    findings = report["findings"]
+    report_form = ReportOptionsForm()
+
+    if generate:
+        report_form = ReportOptionsForm(request.GET)
+        if report_format == "HTML":
+            return render(request, report["template"], get_report_html_context(report))
+
+        raise Http404
+    paged_findings = get_page_items(request, findings.qs.distinct().order_by("numerical_severity"), 25)
+
+    product_type = report["product_type"]
+    product = report["product"]
+    engagement = report["engagement"]
+    test = report["test"]
+    endpoint = report["endpoint"]
+    endpoints = report["endpoints"]
+    product_tab = None
+    if engagement:
+        product_tab = Product_Tab(engagement.product, title="Engagement Report", tab="engagements")
+        product_tab.setEngagement(engagement)
+    elif test:
+        product_tab = Product_Tab(test.engagement.product, title="Test Report", tab="engagements")
+        product_tab.setEngagement(test.engagement)
+    elif product:
+        product_tab = Product_Tab(product, title="Product Report", tab="findings")
+    elif endpoints:
+        if host_view:
+            product_tab = Product_Tab(endpoint.product, title="Endpoint Host Report", tab="endpoints")
+        else:
+            product_tab = Product_Tab(endpoint.product, title="Endpoint Report", tab="endpoints")
+
+    return render(request, "dojo/request_report.html",
+                  {"product_type": product_type,
+                   "product": product,
+                   "product_tab": product_tab,
+                   "engagement": engagement,
+                   "test": test,
+                   "endpoint": endpoint,
+                   "findings": findings,
+                   "paged_findings": paged_findings,
+                   "report_form": report_form,
+                   "host_view": host_view,
+                   "context": report["context"],
+                   })
+
+
+def get_report_data(params, obj, user, host, *, host_view=False):
+    """
+    Collects the findings and context of the report of obj, with the options and filters in params.
+    Authorization of the user for obj has to be checked by the caller
+    """
+    product_type = None
+    product = None
+    engagement = None
+    test = None
+    endpoint = None
+    endpoints = None
+    report_title = None
+
+    include_finding_notes = int(params.get("include_finding_notes", 0))
+    include_finding_images = int(params.get("include_finding_images", 0))
+    include_executive_summary = int(params.get("include_executive_summary", 0))
+    include_table_of_contents = int(params.get("include_table_of_contents", 0))
+    include_disclaimer = int(params.get("include_disclaimer", 0)) or (get_system_setting("disclaimer_reports_forced", 0))
     disclaimer = get_system_setting("disclaimer_reports")
 
     if include_disclaimer and len(disclaimer) == 0:
         disclaimer = "Please configure in System Settings."
-    generate = "_generate" in request.GET
     report_name = str(obj)
     filter_string_matching = get_system_setting("filter_string_matching", False)
     report_finding_filter_class = ReportFindingFilterWithoutObjectLookups if filter_string_matching else ReportFindingFilter
-    add_breadcrumb(title="Generate Report", top_level=False, request=request)
     if type(obj).__name__ == "Product_Type":
         product_type = obj
         template = "dojo/product_type_pdf_report.html"
         report_name = "Product Type Report: " + str(product_type)
         report_title = "Product Type Report"
-        findings = report_finding_filter_class(request.GET, prod_type=product_type, queryset=prefetch_related_findings_for_report(Finding.objects.filter(
+        findings = report_finding_filter_class(params, prod_type=product_type, queryset=prefetch_related_findings_for_report(Finding.objects.filter(
             test__engagement__product__prod_type=product_type)))
         products = Product.objects.filter(prod_type=product_type,
                                           engagement__test__finding__in=findings.qs).distinct()
@@ -393,8 +487,10 @@ def generate_report(request, obj, *, host_view=False):
                                                 test__finding__in=findings.qs).distinct()
         tests = Test.objects.filter(engagement__product__prod_type=product_type,
                                     finding__in=findings.qs).distinct()
-        if len(findings.qs) > 0:
-            start_date = timezone.make_aware(datetime.combine(findings.qs.last().date, datetime.min.time()))
+        # only the last finding is needed, not all findings with their prefetched relations
+        last_finding = findings.qs.prefetch_related(None).last()
+        if last_finding is not None:
+            start_date = timezone.make_aware(datetime.combine(last_finding.date, datetime.min.time()))
         else:
             start_date = timezone.now()
 
@@ -427,17 +523,17 @@ def generate_report(request, obj, *, host_view=False):
                    "user": user,
                    "team_name": settings.TEAM_NAME,
                    "title": report_title,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id}
+                   "host": host,
+                   "user_id": user.id}
 
     elif type(obj).__name__ == "Product":
         product = obj
         template = "dojo/product_pdf_report.html"
         report_name = "Product Report: " + str(product)
         report_title = "Product Report"
-        findings = report_finding_filter_class(request.GET, product=product, queryset=prefetch_related_findings_for_report(Finding.objects.filter(
+        findings = report_finding_filter_class(params, product=product, queryset=prefetch_related_findings_for_report(Finding.objects.filter(
             test__engagement__product=product)))
-        ids = set(finding.id for finding in findings.qs)  # noqa: C401
+        ids = findings.qs.values("id")
         engagements = Engagement.objects.filter(test__finding__id__in=ids).distinct()
         tests = Test.objects.filter(finding__id__in=ids).distinct()
         endpoints = Endpoint.objects.filter(product=product).distinct()
@@ -456,19 +552,19 @@ def generate_report(request, obj, *, host_view=False):
                    "team_name": settings.TEAM_NAME,
                    "title": report_title,
                    "endpoints": endpoints,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id}
+                   "host": host,
+                   "user_id": user.id}
 
     elif type(obj).__name__ == "Engagement":
         logger.debug("generating report for Engagement")
         engagement = obj
-        findings = report_finding_filter_class(request.GET, engagement=engagement,
+        findings = report_finding_filter_class(params, engagement=engagement,
                                        queryset=prefetch_related_findings_for_report(Finding.objects.filter(test__engagement=engagement)))
         report_name = "Engagement Report: " + str(engagement)
         template = "dojo/engagement_pdf_report.html"
         report_title = "Engagement Report"
 
-        ids = set(finding.id for finding in findings.qs)  # noqa: C401
+        ids = findings.qs.values("id")
         tests = Test.objects.filter(finding__id__in=ids).distinct()
         endpoints = Endpoint.objects.filter(product=engagement.product).distinct()
 
@@ -485,13 +581,13 @@ def generate_report(request, obj, *, host_view=False):
                    "user": user,
                    "team_name": settings.TEAM_NAME,
                    "title": report_title,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id,
+                   "host": host,
+                   "user_id": user.id,
                    "endpoints": endpoints}
 
     elif type(obj).__name__ == "Test":
         test = obj
-        findings = report_finding_filter_class(request.GET, engagement=test.engagement,
+        findings = report_finding_filter_class(params, engagement=test.engagement,
                                        queryset=prefetch_related_findings_for_report(Finding.objects.filter(test=test)))
         template = "dojo/test_pdf_report.html"
         report_name = "Test Report: " + str(test)
@@ -509,8 +605,8 @@ def generate_report(request, obj, *, host_view=False):
                    "user": user,
                    "team_name": settings.TEAM_NAME,
                    "title": report_title,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id}
+                   "host": host,
+                   "user_id": user.id}
 
     elif type(obj).__name__ == "Endpoint":
         endpoint = obj
@@ -524,7 +620,7 @@ def generate_report(request, obj, *, host_view=False):
             endpoints = Endpoint.objects.filter(pk=endpoint.id).distinct()
             report_title = "Endpoint Report"
         template = "dojo/endpoint_pdf_report.html"
-        findings = report_finding_filter_class(request.GET,
+        findings = report_finding_filter_class(params,
                                        queryset=prefetch_related_findings_for_report(Finding.objects.filter(endpoints__in=endpoints)))
 
         context = {"endpoint": endpoint,
@@ -540,10 +636,10 @@ def generate_report(request, obj, *, host_view=False):
                    "user": user,
                    "team_name": get_system_setting("team_name"),
                    "title": report_title,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id}
+                   "host": host,
+                   "user_id": user.id}
     elif type(obj).__name__ in {"QuerySet", "CastTaggedQuerySet", "TagulousCastTaggedQuerySet"}:
-        findings = report_finding_filter_class(request.GET, queryset=prefetch_related_findings_for_report(obj).distinct())
+        findings = report_finding_filter_class(params, queryset=prefetch_related_findings_for_report(obj).distinct())
         report_name = "Finding"
         template = "dojo/finding_pdf_report.html"
         report_title = "Finding Report"
@@ -559,72 +655,50 @@ def generate_report(request, obj, *, host_view=False):
                    "user": user,
                    "team_name": settings.TEAM_NAME,
                    "title": report_title,
-                   "host": report_url_resolver(request),
-                   "user_id": request.user.id}
+                   "host": host,
+                   "user_id": user.id}
     else:
         raise Http404
 
-    report_form = ReportOptionsForm()
-
-    if generate:
-        report_form = ReportOptionsForm(request.GET)
-        if report_format == "HTML":
-            return render(request,
-                          template,
-                          {"product_type": product_type,
-                           "product": product,
-                           "engagement": engagement,
-                           "report_name": report_name,
-                           "test": test,
-                           "endpoint": endpoint,
-                           "endpoints": endpoints,
-                           "findings": findings.qs.distinct().order_by("numerical_severity"),
-                           "include_finding_notes": include_finding_notes,
-                           "include_finding_images": include_finding_images,
-                           "include_executive_summary": include_executive_summary,
-                           "include_table_of_contents": include_table_of_contents,
-                           "include_disclaimer": include_disclaimer,
-                           "disclaimer": disclaimer,
-                           "user": user,
-                           "team_name": settings.TEAM_NAME,
-                           "title": report_title,
-                           "user_id": request.user.id,
-                           "host": "",
-                           "host_view": host_view,
-                           "context": context,
-                           })
-
-        raise Http404
-    paged_findings = get_page_items(request, findings.qs.distinct().order_by("numerical_severity"), 25)
-
-    product_tab = None
-    if engagement:
-        product_tab = Product_Tab(engagement.product, title="Engagement Report", tab="engagements")
-        product_tab.setEngagement(engagement)
-    elif test:
-        product_tab = Product_Tab(test.engagement.product, title="Test Report", tab="engagements")
-        product_tab.setEngagement(test.engagement)
-    elif product:
-        product_tab = Product_Tab(product, title="Product Report", tab="findings")
-    elif endpoints:
-        if host_view:
-            product_tab = Product_Tab(endpoint.product, title="Endpoint Host Report", tab="endpoints")
-        else:
-            product_tab = Product_Tab(endpoint.product, title="Endpoint Report", tab="endpoints")
-
-    return render(request, "dojo/request_report.html",
-                  {"product_type": product_type,
-                   "product": product,
-                   "product_tab": product_tab,
-                   "engagement": engagement,
-                   "test": test,
-                   "endpoint": endpoint,
-                   "findings": findings,
-                   "paged_findings": paged_findings,
-                   "report_form": report_form,
-                   "host_view": host_view,
-                   "context": context,
-                   })
+    return {"product_type": product_type,
+            "product": product,
+            "engagement": engagement,
+            "test": test,
+            "endpoint": endpoint,
+            "endpoints": endpoints,
+            "report_name": report_name,
+            "report_title": report_title,
+            "template": template,
+            "findings": findings,
+            "host_view": host_view,
+            "context": context}
+
+
+def get_report_html_context(report):
+    """Returns the context for rendering the template of a report collected by get_report_data"""
+    context = report["context"]
+    return {"product_type": report["product_type"],
+            "product": report["product"],
+            "engagement": report["engagement"],
+            "report_name": report["report_name"],
+            "test": report["test"],
+            "endpoint": report["endpoint"],
+            "endpoints": report["endpoints"],
+            "findings": report["findings"].qs.distinct().order_by("numerical_severity"),
+            "include_finding_notes": context["include_finding_notes"],
+            "include_finding_images": context["include_finding_images"],
+            "include_executive_summary": context["include_executive_summary"],
+            "include_table_of_contents": context["include_table_of_contents"],
+            "include_disclaimer": context["include_disclaimer"],
+            "disclaimer": context["disclaimer"],
+            "user": context["user"],
+            "team_name": settings.TEAM_NAME,
+            "title": report["report_title"],
+            "user_id": context["user_id"],
+            "host": "",
+            "host_view": report["host_view"],
+            "context": context,
+            }
 
 
 def prefetch_related_findings_for_report(findings):
@@ -797,6 +871,106 @@ def get_attributes():
     return ["sla_age", "sla_deadline", "sla_days_remaining"]
 
 
+def get_export_columns(finding):
+    """
+    Works out the attribute columns of a findings export once, from the first finding. Returns a list of
+    (column name, function) tuples, where the function returns the value of the column for a finding.
+    The values are the same as when all attributes of every finding are inspected, but only the
+    attributes that end up in the export are evaluated
+    """
+    allowed_attributes = get_attributes()
+    excludes_list = get_excludes()
+    allowed_foreign_keys = get_foreign_keys()
+
+    def get_value(finding, key):
+        return finding.__dict__.get(key)
+
+    def get_cached_property_value(finding, key):
+        return getattr(finding, key)
+
+    def get_method_value(finding, key):
+        return getattr(finding, key)()
+
+    def get_related_value(finding, key):
+        value = getattr(finding, key)
+        return str(value) if value else finding.__dict__.get(key)
+
+    columns = []
+    for key in dir(finding):
+        if key in excludes_list or key.startswith("_"):
+            continue
+        try:
+            is_callable = callable(getattr(finding, key))
+        except Exception as exc:
+            logger.error("Error in attribute: " + str(exc))
+            columns.append((key, None))
+            continue
+        if is_callable and key not in allowed_attributes:
+            continue
+        if is_callable:
+            get_column_value = get_method_value
+        elif key in allowed_foreign_keys or key in allowed_attributes:
+            get_column_value = get_related_value
+        elif isinstance(getattr(type(finding), key, None), cached_property):
+            get_column_value = get_cached_property_value
+        else:
+            # fields and annotations, other properties are never exported
+            get_column_value = get_value
+        columns.append((key, get_column_value))
+    return columns
+
+
+def get_export_column_value(finding, key, get_column_value):
+    if get_column_value is None:
+        # the attribute could not be read for the first finding either
+        msg = f"attribute {key} is not supported"
+        raise ValueError(msg)
+    return get_column_value(finding, key)
+
+
+def iterate_findings_for_export(findings):
+    """
+    Yields the findings in the order of the queryset. The ids are read upfront, after which the findings are
+    loaded with their related objects one chunk at a time, so that the export never holds all findings in memory
+    """
+    if not isinstance(findings, QuerySet):
+        yield from findings
+        return
+    finding_ids = list(dict.fromkeys(findings.values_list("id", flat=True)))
+    for offset in range(0, len(finding_ids), EXPORT_CHUNK_SIZE):
+        chunk_ids = finding_ids[offset:offset + EXPORT_CHUNK_SIZE]
+        chunk = findings.filter(id__in=chunk_ids).select_related(
+            "test__test_type",
+            "test__engagement__product",
+            "reporter",
+            "mitigated_by",
+            "last_reviewed_by",
+            "review_requested_by",
+            "defect_review_requested_by",
+            "duplicate_finding",
+            "sonarqube_issue",
+        ).prefetch_related(
+            "endpoints",
+            "vulnerability_id_set",
+            "tags",
+            "finding_group_set",
+        )
+        chunk_findings = {finding.id: finding for finding in chunk}
+        for finding_id in chunk_ids:
+            finding = chunk_findings[finding_id]
+            # Same as Finding.finding_group, but from the prefetched groups
+            finding.finding_group = min(finding.finding_group_set.all(), key=lambda group: group.id, default=None)
+            yield finding
+
+
+class Echo:
+
+    """An object that implements just the write method of the file-like interface, for streaming csv rows"""
+
+    def write(self, value):
+        return value
+
+
 class CSVExportView(View):
     def add_findings_data(self):
         return self.findings
@@ -811,29 +985,19 @@ class CSVExportView(View):
         findings, _obj = get_findings(request)
         self.findings = findings
         findings = self.add_findings_data()
-        response = HttpResponse(content_type="text/csv")
+        response = StreamingHttpResponse(self.get_rows(findings), content_type="text/csv")
         response["Content-Disposition"] = "attachment; filename=findings.csv"
-        writer = csv.writer(response)
-        allowed_attributes = get_attributes()
-        excludes_list = get_excludes()
-        allowed_foreign_keys = get_foreign_keys()
-        first_row = True
+        return response
+
+    def get_rows(self, findings):
+        writer = csv.writer(Echo())
+        columns = None
 
-        for finding in findings:
+        for finding in iterate_findings_for_export(findings):
             self.finding = finding
-            if first_row:
-                fields = []
-                self.fields = fields
-                for key in dir(finding):
-                    try:
-                        if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith("_"):
-                            if callable(getattr(finding, key)) and key not in allowed_attributes:
-                                continue
-                            fields.append(key)
-                    except Exception as exc:
-                        logger.error("Error in attribute: " + str(exc))
-                        fields.append(key)
-                        continue
+            if columns is None:
+                columns = get_export_columns(finding)
+                fields = [key for key, _ in columns]
                 fields.extend((
                     "test",
                     "found_by",
@@ -848,76 +1012,68 @@ class CSVExportView(View):
                 self.fields = fields
                 self.add_extra_headers()
 
-                writer.writerow(fields)
-
-                first_row = False
-            if not first_row:
-                fields = []
-                for key in dir(finding):
-                    try:
-                        if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith("_"):
-                            if not callable(getattr(finding, key)):
-                                value = finding.__dict__.get(key)
-                            if (key in allowed_foreign_keys or key in allowed_attributes) and getattr(finding, key):
-                                if callable(getattr(finding, key)):
-                                    func = getattr(finding, key)
-                                    result = func()
-                                    value = result
-                                else:
-                                    value = str(getattr(finding, key))
-                            if value and isinstance(value, str):
-                                value = value.replace("\n", " NEWLINE ").replace("\r", "")
-                            fields.append(value)
-                    except Exception as exc:
-                        logger.error("Error in attribute: " + str(exc))
-                        fields.append("Value not supported")
-                        continue
-                fields.append(finding.test.title)
-                fields.append(finding.test.test_type.name)
-                fields.append(finding.test.engagement.id)
-                fields.append(finding.test.engagement.name)
-                fields.append(finding.test.engagement.product.id)
-                fields.append(finding.test.engagement.product.name)
-
-                endpoint_value = ""
-                for endpoint in finding.endpoints.all():
-                    endpoint_value += f"{endpoint}; "
-                endpoint_value = endpoint_value.removesuffix("; ")
-                if len(endpoint_value) > EXCEL_CHAR_LIMIT:
-                    endpoint_value = endpoint_value[:EXCEL_CHAR_LIMIT - 3] + "..."
-                fields.append(endpoint_value)
-
-                vulnerability_ids_value = ""
-                for num_vulnerability_ids, vulnerability_id in enumerate(finding.vulnerability_ids):
-                    if num_vulnerability_ids > 5:
-                        vulnerability_ids_value += "..."
-                        break
-                    vulnerability_ids_value += f"{vulnerability_id}; "
-                if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
-                    vulnerability_ids_value += finding.cve
-                vulnerability_ids_value = vulnerability_ids_value.removesuffix("; ")
-                fields.append(vulnerability_ids_value)
-                # Tags
-                tags_value = ""
-                for num_tags, tag in enumerate(finding.tags.all()):
-                    if num_tags > 5:
-                        tags_value += "..."
-                        break
-                    tags_value += f"{tag}; "
-                tags_value = tags_value.removesuffix("; ")
-                fields.append(tags_value)
-
-                self.fields = fields
-                self.finding = finding
-                self.add_extra_values()
-
-                writer.writerow(fields)
+                yield writer.writerow(fields)
+
+            fields = []
+            for key, get_column_value in columns:
+                try:
+                    value = get_export_column_value(finding, key, get_column_value)
+                    if value and isinstance(value, str):
+                        value = value.replace("\n", " NEWLINE ").replace("\r", "")
+                    fields.append(value)
+                except Exception as exc:
+                    logger.error("Error in attribute: " + str(exc))
+                    fields.append("Value not supported")
+                    continue
+            fields.append(finding.test.title)
+            fields.append(finding.test.test_type.name)
+            fields.append(finding.test.engagement.id)
+            fields.append(finding.test.engagement.name)
+            fields.append(finding.test.engagement.product.id)
+            fields.append(finding.test.engagement.product.name)
+
+            endpoint_value = ""
+            for endpoint in finding.endpoints.all():
+                endpoint_value += f"{endpoint}; "
+            endpoint_value = endpoint_value.removesuffix("; ")
+            if len(endpoint_value) > EXCEL_CHAR_LIMIT:
+                endpoint_value = endpoint_value[:EXCEL_CHAR_LIMIT - 3] + "..."
+            fields.append(endpoint_value)
+
+            vulnerability_ids_value = ""
+            for num_vulnerability_ids, vulnerability_id in enumerate(finding.vulnerability_ids):
+                if num_vulnerability_ids > 5:
+                    vulnerability_ids_value += "..."
+                    break
+                vulnerability_ids_value += f"{vulnerability_id}; "
+            if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
+                vulnerability_ids_value += finding.cve
+            vulnerability_ids_value = vulnerability_ids_value.removesuffix("; ")
+            fields.append(vulnerability_ids_value)
+            # Tags
+            tags_value = ""
+            for num_tags, tag in enumerate(finding.tags.all()):
+                if num_tags > 5:
+                    tags_value += "..."
+                    break
+                tags_value += f"{tag}; "
+            tags_value = tags_value.removesuffix("; ")
+            fields.append(tags_value)
+
+            self.fields = fields
+            self.finding = finding
+            self.add_extra_values()
 
-        return response
+            yield writer.writerow(fields)
 
 
 class ExcelExportView(View):
 
+    """
+    The workbook is written in write-only mode, so rows can only be appended. Extensions add their
+    headers and values to self.fields, which holds the row that is about to be appended
+    """
+
     def add_findings_data(self):
         return self.findings
 
@@ -931,139 +1087,100 @@ class ExcelExportView(View):
         findings, _obj = get_findings(request)
         self.findings = findings
         findings = self.add_findings_data()
-        workbook = Workbook()
+        workbook = Workbook(write_only=True)
         workbook.iso_dates = True
-        worksheet = workbook.active
-        worksheet.title = "Findings"
+        worksheet = workbook.create_sheet("Findings")
         self.worksheet = worksheet
         font_bold = Font(bold=True)
         self.font_bold = font_bold
-        allowed_attributes = get_attributes()
-        excludes_list = get_excludes()
-        allowed_foreign_keys = get_foreign_keys()
+        columns = None
 
         row_num = 1
-        for finding in findings:
+        for finding in iterate_findings_for_export(findings):
             logger.debug(f"processing finding: {finding.id}")
-            if row_num == 1:
-                col_num = 1
-                for key in dir(finding):
-                    try:
-                        if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith("_"):
-                            if callable(getattr(finding, key)) and key not in allowed_attributes:
-                                continue
-                            cell = worksheet.cell(row=row_num, column=col_num, value=key)
-                            cell.font = font_bold
-                            col_num += 1
-                    except Exception as exc:
-                        logger.warning(f"Error in attribute: {key}" + str(exc))
-                        cell = worksheet.cell(row=row_num, column=col_num, value=key)
-                        col_num += 1
-                        continue
-                cell = worksheet.cell(row=row_num, column=col_num, value="found_by")
-                cell.font = font_bold
-                col_num += 1
-                worksheet.cell(row=row_num, column=col_num, value="engagement_id")
-                cell = cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="engagement")
-                cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="product_id")
-                cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="product")
-                cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="endpoints")
-                cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="vulnerability_ids")
-                cell.font = font_bold
-                col_num += 1
-                cell = worksheet.cell(row=row_num, column=col_num, value="tags")
-                cell.font = font_bold
-                col_num += 1
+            if columns is None:
+                columns = get_export_columns(finding)
+                fields = [key for key, _ in columns]
+                fields.extend((
+                    "found_by",
+                    "engagement_id",
+                    "engagement",
+                    "product_id",
+                    "product",
+                    "endpoints",
+                    "vulnerability_ids",
+                    "tags",
+                ))
+                self.fields = fields
                 self.row_num = row_num
-                self.col_num = col_num
+                self.col_num = len(fields) + 1
                 self.add_extra_headers()
+                worksheet.append([self.bold_cell(value) for value in self.fields])
 
                 row_num = 2
-            if row_num > 1:
-                col_num = 1
-                for key in dir(finding):
-                    try:
-                        if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith("_"):
-                            if not callable(getattr(finding, key)):
-                                value = finding.__dict__.get(key)
-                            if (key in allowed_foreign_keys or key in allowed_attributes) and getattr(finding, key):
-                                if callable(getattr(finding, key)):
-                                    func = getattr(finding, key)
-                                    result = func()
-                                    value = result
-                                else:
-                                    value = str(getattr(finding, key))
-                            if value and isinstance(value, datetime):
-                                value = value.replace(tzinfo=None)
-                            worksheet.cell(row=row_num, column=col_num, value=value)
-                            col_num += 1
-                    except Exception as exc:
-                        logger.warning(f"Error in attribute: {key}" + str(exc))
-                        worksheet.cell(row=row_num, column=col_num, value="Value not supported")
-                        col_num += 1
-                        continue
-                worksheet.cell(row=row_num, column=col_num, value=finding.test.test_type.name)
-                col_num += 1
-                worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.id)
-                col_num += 1
-                worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.name)
-                col_num += 1
-                worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.product.id)
-                col_num += 1
-                worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.product.name)
-                col_num += 1
-
-                endpoint_value = ""
-                for endpoint in finding.endpoints.all():
-                    endpoint_value += f"{endpoint}; \n"
-                endpoint_value = endpoint_value.removesuffix("; \n")
-                if len(endpoint_value) > EXCEL_CHAR_LIMIT:
-                    endpoint_value = endpoint_value[:EXCEL_CHAR_LIMIT - 3] + "..."
-                worksheet.cell(row=row_num, column=col_num, value=endpoint_value)
-                col_num += 1
-
-                vulnerability_ids_value = ""
-                for num_vulnerability_ids, vulnerability_id in enumerate(finding.vulnerability_ids):
-                    if num_vulnerability_ids > 5:
-                        vulnerability_ids_value += "..."
-                        break
-                    vulnerability_ids_value += f"{vulnerability_id}; \n"
-                if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
-                    vulnerability_ids_value += finding.cve
-                vulnerability_ids_value = vulnerability_ids_value.removesuffix("; \n")
-                worksheet.cell(row=row_num, column=col_num, value=vulnerability_ids_value)
-                col_num += 1
-                # tags
-                tags_value = ""
-                for tag in finding.tags.all():
-                    tags_value += f"{tag}; \n"
-                tags_value = tags_value.removesuffix("; \n")
-                worksheet.cell(row=row_num, column=col_num, value=tags_value)
-                col_num += 1
-                self.col_num = col_num
-                self.row_num = row_num
-                self.finding = finding
-                self.add_extra_values()
+
+            fields = []
+            for key, get_column_value in columns:
+                try:
+                    value = get_export_column_value(finding, key, get_column_value)
+                    if value and isinstance(value, datetime):
+                        value = value.replace(tzinfo=None)
+                    fields.append(value)
+                except Exception as exc:
+                    logger.warning(f"Error in attribute: {key}" + str(exc))
+                    fields.append("Value not supported")
+                    continue
+            fields.append(finding.test.test_type.name)
+            fields.append(finding.test.engagement.id)
+            fields.append(finding.test.engagement.name)
+            fields.append(finding.test.engagement.product.id)
+            fields.append(finding.test.engagement.product.name)
+
+            endpoint_value = ""
+            for endpoint in finding.endpoints.all():
+                endpoint_value += f"{endpoint}; \n"
+            endpoint_value = endpoint_value.removesuffix("; \n")
+            if len(endpoint_value) > EXCEL_CHAR_LIMIT:
+                endpoint_value = endpoint_value[:EXCEL_CHAR_LIMIT - 3] + "..."
+            fields.append(endpoint_value)
+
+            vulnerability_ids_value = ""
+            for num_vulnerability_ids, vulnerability_id in enumerate(finding.vulnerability_ids):
+                if num_vulnerability_ids > 5:
+                    vulnerability_ids_value += "..."
+                    break
+                vulnerability_ids_value += f"{vulnerability_id}; \n"
+            if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
+                vulnerability_ids_value += finding.cve
+            vulnerability_ids_value = vulnerability_ids_value.removesuffix("; \n")
+            fields.append(vulnerability_ids_value)
+            # tags
+            tags_value = ""
+            for tag in finding.tags.all():
+                tags_value += f"{tag}; \n"
+            tags_value = tags_value.removesuffix("; \n")
+            fields.append(tags_value)
+            self.fields = fields
+            self.col_num = len(fields) + 1
+            self.row_num = row_num
+            self.finding = finding
+            self.add_extra_values()
+            worksheet.append(self.fields)
             row_num += 1
 
-        with NamedTemporaryFile() as tmp:
-            workbook.save(tmp.name)
-            tmp.seek(0)
-            stream = tmp.read()
+        # The temporary file is removed once the response has been sent and the file is closed
+        tmp = NamedTemporaryFile()
+        workbook.save(tmp)
+        tmp.seek(0)
 
-        response = HttpResponse(
-            content=stream,
+        response = FileResponse(
+            tmp,
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
         response["Content-Disposition"] = "attachment; filename=findings.xlsx"
         return response
+
+    def bold_cell(self, value):
+        cell = WriteOnlyCell(self.worksheet, value=value)
+        cell.font = self.font_bold
+        return cell
@@ -0,0 +1,95 @@
+import logging
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from watson import search as watson
+
+from dojo.search.indexes import SEARCH_CONFIG, get_field_search_vector, get_search_vector, search_related_fields
+
+logger = logging.getLogger(__name__)
+
+word_pattern = re.compile(r"^\w+$")
+
+
+class WatsonSearchBackend:
+
+    """Searches the django-watson index, which keeps an entry with the text of each registered object"""
+
+    name = "watson"
+
+    def filter(self, qs, keywords_query, limit=None):
+        # watson is too slow to get all results or even to count them
+        # counting also results in invalid queries with group by errors
+        watson_results = watson.filter(qs, keywords_query)
+        if limit:
+            watson_results = watson_results[:limit]
+        return qs.filter(id__in=[watson.id for watson in watson_results])
+
+    def search(self, keywords_query, querysets, limit):
+        return watson.search(keywords_query, models=tuple(querysets)).prefetch_related("object")[:limit]
+
+
+class PostgresSearchBackend:
+
+    """
+    Searches the full-text GIN indexes of the models, as part of the query for the authorized objects, and orders
+    the results by rank unless they are ordered otherwise. There is no search across all models. The indexes are
+    created by the search_indexes command, see dojo.search.indexes for the fields.
+    """
+
+    name = "postgres"
+
+    def get_search_query(self, keywords_query):
+        search_query = None
+        for quoted_keyword in keywords_query.split():
+            # vulnerability ids come quoted for watson, see vulnerability_id_fix
+            keyword = quoted_keyword.strip("'\"")
+            if word_pattern.match(keyword):
+                # words also match the words they are the start of, just like with watson
+                keyword_query = SearchQuery(f"{keyword}:*", search_type="raw", config=SEARCH_CONFIG)
+            elif keyword:
+                # hyphenated ids and paths are split into words by PostgreSQL, in the same way as when indexing
+                keyword_query = SearchQuery(keyword, search_type="phrase", config=SEARCH_CONFIG)
+            else:
+                continue
+            search_query = keyword_query if search_query is None else search_query & keyword_query
+        return search_query
+
+    def get_related_matches(self, model, related_field, search_query):
+        """Returns the ids of the objects whose related object has all the words in the field"""
+        relation, _, field = related_field.partition("__")
+        model_field = model._meta.get_field(relation)
+        related_objects = model_field.related_model.objects.alias(related_search_vector=get_field_search_vector(field)) \
+            .filter(related_search_vector=search_query)
+        if model_field.concrete:
+            return model.objects.filter(**{f"{model_field.attname}__in": related_objects.values("pk")}).order_by().values("pk")
+        return related_objects.order_by().values(model_field.field.attname)
+
+    def filter(self, qs, keywords_query, limit=None):
+        search_vector = get_search_vector(qs.model)
+        search_query = self.get_search_query(keywords_query)
+        if search_query is None:
+            return qs.none()
+        related_fields = search_related_fields.get(qs.model._meta.model_name, ())
+        if related_fields:
+            # a union rather than OR conditions, which would keep PostgreSQL from using the search index
+            matches = qs.model.objects.alias(search_vector=search_vector).filter(search_vector=search_query).order_by().values("pk")
+            matches = matches.union(*(self.get_related_matches(qs.model, related_field, search_query) for related_field in related_fields))
+            qs = qs.alias(search_vector=search_vector).filter(pk__in=matches)
+        else:
+            qs = qs.alias(search_vector=search_vector).filter(search_vector=search_query)
+        if not qs.query.order_by:
+            qs = qs.alias(search_rank=SearchRank(search_vector, search_query)).order_by("-search_rank", "-id")
+        # the results are not limited, the index makes counting and paging through all of them cheap
+        return qs
+
+    def search(self, keywords_query, querysets, limit):
+        return None
+
+
+search_backends = {backend.name: backend for backend in (WatsonSearchBackend, PostgresSearchBackend)}
+
+
+def get_search_backend():
+    return search_backends[settings.SEARCH_BACKEND]()
@@ -0,0 +1,117 @@
+import logging
+
+from django.apps import apps as django_apps
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db.models.functions import Left
+
+logger = logging.getLogger(__name__)
+
+# The search vectors of the full-text search are built without stemming or stop words, as most searches are
+# for identifiers, component names and vulnerability ids rather than for natural language
+SEARCH_CONFIG = "simple"
+# Only the start of long texts is indexed, the tsvector of a whole scan output could exceed the maximum size
+SEARCH_FIELD_MAX_LENGTH = 100000
+
+# The text fields watson indexes for each model, see register_watson_models, weighted from A to D for the ranking
+search_fields = {
+    "product": (
+        ("name", "A"), ("description", "C"), ("business_criticality", "D"), ("platform", "D"), ("lifecycle", "D"),
+        ("origin", "D"),
+    ),
+    "engagement": (
+        ("name", "A"), ("version", "B"), ("branch_tag", "B"), ("build_id", "B"), ("commit_hash", "B"),
+        ("description", "C"), ("reason", "D"), ("tracker", "D"), ("test_strategy", "D"), ("status", "D"), ("progress", "D"),
+        ("tmodel_path", "D"), ("engagement_type", "D"), ("source_code_management_uri", "D"),
+    ),
+    "test": (
+        ("title", "A"), ("version", "B"), ("branch_tag", "B"), ("build_id", "B"), ("commit_hash", "B"),
+        ("description", "C"), ("scan_type", "D"),
+    ),
+    "finding": (
+        ("title", "A"), ("vuln_id_from_tool", "A"), ("cve", "A"), ("component_name", "B"), ("component_version", "B"),
+        ("file_path", "B"), ("unique_id_from_tool", "B"), ("url", "B"), ("service", "B"), ("hash_code", "B"),
+        ("description", "C"), ("mitigation", "D"), ("impact", "D"), ("steps_to_reproduce", "D"),
+        ("severity_justification", "D"), ("references", "D"), ("param", "D"), ("payload", "D"),
+        ("sast_source_object", "D"), ("sast_sink_object", "D"), ("sast_source_file_path", "D"),
+        ("planned_remediation_version", "D"), ("effort_for_fixing", "D"), ("cvssv3", "D"), ("severity", "D"),
+        ("numerical_severity", "D"),
+    ),
+    "finding_template": (
+        ("title", "A"), ("cve", "A"), ("description", "C"), ("mitigation", "D"), ("impact", "D"), ("references", "D"),
+        ("cvssv3", "D"), ("severity", "D"), ("numerical_severity", "D"),
+    ),
+    "vulnerability_id": (
+        ("vulnerability_id", "A"),
+    ),
+}
+
+# The fields of related objects watson indexes along with each model. They cannot be part of an index on the table of
+# the model, so the objects match when all the words are in one of these fields, but not when some of the words are
+# in the related field and the others in the fields of the object itself.
+search_related_fields = {
+    "product": ("prod_type__name",),
+    "engagement": ("product__name",),
+    "test": ("engagement__product__name",),
+    "finding": ("test__engagement__product__name", "jira_issue__jira_key"),
+}
+
+
+def get_field_search_vector(field, weight=None):
+    return SearchVector(Left(field, SEARCH_FIELD_MAX_LENGTH), weight=weight, config=SEARCH_CONFIG)
+
+
+def get_search_vector(model):
+    """
+    Returns the full-text search vector of the fields of the model, or None when the model is not searched. The
+    search index is built on the very same expression, so that the PostgreSQL search backend uses it.
+    """
+    search_vector = None
+    for field, weight in search_fields.get(model._meta.model_name, ()):
+        field_vector = get_field_search_vector(field, weight)
+        search_vector = field_vector if search_vector is None else search_vector + field_vector
+    return search_vector
+
+
+def get_search_indexes(apps=django_apps):
+    """
+    Returns the models with the GIN indexes on their search vectors, and on the vectors of the related fields the
+    search also matches
+    """
+    search_indexes = {}
+    for model_name in search_fields:
+        model = apps.get_model("dojo", model_name)
+        search_indexes[f"{model_name}_search_idx"] = (model, GinIndex(get_search_vector(model), name=f"{model_name}_search_idx"))
+        for related_field in search_related_fields.get(model_name, ()):
+            *relations, field = related_field.split("__")
+            related_model = model
+            for relation in relations:
+                related_model = related_model._meta.get_field(relation).related_model
+            name = f"{related_model._meta.model_name}_{field}_search_idx"
+            search_indexes[name] = (related_model, GinIndex(get_field_search_vector(field), name=name))
+    return list(search_indexes.values())
+
+
+def get_existing_index_names(schema_editor, model):
+    with schema_editor.connection.cursor() as cursor:
+        return set(schema_editor.connection.introspection.get_constraints(cursor, model._meta.db_table))
+
+
+def create_search_indexes(apps=django_apps, schema_editor=None, *, recreate=False):
+    """
+    Creates the full-text search indexes the PostgreSQL search backend uses, without locking the tables for writes.
+    The indexes are only needed by that backend, so they are not part of the models.
+    """
+    for model, index in get_search_indexes(apps):
+        exists = index.name in get_existing_index_names(schema_editor, model)
+        if exists and recreate:
+            schema_editor.remove_index(model, index, concurrently=True)
+        if not exists or recreate:
+            logger.info("creating the search index %s, this can take a while for large tables", index.name)
+            schema_editor.add_index(model, index, concurrently=True)
+
+
+def drop_search_indexes(apps=django_apps, schema_editor=None):
+    for model, index in get_search_indexes(apps):
+        if index.name in get_existing_index_names(schema_editor, model):
+            schema_editor.remove_index(model, index, concurrently=True)
@@ -7,7 +7,6 @@ from django.conf import settings
 from django.db.models import Q
 from django.shortcuts import render
 from django.utils.translation import gettext as _
-from watson import search as watson
 
 from dojo.authorization.roles_permissions import Permissions
 from dojo.endpoint.queries import get_authorized_endpoints
@@ -19,6 +18,7 @@ from dojo.finding.views import prefetch_for_findings
 from dojo.forms import SimpleSearchForm
 from dojo.models import Engagement, Finding, Finding_Template, Languages, Product, Test
 from dojo.product.queries import get_authorized_app_analysis, get_authorized_products
+from dojo.search.backends import get_search_backend
 from dojo.test.queries import get_authorized_tests
 from dojo.utils import add_breadcrumb, get_page_items, get_system_setting, get_words_for_field
 
@@ -232,9 +232,7 @@ def simple_search(request):
                 finding_templates = authorized_finding_templates
                 finding_templates = apply_tag_filters(finding_templates, operators)
 
-                if keywords_query:
-                    watson_results = watson.filter(finding_templates, keywords_query)
-                    finding_templates = finding_templates.filter(id__in=[watson.id for watson in watson_results])
+                finding_templates = perform_keyword_search_for_operator(finding_templates, operators, "template", keywords_query)
 
                 finding_templates = finding_templates[:max_results]
             else:
@@ -246,9 +244,7 @@ def simple_search(request):
                 tests = authorized_tests
                 tests = apply_tag_filters(tests, operators)
 
-                if keywords_query:
-                    watson_results = watson.filter(tests, keywords_query)
-                    tests = tests.filter(id__in=[watson.id for watson in watson_results])
+                tests = perform_keyword_search_for_operator(tests, operators, "test", keywords_query)
 
                 tests = tests.prefetch_related("engagement", "engagement__product", "test_type", "tags", "engagement__tags", "engagement__product__tags")
                 tests = tests[:max_results]
@@ -261,9 +257,7 @@ def simple_search(request):
                 engagements = authorized_engagements
                 engagements = apply_tag_filters(engagements, operators)
 
-                if keywords_query:
-                    watson_results = watson.filter(engagements, keywords_query)
-                    engagements = engagements.filter(id__in=[watson.id for watson in watson_results])
+                engagements = perform_keyword_search_for_operator(engagements, operators, "engagement", keywords_query)
 
                 engagements = engagements.prefetch_related("product", "product__tags", "tags")
                 engagements = engagements[:max_results]
@@ -276,9 +270,7 @@ def simple_search(request):
                 products = authorized_products
                 products = apply_tag_filters(products, operators)
 
-                if keywords_query:
-                    watson_results = watson.filter(products, keywords_query)
-                    products = products.filter(id__in=[watson.id for watson in watson_results])
+                products = perform_keyword_search_for_operator(products, operators, "product", keywords_query)
 
                 products = products.prefetch_related("tags")
                 products = products[:max_results]
@@ -321,8 +313,7 @@ def simple_search(request):
                 vulnerability_ids = authorized_vulnerability_ids
                 vulnerability_ids = apply_vulnerability_id_filter(vulnerability_ids, operators)
                 if keywords_query:
-                    watson_results = watson.filter(vulnerability_ids, keywords_query)
-                    vulnerability_ids = vulnerability_ids.filter(id__in=[watson.id for watson in watson_results])
+                    vulnerability_ids = get_search_backend().filter(vulnerability_ids, keywords_query)
                 vulnerability_ids = vulnerability_ids.prefetch_related("finding__test__engagement__product", "finding__test__engagement__product__tags")
                 vulnerability_ids = vulnerability_ids[:max_results]
             else:
@@ -331,11 +322,10 @@ def simple_search(request):
             if keywords_query:
                 logger.debug("searching generic")
                 logger.debug("going generic with: %s", keywords_query)
-                generic = watson.search(keywords_query, models=(
+                generic = get_search_backend().search(keywords_query, (
                     authorized_findings, authorized_tests, authorized_engagements,
                     authorized_products, authorized_endpoints,
-                    authorized_finding_templates, authorized_vulnerability_ids, authorized_app_analysis)) \
-                    .prefetch_related("object")[:max_results]
+                    authorized_finding_templates, authorized_vulnerability_ids, authorized_app_analysis), max_results)
             else:
                 generic = None
 
@@ -538,22 +528,18 @@ def apply_vulnerability_id_filter(qs, operators):
 
 
 def perform_keyword_search_for_operator(qs, operators, operator, keywords_query):
-    watson_results = None
     operator_query = ""
     keywords_query = keywords_query or ""
 
     if operator in operators:
         operator_query = " ".join(operators[operator])
 
-    keywords_query = operator_query + keywords_query
+    keywords_query = operator_query + " " + keywords_query
     keywords_query = keywords_query.strip()
 
     if keywords_query:
-        logger.debug("going watson with: %s", keywords_query)
-        # watson is too slow to get all results or even to count them
-        # counting also results in invalid queries with group by errors
-        watson_results = watson.filter(qs, keywords_query)[:max_results]
-        # watson_results = watson.filter(qs, keywords_query)
-        qs = qs.filter(id__in=[watson.id for watson in watson_results])
+        search_backend = get_search_backend()
+        logger.debug("going %s with: %s", search_backend.name, keywords_query)
+        qs = search_backend.filter(qs, keywords_query, limit=max_results)
 
     return qs
@@ -221,6 +221,14 @@ env = environ.FileAwareEnv(
     DD_SLA_NOTIFY_POST_BREACH=(int, 7),
     # maximum number of result in search as search can be an expensive operation
     DD_SEARCH_MAX_RESULTS=(int, 100),
+    # The index the simple search uses: 'watson' keeps a django-watson search entry for each object, 'postgres' uses the
+    # full-text (tsvector/GIN) indexes of the findings, tests, engagements, products, templates and vulnerability ids,
+    # which PostgreSQL keeps current by itself. These indexes are only created by the migrations when 'postgres' is
+    # already set, run './manage.py search_indexes' when switching to it and './manage.py search_indexes --drop' and
+    # './manage.py buildwatson' when switching back, as watson is not updated with 'postgres'. The same text fields are
+    # searched, but the names of the related product, product type and JIRA issue only match when all the words are
+    # in them. The experimental search across all types is only available with watson.
+    DD_SEARCH_BACKEND=(str, "watson"),
     DD_SIMILAR_FINDINGS_MAX_RESULTS=(int, 25),
     # The maximum number of request/response pairs to return from the API. Values <0 return all pairs.
     DD_MAX_REQRESP_FROM_API=(int, -1),
@@ -231,6 +239,14 @@ env = environ.FileAwareEnv(
     DD_JIRA_WEBHOOK_ALLOW_FINDING_GROUP_REOPEN=(bool, False),
     # You can set extra Jira issue types via a simple env var that supports a csv format, like "Work Item,Vulnerability"
     DD_JIRA_EXTRA_ISSUE_TYPES=(str, ""),
+    # Seconds a worker reuses its connection to a JIRA instance, with the keep-alive session and server info of
+    # the client, instead of connecting for each push, comment or status update. 0 connects every time.
+    DD_JIRA_CONNECTION_MAX_AGE=(int, 0),
+    # Seconds the fields of the JIRA issue types (createmeta) are cached in the Django cache. 0 disables the cache.
+    # Fields added to an issue type in JIRA are picked up once the cached fields expire.
+    DD_JIRA_METADATA_CACHE_TIMEOUT=(int, 0),
+    # Number of JIRA projects whose updated issues the incremental JIRA status reconciliation searches in parallel
+    DD_JIRA_RECONCILIATION_THREADS=(int, 4),
     # if you want to keep logging to the console but in json format, change this here to 'json_console'
     DD_LOGGING_HANDLER=(str, "console"),
     # If true, drf-spectacular will load CSS & JS from default CDN, otherwise from static resources
@@ -245,6 +261,14 @@ env = environ.FileAwareEnv(
     # could be usefull to limit parser allowed
     # AWS Scout2 Scan Parser is deprecated (see https://github.com/DefectDojo/django-DefectDojo/pull/5268)
     DD_PARSER_EXCLUDE=(str, ""),
+    # When enabled, the parsers listed in dojo/tools/parsers_manifest.json are only imported the first time they are
+    # used, which makes starting web and celery workers faster. Parsers that are not listed are imported at startup.
+    DD_PARSERS_MANIFEST_ENABLED=(bool, True),
+    # When enabled, the test types and whether they are active are cached in the Django cache for the parser lookups.
+    # The cache is invalidated whenever a test type is saved or deleted.
+    DD_TEST_TYPES_CACHE_ENABLED=(bool, False),
+    # Seconds after which the cached test types expire
+    DD_TEST_TYPES_CACHE_TIMEOUT=(int, 3600),
     # when enabled in sytem settings,  every minute a job run to delete excess duplicates
     # we limit the amount of duplicates that can be deleted in a single run of that job
     # to prevent overlapping runs of that job from occurrring
@@ -253,6 +277,53 @@ env = environ.FileAwareEnv(
     DD_EDITABLE_MITIGATED_DATA=(bool, False),
     # new feature that tracks history across multiple reimports for the same test
     DD_TRACK_IMPORT_HISTORY=(bool, True),
+    # When enabled, the importer persists new findings in chunks using bulk inserts instead of
+    # saving them one by one. Deduplication and product grading are then run once per chunk.
+    DD_IMPORT_BULK_CREATE=(bool, False),
+    # The number of findings that are persisted per chunk when DD_IMPORT_BULK_CREATE is enabled,
+    # and that are closed per chunk when DD_IMPORT_BULK_CLOSE_OLD_FINDINGS is enabled
+    DD_IMPORT_BULK_CREATE_CHUNK_SIZE=(int, 1000),
+    # When enabled, the findings closed by "close old findings" of an import or reimport are closed in chunks with
+    # set-based updates and bulk inserts of their notes, instead of saving them one by one. Their post processing
+    # (product grading, pushing to JIRA) is then run once per chunk.
+    DD_IMPORT_BULK_CLOSE_OLD_FINDINGS=(bool, False),
+    # When enabled, parsers that support it read the report incrementally and the importer consumes
+    # the findings as they are parsed, so that very large reports are never fully held in memory.
+    # Parsing errors are then only raised while the findings are being imported.
+    DD_IMPORT_STREAM_FINDINGS=(bool, False),
+    # The number of findings of an import or bulk edit that are post processed (deduplication, product grading,
+    # pushing to JIRA) together in a single task
+    DD_POST_PROCESS_FINDINGS_BATCH_SIZE=(int, 1000),
+    # When set, the grade of a product is calculated this many seconds after a change to the product, and
+    # all changes within that window are covered by a single calculation. Changes are only coalesced across
+    # processes when the configured Django cache is shared between them.
+    DD_PRODUCT_GRADE_DEBOUNCE_SECONDS=(int, 0),
+    # When enabled, the finding charts of the metrics pages are computed from a daily rollup of the finding
+    # counts per product and severity, instead of from the findings themselves. The rollup is maintained by
+    # the 'update-finding-daily-metrics' celery beat task, so the charts can lag behind by up to its interval.
+    DD_METRICS_DAILY_ROLLUP=(bool, False),
+    # When enabled, the system settings are cached in the Django cache with a version stamp that is replaced
+    # whenever they are saved, so that lookups outside of a request (e.g. in celery tasks) do not query the database.
+    # Without a shared cache backend (CACHES), other processes pick up changes after DD_SYSTEM_SETTINGS_CACHE_TIMEOUT.
+    DD_SYSTEM_SETTINGS_CACHE_ENABLED=(bool, False),
+    # Seconds after which the cached system settings and their version stamp expire
+    DD_SYSTEM_SETTINGS_CACHE_TIMEOUT=(int, 300),
+    # Seconds a process uses its copy of the system settings before comparing its version with the cached version stamp
+    DD_SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL=(int, 1),
+    # When enabled, the products a user is authorized for through product (type) memberships and groups are
+    # cached per user in the Django cache. The cache of all users is invalidated whenever a membership changes.
+    # Requires a default cache backend that all processes share (CACHES, e.g. redis or memcached), as otherwise
+    # revoked memberships would keep granting access in the other processes. With the local memory cache of the
+    # default configuration, the setting is refused by a system check and ignored.
+    DD_AUTHORIZATION_CACHE_ENABLED=(bool, False),
+    # Seconds after which the cached authorizations of a user expire
+    DD_AUTHORIZATION_CACHE_TIMEOUT=(int, 3600),
+    # When enabled, the HTML reports of product types, products, engagements and tests are rendered by a celery
+    # worker and stored in the media folder. Requesting a report with the same options and filters again serves the
+    # stored report, as long as no findings were added, removed or changed status in the meantime.
+    DD_REPORTS_ASYNC=(bool, False),
+    # Seconds after which a stored report is rendered again, to pick up changes to findings that do not affect their status
+    DD_REPORTS_ASYNC_MAX_AGE=(int, 3600),
     # Delete Auditlogs older than x month; -1 to keep all logs
     DD_AUDITLOG_FLUSH_RETENTION_PERIOD=(int, -1),
     # Allow grouping of findings in the same test, for example to group findings per dependency
@@ -312,6 +383,19 @@ env = environ.FileAwareEnv(
     DD_QUALYS_LEGACY_SEVERITY_PARSING=(bool, True),
     # Use System notification settings to override user's notification settings
     DD_NOTIFICATIONS_SYSTEM_LEVEL_TRUMP=(list, ["user_mentioned", "review_requested"]),
+    # When enabled, the users that receive the personal notifications about a product or product type are cached in
+    # the Django cache. The cache is invalidated whenever memberships, roles, users or notification settings change.
+    # Like DD_AUTHORIZATION_CACHE_ENABLED, it requires a default cache backend that all processes share (CACHES).
+    DD_NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED=(bool, False),
+    # Seconds after which the cached notification recipients expire
+    DD_NOTIFICATIONS_RECIPIENTS_CACHE_TIMEOUT=(int, 3600),
+    # Number of threads that deliver the personal Slack and webhook notifications of an event
+    DD_NOTIFICATIONS_DELIVERY_THREADS=(int, 4),
+    # Maximum number of personal Slack messages resp. webhook calls per second for an event, 0 for no limit.
+    # Slack limits the messages per channel, and each personal message goes to a channel of its own, so the
+    # Slack messages are not limited by default. A limit holds up the worker for about 1 / limit seconds per user.
+    DD_NOTIFICATIONS_SLACK_RATE_LIMIT=(float, 0),
+    DD_NOTIFICATIONS_WEBHOOKS_RATE_LIMIT=(float, 10.0),
     # When enabled, force the password field to be required for creating/updating users
     DD_REQUIRE_PASSWORD_ON_USER=(bool, True),
     # For HTTP requests, how long connection is open before timeout
@@ -651,6 +735,7 @@ SLA_NOTIFY_POST_BREACH = env("DD_SLA_NOTIFY_POST_BREACH")  # in days, skip notif
 
 
 SEARCH_MAX_RESULTS = env("DD_SEARCH_MAX_RESULTS")
+SEARCH_BACKEND = env("DD_SEARCH_BACKEND")
 SIMILAR_FINDINGS_MAX_RESULTS = env("DD_SIMILAR_FINDINGS_MAX_RESULTS")
 MAX_REQRESP_FROM_API = env("DD_MAX_REQRESP_FROM_API")
 MAX_AUTOCOMPLETE_WORDS = env("DD_MAX_AUTOCOMPLETE_WORDS")
@@ -805,7 +890,7 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": (
         "rest_framework.renderers.JSONRenderer",
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "dojo.api_v2.pagination.DojoPagination",
     "PAGE_SIZE": 25,
     "EXCEPTION_HANDLER": "dojo.api_v2.exception_handler.custom_exception_handler",
 }
@@ -1150,7 +1235,7 @@ CELERY_LOG_LEVEL = env("DD_CELERY_LOG_LEVEL")
 if len(env("DD_CELERY_BROKER_TRANSPORT_OPTIONS")) > 0:
     CELERY_BROKER_TRANSPORT_OPTIONS = json.loads(env("DD_CELERY_BROKER_TRANSPORT_OPTIONS"))
 
-CELERY_IMPORTS = ("dojo.tools.tool_issue_updater", )
+CELERY_IMPORTS = ("dojo.tools.tool_issue_updater", "dojo.reports.helper")
 
 # Celery beat scheduled tasks
 CELERY_BEAT_SCHEDULE = {
@@ -1196,10 +1281,23 @@ CELERY_BEAT_SCHEDULE = {
         "task": "dojo.tasks.clear_sessions",
         "schedule": crontab(hour=0, minute=0, day_of_week=0),
     },
+    # only does work when DD_METRICS_DAILY_ROLLUP is enabled
+    "update-finding-daily-metrics": {
+        "task": "dojo.tasks.update_finding_daily_metrics_task",
+        "schedule": timedelta(minutes=15),
+        "args": [timedelta(minutes=15)],
+    },
+    # the full rebuild picks up deleted findings and changes that do not touch the status of a finding
+    "rebuild-finding-daily-metrics": {
+        "task": "dojo.tasks.update_finding_daily_metrics_task",
+        "schedule": crontab(hour=2, minute=0),
+    },
     # 'jira_status_reconciliation': {
     #     'task': 'dojo.tasks.jira_status_reconciliation_task',
     #     'schedule': timedelta(hours=12),
     #     'kwargs': {'mode': 'reconcile', 'dryrun': True, 'daysback': 10, 'product': None, 'engagement': None}
+    #     # or only the findings whose JIRA issue has been updated since the previous run:
+    #     # 'kwargs': {'mode': 'reconcile', 'dryrun': False, 'incremental': True, 'daysback': None, 'product': None, 'engagement': None}
     # },
     # 'fix_loop_duplicates': {
     #     'task': 'dojo.tasks.fix_loop_duplicates_task',
@@ -1625,6 +1723,25 @@ DISABLE_FINDING_MERGE = env("DD_DISABLE_FINDING_MERGE")
 
 TRACK_IMPORT_HISTORY = env("DD_TRACK_IMPORT_HISTORY")
 
+IMPORT_BULK_CREATE = env("DD_IMPORT_BULK_CREATE")
+IMPORT_BULK_CREATE_CHUNK_SIZE = env("DD_IMPORT_BULK_CREATE_CHUNK_SIZE")
+IMPORT_BULK_CLOSE_OLD_FINDINGS = env("DD_IMPORT_BULK_CLOSE_OLD_FINDINGS")
+IMPORT_STREAM_FINDINGS = env("DD_IMPORT_STREAM_FINDINGS")
+POST_PROCESS_FINDINGS_BATCH_SIZE = env("DD_POST_PROCESS_FINDINGS_BATCH_SIZE")
+PRODUCT_GRADE_DEBOUNCE_SECONDS = env("DD_PRODUCT_GRADE_DEBOUNCE_SECONDS")
+
+METRICS_DAILY_ROLLUP = env("DD_METRICS_DAILY_ROLLUP")
+
+SYSTEM_SETTINGS_CACHE_ENABLED = env("DD_SYSTEM_SETTINGS_CACHE_ENABLED")
+SYSTEM_SETTINGS_CACHE_TIMEOUT = env("DD_SYSTEM_SETTINGS_CACHE_TIMEOUT")
+SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL = env("DD_SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL")
+
+AUTHORIZATION_CACHE_ENABLED = env("DD_AUTHORIZATION_CACHE_ENABLED")
+AUTHORIZATION_CACHE_TIMEOUT = env("DD_AUTHORIZATION_CACHE_TIMEOUT")
+
+REPORTS_ASYNC = env("DD_REPORTS_ASYNC")
+REPORTS_ASYNC_MAX_AGE = env("DD_REPORTS_ASYNC_MAX_AGE")
+
 # ------------------------------------------------------------------------------
 # JIRA
 # ------------------------------------------------------------------------------
@@ -1644,6 +1761,9 @@ if env("DD_JIRA_EXTRA_ISSUE_TYPES") != "":
 
 JIRA_SSL_VERIFY = env("DD_JIRA_SSL_VERIFY")
 JIRA_WEBHOOK_ALLOW_FINDING_GROUP_REOPEN = env("DD_JIRA_WEBHOOK_ALLOW_FINDING_GROUP_REOPEN")
+JIRA_CONNECTION_MAX_AGE = env("DD_JIRA_CONNECTION_MAX_AGE")
+JIRA_METADATA_CACHE_TIMEOUT = env("DD_JIRA_METADATA_CACHE_TIMEOUT")
+JIRA_RECONCILIATION_THREADS = env("DD_JIRA_RECONCILIATION_THREADS")
 
 # ------------------------------------------------------------------------------
 # LOGGING
@@ -1760,6 +1880,9 @@ QUALYS_WAS_UNIQUE_ID = False
 
 # exclusion list for parsers
 PARSER_EXCLUDE = env("DD_PARSER_EXCLUDE")
+PARSERS_MANIFEST_ENABLED = env("DD_PARSERS_MANIFEST_ENABLED")
+TEST_TYPES_CACHE_ENABLED = env("DD_TEST_TYPES_CACHE_ENABLED")
+TEST_TYPES_CACHE_TIMEOUT = env("DD_TEST_TYPES_CACHE_TIMEOUT")
 
 SERIALIZATION_MODULES = {
     "xml": "tagulous.serializers.xml_serializer",
@@ -1890,6 +2013,11 @@ USE_QUALYS_LEGACY_SEVERITY_PARSING = env("DD_QUALYS_LEGACY_SEVERITY_PARSING")
 # Notifications
 # ------------------------------------------------------------------------------
 NOTIFICATIONS_SYSTEM_LEVEL_TRUMP = env("DD_NOTIFICATIONS_SYSTEM_LEVEL_TRUMP")
+NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED = env("DD_NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED")
+NOTIFICATIONS_RECIPIENTS_CACHE_TIMEOUT = env("DD_NOTIFICATIONS_RECIPIENTS_CACHE_TIMEOUT")
+NOTIFICATIONS_DELIVERY_THREADS = env("DD_NOTIFICATIONS_DELIVERY_THREADS")
+NOTIFICATIONS_SLACK_RATE_LIMIT = env("DD_NOTIFICATIONS_SLACK_RATE_LIMIT")
+NOTIFICATIONS_WEBHOOKS_RATE_LIMIT = env("DD_NOTIFICATIONS_WEBHOOKS_RATE_LIMIT")
 
 # ------------------------------------------------------------------------------
 # Timeouts
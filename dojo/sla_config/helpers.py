@@ -1,12 +1,22 @@
 import logging
+from datetime import timedelta
+
+from django.db.models import DateField, ExpressionWrapper
+from django.db.models.functions import Coalesce
 
 from dojo.celery import app
 from dojo.decorators import dojo_async_task
-from dojo.models import Finding, Product, SLA_Configuration
-from dojo.utils import calculate_grade, mass_model_updater
+from dojo.models import Finding, Product, SLA_Configuration, System_Settings
+from dojo.utils import calculate_grades
 
 logger = logging.getLogger(__name__)
 
+# The findings of this many products are updated per statement, so that a single update does not lock
+# the findings of a large SLA configuration all at once, and progress can be reported in between
+SLA_UPDATE_PRODUCT_BATCH_SIZE = 100
+
+SLA_SEVERITIES = ("Critical", "High", "Medium", "Low")
+
 
 @dojo_async_task
 @app.task
@@ -20,33 +30,51 @@ def update_sla_expiration_dates_product_async(product, sla_config, *args, **kwar
     update_sla_expiration_dates_sla_config_sync(sla_config, [product])
 
 
-def update_sla_expiration_dates_sla_config_sync(sla_config, products, severities=None):
-    logger.info(f"Updating finding SLA expiration dates within the {sla_config} SLA configuration")
-    # update each finding that is within the SLA configuration that was saved
-    findings = Finding.objects.filter(test__engagement__product__sla_configuration_id=sla_config.id)
-    if products:
-        findings = findings.filter(test__engagement__product__in=products)
-    if severities:
-        findings = findings.filter(severity__in=severities)
+def get_sla_expiration_date_updates(sla_config, severities=None):
+    """
+    Returns the sla_expiration_date to set for the findings of each severity within the SLA configuration,
+    the same value Finding.set_sla_expiration_date() computes, as a database expression
+    """
+    updates = {}
+    for severity in severities or SLA_SEVERITIES:
+        sla_period = getattr(sla_config, severity.lower())
+        if sla_period is not None and getattr(sla_config, f"enforce_{severity.lower()}"):
+            updates[severity] = ExpressionWrapper(
+                Coalesce("sla_start_date", "date") + timedelta(days=sla_period),
+                output_field=DateField(),
+            )
+        else:
+            updates[severity] = None
+    return updates
 
-    findings = findings.prefetch_related(
-            "test",
-            "test__engagement",
-            "test__engagement__product",
-            "test__engagement__product__sla_configuration",
-    )
 
-    findings = findings.order_by("id").only("id", "sla_start_date", "date", "severity", "test")
+def update_sla_expiration_dates_sla_config_sync(sla_config, products, severities=None):
+    logger.info(f"Updating finding SLA expiration dates within the {sla_config} SLA configuration")
+    # the days of the configuration as saved, the task could have been queued with an outdated instance
+    sla_config.refresh_from_db()
+    product_ids = sorted(product.id for product in products)
 
-    mass_model_updater(Finding, findings, lambda f: f.set_sla_expiration_date(), fields=["sla_expiration_date"])
+    if System_Settings.objects.get().enable_finding_sla:
+        updates = get_sla_expiration_date_updates(sla_config, severities)
+        findings = Finding.objects.filter(test__engagement__product__sla_configuration_id=sla_config.id)
+        for start in range(0, len(product_ids), SLA_UPDATE_PRODUCT_BATCH_SIZE):
+            batch_findings = findings.filter(test__engagement__product__in=product_ids[start:start + SLA_UPDATE_PRODUCT_BATCH_SIZE])
+            for severity, sla_expiration_date in updates.items():
+                batch_findings.filter(severity=severity).update(sla_expiration_date=sla_expiration_date)
+            if not severities:
+                # severities without an SLA, like Info, have no expiration date
+                batch_findings.exclude(severity__in=SLA_SEVERITIES).update(sla_expiration_date=None)
+            progress = min(100, (start + SLA_UPDATE_PRODUCT_BATCH_SIZE) * 100 // len(product_ids))
+            SLA_Configuration.objects.filter(id=sla_config.id).update(async_updating_progress=progress)
+            logger.debug("updated finding SLA expiration dates of %i%% of the products within the %s SLA configuration", progress, sla_config)
 
     # reset the async updating flag to false for all products using this sla config
-    for product in products:
-        product.async_updating = False
-        super(Product, product).save()
-        calculate_grade(product)
+    products = Product.objects.filter(id__in=product_ids)
+    products.update(async_updating=False)
+    calculate_grades(products)
 
     # reset the async updating flag to false for this sla config
     sla_config.async_updating = False
+    sla_config.async_updating_progress = 100
     super(SLA_Configuration, sla_config).save()
     logger.info(f"DONE Updating finding SLA expiration dates within the {sla_config} SLA configuration")
@@ -0,0 +1,108 @@
+import logging
+from collections import Counter
+
+from django.db.models import F, Model
+
+logger = logging.getLogger(__name__)
+
+
+def _get_tag_field_details(model: type[Model], tag_field_name: str):
+    tag_field = model._meta.get_field(tag_field_name)
+    through = tag_field.remote_field.through
+    return (
+        tag_field,
+        tag_field.related_model,
+        through,
+        f"{tag_field.m2m_field_name()}_id",
+        f"{tag_field.m2m_reverse_field_name()}_id",
+    )
+
+
+def _normalize_tag_names(tag_field, tag_names: list[str]) -> list[str]:
+    normalized = []
+    for tag_name in tag_names:
+        if tag_name is None:
+            continue
+        name = str(tag_name).strip()
+        if not name:
+            continue
+        if tag_field.tag_options.force_lowercase:
+            name = name.lower()
+        normalized.append(name)
+    # Remove duplicates while keeping the order
+    return list(dict.fromkeys(normalized))
+
+
+def get_or_create_tags(model: type[Model], tag_names: list[str], tag_field_name: str = "tags") -> dict:
+    """
+    Returns a dictionary of tag name -> tag object for the tag model backing the
+    supplied tag field, creating any of the tags that do not exist yet
+    """
+    tag_field, tag_model, _, _, _ = _get_tag_field_details(model, tag_field_name)
+    tag_names = _normalize_tag_names(tag_field, tag_names)
+    tags = {tag.name: tag for tag in tag_model.objects.filter(name__in=tag_names)}
+    for tag_name in tag_names:
+        if tag_name not in tags:
+            field_lookup = "name" if tag_field.tag_options.case_sensitive else "name__iexact"
+            tags[tag_name], _ = tag_model.objects.get_or_create(
+                defaults={"name": tag_name, "protected": False},
+                **{field_lookup: tag_name},
+            )
+    return tags
+
+
+def bulk_add_tags(model: type[Model], instances_to_tag_names: dict, tag_field_name: str = "tags") -> int:
+    """
+    Adds tags to many saved instances of the same model at once. The tag relations are
+    written with a single bulk insert and the tag counts are updated once per tag, rather
+    than going through the tagulous manager of each instance.
+
+    `instances_to_tag_names` maps an instance (that has a primary key) to a list of tag names.
+    Relations that already exist are left untouched. Returns the number of relations created.
+    """
+    tag_field, tag_model, through, instance_column, tag_column = _get_tag_field_details(model, tag_field_name)
+    instances_to_tag_names = {
+        instance: _normalize_tag_names(tag_field, tag_names)
+        for instance, tag_names in instances_to_tag_names.items()
+        if tag_names
+    }
+    if not instances_to_tag_names:
+        return 0
+    tags = get_or_create_tags(
+        model,
+        [tag_name for tag_names in instances_to_tag_names.values() for tag_name in tag_names],
+        tag_field_name=tag_field_name,
+    )
+    # Avoid violating the unique constraint of the through table
+    existing = set(through.objects.filter(
+        **{
+            f"{instance_column}__in": [instance.pk for instance in instances_to_tag_names],
+            f"{tag_column}__in": [tag.pk for tag in tags.values()],
+        },
+    ).values_list(instance_column, tag_column))
+    relations = []
+    for instance, tag_names in instances_to_tag_names.items():
+        for tag_name in tag_names:
+            key = (instance.pk, tags[tag_name].pk)
+            if key not in existing:
+                existing.add(key)
+                relations.append(through(**{instance_column: key[0], tag_column: key[1]}))
+    through.objects.bulk_create(relations)
+    # Keep the tag counts maintained by tagulous accurate
+    for tag_pk, amount in Counter(getattr(relation, tag_column) for relation in relations).items():
+        tag_model.objects.filter(pk=tag_pk).update(count=F("count") + amount)
+    # Drop any cached tag managers so that the tags are reloaded from the database on next access
+    for instance in instances_to_tag_names:
+        reset_tag_manager(instance, tag_field_name)
+    logger.debug("bulk added %i %s relations for %i %s", len(relations), tag_field_name, len(instances_to_tag_names), model.__name__)
+    return len(relations)
+
+
+def reset_tag_manager(instance: Model, tag_field_name: str = "tags") -> None:
+    """
+    Removes the tag manager that tagulous caches on the instance. This is required after
+    writing tag relations directly to the database, as a stale manager would otherwise
+    overwrite the new relations the next time the instance is saved
+    """
+    tag_field = instance._meta.get_field(tag_field_name)
+    instance.__dict__.pop(tag_field.get_manager_name(), None)
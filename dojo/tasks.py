@@ -11,9 +11,9 @@ from django.urls import reverse
 from django.utils import timezone
 
 from dojo.celery import app
-from dojo.models import Alerts, Announcement, Endpoint, Engagement, Finding, Product, System_Settings, User
+from dojo.models import Alerts, Announcement, Endpoint, Engagement, Finding, System_Settings, User
 from dojo.notifications.helper import create_notification
-from dojo.utils import calculate_grade, sla_compute_and_notify
+from dojo.utils import calculate_grades, sla_compute_and_notify
 
 logger = get_task_logger(__name__)
 deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
@@ -66,9 +66,7 @@ def add_alerts(self, runinterval):
 
     # Calculate grade
     if system_settings.enable_product_grade:
-        products = Product.objects.all()
-        for product in products:
-            calculate_grade(product)
+        calculate_grades()
 
 
 @app.task(bind=True)
@@ -192,6 +190,17 @@ def fix_loop_duplicates_task(*args, **kwargs):
     return fix_loop_duplicates()
 
 
+@app.task(bind=True)
+def update_finding_daily_metrics_task(self, runinterval=None):
+    if not settings.METRICS_DAILY_ROLLUP:
+        return
+    from dojo.metrics.helper import update_finding_daily_metrics
+    # Look back twice the interval, so that changes are not missed when a run starts late
+    changed_since = timezone.now() - runinterval * 2 if runinterval else None
+    rows_written = update_finding_daily_metrics(changed_since)
+    logger.info("%d finding daily metrics rows updated", rows_written)
+
+
 @app.task
 def evaluate_pro_proposition(*args, **kwargs):
     # Ensure we should be doing this
@@ -3,14 +3,15 @@ import contextlib
 from auditlog.models import LogEntry
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_delete, pre_delete, pre_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
-from dojo.models import Finding, Test
+from dojo.models import Finding, Test, Test_Type
 from dojo.notes.helper import delete_related_notes
 from dojo.notifications.helper import create_notification
+from dojo.tools.factory import invalidate_test_types
 
 
 @receiver(post_delete, sender=Test)
@@ -55,3 +56,9 @@ def update_found_by_for_findings(sender, instance, **kwargs):
 @receiver(pre_delete, sender=Test)
 def test_pre_delete(sender, instance, **kwargs):
     delete_related_notes(instance)
+
+
+@receiver(post_save, sender=Test_Type)
+@receiver(post_delete, sender=Test_Type)
+def test_type_changed(sender, instance, **kwargs):
+    invalidate_test_types()
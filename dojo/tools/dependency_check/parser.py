@@ -24,6 +24,11 @@ class DependencyCheckParser:
     }
 
     def add_finding(self, finding, dupes):
+        key = self.get_finding_key(finding)
+        if key not in dupes:
+            dupes[key] = finding
+
+    def get_finding_key(self, finding):
         key_str = "|".join(
             [
                 str(finding.title),
@@ -31,9 +36,7 @@ class DependencyCheckParser:
                 str(finding.file_path).lower(),
             ],
         )
-        key = hashlib.sha256(key_str.encode("utf-8")).hexdigest()
-        if key not in dupes:
-            dupes[key] = finding
+        return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
 
     def get_filename_and_path_from_dependency(
         self, dependency, related_dependency, namespace,
@@ -366,61 +369,89 @@ class DependencyCheckParser:
 
         if dependencies:
             for dependency in dependencies.findall(namespace + "dependency"):
-                vulnerabilities = dependency.find(
-                    namespace + "vulnerabilities",
-                )
-                if vulnerabilities is not None:
-                    for vulnerability in vulnerabilities.findall(
-                        namespace + "vulnerability",
-                    ):
-                        if vulnerability:
-                            finding = self.get_finding_from_vulnerability(
-                                dependency,
-                                None,
-                                vulnerability,
-                                test,
-                                namespace,
-                            )
-                            if scan_date:
-                                finding.date = scan_date
-                            self.add_finding(finding, dupes)
+                for finding in self.get_findings_from_dependency(dependency, test, namespace, scan_date):
+                    self.add_finding(finding, dupes)
 
-                            relatedDependencies = dependency.find(
-                                namespace + "relatedDependencies",
-                            )
-                            if relatedDependencies:
-                                for (
-                                    relatedDependency
-                                ) in relatedDependencies.findall(
-                                    namespace + "relatedDependency",
-                                ):
-                                    finding = (
-                                        self.get_finding_from_vulnerability(
-                                            dependency,
-                                            relatedDependency,
-                                            vulnerability,
-                                            test,
-                                            namespace,
-                                        )
-                                    )
-                                    if finding:  # could be None
-                                        if scan_date:
-                                            finding.date = scan_date
-                                        self.add_finding(finding, dupes)
-
-                    for suppressedVulnerability in vulnerabilities.findall(
-                        namespace + "suppressedVulnerability",
-                    ):
-                        if suppressedVulnerability:
-                            finding = self.get_finding_from_vulnerability(
-                                dependency,
-                                None,
-                                suppressedVulnerability,
-                                test,
-                                namespace,
+        return list(dupes.values())
+
+    def iter_findings(self, filename, test):
+        """
+        Streaming version of `get_findings`, where the report is parsed incrementally and
+        each dependency is discarded once its findings have been generated
+        """
+        keys = set()
+        namespace = None
+        scan_date = None
+        for event, element in ElementTree.iterparse(filename, events=("start", "end")):
+            if namespace is None:
+                matches = re.match(r"{.*}", element.tag)
+                namespace = matches.group(0) if matches else ""
+            if event != "end":
+                continue
+            if element.tag == f"{namespace}projectInfo" and element.findtext(f"{namespace}reportDate"):
+                scan_date = dateutil.parser.parse(element.findtext(f"{namespace}reportDate"))
+            elif element.tag == f"{namespace}dependency":
+                for finding in self.get_findings_from_dependency(element, test, namespace, scan_date):
+                    key = self.get_finding_key(finding)
+                    if key not in keys:
+                        keys.add(key)
+                        yield finding
+                element.clear()
+
+    def get_findings_from_dependency(self, dependency, test, namespace, scan_date):
+        vulnerabilities = dependency.find(
+            namespace + "vulnerabilities",
+        )
+        if vulnerabilities is not None:
+            for vulnerability in vulnerabilities.findall(
+                namespace + "vulnerability",
+            ):
+                if vulnerability:
+                    finding = self.get_finding_from_vulnerability(
+                        dependency,
+                        None,
+                        vulnerability,
+                        test,
+                        namespace,
+                    )
+                    if scan_date:
+                        finding.date = scan_date
+                    yield finding
+
+                    relatedDependencies = dependency.find(
+                        namespace + "relatedDependencies",
+                    )
+                    if relatedDependencies:
+                        for (
+                            relatedDependency
+                        ) in relatedDependencies.findall(
+                            namespace + "relatedDependency",
+                        ):
+                            finding = (
+                                self.get_finding_from_vulnerability(
+                                    dependency,
+                                    relatedDependency,
+                                    vulnerability,
+                                    test,
+                                    namespace,
+                                )
                             )
-                            if scan_date:
-                                finding.date = scan_date
-                            self.add_finding(finding, dupes)
+                            if finding:  # could be None
+                                if scan_date:
+                                    finding.date = scan_date
+                                yield finding
 
-        return list(dupes.values())
+            for suppressedVulnerability in vulnerabilities.findall(
+                namespace + "suppressedVulnerability",
+            ):
+                if suppressedVulnerability:
+                    finding = self.get_finding_from_vulnerability(
+                        dependency,
+                        None,
+                        suppressedVulnerability,
+                        test,
+                        namespace,
+                    )
+                    if scan_date:
+                        finding.date = scan_date
+                    yield finding
@@ -1,35 +1,129 @@
+import json
 import logging
 import os
 import re
+from collections.abc import Mapping
 from importlib import import_module
 from importlib.util import find_spec
 from inspect import isclass
 from pathlib import Path
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
 from dojo.models import Test_Type, Tool_Configuration, Tool_Type
 
-PARSERS = {}
-
 logger = logging.getLogger(__name__)
 
+# Generated with "manage.py parsers_manifest", lists the scan types of all parsers in this package
+MANIFEST_PATH = Path(__file__).resolve().parent / "parsers_manifest.json"
+
+TEST_TYPES_CACHE_KEY = "dojo_test_types_active"
+
+
+class ParserRegistry(Mapping):
+
+    """
+    Parsers by scan type. The parsers listed in the manifest are imported the first time one of their scan types is
+    used, the other ones are registered when this module is imported.
+    """
+
+    def __init__(self):
+        self.manifest = {}
+        self.parsers = {}
+
+    def register(self, scan_type, parser):
+        # check double registration or registration with an existing key
+        if scan_type in self:
+            msg = f"Try to register an existing parser '{scan_type}'"
+            raise ValueError(msg)
+        self.parsers[scan_type] = parser
+
+    def __getitem__(self, scan_type):
+        if scan_type not in self.parsers:
+            entry = self.manifest[scan_type]
+            logger.debug(f"loading parser {entry['class']} from {entry['module']} for scan_type:{scan_type}")
+            parser_type = getattr(import_module(entry["module"]), entry["class"])
+            for other_scan_type, other_entry in self.manifest.items():
+                if (other_entry["module"], other_entry["class"]) == (entry["module"], entry["class"]):
+                    self.parsers[other_scan_type] = create_parser(parser_type, other_scan_type)
+        return self.parsers[scan_type]
+
+    def __contains__(self, scan_type):
+        return scan_type in self.manifest or scan_type in self.parsers
+
+    def __iter__(self):
+        yield from self.manifest
+        yield from (scan_type for scan_type in self.parsers if scan_type not in self.manifest)
+
+    def __len__(self):
+        return len(self.manifest) + sum(scan_type not in self.manifest for scan_type in self.parsers)
+
+    def get_info(self, scan_type):
+        """Returns what is known about the scan type without importing its parser, if it is in the manifest"""
+        if scan_type in self.manifest:
+            return self.manifest[scan_type]
+        return get_parser_info(scan_type, self.parsers[scan_type])
+
+
+PARSERS = ParserRegistry()
+
+
+def create_parser(parser_type, scan_type):
+    parser = parser_type()
+    if scan_type.endswith("detailed"):
+        parser.set_mode("detailed")
+    return parser
+
 
 def register(parser_type):
     for scan_type in parser_type().get_scan_types():
-        parser = parser_type()
-        if scan_type.endswith("detailed"):
-            parser.set_mode("detailed")
-        register_parser(scan_type, parser)
+        register_parser(scan_type, create_parser(parser_type, scan_type))
 
 
 def register_parser(scan_type, parser):
     logger.debug(f"register scan_type:{scan_type} with parser:{parser}")
-    # check double registration or registration with an existing key
-    if scan_type in PARSERS:
-        msg = f"Try to register an existing parser '{scan_type}'"
-        raise ValueError(msg)
-    PARSERS[scan_type] = parser
+    PARSERS.register(scan_type, parser)
+
+
+def get_parser_info(scan_type, parser):
+    return {
+        "module": type(parser).__module__,
+        "class": type(parser).__name__,
+        "label": parser.get_label_for_scan_types(scan_type),
+        "description": parser.get_description_for_scan_types(scan_type),
+        # Set a sane default to require files since it is the
+        # more commen scenario.
+        "requires_file": parser.requires_file(scan_type) if hasattr(parser, "requires_file") else True,
+        "requires_tool_type": parser.requires_tool_type(scan_type) if hasattr(parser, "requires_tool_type") else None,
+        "api_scan_configuration_hint": hasattr(parser, "api_scan_configuration_hint"),
+    }
+
+
+def get_test_types_active():
+    """Returns the names of the test types with whether they are active, cached until a test type changes"""
+    test_types = cache.get(TEST_TYPES_CACHE_KEY)
+    if test_types is None:
+        test_types = dict(Test_Type.objects.values_list("name", "active"))
+        cache.set(TEST_TYPES_CACHE_KEY, test_types, timeout=settings.TEST_TYPES_CACHE_TIMEOUT)
+    return test_types
+
+
+def invalidate_test_types():
+    if not settings.TEST_TYPES_CACHE_ENABLED:
+        return
+    # Again after the commit, so that no other process can cache the old test types in the meantime
+    cache.delete(TEST_TYPES_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(TEST_TYPES_CACHE_KEY))
+
+
+def is_test_type_active(scan_type):
+    if settings.TEST_TYPES_CACHE_ENABLED and (active := get_test_types_active().get(scan_type)) is not None:
+        return active
+    # update DB dynamically
+    test_type, _ = Test_Type.objects.get_or_create(name=scan_type)
+    return test_type.active
 
 
 def get_parser(scan_type):
@@ -39,9 +133,7 @@ def get_parser(scan_type):
         raise ValueError(msg)
     rg = re.compile(settings.PARSER_EXCLUDE)
     if not rg.match(scan_type) or settings.PARSER_EXCLUDE.strip() == "":
-        # update DB dynamically
-        test_type, _ = Test_Type.objects.get_or_create(name=scan_type)
-        if test_type.active:
+        if is_test_type_active(scan_type):
             return PARSERS[scan_type]
     msg = f"Parser {scan_type} is not active"
     raise ValueError(msg)
@@ -49,6 +141,8 @@ def get_parser(scan_type):
 
 def get_inactive_test_types():
     try:
+        if settings.TEST_TYPES_CACHE_ENABLED:
+            return [name for name, active in get_test_types_active().items() if not active]
         return list(Test_Type.objects.filter(active=False).values_list("name", flat=True))
     except Exception:
         # This exception is reached in the event of loading fixtures in to an empty database
@@ -58,32 +152,28 @@ def get_inactive_test_types():
 
 def get_scan_types_sorted():
     inactive_test_types = get_inactive_test_types()
-    res = [(key, PARSERS[key].get_description_for_scan_types(key)) for key in PARSERS if key not in inactive_test_types]
+    res = [(key, PARSERS.get_info(key)["description"]) for key in PARSERS if key not in inactive_test_types]
     return sorted(res, key=lambda x: x[0].lower())
 
 
 def get_choices_sorted():
     inactive_test_types = get_inactive_test_types()
-    res = [(key, PARSERS[key].get_label_for_scan_types(key)) for key in PARSERS if key not in inactive_test_types]
+    res = [(key, PARSERS.get_info(key)["label"]) for key in PARSERS if key not in inactive_test_types]
     return sorted(res, key=lambda x: x[1].lower())
 
 
 def requires_file(scan_type):
     if scan_type not in PARSERS:
         return False
-    parser = PARSERS[scan_type]
-    if hasattr(parser, "requires_file"):
-        return parser.requires_file(scan_type)
-    # Set a sane default to require files since it is the
-    # more commen scenario.
-    return True
+    return PARSERS.get_info(scan_type)["requires_file"]
 
 
 def get_api_scan_configuration_hints():
     res = []
     inactive_test_types = get_inactive_test_types()
-    for name, parser in PARSERS.items():
-        if name not in inactive_test_types and hasattr(parser, "api_scan_configuration_hint"):
+    for name in PARSERS:
+        if name not in inactive_test_types and PARSERS.get_info(name)["api_scan_configuration_hint"]:
+            parser = PARSERS[name]
             scan_types = parser.get_scan_types()
             for scan_type in scan_types:
                 tool_type = parser.requires_tool_type(scan_type)
@@ -101,25 +191,52 @@ def get_api_scan_configuration_hints():
 def requires_tool_type(scan_type):
     if scan_type not in PARSERS:
         return None
-    parser = PARSERS[scan_type]
-    if hasattr(parser, "requires_tool_type"):
-        return parser.requires_tool_type(scan_type)
-    return None
+    return PARSERS.get_info(scan_type)["requires_tool_type"]
+
 
+def get_parser_modules(exclude=()):
+    """Returns the names of the modules in this package that contain a parser.py"""
+    package_dir = Path(__file__).resolve().parent
+    # check if it's dir, and if it's a Python module
+    return sorted(module_name for module_name in os.listdir(package_dir)  # noqa: PTH208
+                  if module_name not in exclude and (package_dir / module_name).is_dir()
+                  and find_spec(f"dojo.tools.{module_name}.parser"))
 
-# iterate through the modules in the current package
-package_dir = str(Path(__file__).resolve().parent)
-for module_name in os.listdir(package_dir):  # noqa: PTH208
-    # check if it's dir
-    if (Path(package_dir) / module_name).is_dir():
+
+def import_parsers(module_names, register):
+    for module_name in module_names:
         try:
-            # check if it's a Python module
-            if find_spec(f"dojo.tools.{module_name}.parser"):
-                # import the module and iterate through its attributes
-                module = import_module(f"dojo.tools.{module_name}.parser")
-                for attribute_name in dir(module):
-                    attribute = getattr(module, attribute_name)
-                    if isclass(attribute) and attribute_name.lower() == module_name.replace("_", "") + "parser":
-                        register(attribute)
+            # import the module and iterate through its attributes
+            module = import_module(f"dojo.tools.{module_name}.parser")
+            for attribute_name in dir(module):
+                attribute = getattr(module, attribute_name)
+                if isclass(attribute) and attribute_name.lower() == module_name.replace("_", "") + "parser":
+                    register(attribute)
         except:
             logger.exception(f"failed to load {module_name}")
+
+
+def build_parsers_manifest():
+    """Imports all the parsers of this package and returns the manifest that lists them"""
+    module_names = get_parser_modules()
+    scan_types = {}
+
+    def add_to_manifest(parser_type):
+        for scan_type in parser_type().get_scan_types():
+            scan_types[scan_type] = get_parser_info(scan_type, create_parser(parser_type, scan_type))
+
+    import_parsers(module_names, add_to_manifest)
+    return {"modules": module_names, "scan_types": dict(sorted(scan_types.items()))}
+
+
+def read_parsers_manifest():
+    if not settings.PARSERS_MANIFEST_ENABLED or not MANIFEST_PATH.is_file():
+        return {"modules": [], "scan_types": {}}
+    with MANIFEST_PATH.open(encoding="utf-8") as manifest_file:
+        return json.load(manifest_file)
+
+
+# iterate through the modules in the current package, the ones in the manifest are imported on first use
+manifest = read_parsers_manifest()
+PARSERS.manifest = manifest["scan_types"]
+import_parsers(get_parser_modules(exclude=set(manifest["modules"])), register)
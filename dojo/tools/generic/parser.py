@@ -37,5 +37,20 @@ class GenericParser:
         data = json.load(filename)
         return [GenericJSONParser()._get_test_json(data)]
 
+    def iter_findings(self, filename, test):
+        """
+        Streaming version of `get_findings`. Only JSON reports are streamed, as the findings
+        of CSV reports are aggregated over the whole file
+        """
+        if filename.name.lower().endswith(".json"):
+            return GenericJSONParser()._iter_test_json(filename).findings
+        return iter(self.get_findings(filename, test))
+
+    def iter_tests(self, scan_type, filename):
+        """Streaming version of `get_tests`, the findings of the JSON test are read lazily"""
+        if filename.name.lower().endswith(".csv"):
+            return self.get_tests(scan_type, filename)
+        return [GenericJSONParser()._iter_test_json(filename)]
+
     def requires_file(self, scan_type):
         return True
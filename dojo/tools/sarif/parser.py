@@ -8,6 +8,7 @@ from django.utils.translation import gettext as _
 
 from dojo.models import Finding
 from dojo.tools.parser_test import ParserTest
+from dojo.tools.utils import iter_json_array, load_json_excluding
 
 logger = logging.getLogger(__name__)
 
@@ -119,18 +120,47 @@ class SarifParser:
             tests.append(test)
         return tests
 
+    def iter_findings(self, filehandle, test):
+        """
+        Streaming version of `get_findings`. The report is first read without the results of
+        the runs, then the results of each run are read one at a time
+        """
+        for index, run in enumerate(self.__load_runs_without_results(filehandle)):
+            yield from self.__iter_streamed_items_from_run(filehandle, index, run)
+
+    def iter_tests(self, scan_type, handle):
+        """Streaming version of `get_tests`, the findings of each test are read lazily"""
+        tests = []
+        for index, run in enumerate(self.__load_runs_without_results(handle)):
+            test = ParserTest(
+                name=run["tool"]["driver"]["name"],
+                parser_type=run["tool"]["driver"]["name"],
+                version=run["tool"]["driver"].get("version"),
+            )
+            test.findings = self.__iter_streamed_items_from_run(handle, index, run)
+            tests.append(test)
+        return tests
+
+    def __load_runs_without_results(self, filehandle):
+        return load_json_excluding(filehandle, [("runs", "*", "results")]).get("runs", [])
+
+    def __iter_streamed_items_from_run(self, filehandle, index, run):
+        filehandle.seek(0)
+        yield from self.__iter_items_from_run(run, iter_json_array(filehandle, ("runs", index, "results")))
+
     def __get_items_from_run(self, run):
-        items = []
+        return list(self.__iter_items_from_run(run, run.get("results", [])))
+
+    def __iter_items_from_run(self, run, results):
         # load rules
         rules = get_rules(run)
         artifacts = get_artifacts(run)
         # get the timestamp of the run if possible
         run_date = self.__get_last_invocation_date(run)
-        for result in run.get("results", []):
+        for result in results:
             result_items = get_items_from_result(result, rules, artifacts, run_date)
             if result_items:
-                items.extend(result_items)
-        return items
+                yield from result_items
 
     def __get_last_invocation_date(self, data):
         invocations = data.get("invocations", [])
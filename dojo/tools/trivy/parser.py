@@ -4,6 +4,7 @@ import json
 import logging
 
 from dojo.models import Finding
+from dojo.tools.utils import JSONStreamReader
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +74,36 @@ class TrivyParser:
             data = json.loads(str(scan_data, "utf-8"))
         except Exception:
             data = json.loads(scan_data)
-
+        return self.get_findings_from_data(test, data)
+
+    def iter_findings(self, scan_file, test):
+        """
+        Streaming version of `get_findings`. The results of the legacy and version 2 formats
+        are read one target at a time, while cluster reports are still read as a whole
+        """
+        reader = JSONStreamReader(scan_file)
+        # Legacy format with results
+        if reader.peek() == "[":
+            for _ in reader.iter_array():
+                yield from self.get_result_items(test, [reader.read_value()])
+            return
+        if reader.peek() != "{":
+            yield from self.get_findings_from_data(test, reader.read_value())
+            return
+        data = {}
+        for key in reader.iter_object():
+            # trivy writes the schema version before the results
+            if key == "Results" and data.get("SchemaVersion") == 2 and reader.peek() == "[":
+                for _ in reader.iter_array():
+                    yield from self.get_result_items(test, [reader.read_value()], artifact_name=data.get("ArtifactName", ""))
+                data[key] = []
+            elif key in {"SchemaVersion", "ArtifactName", "ClusterName", "Results", "Vulnerabilities", "Misconfigurations", "Resources"}:
+                data[key] = reader.read_value()
+            else:
+                reader.skip_value()
+        yield from self.get_findings_from_data(test, data)
+
+    def get_findings_from_data(self, test, data):
         # Legacy format is empty
         if data is None:
             return []
@@ -1,8 +1,12 @@
+import codecs
 import json
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
 
 def get_npm_cwe(item_node):
     """
@@ -27,3 +31,177 @@ def get_npm_cwe(item_node):
 
     # Use CWE-1035 as fallback (vulnerable third party component)
     return 1035
+
+
+class JSONStreamReader:
+
+    """
+    Incremental reader for large JSON documents that only keeps the part of the document
+    that is currently being parsed in memory. Containers can be walked with `iter_object`
+    and `iter_array`, which hand over control after each key or element so that the caller
+    decides whether to read the value with `read_value`, skip it with `skip_value` or
+    descend into it. Both text and binary file handles are supported
+    """
+
+    def __init__(self, filehandle, chunk_size=65536):
+        self.filehandle = filehandle
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        """Appends the next chunk of the file to the buffer, returns False once the end of the file was reached"""
+        if self.eof:
+            return False
+        data = self.filehandle.read(size or self.chunk_size)
+        self.eof = not data
+        if isinstance(data, bytes):
+            data = self.text_decoder.decode(data, final=self.eof)
+        self.buffer = self.buffer[self.position:] + (data or "")
+        self.position = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            self.position = WHITESPACE_REGEX.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self._fill():
+                return
+
+    def peek(self):
+        """Returns the next non whitespace character without consuming it, or an empty string at the end of the document"""
+        self._skip_whitespace()
+        return self.buffer[self.position:self.position + 1]
+
+    def _consume(self, expected):
+        character = self.peek()
+        if character not in expected:
+            msg = f"Invalid JSON: expected one of {expected!r} but got {character or 'end of file'!r}"
+            raise ValueError(msg)
+        self.position += 1
+        return character
+
+    def read_value(self):
+        """Reads and returns the next complete JSON value"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # grow the buffer geometrically so that big values are not decoded over and over
+            self._fill(max(self.chunk_size, len(self.buffer) - self.position))
+
+    def skip_value(self):
+        """Skips the next JSON value, only holding one element of it in memory at a time"""
+        character = self.peek()
+        if character == "{":
+            for _ in self.iter_object():
+                self.read_value()
+        elif character == "[":
+            for _ in self.iter_array():
+                self.read_value()
+        else:
+            self.read_value()
+
+    def iter_object(self):
+        """
+        Walks the members of the next JSON object and yields their keys. The value of each
+        member must be consumed by the caller before requesting the next key
+        """
+        self._consume("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            if self.peek() != '"':
+                msg = "Invalid JSON: object keys must be strings"
+                raise ValueError(msg)
+            key = self.read_value()
+            self._consume(":")
+            yield key
+            if self._consume(",}") == "}":
+                return
+
+    def iter_array(self):
+        """
+        Walks the elements of the next JSON array and yields their index. Each element must
+        be consumed by the caller before requesting the next one
+        """
+        self._consume("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        index = 0
+        while True:
+            yield index
+            if self._consume(",]") == "]":
+                return
+            index += 1
+
+    def read_value_excluding(self, excluded_paths, path=()):
+        """
+        Reads the next JSON value, leaving out the members found at any of the excluded paths.
+        A path is a tuple of object keys, where "*" matches every element of an array
+        """
+        if not any(excluded[:len(path)] == path for excluded in excluded_paths):
+            return self.read_value()
+        character = self.peek()
+        if character == "{":
+            value = {}
+            for key in self.iter_object():
+                if (*path, key) in excluded_paths:
+                    self.skip_value()
+                else:
+                    value[key] = self.read_value_excluding(excluded_paths, (*path, key))
+            return value
+        if character == "[":
+            return [self.read_value_excluding(excluded_paths, (*path, "*")) for _ in self.iter_array()]
+        return self.read_value()
+
+    def iter_array_at(self, path):
+        """
+        Yields the elements of the array found at the supplied path of the next JSON value,
+        reading a single element at a time. A path is a tuple of object keys and array indexes,
+        where "*" matches every element of an array. Nothing is yielded when the path is missing
+        """
+        character = self.peek()
+        if not path:
+            if character == "[":
+                for _ in self.iter_array():
+                    yield self.read_value()
+            else:
+                self.skip_value()
+            return
+        head, rest = path[0], path[1:]
+        if character == "{" and isinstance(head, str) and head != "*":
+            for key in self.iter_object():
+                if key == head:
+                    yield from self.iter_array_at(rest)
+                else:
+                    self.skip_value()
+        elif character == "[" and (head == "*" or isinstance(head, int)):
+            for index in self.iter_array():
+                if head in {"*", index}:
+                    yield from self.iter_array_at(rest)
+                else:
+                    self.skip_value()
+        else:
+            self.skip_value()
+
+
+def load_json_excluding(filehandle, excluded_paths):
+    """Loads a JSON document without the (usually big) members found at the excluded paths"""
+    return JSONStreamReader(filehandle).read_value_excluding(set(excluded_paths))
+
+
+def iter_json_array(filehandle, path):
+    """Yields the elements of the array found at the supplied path of a JSON document one at a time"""
+    yield from JSONStreamReader(filehandle).iter_array_at(tuple(path))
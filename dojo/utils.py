@@ -7,7 +7,9 @@ import mimetypes
 import os
 import pathlib
 import re
+import threading
 from calendar import monthrange
+from collections import Counter
 from collections.abc import Callable
 from datetime import date, datetime, timedelta
 from math import pi, sqrt
@@ -18,6 +20,9 @@ import crum
 import hyperlink
 import vobject
 from asteval import Interpreter
+from auditlog.cid import get_cid
+from auditlog.diff import model_instance_diff
+from auditlog.models import LogEntry
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from dateutil.parser import parse
@@ -25,9 +30,25 @@ from dateutil.relativedelta import MO, SU, relativedelta
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
-from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Coalesce, TruncDate
 from django.db.models.query import QuerySet
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -56,15 +77,19 @@ from dojo.models import (
     Engagement,
     FileUpload,
     Finding,
+    Finding_Daily_Metrics,
     Finding_Group,
     Finding_Template,
+    JIRA_Project,
     Language_Type,
     Languages,
     Notifications,
     Product,
+    Risk_Acceptance,
     System_Settings,
     Test,
     User,
+    get_current_date,
 )
 from dojo.notifications.helper import create_notification
 
@@ -235,10 +260,6 @@ def is_deduplication_on_engagement_mismatch(new_finding, to_duplicate_finding):
     return not new_finding.test.engagement.deduplication_on_engagement and to_duplicate_finding.test.engagement.deduplication_on_engagement
 
 
-def get_endpoints_as_url(finding):
-    return [hyperlink.parse(str(e)) for e in finding.endpoints.all()]
-
-
 def are_urls_equal(url1, url2, fields):
     # Possible values are: scheme, host, port, path, query, fragment, userinfo, and user.
     # For a details description see https://hyperlink.readthedocs.io/en/latest/api.html#attributes
@@ -280,13 +301,17 @@ def are_endpoints_duplicates(new_finding, to_duplicate_finding):
         deduplicationLogger.debug("deduplication by endpoint fields is disabled")
         return True
 
-    list1 = get_endpoints_as_url(new_finding)
-    list2 = get_endpoints_as_url(to_duplicate_finding)
-
-    deduplicationLogger.debug(f"Starting deduplication by endpoint fields for finding {new_finding.id} with urls {list1} and finding {to_duplicate_finding.id} with urls {list2}")
-    if list1 == [] and list2 == []:
+    endpoints1 = list(new_finding.endpoints.all())
+    endpoints2 = list(to_duplicate_finding.endpoints.all())
+    if endpoints1 == [] and endpoints2 == []:
+        return True
+    # endpoints with the same canonical URL are equal in all the fields
+    if {endpoint.get_canonical_url_hash() for endpoint in endpoints1} & {endpoint.get_canonical_url_hash() for endpoint in endpoints2}:
         return True
 
+    list1 = [hyperlink.parse(str(endpoint)) for endpoint in endpoints1]
+    list2 = [hyperlink.parse(str(endpoint)) for endpoint in endpoints2]
+    deduplicationLogger.debug(f"Starting deduplication by endpoint fields for finding {new_finding.id} with urls {list1} and finding {to_duplicate_finding.id} with urls {list2}")
     for l1 in list1:
         for l2 in list2:
             if are_urls_equal(l1, l2, fields):
@@ -330,37 +355,198 @@ def do_dedupe_finding(new_finding, *args, **kwargs):
     return None
 
 
-def deduplicate_legacy(new_finding):
+@dojo_async_task
+@app.task
+def do_dedupe_findings_batch_task(finding_ids, *args, **kwargs):
+    findings = Finding.objects.filter(id__in=finding_ids).select_related("test__engagement__product", "test__test_type")
+    return do_dedupe_findings_batch(list(findings), *args, **kwargs)
+
+
+def do_dedupe_findings_batch(findings, *args, **kwargs):
+    """
+    Deduplicates many new findings at once, i.e. all findings of a test or an import.
+
+    The candidate originals for all findings are fetched with one query per product or engagement
+    (depending on deduplication_on_engagement) instead of one query per finding. Each finding is then
+    deduplicated in order of id with the same logic as do_dedupe_finding, as if it was called right
+    after each of the findings was created: a finding is never marked as a duplicate of a finding
+    that comes after it in the batch.
+    """
+    if dedupe_method := get_custom_method("FINDING_DEDUPE_METHOD"):
+        for finding in findings:
+            dedupe_method(finding, *args, **kwargs)
+        return
+
+    try:
+        enabled = System_Settings.objects.get(no_cache=True).enable_deduplication
+    except System_Settings.DoesNotExist:
+        logger.warning("system settings not found")
+        enabled = False
+    if not enabled:
+        deduplicationLogger.debug("dedupe: skipping dedupe because it's disabled in system settings get()")
+        return
+
+    findings = sorted(findings, key=lambda finding: finding.id)
+    if not findings:
+        return
+    prefetch_related_objects(findings, "test__engagement__product", "test__test_type", "endpoints")
+    # Findings in the batch are represented by the same instance when they are a candidate for
+    # another finding in the batch, so their status is always up to date
+    batch = {finding.id: finding for finding in findings}
+
+    findings_per_scope = {}
+    for finding in findings:
+        findings_per_scope.setdefault(get_dedupe_scope(finding), []).append(finding)
+    candidates_per_scope = {
+        scope: index_dedupe_candidates(scope, get_dedupe_candidates(scope, scope_findings, batch))
+        for scope, scope_findings in findings_per_scope.items()
+    }
+
+    try:
+        for new_finding in findings:
+            scope = get_dedupe_scope(new_finding)
+            deduplication_algorithm = scope[0]
+            deduplicationLogger.debug("dedupe for: " + str(new_finding.id)
+                        + ":" + str(new_finding.title))
+            deduplicationLogger.debug("deduplication algorithm: " + deduplication_algorithm)
+            existing_findings = [
+                candidate for candidate in match_dedupe_candidates(scope, candidates_per_scope[scope], new_finding)
+                if candidate.id != new_finding.id
+                and not candidate.duplicate
+                and (candidate.id not in batch or candidate.id < new_finding.id)
+            ]
+            if deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL:
+                deduplicate_unique_id_from_tool(new_finding, existing_findings)
+            elif deduplication_algorithm == settings.DEDUPE_ALGO_HASH_CODE:
+                deduplicate_hash_code(new_finding, existing_findings)
+            elif deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE:
+                deduplicate_uid_or_hash_code(new_finding, existing_findings)
+            else:
+                deduplicationLogger.debug("no configuration per parser found; using legacy algorithm")
+                deduplicate_legacy(new_finding, existing_findings)
+    finally:
+        # the endpoints of the findings may still change after this, so do not leave them cached
+        for finding in findings:
+            getattr(finding, "_prefetched_objects_cache", {}).pop("endpoints", None)
+
+
+def get_dedupe_scope(finding):
+    """Returns the deduplication algorithm together with the product or engagement to look for duplicates in"""
+    engagement = finding.test.engagement
+    if engagement.deduplication_on_engagement:
+        return (finding.test.deduplication_algorithm, "engagement", engagement.id)
+    return (finding.test.deduplication_algorithm, "product", engagement.product_id)
+
+
+def get_dedupe_candidates(scope, findings, batch):
+    """Fetches the findings in the scope that could be an original of any of the given findings in a single query"""
+    deduplication_algorithm, scope_type, scope_id = scope
+    scope_filter = {"test__engagement": scope_id} if scope_type == "engagement" else {"test__engagement__product": scope_id}
+    hash_codes = {finding.hash_code for finding in findings if finding.hash_code is not None}
+    unique_ids = {finding.unique_id_from_tool for finding in findings if finding.unique_id_from_tool is not None}
+
+    if deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL:
+        condition = Q(unique_id_from_tool__in=unique_ids)
+    elif deduplication_algorithm == settings.DEDUPE_ALGO_HASH_CODE:
+        condition = Q(hash_code__in=hash_codes)
+    elif deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE:
+        condition = Q(hash_code__in=hash_codes) | Q(unique_id_from_tool__in=unique_ids)
+    else:
+        cwes = {finding.cwe for finding in findings if finding.cwe != 0}
+        condition = Q(cwe__in=cwes) | Q(title__in={finding.title for finding in findings})
+        if None in cwes:
+            condition |= Q(cwe__isnull=True)
+
+    candidates = (
+        Finding.objects.filter(condition, **scope_filter)
+        .exclude(duplicate=True)
+        .select_related("test__engagement", "test__test_type")
+        .prefetch_related("endpoints")
+        .order_by("id")
+    )
+    return [batch.get(candidate.id, candidate) for candidate in candidates]
+
+
+def index_dedupe_candidates(scope, candidates):
+    """Indexes the candidates of a scope by the values used to match them for the deduplication algorithm"""
+    deduplication_algorithm, scope_type, _ = scope
+    index = {}
+    for candidate in candidates:
+        if deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL:
+            if candidate.unique_id_from_tool is not None:
+                # the unique_id_from_tool is unique for a given tool: do not compare with other tools, except inside an engagement
+                test_type_id = candidate.test.test_type_id if scope_type == "product" else None
+                index.setdefault(("unique_id_from_tool", test_type_id, candidate.unique_id_from_tool), []).append(candidate)
+        elif deduplication_algorithm == settings.DEDUPE_ALGO_HASH_CODE:
+            if candidate.hash_code is not None:
+                index.setdefault(("hash_code", candidate.hash_code), []).append(candidate)
+        elif deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE:
+            if candidate.hash_code is not None:
+                index.setdefault(("hash_code", candidate.hash_code), []).append(candidate)
+            if candidate.unique_id_from_tool is not None:
+                index.setdefault(("unique_id_from_tool", candidate.test.test_type_id, candidate.unique_id_from_tool), []).append(candidate)
+        else:
+            if candidate.cwe != 0:
+                index.setdefault(("cwe", candidate.cwe), []).append(candidate)
+            index.setdefault(("title", candidate.title), []).append(candidate)
+    return index
+
+
+def match_dedupe_candidates(scope, index, new_finding):
+    """Returns the indexed candidates matching the new finding, ordered by id"""
+    deduplication_algorithm, scope_type, _ = scope
+    if deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL:
+        test_type_id = new_finding.test.test_type_id if scope_type == "product" else None
+        keys = [("unique_id_from_tool", test_type_id, new_finding.unique_id_from_tool)]
+    elif deduplication_algorithm == settings.DEDUPE_ALGO_HASH_CODE:
+        keys = [("hash_code", new_finding.hash_code)]
+    elif deduplication_algorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE:
+        keys = [
+            ("hash_code", new_finding.hash_code),
+            ("unique_id_from_tool", new_finding.test.test_type_id, new_finding.unique_id_from_tool),
+        ]
+    else:
+        keys = [("cwe", new_finding.cwe), ("title", new_finding.title)]
+    matches = {candidate.id: candidate for key in keys for candidate in index.get(key, [])}
+    return [matches[candidate_id] for candidate_id in sorted(matches)]
+
+
+def deduplicate_legacy(new_finding, existing_findings=None):
     # ---------------------------------------------------------
     # 1) Collects all the findings that have the same:
     #      (title  and static_finding and dynamic_finding)
     #      or (CWE and static_finding and dynamic_finding)
     #    as the new one
     #    (this is "cond1")
+    #    unless these have been collected already by do_dedupe_findings_batch
     # ---------------------------------------------------------
-    if new_finding.test.engagement.deduplication_on_engagement:
-        eng_findings_cwe = Finding.objects.filter(
-            test__engagement=new_finding.test.engagement,
-            cwe=new_finding.cwe).exclude(id=new_finding.id).exclude(cwe=0).exclude(duplicate=True).values("id")
-        eng_findings_title = Finding.objects.filter(
-            test__engagement=new_finding.test.engagement,
-            title=new_finding.title).exclude(id=new_finding.id).exclude(duplicate=True).values("id")
+    if existing_findings is None:
+        if new_finding.test.engagement.deduplication_on_engagement:
+            eng_findings_cwe = Finding.objects.filter(
+                test__engagement=new_finding.test.engagement,
+                cwe=new_finding.cwe).exclude(id=new_finding.id).exclude(cwe=0).exclude(duplicate=True).values("id")
+            eng_findings_title = Finding.objects.filter(
+                test__engagement=new_finding.test.engagement,
+                title=new_finding.title).exclude(id=new_finding.id).exclude(duplicate=True).values("id")
+        else:
+            eng_findings_cwe = Finding.objects.filter(
+                test__engagement__product=new_finding.test.engagement.product,
+                cwe=new_finding.cwe).exclude(id=new_finding.id).exclude(cwe=0).exclude(duplicate=True).values("id")
+            eng_findings_title = Finding.objects.filter(
+                test__engagement__product=new_finding.test.engagement.product,
+                title=new_finding.title).exclude(id=new_finding.id).exclude(duplicate=True).values("id")
+
+        total_findings = Finding.objects.filter(Q(id__in=eng_findings_cwe) | Q(id__in=eng_findings_title)).prefetch_related("endpoints", "test", "test__engagement", "found_by", "original_finding", "test__test_type")
+        deduplicationLogger.debug("Found "
+            + str(len(eng_findings_cwe)) + " findings with same cwe, "
+            + str(len(eng_findings_title)) + " findings with same title: "
+            + str(len(total_findings)) + " findings with either same title or same cwe")
+        # total_findings = total_findings.order_by('date')
+        existing_findings = total_findings.order_by("id")
     else:
-        eng_findings_cwe = Finding.objects.filter(
-            test__engagement__product=new_finding.test.engagement.product,
-            cwe=new_finding.cwe).exclude(id=new_finding.id).exclude(cwe=0).exclude(duplicate=True).values("id")
-        eng_findings_title = Finding.objects.filter(
-            test__engagement__product=new_finding.test.engagement.product,
-            title=new_finding.title).exclude(id=new_finding.id).exclude(duplicate=True).values("id")
-
-    total_findings = Finding.objects.filter(Q(id__in=eng_findings_cwe) | Q(id__in=eng_findings_title)).prefetch_related("endpoints", "test", "test__engagement", "found_by", "original_finding", "test__test_type")
-    deduplicationLogger.debug("Found "
-        + str(len(eng_findings_cwe)) + " findings with same cwe, "
-        + str(len(eng_findings_title)) + " findings with same title: "
-        + str(len(total_findings)) + " findings with either same title or same cwe")
+        deduplicationLogger.debug("Found " + str(len(existing_findings)) + " findings with either same title or same cwe")
 
-    # total_findings = total_findings.order_by('date')
-    for find in total_findings.order_by("id"):
+    for find in existing_findings:
         flag_endpoints = False
         flag_line_path = False
         flag_hash = False
@@ -418,23 +604,25 @@ def deduplicate_legacy(new_finding):
             break
 
 
-def deduplicate_unique_id_from_tool(new_finding):
-    if new_finding.test.engagement.deduplication_on_engagement:
-        existing_findings = Finding.objects.filter(
-            test__engagement=new_finding.test.engagement,
-            unique_id_from_tool=new_finding.unique_id_from_tool).exclude(
-                id=new_finding.id).exclude(
-                    unique_id_from_tool=None).exclude(
-                        duplicate=True).order_by("id")
-    else:
-        existing_findings = Finding.objects.filter(
-            test__engagement__product=new_finding.test.engagement.product,
-            # the unique_id_from_tool is unique for a given tool: do not compare with other tools
-            test__test_type=new_finding.test.test_type,
-            unique_id_from_tool=new_finding.unique_id_from_tool).exclude(
-                id=new_finding.id).exclude(
-                    unique_id_from_tool=None).exclude(
-                        duplicate=True).order_by("id")
+def deduplicate_unique_id_from_tool(new_finding, existing_findings=None):
+    # candidates may have been collected already by do_dedupe_findings_batch
+    if existing_findings is None:
+        if new_finding.test.engagement.deduplication_on_engagement:
+            existing_findings = Finding.objects.filter(
+                test__engagement=new_finding.test.engagement,
+                unique_id_from_tool=new_finding.unique_id_from_tool).exclude(
+                    id=new_finding.id).exclude(
+                        unique_id_from_tool=None).exclude(
+                            duplicate=True).order_by("id")
+        else:
+            existing_findings = Finding.objects.filter(
+                test__engagement__product=new_finding.test.engagement.product,
+                # the unique_id_from_tool is unique for a given tool: do not compare with other tools
+                test__test_type=new_finding.test.test_type,
+                unique_id_from_tool=new_finding.unique_id_from_tool).exclude(
+                    id=new_finding.id).exclude(
+                        unique_id_from_tool=None).exclude(
+                            duplicate=True).order_by("id")
 
     deduplicationLogger.debug("Found "
         + str(len(existing_findings)) + " findings with same unique_id_from_tool")
@@ -451,21 +639,23 @@ def deduplicate_unique_id_from_tool(new_finding):
             continue
 
 
-def deduplicate_hash_code(new_finding):
-    if new_finding.test.engagement.deduplication_on_engagement:
-        existing_findings = Finding.objects.filter(
-            test__engagement=new_finding.test.engagement,
-            hash_code=new_finding.hash_code).exclude(
-                id=new_finding.id).exclude(
-                    hash_code=None).exclude(
-                        duplicate=True).order_by("id")
-    else:
-        existing_findings = Finding.objects.filter(
-            test__engagement__product=new_finding.test.engagement.product,
-            hash_code=new_finding.hash_code).exclude(
-                id=new_finding.id).exclude(
-                    hash_code=None).exclude(
-                        duplicate=True).order_by("id")
+def deduplicate_hash_code(new_finding, existing_findings=None):
+    # candidates may have been collected already by do_dedupe_findings_batch
+    if existing_findings is None:
+        if new_finding.test.engagement.deduplication_on_engagement:
+            existing_findings = Finding.objects.filter(
+                test__engagement=new_finding.test.engagement,
+                hash_code=new_finding.hash_code).exclude(
+                    id=new_finding.id).exclude(
+                        hash_code=None).exclude(
+                            duplicate=True).order_by("id")
+        else:
+            existing_findings = Finding.objects.filter(
+                test__engagement__product=new_finding.test.engagement.product,
+                hash_code=new_finding.hash_code).exclude(
+                    id=new_finding.id).exclude(
+                        hash_code=None).exclude(
+                            duplicate=True).order_by("id")
 
     deduplicationLogger.debug("Found "
         + str(len(existing_findings)) + " findings with same hash_code")
@@ -483,23 +673,25 @@ def deduplicate_hash_code(new_finding):
             continue
 
 
-def deduplicate_uid_or_hash_code(new_finding):
-    if new_finding.test.engagement.deduplication_on_engagement:
-        existing_findings = Finding.objects.filter(
-            (Q(hash_code__isnull=False) & Q(hash_code=new_finding.hash_code))
-            # unique_id_from_tool can only apply to the same test_type because it is parser dependent
-            | (Q(unique_id_from_tool__isnull=False) & Q(unique_id_from_tool=new_finding.unique_id_from_tool) & Q(test__test_type=new_finding.test.test_type)),
-            test__engagement=new_finding.test.engagement).exclude(
-                id=new_finding.id).exclude(
-                        duplicate=True).order_by("id")
-    else:
-        # same without "test__engagement=new_finding.test.engagement" condition
-        existing_findings = Finding.objects.filter(
-            (Q(hash_code__isnull=False) & Q(hash_code=new_finding.hash_code))
-            | (Q(unique_id_from_tool__isnull=False) & Q(unique_id_from_tool=new_finding.unique_id_from_tool) & Q(test__test_type=new_finding.test.test_type)),
-            test__engagement__product=new_finding.test.engagement.product).exclude(
-                id=new_finding.id).exclude(
-                        duplicate=True).order_by("id")
+def deduplicate_uid_or_hash_code(new_finding, existing_findings=None):
+    # candidates may have been collected already by do_dedupe_findings_batch
+    if existing_findings is None:
+        if new_finding.test.engagement.deduplication_on_engagement:
+            existing_findings = Finding.objects.filter(
+                (Q(hash_code__isnull=False) & Q(hash_code=new_finding.hash_code))
+                # unique_id_from_tool can only apply to the same test_type because it is parser dependent
+                | (Q(unique_id_from_tool__isnull=False) & Q(unique_id_from_tool=new_finding.unique_id_from_tool) & Q(test__test_type=new_finding.test.test_type)),
+                test__engagement=new_finding.test.engagement).exclude(
+                    id=new_finding.id).exclude(
+                            duplicate=True).order_by("id")
+        else:
+            # same without "test__engagement=new_finding.test.engagement" condition
+            existing_findings = Finding.objects.filter(
+                (Q(hash_code__isnull=False) & Q(hash_code=new_finding.hash_code))
+                | (Q(unique_id_from_tool__isnull=False) & Q(unique_id_from_tool=new_finding.unique_id_from_tool) & Q(test__test_type=new_finding.test.test_type)),
+                test__engagement__product=new_finding.test.engagement.product).exclude(
+                    id=new_finding.id).exclude(
+                            duplicate=True).order_by("id")
     deduplicationLogger.debug("Found "
         + str(len(existing_findings)) + " findings with either the same unique_id_from_tool or hash_code")
     for find in existing_findings:
@@ -1135,6 +1327,9 @@ def opened_in_period(start_date, end_date, **kwargs):
         end_date.month,
         end_date.day,
         tzinfo=timezone.get_current_timezone())
+    # The daily metrics rollup can only be filtered on product level
+    if settings.METRICS_DAILY_ROLLUP and all(key.startswith("test__engagement__product") for key in kwargs):
+        return opened_in_period_from_daily_metrics(start_date, end_date, **kwargs)
     if get_system_setting("enforce_verified_status", True) or get_system_setting("enforce_verified_status_metrics", True):
         opened_in_period = Finding.objects.filter(
             date__range=[start_date, end_date],
@@ -1271,6 +1466,50 @@ def opened_in_period(start_date, end_date, **kwargs):
     return oip
 
 
+def opened_in_period_from_daily_metrics(start_date, end_date, **kwargs):
+    """Same as `opened_in_period`, but reads the counts of unresolved findings from the daily metrics rollup"""
+    if get_system_setting("enforce_verified_status", True) or get_system_setting("enforce_verified_status_metrics", True):
+        count_field = "unresolved_verified_count"
+    else:
+        count_field = "unresolved_count"
+    severities = ("Critical", "High", "Medium", "Low")
+    daily_metrics = Finding_Daily_Metrics.objects.filter(
+        severity__in=severities,
+        **{key.replace("test__engagement__product", "product", 1): value for key, value in kwargs.items()})
+    opened_in_period = daily_metrics.filter(
+        date__range=[start_date, end_date]).values("numerical_severity").annotate(count=Sum(count_field)).order_by()
+
+    oip = {
+        "S0": 0,
+        "S1": 0,
+        "S2": 0,
+        "S3": 0,
+        "Total": None,
+        "start_date": start_date,
+        "end_date": end_date,
+        # The mitigation date is not part of the rollup
+        "closed": Finding.objects.filter(
+            mitigated__date__range=[start_date, end_date],
+            **kwargs,
+            severity__in=severities).aggregate(
+                total=Sum(
+                    Case(
+                        When(
+                            severity__in=severities,
+                            then=Value(1)),
+                        output_field=IntegerField())))["total"],
+        "to_date_total": daily_metrics.filter(date__lte=end_date.date()).aggregate(total=Sum(count_field))["total"] or 0,
+    }
+    # grouped by the numerical severity stored on the findings, which is not always the one of their severity
+    for o in opened_in_period:
+        if o["count"]:
+            oip[o["numerical_severity"]] = o["count"]
+    # Like the aggregation over the findings, the total is None when there is nothing open in the period
+    oip["Total"] = sum(o["count"] for o in opened_in_period) or None
+
+    return oip
+
+
 class FileIterWrapper:
     def __init__(self, flo, chunk_size=1024**2):
         self.flo = flo
@@ -1563,51 +1802,117 @@ def get_setting(setting):
     return getattr(settings, setting)
 
 
+# The keyword arguments are passed to grade_product in this order
+PRODUCT_GRADE_COUNTS = {
+    "critical": Count("id", filter=Q(severity="Critical")),
+    "high": Count("id", filter=Q(severity="High")),
+    "medium": Count("id", filter=Q(severity="Medium")),
+    "low": Count("id", filter=Q(severity="Low")),
+}
+PRODUCT_GRADE_PENDING_KEY = "dojo_product_grade_pending_{}"
+
+# The interpreter in which the grade_product function of the system settings has been defined
+_product_grade_interpreter = {}
+_product_grade_interpreter_lock = threading.Lock()
+
+
+def evaluate_product_grade(product_grade, critical, high, medium, low):
+    """
+    Calls the grade_product function defined in the system settings. Creating the interpreter and
+    evaluating the definition is only done again once the definition in the system settings changes
+    """
+    with _product_grade_interpreter_lock:
+        aeval = _product_grade_interpreter.get(product_grade)
+        if aeval is None:
+            aeval = Interpreter()
+            aeval(product_grade)
+            _product_grade_interpreter.clear()
+            _product_grade_interpreter[product_grade] = aeval
+        return aeval(f"grade_product({critical}, {high}, {medium}, {low})")
+
+
+def get_product_grade_findings():
+    findings = Finding.objects.filter(
+            ~Q(severity="Info"),
+            active=True,
+            duplicate=False,
+            false_p=False)
+
+    if get_system_setting("enforce_verified_status", True) or get_system_setting("enforce_verified_status_product_grading", True):
+        findings = findings.filter(verified=True)
+    return findings
+
+
+def calculate_grade(product, *args, **kwargs):
+    if not product:
+        logger.warning("ignoring calculate product for product None!")
+        return
+
+    if settings.PRODUCT_GRADE_DEBOUNCE_SECONDS > 0:
+        # The calculation is delayed, so that all changes to the product until it runs are covered by it.
+        # The key expires by itself in case the task is lost
+        if not cache.add(PRODUCT_GRADE_PENDING_KEY.format(product.id), 1, timeout=settings.PRODUCT_GRADE_DEBOUNCE_SECONDS * 10):
+            logger.debug("product grade calculation for %s:%s is already scheduled", product.id, product.name)
+            return
+        kwargs["countdown"] = settings.PRODUCT_GRADE_DEBOUNCE_SECONDS
+
+    calculate_grade_task(product, *args, **kwargs)
+
+
 @dojo_model_to_id
 @dojo_async_task
 @app.task
 @dojo_model_from_id(model=Product)
-def calculate_grade(product, *args, **kwargs):
-    system_settings = System_Settings.objects.get()
+def calculate_grade_task(product, *args, **kwargs):
     if not product:
         logger.warning("ignoring calculate product for product None!")
         return
 
+    if settings.PRODUCT_GRADE_DEBOUNCE_SECONDS > 0:
+        # Changes from here on need a new calculation, as this one might not see them
+        cache.delete(PRODUCT_GRADE_PENDING_KEY.format(product.id))
+
+    system_settings = System_Settings.objects.get()
     if system_settings.enable_product_grade:
         logger.debug("calculating product grade for %s:%s", product.id, product.name)
-        findings = Finding.objects.filter(
-                ~Q(severity="Info"),
-                active=True,
-                duplicate=False,
-                false_p=False,
-                test__engagement__product=product)
-
-        if get_system_setting("enforce_verified_status", True) or get_system_setting("enforce_verified_status_product_grading", True):
-            findings = findings.filter(verified=True)
-
-        severity_values = findings.values("severity").annotate(
-                    Count("numerical_severity")).order_by()
-
-        low = 0
-        medium = 0
-        high = 0
-        critical = 0
-        for severity_count in severity_values:
-            if severity_count["severity"] == "Critical":
-                critical = severity_count["numerical_severity__count"]
-            elif severity_count["severity"] == "High":
-                high = severity_count["numerical_severity__count"]
-            elif severity_count["severity"] == "Medium":
-                medium = severity_count["numerical_severity__count"]
-            elif severity_count["severity"] == "Low":
-                low = severity_count["numerical_severity__count"]
-        aeval = Interpreter()
-        aeval(system_settings.product_grade)
-        grade_product = f"grade_product({critical}, {high}, {medium}, {low})"
-        product.prod_numeric_grade = aeval(grade_product)
+        counts = get_product_grade_findings().filter(test__engagement__product=product).aggregate(**PRODUCT_GRADE_COUNTS)
+        product.prod_numeric_grade = evaluate_product_grade(system_settings.product_grade, **counts)
         super(Product, product).save()
 
 
+def calculate_grades(products=None):
+    """
+    Calculates the grade of many products at once. The finding counts of all products are read
+    with a single query and only the grades that changed are written, with bulk updates.
+    Returns the number of products whose grade changed
+    """
+    system_settings = System_Settings.objects.get()
+    if not system_settings.enable_product_grade:
+        return 0
+
+    if products is None:
+        products = Product.objects.all()
+    counts_by_product = {
+        counts.pop("test__engagement__product"): counts
+        for counts in get_product_grade_findings()
+        .filter(test__engagement__product__in=products)
+        .order_by()
+        .values("test__engagement__product")
+        .annotate(**PRODUCT_GRADE_COUNTS)
+    }
+    no_findings = dict.fromkeys(PRODUCT_GRADE_COUNTS, 0)
+
+    changed_products = []
+    for product in products.order_by("id").only("id", "prod_numeric_grade").iterator():
+        grade = evaluate_product_grade(system_settings.product_grade, **counts_by_product.get(product.id, no_findings))
+        if grade != product.prod_numeric_grade:
+            product.prod_numeric_grade = grade
+            changed_products.append(product)
+    Product.objects.bulk_update(changed_products, ["prod_numeric_grade"], batch_size=1000)
+    logger.debug("grades of %i products changed", len(changed_products))
+    return len(changed_products)
+
+
 def get_celery_worker_status():
     from .tasks import celery_status
     res = celery_status.apply_async()
@@ -1859,19 +2164,21 @@ def sla_compute_and_notify(*args, **kwargs):
     import dojo.jira_link.helper as jira_helper
 
     class NotificationEntry:
-        def __init__(self, finding=None, jira_issue=None, *, do_jira_sla_comment=False):
+        def __init__(self, finding=None, jira_issue=None, jira_instance=None, *, do_jira_sla_comment=False):
             self.finding = finding
             self.jira_issue = jira_issue
+            self.jira_instance = jira_instance
             self.do_jira_sla_comment = do_jira_sla_comment
 
     def _add_notification(finding, kind):
-        # jira_issue, do_jira_sla_comment are taken from the context
+        # jira_issue, jira_instance, do_jira_sla_comment are taken from the context
         # kind can be one of: breached, prebreach, breaching
         if finding.test.engagement.product.disable_sla_breach_notifications:
             return
 
         notification = NotificationEntry(finding=finding,
                                          jira_issue=jira_issue,
+                                         jira_instance=jira_instance,
                                          do_jira_sla_comment=do_jira_sla_comment)
 
         pt = finding.test.engagement.product.prod_type.name
@@ -1926,7 +2233,7 @@ def sla_compute_and_notify(*args, **kwargs):
 
                         if n.do_jira_sla_comment:
                             logger.info("Creating JIRA comment to notify of SLA breach information.")
-                            jira_helper.add_simple_jira_comment(jira_instance, n.jira_issue, title)
+                            jira_helper.add_simple_jira_comment(n.jira_instance, n.jira_issue, title)
 
                         findings_list.append(n.finding)
 
@@ -1942,6 +2249,25 @@ def sla_compute_and_notify(*args, **kwargs):
                         base_url=get_script_prefix(),
                     )
 
+    def _get_jira_projects(findings):
+        # same lookup as jira_helper.get_jira_project() for all findings at once: the jira project of the
+        # engagement takes precedence over the (first) jira project of the product
+        jira_projects_by_engagement = {}
+        jira_projects_by_product = {}
+        if not jira_helper.is_jira_enabled():
+            return jira_projects_by_engagement, jira_projects_by_product
+
+        engagement_ids = {finding.test.engagement_id for finding in findings}
+        product_ids = {finding.test.engagement.product_id for finding in findings}
+        jira_projects = JIRA_Project.objects.filter(Q(engagement_id__in=engagement_ids) | Q(product_id__in=product_ids)) \
+            .select_related("jira_instance").order_by("id")
+        for jira_project in jira_projects:
+            if jira_project.engagement_id in engagement_ids:
+                jira_projects_by_engagement[jira_project.engagement_id] = jira_project
+            if jira_project.product_id in product_ids:
+                jira_projects_by_product.setdefault(jira_project.product_id, jira_project)
+        return jira_projects_by_engagement, jira_projects_by_product
+
     # exit early on flags
     system_settings = System_Settings.objects.get()
     if not system_settings.enable_notify_sla_active and not system_settings.enable_notify_sla_active_verified:
@@ -1964,10 +2290,30 @@ def sla_compute_and_notify(*args, **kwargs):
                 query = Q(active=True, is_mitigated=False, duplicate=False)
             logger.debug(f"My query: {query}")
 
-            no_jira_findings = {}
+            # Only the severities for which the SLA of the product is enforced are considered. A finding with 'Info'
+            # severity will not be considered for SLA notifications (not in model)
+            enforced_query = Q()
+            for severity in ("Critical", "High", "Medium", "Low"):
+                enforced_query |= Q(severity=severity, **{f"test__engagement__product__sla_configuration__enforce_{severity.lower()}": True})
+
+            # Only findings that expire within the notification window are selected. Findings without an expiration
+            # date count as breaching today. The days remaining of a finding with a mitigation date are counted until
+            # that date, so these findings are all selected and checked below.
+            today = get_current_date()
+            notification_window_query = Q(sla_expiration_date__isnull=True) | Q(mitigated__isnull=False) | Q(
+                sla_expiration_date__gte=today - timedelta(days=settings.SLA_NOTIFY_POST_BREACH),
+                sla_expiration_date__lte=today + timedelta(days=settings.SLA_NOTIFY_PRE_BREACH),
+            )
+
+            findings = Finding.objects.filter(query).filter(enforced_query, notification_window_query)
             if system_settings.enable_notify_sla_jira_only:
                 logger.debug("Ignoring findings that are not linked to a JIRA issue")
-                no_jira_findings = Finding.objects.exclude(jira_issue__isnull=False)
+                findings = findings.filter(jira_issue__isnull=False)
+
+            findings = list(findings
+                .select_related("test__engagement__product__prod_type", "jira_issue")
+                .prefetch_related(Prefetch("finding_group_set", queryset=Finding_Group.objects.select_related("jira_issue"))))
+            jira_projects_by_engagement, jira_projects_by_product = _get_jira_projects(findings)
 
             total_count = 0
             pre_breach_count = 0
@@ -1976,26 +2322,10 @@ def sla_compute_and_notify(*args, **kwargs):
             jira_count = 0
             at_breach_count = 0
 
-            # Taking away for now, since the prefetch is not efficient
-            # .select_related('jira_issue') \
-            # .prefetch_related(Prefetch('test__engagement__product__jira_project_set__jira_instance')) \
-            # A finding with 'Info' severity will not be considered for SLA notifications (not in model)
-            findings = Finding.objects \
-                .filter(query) \
-                .exclude(severity="Info") \
-                .exclude(id__in=no_jira_findings)
-
             for finding in findings:
                 total_count += 1
                 sla_age = finding.sla_days_remaining()
 
-                # get the sla enforcement for the severity and, if the severity setting is not enforced, do not notify
-                # resolves an issue where notifications are always sent for the severity of SLA that is not enforced
-                severity, enforce = finding.get_sla_period()
-                if not enforce:
-                    logger.debug(f"SLA is not enforced for Finding {finding.id} of {severity} severity, skipping notification.")
-                    continue
-
                 # if SLA is set to 0 in settings, it's a null. And setting at 0 means no SLA apparently.
                 if sla_age is None:
                     sla_age = 0
@@ -2006,8 +2336,12 @@ def sla_compute_and_notify(*args, **kwargs):
                     logger.debug(f"Finding {finding.id} breached the SLA {abs(sla_age)} days ago. Skipping notifications.")
                     continue
 
+                # same as finding.finding_group, from the prefetched groups
+                finding.finding_group = next(iter(finding.finding_group_set.all()), None)
+
                 do_jira_sla_comment = False
                 jira_issue = None
+                jira_instance = None
                 if finding.has_jira_issue:
                     jira_issue = finding.jira_issue
                 elif finding.has_jira_group_issue:
@@ -2015,17 +2349,13 @@ def sla_compute_and_notify(*args, **kwargs):
 
                 if jira_issue:
                     jira_count += 1
-                    jira_instance = jira_helper.get_jira_instance(finding)
-                    if jira_instance is not None:
+                    jira_project = jira_projects_by_engagement.get(finding.test.engagement_id) \
+                        or jira_projects_by_product.get(finding.test.engagement.product_id)
+                    if jira_project is not None and jira_project.jira_instance is not None:
+                        jira_instance = jira_project.jira_instance
                         logger.debug(f"JIRA config for finding is {jira_instance}")
                         # global config or product config set, product level takes precedence
-                        try:
-                            # TODO: see new property from #2649 to then replace, somehow not working with prefetching though.
-                            product_jira_sla_comment_enabled = jira_helper.get_jira_project(finding).product_jira_sla_notification
-                        except Exception as e:
-                            logger.error("The product is not linked to a JIRA configuration! Something is weird here.")
-                            logger.error(f"Error is: {e}")
-
+                        product_jira_sla_comment_enabled = jira_project.product_jira_sla_notification
                         jiraconfig_sla_notification_enabled = jira_instance.global_jira_sla_notification
 
                         if jiraconfig_sla_notification_enabled or product_jira_sla_comment_enabled:
@@ -2086,6 +2416,33 @@ def get_current_request():
     return crum.get_current_request()
 
 
+def bulk_create_audit_log_entries(instances, user, instances_before=None):
+    """
+    Objects inserted with `bulk_create` or changed with bulk updates do not trigger the auditlog
+    signals, so their log entries are written here in bulk instead. The entries are "create"
+    entries, or "update" entries when the state of the objects before the update is supplied
+    """
+    if not settings.ENABLE_AUDITLOG or not instances:
+        return
+    content_type = ContentType.objects.get_for_model(instances[0])
+    actor = user if user and user.is_authenticated else None
+    cid = get_cid()
+    LogEntry.objects.bulk_create([
+        LogEntry(
+            content_type=content_type,
+            object_pk=str(instance.pk),
+            object_id=instance.pk,
+            object_repr=str(instance),
+            action=LogEntry.Action.CREATE if instances_before is None else LogEntry.Action.UPDATE,
+            changes=model_instance_diff(None if instances_before is None else instances_before[instance.pk], instance),
+            actor=actor,
+            actor_email=getattr(actor, "email", None),
+            cid=cid,
+        )
+        for instance in instances
+    ])
+
+
 def create_bleached_link(url, title):
     link = '<a href="'
     link += url
@@ -2458,133 +2815,75 @@ def calculate_finding_age(f):
 
 
 def get_open_findings_burndown(product):
-    findings = Finding.objects.filter(test__engagement__product=product, duplicate=False)
-    f_list = list(findings)
-
+    """
+    Returns the number of open findings per severity for each of the last 91 days. The number of
+    findings still open at the start of the window and the findings opened, mitigated or risk
+    accepted on each day are aggregated in the database, after which the daily numbers are a
+    running sum of these events
+    """
     curr_date = datetime.combine(datetime.now(), datetime.min.time())
     start_date = curr_date - timedelta(days=90)
+    window_start = timezone.make_aware(start_date)
+    window_end = timezone.make_aware(curr_date + timedelta(days=1))
 
-    critical_count = 0
-    high_count = 0
-    medium_count = 0
-    low_count = 0
-    info_count = 0
+    # simple risk acceptance does not have a risk acceptance object, so we fall back to creation date.
+    risk_accepted_date = Coalesce(
+        Subquery(
+            Risk_Acceptance.objects.filter(accepted_findings=OuterRef("pk")).order_by("pk").values("created")[:1],
+        ),
+        F("created"),
+    )
+    findings = (
+        Finding.objects.filter(test__engagement__product=product, duplicate=False)
+        .annotate(risk_accepted_date=risk_accepted_date)
+        .order_by()
+    )
 
+    severities = ["Critical", "High", "Medium", "Low", "Info"]
+    counts = dict.fromkeys(severities, 0)
     # count all findings older than 90 days that are still active OR will be mitigated/risk-accepted in the next 90 days
-    for f in list(findings.filter(date__lt=start_date)):
-        if f.active:
-            if f.severity == "Critical":
-                critical_count += 1
-            if f.severity == "High":
-                high_count += 1
-            if f.severity == "Medium":
-                medium_count += 1
-            if f.severity == "Low":
-                low_count += 1
-            if f.severity == "Info":
-                info_count += 1
-        elif f.is_mitigated:
-            f_mitigated_date = f.mitigated.timestamp()
-            if f_mitigated_date >= start_date.timestamp():
-                if f.severity == "Critical":
-                    critical_count += 1
-                if f.severity == "High":
-                    high_count += 1
-                if f.severity == "Medium":
-                    medium_count += 1
-                if f.severity == "Low":
-                    low_count += 1
-                if f.severity == "Info":
-                    info_count += 1
-        elif f.risk_accepted:
-            # simple risk acceptance does not have a risk acceptance object, so we fall back to creation date.
-            f_risk_accepted_date = f.created.timestamp()
-            if f.risk_acceptance:
-                f_risk_accepted_date = f.risk_acceptance.created.timestamp()
-            if f_risk_accepted_date >= start_date.timestamp():
-                if f.severity == "Critical":
-                    critical_count += 1
-                if f.severity == "High":
-                    high_count += 1
-                if f.severity == "Medium":
-                    medium_count += 1
-                if f.severity == "Low":
-                    low_count += 1
-                if f.severity == "Info":
-                    info_count += 1
+    open_before_window = findings.filter(date__lt=start_date.date()).filter(
+        Q(active=True)
+        | Q(is_mitigated=True, mitigated__gte=window_start)
+        | Q(is_mitigated=False, risk_accepted=True, risk_accepted_date__gte=window_start),
+    )
+    for row in open_before_window.values("severity").annotate(count=Count("id")):
+        if row["severity"] in counts:
+            counts[row["severity"]] += row["count"]
+
+    # the changes to the number of open findings per day and severity during the window
+    deltas = {}
+    opened = findings.filter(date__gte=start_date.date(), date__lte=curr_date.date()).values("date", "severity")
+    for row in opened.annotate(count=Count("id")):
+        deltas.setdefault(row["date"], Counter())[row["severity"]] += row["count"]
+    closed = [
+        findings.filter(is_mitigated=True, mitigated__gte=window_start, mitigated__lt=window_end)
+        .annotate(day=TruncDate("mitigated")),
+        findings.filter(is_mitigated=False, risk_accepted=True, risk_accepted_date__gte=window_start, risk_accepted_date__lt=window_end)
+        .annotate(day=TruncDate("risk_accepted_date")),
+    ]
+    for queryset in closed:
+        for row in queryset.values("day", "severity").annotate(count=Count("id")):
+            deltas.setdefault(row["day"], Counter())[row["severity"]] -= row["count"]
 
     running_min, running_max = float("inf"), float("-inf")
-    past_90_days = {
-        "Critical": [],
-        "High": [],
-        "Medium": [],
-        "Low": [],
-        "Info": [],
-    }
+    past_90_days = {severity: [] for severity in severities}
 
     # count the number of open findings for the 90-day window
     for i in range(90, -1, -1):
         start = (curr_date - timedelta(days=i))
-
         d_start = start.timestamp()
-        d_end = (start + timedelta(days=1)).timestamp()
 
-        for f in f_list:
-            # If a finding was opened on this day we add it to the counter of that day
-            f_open_date = datetime.combine(f.date, datetime.min.time()).timestamp()
-            if f_open_date >= d_start and f_open_date < d_end:
-                if f.severity == "Critical":
-                    critical_count += 1
-                if f.severity == "High":
-                    high_count += 1
-                if f.severity == "Medium":
-                    medium_count += 1
-                if f.severity == "Low":
-                    low_count += 1
-                if f.severity == "Info":
-                    info_count += 1
-
-            # If a finding was mitigated on this day we subtract it
-            if f.is_mitigated:
-                f_mitigated_date = f.mitigated.timestamp()
-                if f_mitigated_date >= d_start and f_mitigated_date < d_end:
-                    if f.severity == "Critical":
-                        critical_count -= 1
-                    if f.severity == "High":
-                        high_count -= 1
-                    if f.severity == "Medium":
-                        medium_count -= 1
-                    if f.severity == "Low":
-                        low_count -= 1
-                    if f.severity == "Info":
-                        info_count -= 1
-
-            # If a finding was risk accepted on this day we subtract it
-            elif f.risk_accepted:
-                f_risk_accepted_date = f.created.timestamp()
-                if f.risk_acceptance:
-                    f_risk_accepted_date = f.risk_acceptance.created.timestamp()
-                if f_risk_accepted_date >= d_start and f_risk_accepted_date < d_end:
-                    if f.severity == "Critical":
-                        critical_count -= 1
-                    if f.severity == "High":
-                        high_count -= 1
-                    if f.severity == "Medium":
-                        medium_count -= 1
-                    if f.severity == "Low":
-                        low_count -= 1
-                    if f.severity == "Info":
-                        info_count -= 1
-
-        f_day = [critical_count, high_count, medium_count, low_count, info_count]
+        for severity, delta in deltas.get(start.date(), {}).items():
+            if severity in counts:
+                counts[severity] += delta
+
+        f_day = [counts[severity] for severity in severities]
         running_min = min(running_min, *f_day)
         running_max = max(running_max, *f_day)
 
-        past_90_days["Critical"].append([d_start * 1000, critical_count])
-        past_90_days["High"].append([d_start * 1000, high_count])
-        past_90_days["Medium"].append([d_start * 1000, medium_count])
-        past_90_days["Low"].append([d_start * 1000, low_count])
-        past_90_days["Info"].append([d_start * 1000, info_count])
+        for severity in severities:
+            past_90_days[severity].append([d_start * 1000, counts[severity]])
 
     past_90_days["y_max"] = running_max
     past_90_days["y_min"] = running_min
@@ -12,6 +12,8 @@ from dojo.models import (
     Choice,
     Contact,
     FileAccessToken,
+    Finding_Daily_Metrics,
+    Generated_Report,
     GITHUB_Clone,
     GITHUB_Conf,
     GITHUB_Details_Cache,
@@ -109,6 +111,8 @@ class ApiEndpoints(DojoTestCase):
             Benchmark_Requirement,
             Benchmark_Product,
             Benchmark_Product_Summary,
+            Finding_Daily_Metrics,
+            Generated_Report,
             Choice,
         ]
 
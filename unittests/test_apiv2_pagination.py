@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from dojo.models import Finding, Test
+
+
+class APIPaginationTest(APITestCase):
+
+    """Test the cursor and count parameters of the list endpoints"""
+
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        token = Token.objects.get(user__username="admin")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_all(self, url, params):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url, params, format="json")
+            self.assertEqual(200, response.status_code, response.content[:1000])
+            data = response.json()
+            self.assertIsNone(data["previous"])
+            ids += [result["id"] for result in data["results"]]
+            # the next link has all the parameters
+            url, params = data["next"], None
+            pages += 1
+        return ids, pages, data["count"]
+
+    def test_cursor(self):
+        expected = list(Finding.objects.order_by("id").values_list("id", flat=True))
+        ids, pages, count = self.get_all(reverse("finding-list"), {"cursor": "", "limit": 10, "o": "-title"})
+        self.assertEqual(expected, ids)
+        self.assertEqual((len(expected) + 9) // 10, pages)
+        self.assertEqual(len(expected), count)
+
+        ids, _, count = self.get_all(reverse("endpoint-list"), {"cursor": "", "limit": 2, "count": "false", "host": "127.0.0.1"})
+        self.assertEqual([1, 3], ids)
+        self.assertIsNone(count)
+
+    def test_not_counted(self):
+        for params in ({"cursor": ""}, {"offset": 1}):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("finding-list"), {"limit": 10, "count": "false"} | params, format="json")
+            self.assertEqual(10, len(response.json()["results"]))
+            self.assertFalse([query for query in queries.captured_queries if "COUNT(" in query["sql"]])
+
+    def test_cursor_updated(self):
+        now = timezone.now()
+        Finding.objects.update(updated=now - timedelta(days=10))
+        for days, finding_ids in enumerate(([7, 3], [2], [5, 4]), start=1):
+            Finding.objects.filter(id__in=finding_ids).update(updated=now - timedelta(days=5 - days))
+        ids, _, count = self.get_all(reverse("finding-list"), {"cursor": "", "limit": 2, "updated__gt": (now - timedelta(days=5)).isoformat()})
+        # ordered by the time of the change, and by id for the same time
+        self.assertEqual([3, 7, 2, 4, 5], ids)
+        self.assertEqual(5, count)
+
+        response = self.client.get(reverse("finding-list"), {"cursor": "", "updated__gt": "yesterday"}, format="json")
+        self.assertEqual(400, response.status_code)
+        response = self.client.get(reverse("finding-list"), {"cursor": "not a cursor"}, format="json")
+        self.assertEqual(404, response.status_code)
+
+    def test_cursor_updated_edited(self):
+        now = timezone.now()
+        Finding.objects.update(updated=now - timedelta(days=1))
+        params = {"cursor": "", "updated__gt": now.isoformat()}
+        self.assertEqual([], self.get_all(reverse("finding-list"), params)[0])
+
+        # a change of the content is a change as well, not only a change of the status
+        response = self.client.patch(reverse("finding-detail", args=(2,)), {"severity": "Low"}, format="json")
+        self.assertEqual(200, response.status_code, response.content[:1000])
+        self.assertEqual([2], self.get_all(reverse("finding-list"), params)[0])
+
+    def test_offset_not_counted(self):
+        url = reverse("test-list")
+        response = self.client.get(url, {"limit": 2, "offset": 2, "count": "false"}, format="json").json()
+        self.assertIsNone(response["count"])
+        self.assertEqual(2, len(response["results"]))
+        self.assertIn("offset=4", response["next"])
+        self.assertNotIn("offset", response["previous"])
+
+        count = Test.objects.count()
+        response = self.client.get(url, {"limit": 2, "offset": count - 2, "count": "false"}, format="json").json()
+        self.assertEqual(2, len(response["results"]))
+        self.assertIsNone(response["next"])
@@ -0,0 +1,67 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from dojo.api_v2.prefetch.prefetcher import _Prefetcher, serializers_by_model
+from dojo.api_v2.serializers import EndpointSerializer, TestSerializer, UserStubSerializer
+from dojo.models import Dojo_User, Finding, Test
+
+
+class APIPrefetchTest(APITestCase):
+
+    """Test that the prefetched objects of a page are fetched and serialized in batches"""
+
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        token = Token.objects.get(user__username="admin")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_findings(self, prefetch):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("finding-list"), {"limit": 20, "prefetch": prefetch}, format="json")
+        self.assertEqual(200, response.status_code)
+        return response.json(), len(queries.captured_queries)
+
+    def test_list_prefetch_batched(self):
+        _, queries_without_prefetch = self.get_findings("")
+        # the users of all the fields and findings of the page are fetched with one query
+        findings, queries = self.get_findings("reporter,mitigated_by,last_reviewed_by,review_requested_by")
+        self.assertEqual(queries_without_prefetch + 1, queries)
+        self.assertEqual({"reporter", "mitigated_by", "last_reviewed_by", "review_requested_by"}, set(findings["prefetch"]))
+
+        findings, _ = self.get_findings("test,reporter,endpoints,found_by")
+        prefetched = findings["prefetch"]
+        self.assertEqual({"test", "reporter", "endpoints", "found_by"}, set(prefetched))
+
+        def render(data):
+            return json.loads(JSONRenderer().render(data))
+
+        for finding in findings["results"]:
+            test = Test.objects.get(id=finding["test"])
+            self.assertEqual(render(TestSerializer(test).data), prefetched["test"][str(test.id)])
+            reporter = Dojo_User.objects.get(id=finding["reporter"])
+            self.assertEqual(render(UserStubSerializer(reporter).data), prefetched["reporter"][str(reporter.id)])
+            for endpoint in Finding.objects.get(id=finding["id"]).endpoints.all():
+                self.assertEqual(render(EndpointSerializer(endpoint).data), prefetched["endpoints"][str(endpoint.id)])
+
+    def test_objects_serialized_once(self):
+        findings = list(Finding.objects.filter(test_id=3))
+        self.assertGreater(len(findings), 1)
+        with CaptureQueriesContext(connection) as queries_one_finding:
+            _Prefetcher()._prefetch_many(findings[:1], ["test"])
+        prefetcher = _Prefetcher()
+        with self.assertNumQueries(len(queries_one_finding)):
+            prefetcher._prefetch_many(findings, ["test"])
+        self.assertEqual([3], list(prefetcher.prefetched_data["test"]))
+        self.assertEqual(1, len(prefetcher._representations))
+
+    def test_serializers_built_once(self):
+        self.assertIs(serializers_by_model, _Prefetcher()._serializers)
+        self.assertIs(TestSerializer, serializers_by_model[Test])
@@ -1,5 +1,6 @@
 import logging
 import unittest
+from unittest.mock import patch
 
 from crum import impersonate
 from django.conf import settings
@@ -15,6 +16,7 @@ from dojo.models import (
     User,
     _copy_model_util,
 )
+from dojo.utils import do_dedupe_findings_batch
 
 from .dojo_test_case import DojoTestCase
 
@@ -1283,3 +1285,71 @@ class TestDuplicationLogic(DojoTestCase):
         system_settings = System_Settings.objects.get()
         system_settings.enable_deduplication = enable
         system_settings.save()
+
+
+class TestDuplicationLogicBatch(TestDuplicationLogic):
+
+    """Runs all deduplication scenarios through do_dedupe_findings_batch instead of do_dedupe_finding"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch(
+            "dojo.utils.do_dedupe_finding",
+            side_effect=lambda finding, *args, **kwargs: do_dedupe_findings_batch([finding], *args, **kwargs),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def copy_and_save_finding_without_dedupe(self, find_id, test=None):
+        finding_new, finding_org = self.copy_and_reset_finding(find_id=find_id)
+        if test:
+            finding_new.test = test
+        finding_new.hash_code = finding_org.hash_code
+        finding_new.save(dedupe_option=False)
+        for ep in finding_org.endpoints.all():
+            finding_new.endpoints.add(ep)
+        return finding_new
+
+    def test_batch_identical_hash_code(self):
+        # 2 is the original of 3, 4, 5 and 6
+        # expect: all new findings marked as duplicate of 2
+        findings_new = [self.copy_and_save_finding_without_dedupe(find_id=2) for _ in range(3)]
+        do_dedupe_findings_batch(findings_new)
+
+        for finding_new in findings_new:
+            finding_new.refresh_from_db()
+            self.assert_finding(finding_new, not_pk=2, duplicate=True, duplicate_finding_id=2)
+
+    def test_batch_identical_hash_code_no_original(self):
+        # no original in the new engagement
+        # expect: the first new finding becomes the original of the other new findings
+        test_new, _eng_new = self.create_new_test_and_engagment_from_finding(Finding.objects.get(id=2))
+        findings_new = [self.copy_and_save_finding_without_dedupe(find_id=2, test=test_new) for _ in range(3)]
+        do_dedupe_findings_batch(reversed(findings_new))
+
+        for finding_new in findings_new:
+            finding_new.refresh_from_db()
+        self.assert_finding(findings_new[0], duplicate=False)
+        self.assert_finding(findings_new[1], duplicate=True, duplicate_finding_id=findings_new[0].id)
+        self.assert_finding(findings_new[2], duplicate=True, duplicate_finding_id=findings_new[0].id)
+
+    def test_batch_identical_unique_id_and_legacy(self):
+        # 124 (unique_id_from_tool) and 22 (legacy) are originals in different engagements
+        # expect: each new finding marked as duplicate of the original of its own algorithm
+        finding_new_124 = self.copy_and_save_finding_without_dedupe(find_id=124)
+        finding_new_22 = self.copy_and_save_finding_without_dedupe(find_id=22)
+        do_dedupe_findings_batch([finding_new_124, finding_new_22])
+
+        finding_new_124.refresh_from_db()
+        finding_new_22.refresh_from_db()
+        self.assert_finding(finding_new_124, not_pk=124, duplicate=True, duplicate_finding_id=124)
+        self.assert_finding(finding_new_22, not_pk=22, duplicate=True, duplicate_finding_id=22)
+
+    def test_batch_dedupe_disabled(self):
+        self.enable_dedupe(enable=False)
+        findings_new = [self.copy_and_save_finding_without_dedupe(find_id=2) for _ in range(2)]
+        do_dedupe_findings_batch(findings_new)
+
+        for finding_new in findings_new:
+            finding_new.refresh_from_db()
+            self.assert_finding(finding_new, not_pk=2, duplicate=False)
@@ -1,11 +1,18 @@
 import datetime
+import hashlib
+from io import StringIO
 from unittest import skip
+from unittest.mock import patch
 
 from django.apps import apps
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from dojo.endpoint.utils import endpoint_get_or_create, remove_broken_endpoint_statuses
+from dojo.endpoint.utils import endpoint_get_or_create, remove_broken_endpoint_statuses, store_canonical_urls
+from dojo.importers.endpoint_manager import EndpointManager
 from dojo.models import Endpoint, Endpoint_Status, Engagement, Finding, Product, Product_Type, Test
 
 from .dojo_test_case import DojoTestCase
@@ -156,6 +163,54 @@ class TestEndpointModel(DojoTestCase):
         )
         self.assertTrue(created7)
 
+    def test_get_or_create_in_bulk(self):
+        product_type, _ = Product_Type.objects.get_or_create(name="bulk endpoints")
+        product, _ = Product.objects.get_or_create(name="Bulk Endpoints", prod_type=product_type)
+        existing_http, _ = endpoint_get_or_create(protocol="http", host="bar.foo", product=product)
+        existing_https, _ = endpoint_get_or_create(protocol="https", host="bar.foo", port=8443, product=product)
+        # endpoints of other products and endpoints with empty attributes are never matched
+        endpoint_get_or_create(protocol="ftp", host="bar.foo", product=Product.objects.exclude(id=product.id).first())
+        Endpoint.objects.create(protocol="ftp", host="bar.foo", path="", product=product)
+
+        endpoint_cache = {}
+        with CaptureQueriesContext(connection) as queries, \
+                patch.object(Endpoint, "build_canonical_url", wraps=Endpoint.build_canonical_url) as build_canonical_url:
+            resolved = EndpointManager().get_or_create_endpoints_in_bulk(
+                [
+                    [Endpoint(protocol="HTTP", host="BAR.foo", port=80), Endpoint(protocol="https", host="bar.foo", port=8443),
+                     Endpoint(protocol="https", host="bar.foo"), Endpoint(protocol="http", host="bar.foo")],
+                    [Endpoint(protocol="http", host="bar.foo", path=""), Endpoint(protocol="ftp", host="bar.foo")],
+                ],
+                product,
+                endpoint_cache=endpoint_cache,
+            )
+        # one query by the digests of the canonical URLs, one by the hosts of the endpoints not found by digest
+        # and one insert for the missing ones
+        self.assertEqual(3, len([query for query in queries.captured_queries if '"dojo_endpoint"' in query["sql"]]))
+        created_https = Endpoint.objects.get(product=product, protocol="https", port__isnull=True)
+        created_ftp = Endpoint.objects.get(product=product, protocol="ftp", path__isnull=True)
+        self.assertEqual([[existing_http.id, existing_https.id, created_https.id], [existing_http.id, created_ftp.id]],
+                         [[endpoint.id for endpoint in endpoints] for endpoints in resolved])
+        # once for each of the distinct endpoints of the report, and not again for the created ones
+        self.assertEqual(4, build_canonical_url.call_count)
+        # the same endpoints are found by endpoint_get_or_create
+        for endpoint in [*resolved[0], *resolved[1]]:
+            self.assertEqual((endpoint, False), endpoint_get_or_create(
+                protocol=endpoint.protocol, host=endpoint.host, port=endpoint.port, path=endpoint.path, product=product))
+
+        # endpoints with a stored canonical URL are all found by digest
+        with CaptureQueriesContext(connection) as queries:
+            resolved = EndpointManager().get_or_create_endpoints_in_bulk(
+                [[Endpoint(protocol="https", host="bar.foo", port=8443), Endpoint(protocol="ftp", host="bar.foo")]], product)
+        self.assertEqual([[existing_https.id, created_ftp.id]], [[endpoint.id for endpoint in endpoints] for endpoints in resolved])
+        self.assertEqual(1, len(queries.captured_queries))
+
+        # endpoints resolved earlier are taken from the cache
+        with self.assertNumQueries(0):
+            resolved = EndpointManager().get_or_create_endpoints_in_bulk(
+                [[Endpoint(protocol="https", host="bar.foo", port=443)]], product, endpoint_cache=endpoint_cache)
+        self.assertEqual([[created_https.id]], [[endpoint.id for endpoint in endpoints] for endpoints in resolved])
+
     def test_equality_without_products(self):
         # Test with all the fields
         e1 = Endpoint(protocol="https", host="localhost", port=5439, path="test", query="param=value")
@@ -202,6 +257,45 @@ class TestEndpointModel(DojoTestCase):
         # Because the products are different, the endpoint objects are not the same
         self.assertNotEqual(e1, e3)
 
+    def test_canonical_url_stored(self):
+        product_type, _ = Product_Type.objects.get_or_create(name="canonical urls")
+        product, _ = Product.objects.get_or_create(name="Canonical Urls", prod_type=product_type)
+        endpoint = Endpoint.objects.create(protocol="HTTPS", host="Foo.Bar", port=443, path="a b", product=product)
+        self.assertEqual("https://foo.bar/a%20b", endpoint.canonical_url)
+        self.assertEqual(hashlib.sha256(b"https://foo.bar/a%20b").hexdigest(), endpoint.canonical_url_hash)
+        self.assertEqual({"https://foo.bar/a%20b"}, set(Endpoint.objects.filter(id=endpoint.id).values_list("canonical_url", flat=True)))
+
+        # the stored canonical URL is used without building it again
+        unsaved_endpoint = Endpoint(protocol="https", host="foo.bar", path="a b")
+        str(unsaved_endpoint)
+        with patch.object(Endpoint, "build_canonical_url", side_effect=AssertionError):
+            endpoints = list(Endpoint.objects.filter(product=product))
+            self.assertEqual("https://foo.bar/a%20b", str(endpoints[0]))
+            self.assertEqual(unsaved_endpoint, endpoints[0])
+            self.assertEqual(1, len({*endpoints, *endpoints}))
+
+        # it is built again when the URL changes, and kept on save
+        endpoint = Endpoint.objects.get(id=endpoint.id)
+        endpoint.port = 8443
+        self.assertEqual("https://foo.bar:8443/a%20b", str(endpoint))
+        endpoint.path = "c"
+        endpoint.save(update_fields=["path"])
+        self.assertEqual("https://foo.bar:8443/c", Endpoint.objects.get(id=endpoint.id).canonical_url)
+
+    def test_store_canonical_urls(self):
+        Endpoint.objects.create(protocol="https", host="foo.bar", path="a")
+        Endpoint.objects.create(host="Foo.Bar")
+        Endpoint.objects.update(canonical_url="", canonical_url_hash="")
+        store_canonical_urls(apps, None)
+        for endpoint in Endpoint.objects.all():
+            self.assertTrue(endpoint.canonical_url_hash)
+            self.assertEqual(Endpoint.build_canonical_url(*endpoint.get_url_parts()), endpoint.canonical_url)
+
+        # the command stores them again, when the stored ones are stale after the normalization changed
+        Endpoint.objects.update(canonical_url="stale", canonical_url_hash=Endpoint.hash_canonical_url("stale"))
+        call_command("endpoint_canonical_urls", stdout=StringIO())
+        self.assertEqual({"https://foo.bar/a", "foo.bar"}, set(Endpoint.objects.values_list("canonical_url", flat=True)))
+
 
 @skip("Outdated - this class was testing clean-up broken entries in old version of model; new version of model doesn't to store broken entries")
 class TestEndpointStatusBrokenModel(DojoTestCase):
@@ -4,8 +4,19 @@ from importlib.util import find_spec
 from inspect import isclass
 from pathlib import Path
 
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
 from dojo.models import Test, Test_Type
-from dojo.tools.factory import get_parser
+from dojo.tools.checkmarx.parser import CheckmarxParser
+from dojo.tools.factory import (
+    TEST_TYPES_CACHE_KEY,
+    ParserRegistry,
+    get_inactive_test_types,
+    get_parser,
+    read_parsers_manifest,
+)
 from unittests.dojo_test_case import DojoTestCase, get_unit_tests_path
 
 logger = logging.getLogger(__name__)
@@ -85,3 +96,40 @@ class TestFactory(DojoTestCase):
         if len(missing_parsers) > 0:
             logger.error(f"Parsers with invalid names: {missing_parsers}")
         self.assertEqual(0, len(missing_parsers))
+
+    def test_parsers_manifest_up_to_date(self):
+        """The manifest has to be generated again with 'manage.py parsers_manifest' when parsers change"""
+        call_command("parsers_manifest", "--check")
+
+    def test_parsers_imported_on_first_use(self):
+        parsers = ParserRegistry()
+        parsers.manifest = read_parsers_manifest()["scan_types"]
+        self.assertIn("Checkmarx Scan detailed", parsers)
+        self.assertEqual({}, parsers.parsers)
+        self.assertEqual("Checkmarx Scan detailed", parsers.get_info("Checkmarx Scan detailed")["label"])
+        self.assertEqual({}, parsers.parsers)
+
+        # the parser is created for all the scan types of its module
+        parser = parsers["Checkmarx Scan detailed"]
+        self.assertIsInstance(parser, CheckmarxParser)
+        self.assertEqual("detailed", parser.mode)
+        self.assertEqual({"Checkmarx Scan", "Checkmarx Scan detailed"}, set(parsers.parsers))
+        self.assertIsNone(parsers["Checkmarx Scan"].mode)
+        with self.assertRaises(KeyError):
+            parsers["type_that_doesn't_exist"]
+
+    @override_settings(TEST_TYPES_CACHE_ENABLED=True)
+    def test_test_types_cached(self):
+        cache.delete(TEST_TYPES_CACHE_KEY)
+        Test_Type.objects.update_or_create(name="ZAP Scan", defaults={"active": True})
+        get_parser("ZAP Scan")
+        with self.assertNumQueries(0):
+            get_parser("ZAP Scan")
+            self.assertNotIn("ZAP Scan", get_inactive_test_types())
+
+        # saving a test type invalidates the cache
+        Test_Type.objects.update_or_create(name="ZAP Scan", defaults={"active": False})
+        with self.assertRaises(ValueError):
+            get_parser("ZAP Scan")
+        with self.assertNumQueries(0):
+            self.assertIn("ZAP Scan", get_inactive_test_types())
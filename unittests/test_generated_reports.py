@@ -0,0 +1,90 @@
+import tempfile
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dojo.models import Finding, Generated_Report, Product, User
+from dojo.reports.helper import generate_report
+
+from .dojo_test_case import DojoTestCase
+
+
+class TestGeneratedReports(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(REPORTS_ASYNC=True, MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.get(username="admin")
+        self.client.force_login(self.user)
+        self.product = Product.objects.get(id=2)
+
+    def request_report(self, **params):
+        with patch("dojo.reports.helper.generate_report") as mock_generate_report:
+            response = self.client.get(reverse("product_report", args=(self.product.id,)),
+                {"_generate": "", "report_type": "HTML", "include_finding_notes": 1, **params}, HTTP_HOST="localhost")
+        return response, mock_generate_report
+
+    def test_report_rendered_inline_when_disabled(self):
+        with override_settings(REPORTS_ASYNC=False):
+            response, mock_generate_report = self.request_report()
+        self.assertEqual(200, response.status_code)
+        self.assertContains(response, self.product.name)
+        mock_generate_report.assert_not_called()
+        self.assertFalse(Generated_Report.objects.exists())
+
+    def test_report_generated_and_served_from_storage(self):
+        response, mock_generate_report = self.request_report()
+        report = Generated_Report.objects.get()
+        self.assertRedirects(response, reverse("generated_report", args=(report.id,)))
+        mock_generate_report.assert_called_once_with(report.id)
+        self.assertEqual(Generated_Report.PENDING, report.status)
+
+        response = self.client.get(reverse("generated_report", args=(report.id,)))
+        self.assertContains(response, "The report is being generated")
+
+        generate_report(report.id, sync=True)
+        report.refresh_from_db()
+        self.assertEqual(Generated_Report.SUCCESS, report.status)
+        self.assertEqual(100, report.progress)
+
+        # the same report with the options in a different order is served from storage
+        response, mock_generate_report = self.request_report()
+        self.assertRedirects(response, reverse("generated_report_file", args=(report.id,)), fetch_redirect_response=False)
+        mock_generate_report.assert_not_called()
+        response = self.client.get(reverse("generated_report_file", args=(report.id,)))
+        self.assertIn(self.product.name, b"".join(response.streaming_content).decode("utf-8"))
+
+        # other filters make another report
+        _, mock_generate_report = self.request_report(severity="High")
+        mock_generate_report.assert_called_once()
+        self.assertEqual(2, Generated_Report.objects.count())
+
+    def test_report_generated_again_when_findings_change(self):
+        self.request_report()
+        report = Generated_Report.objects.get()
+        generate_report(report.id, sync=True)
+
+        Finding.objects.filter(test__engagement__product=self.product).update(last_status_update=timezone.now())
+        _, mock_generate_report = self.request_report()
+        new_report = Generated_Report.objects.exclude(id=report.id).get()
+        mock_generate_report.assert_called_once_with(new_report.id)
+
+        # the outdated report is removed once the new one is generated
+        generate_report(new_report.id, sync=True)
+        self.assertEqual([new_report.id], list(Generated_Report.objects.values_list("id", flat=True)))
+
+    def test_report_of_other_user(self):
+        self.request_report()
+        report = Generated_Report.objects.get()
+        self.client.force_login(User.objects.get(username="user2"))
+        # permission denied is rendered with status 400
+        response = self.client.get(reverse("generated_report", args=(report.id,)))
+        self.assertEqual(400, response.status_code)
+        response = self.client.get(reverse("generated_report_file", args=(report.id,)))
+        self.assertEqual(400, response.status_code)
@@ -1775,6 +1775,12 @@ class ImportReimportTestAPI(DojoAPITestCase, ImportReimportMixin):
         self.assertEqual(date, "2006-12-26")
 
 
+@override_settings(IMPORT_BULK_CREATE=True, IMPORT_BULK_CREATE_CHUNK_SIZE=3)
+class ImportReimportTestAPIBulkCreate(ImportReimportTestAPI):
+
+    """Runs the same import/reimport tests with findings being inserted in bulk by the importer"""
+
+
 class ImportReimportTestUI(DojoAPITestCase, ImportReimportMixin):
     fixtures = ["dojo_testdata.json"]
     client_ui = Client()
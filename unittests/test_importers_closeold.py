@@ -3,7 +3,8 @@ import logging
 from django.utils import timezone
 
 from dojo.importers.default_importer import DefaultImporter
-from dojo.models import Development_Environment, Engagement, Product, Product_Type, User
+from dojo.importers.default_reimporter import DefaultReImporter
+from dojo.models import Development_Environment, Engagement, Finding, Product, Product_Type, User
 
 from .dojo_test_case import DojoTestCase, get_unit_tests_scans_path
 
@@ -171,3 +172,60 @@ class TestDojoCloseOld(DojoTestCase):
             _, _, len_new_findings, len_closed_findings, _, _, _ = importer.process_scan(many_findings_scan)
             self.assertEqual(1, len_new_findings)
             self.assertEqual(1, len_closed_findings)
+
+
+class TestDojoCloseOldInBulk(DojoTestCase):
+    def close_old_findings(self, name):
+        user, _ = User.objects.get_or_create(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="closeold")
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        product, _ = Product.objects.get_or_create(name=name, prod_type=product_type)
+        engagement, _ = Engagement.objects.get_or_create(
+            name=name,
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        import_options = {
+            "user": user,
+            "lead": user,
+            "scan_date": None,
+            "environment": environment,
+            "active": True,
+            "verified": False,
+            "scan_type": "Acunetix Scan",
+        }
+        with (get_unit_tests_scans_path("acunetix") / "many_findings.xml").open("r+", encoding="utf-8") as scan:
+            test, *_ = DefaultImporter(engagement=engagement, close_old_findings=False, **import_options).process_scan(scan)
+        with (get_unit_tests_scans_path("acunetix") / "many_findings.xml").open("r+", encoding="utf-8") as scan:
+            DefaultImporter(engagement=engagement, close_old_findings=False, **import_options).process_scan(scan)
+        # the findings of both tests are closed by the import
+        with (get_unit_tests_scans_path("acunetix") / "one_finding.xml").open("r+", encoding="utf-8") as scan:
+            _, _, _, len_closed_by_import, *_ = DefaultImporter(engagement=engagement, close_old_findings=True, **import_options).process_scan(scan)
+        # the findings of the first test are reopened, and closed again by the reimport
+        Finding.objects.filter(test=test).update(active=True, is_mitigated=False, mitigated=None, mitigated_by=None)
+        with (get_unit_tests_scans_path("acunetix") / "one_finding.xml").open("r+", encoding="utf-8") as scan:
+            _, _, _, len_closed_by_reimport, *_ = DefaultReImporter(test=test, close_old_findings=True, **import_options).process_scan(scan)
+
+        findings = Finding.objects.filter(test__engagement=engagement).order_by("id")
+        return (
+            len_closed_by_import,
+            len_closed_by_reimport,
+            [(finding.title, finding.active, finding.is_mitigated, finding.mitigated is not None, finding.mitigated_by_id,
+              [note.entry for note in finding.notes.order_by("id")],
+              sorted(status.mitigated for status in finding.status_finding.all()))
+             for finding in findings],
+        )
+
+    def test_close_old_findings_in_bulk(self):
+        with self.settings(IMPORT_BULK_CLOSE_OLD_FINDINGS=False):
+            expected = self.close_old_findings("TestDojoCloseOldInBulk1")
+        with self.settings(IMPORT_BULK_CLOSE_OLD_FINDINGS=True):
+            closed = self.close_old_findings("TestDojoCloseOldInBulk2")
+        self.assertEqual(expected, closed)
+        self.assertEqual(8, closed[0])
+        self.assertEqual(4, closed[1])
+        # the closed findings have their endpoints mitigated and a note for each closing
+        closed_findings = [finding for finding in closed[2] if not finding[1]]
+        self.assertEqual(8, len(closed_findings))
+        self.assertTrue(all(finding[5] and all(finding[6]) for finding in closed_findings))
@@ -2,12 +2,24 @@ import logging
 import uuid
 from unittest.mock import patch
 
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+import dojo.finding.helper as finding_helper
 from dojo.importers.default_importer import DefaultImporter
-from dojo.models import Development_Environment, Engagement, Finding, Product, Product_Type, Test, User
+from dojo.importers.default_reimporter import DefaultReImporter
+from dojo.models import (
+    Development_Environment,
+    Engagement,
+    Finding,
+    Product,
+    Product_Type,
+    System_Settings,
+    Test,
+    User,
+)
 from dojo.tools.gitlab_sast.parser import GitlabSastParser
 from dojo.tools.sarif.parser import SarifParser
 from dojo.utils import get_object_or_none
@@ -148,6 +160,199 @@ class TestDojoDefaultImporter(DojoTestCase):
             self.assertEqual(1, len_new_findings)
             self.assertEqual(0, len_closed_findings)
 
+    def test_reimport_scan_matches_from_candidate_dictionaries(self):
+        scan_type = SarifParser().get_scan_types()[0]
+        user, _ = User.objects.get_or_create(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test2")
+        product, _ = Product.objects.get_or_create(
+            name="TestDojoDefaultImporter2",
+            prod_type=product_type,
+        )
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Create Engagement2",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        import_options = {
+            "user": user,
+            "lead": user,
+            "scan_date": None,
+            "environment": environment,
+            "minimum_severity": "Info",
+            "active": True,
+            "verified": True,
+            "sync": True,
+            "scan_type": scan_type,
+            "engagement": engagement,
+            "close_old_findings": False,
+        }
+        with (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan:
+            test, _, len_new_findings, _, _, _, _ = DefaultImporter(**import_options).process_scan(scan)
+        self.assertEqual(56, len_new_findings)
+
+        reimporter = DefaultReImporter(test=test, **import_options)
+        with (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan:
+            parsed_findings = reimporter.parse_findings(scan, reimporter.get_parser())
+        reimporter.deduplication_algorithm = reimporter.determine_deduplication_algorithm()
+        reimporter.build_candidate_dictionaries(test.finding_set.all())
+        for finding in parsed_findings:
+            finding.test = test
+            finding.hash_code = reimporter.calculate_unsaved_finding_hash_code(finding)
+        # matching is done against the findings indexed in memory
+        with self.assertNumQueries(0):
+            matched_ids = [reimporter.match_new_finding_to_existing_finding(finding)[0].id for finding in parsed_findings]
+        self.assertEqual(56, len(set(matched_ids)))
+
+        with (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan:
+            _, _, len_new_findings, len_closed_findings, _, len_untouched_findings, _ = DefaultReImporter(test=test, **import_options).process_scan(scan)
+        self.assertEqual(0, len_new_findings)
+        self.assertEqual(0, len_closed_findings)
+        self.assertEqual(56, len_untouched_findings)
+
+    @override_settings(IMPORT_STREAM_FINDINGS=True, IMPORT_BULK_CREATE=True, IMPORT_BULK_CREATE_CHUNK_SIZE=10)
+    def test_import_and_reimport_scan_streamed(self):
+        scan_type = SarifParser().get_scan_types()[0]
+        user, _ = User.objects.get_or_create(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test2")
+        product, _ = Product.objects.get_or_create(
+            name="TestDojoDefaultImporter2",
+            prod_type=product_type,
+        )
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Create Engagement2",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        import_options = {
+            "user": user,
+            "lead": user,
+            "scan_date": None,
+            "environment": environment,
+            "minimum_severity": "Info",
+            "active": True,
+            "verified": True,
+            "sync": True,
+            "scan_type": scan_type,
+            "engagement": engagement,
+            "close_old_findings": False,
+        }
+        with (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan:
+            importer = DefaultImporter(**import_options)
+            # the findings are only read from the report while they are processed
+            self.assertNotIsInstance(importer.parse_findings(scan, importer.get_parser()), list)
+            scan.seek(0)
+            test, _, len_new_findings, len_closed_findings, _, _, _ = DefaultImporter(**import_options).process_scan(scan)
+        self.assertEqual(f"SpotBugs Scan ({scan_type})", test.test_type.name)
+        self.assertEqual(56, len_new_findings)
+        self.assertEqual(0, len_closed_findings)
+
+        with (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan:
+            _, _, len_new_findings, len_closed_findings, _, len_untouched_findings, _ = DefaultReImporter(test=test, **import_options).process_scan(scan)
+        self.assertEqual(0, len_new_findings)
+        self.assertEqual(0, len_closed_findings)
+        self.assertEqual(56, len_untouched_findings)
+
+    @override_settings(POST_PROCESS_FINDINGS_BATCH_SIZE=20)
+    def test_import_and_reimport_scan_post_processed_in_batches(self):
+        System_Settings.objects.update_or_create(defaults={"enable_product_grade": True})
+        scan_type = SarifParser().get_scan_types()[0]
+        user, _ = User.objects.get_or_create(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test2")
+        product, _ = Product.objects.get_or_create(
+            name="TestDojoDefaultImporter2",
+            prod_type=product_type,
+        )
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Create Engagement2",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        import_options = {
+            "user": user,
+            "lead": user,
+            "scan_date": None,
+            "environment": environment,
+            "minimum_severity": "Info",
+            "active": True,
+            "verified": True,
+            "sync": True,
+            "scan_type": scan_type,
+            "engagement": engagement,
+            "close_old_findings": False,
+        }
+        with (
+            patch("dojo.finding.helper.post_process_finding_save") as mock_post_process_finding_save,
+            patch("dojo.finding.helper.post_process_findings_batch") as mock_post_process_findings_batch,
+            (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan,
+        ):
+            test, _, len_new_findings, _, _, _, _ = DefaultImporter(**import_options).process_scan(scan)
+        self.assertEqual(56, len_new_findings)
+        mock_post_process_finding_save.assert_not_called()
+        # one task per batch of 20 findings
+        self.assertEqual(3, mock_post_process_findings_batch.call_count)
+        findings = Finding.objects.filter(test=test)
+        self.assertFalse(findings.filter(hash_code__isnull=True).exists())
+        post_processed_ids = [finding_id for call in mock_post_process_findings_batch.call_args_list for finding_id in call.args[0]]
+        self.assertCountEqual(findings.values_list("id", flat=True), post_processed_ids)
+
+        with (
+            patch("dojo.finding.helper.post_process_finding_save") as mock_post_process_finding_save,
+            patch("dojo.finding.helper.post_process_findings_batch") as mock_post_process_findings_batch,
+            (get_unit_tests_path() / "scans" / "sarif" / "spotbugs.sarif").open(encoding="utf-8") as scan,
+        ):
+            _, _, len_new_findings, _, _, len_untouched_findings, _ = DefaultReImporter(test=test, **import_options).process_scan(scan)
+        self.assertEqual(0, len_new_findings)
+        self.assertEqual(56, len_untouched_findings)
+        mock_post_process_finding_save.assert_not_called()
+        self.assertEqual(3, mock_post_process_findings_batch.call_count)
+        post_processed_ids = [finding_id for call in mock_post_process_findings_batch.call_args_list for finding_id in call.args[0]]
+        self.assertCountEqual(findings.values_list("id", flat=True), post_processed_ids)
+
+        # the grade of the product is calculated once for the whole batch
+        with patch("dojo.utils.calculate_grade") as mock_calculate_grade:
+            finding_helper.post_process_findings_batch(post_processed_ids, sync=True)
+        mock_calculate_grade.assert_called_once_with(product)
+
+    @override_settings(IMPORT_STREAM_FINDINGS=True)
+    def test_import_scan_streamed_static_parser(self):
+        with (get_unit_tests_scans_path("trivy") / "scheme_2_many_vulns.json").open(encoding="utf-8") as scan:
+            user, _ = User.objects.get_or_create(username="admin")
+            product_type, _ = Product_Type.objects.get_or_create(name="test2")
+            product, _ = Product.objects.get_or_create(
+                name="TestDojoDefaultImporter2",
+                prod_type=product_type,
+            )
+            engagement, _ = Engagement.objects.get_or_create(
+                name="Test Create Engagement2",
+                product=product,
+                target_start=timezone.now(),
+                target_end=timezone.now(),
+            )
+            environment, _ = Development_Environment.objects.get_or_create(name="Development")
+            import_options = {
+                "user": user,
+                "lead": user,
+                "scan_date": None,
+                "environment": environment,
+                "minimum_severity": "Info",
+                "active": True,
+                "verified": True,
+                "scan_type": "Trivy Scan",
+                "engagement": engagement,
+                "close_old_findings": False,
+            }
+            importer = DefaultImporter(**import_options)
+            test, _, len_new_findings, len_closed_findings, _, _, _ = importer.process_scan(scan)
+            self.assertEqual("Trivy Scan", test.test_type.name)
+            self.assertEqual(5, len_new_findings)
+            self.assertEqual(0, len_closed_findings)
+
 
 class FlexibleImportTestAPI(DojoAPITestCase):
     def __init__(self, *args, **kwargs):
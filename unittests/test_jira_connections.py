@@ -0,0 +1,99 @@
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.test import override_settings
+
+import dojo.jira_link.helper as jira_helper
+from dojo.models import JIRA_Instance
+
+from .dojo_test_case import DojoTestCase
+
+
+class StubJiraHandler(BaseHTTPRequestHandler):
+
+    """Answers the few JIRA REST calls the helpers make, and counts them by path"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests[url.path] += 1
+        if url.path == "/rest/api/2/serverInfo":
+            body = {"baseUrl": self.server.url, "version": "8.20.0", "versionNumbers": [8, 20, 0], "deploymentType": "Server"}
+        elif url.path == "/rest/api/2/field":
+            body = [{"id": "summary", "name": "Summary", "clauseNames": ["summary"]}]
+        elif url.path == "/rest/api/2/issue/createmeta":
+            body = {"projects": [{"key": "NTEST", "issuetypes": [{"name": "Bug", "fields": {"summary": {}, "priority": {}}}]}]}
+        elif url.path == "/rest/api/2/search":
+            jql = parse_qs(url.query)["jql"][0]
+            jira_ids = jql[jql.index("(") + 1:jql.index(")")].split(",")
+            # the issue with id 13 has been deleted in JIRA
+            issues = [{"id": jira_id, "key": f"NTEST-{jira_id}", "self": f"{self.server.url}/rest/api/2/issue/{jira_id}", "fields": {"summary": jira_id}}
+                      for jira_id in jira_ids if jira_id != "13"]
+            body = {"startAt": 0, "maxResults": len(jira_ids), "total": len(issues), "issues": issues}
+        else:
+            self.send_error(404)
+            return
+        content = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestJiraConnections(DojoTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubJiraHandler)
+        self.server.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.server.requests = Counter()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(jira_helper.clear_jira_connections)
+        self.jira_instance = JIRA_Instance(url=self.server.url, username="defectdojo", password="secret")  # noqa: S106
+
+    def test_connection_per_call_by_default(self):
+        for _ in range(3):
+            jira_helper.get_jira_connection(self.jira_instance)
+        self.assertEqual(3, self.server.requests["/rest/api/2/serverInfo"])
+
+    @override_settings(JIRA_CONNECTION_MAX_AGE=300)
+    def test_connection_pooled(self):
+        jira = jira_helper.get_jira_connection(self.jira_instance)
+        self.assertIs(jira, jira_helper.get_jira_connection(self.jira_instance))
+        self.assertEqual(1, self.server.requests["/rest/api/2/serverInfo"])
+
+        # other credentials get their own connection
+        self.jira_instance.password = "changed"
+        self.assertIsNot(jira, jira_helper.get_jira_connection(self.jira_instance))
+        self.assertEqual(2, self.server.requests["/rest/api/2/serverInfo"])
+
+    @override_settings(JIRA_METADATA_CACHE_TIMEOUT=300)
+    def test_issuetype_fields_cached(self):
+        jira = jira_helper.get_jira_connection(self.jira_instance)
+        for _ in range(3):
+            self.assertEqual(["summary", "priority"], jira_helper.get_issuetype_fields(jira, "NTEST", "Bug"))
+        self.assertEqual(1, self.server.requests["/rest/api/2/issue/createmeta"])
+
+        jira_helper.get_issuetype_fields(jira, "NTEST", "Bug", use_cache=False)
+        self.assertEqual(2, self.server.requests["/rest/api/2/issue/createmeta"])
+
+    def test_issuetype_fields_not_cached_by_default(self):
+        jira = jira_helper.get_jira_connection(self.jira_instance)
+        for _ in range(3):
+            self.assertEqual(["summary", "priority"], list(jira_helper.get_issuetype_fields(jira, "NTEST", "Bug")))
+        self.assertEqual(3, self.server.requests["/rest/api/2/issue/createmeta"])
+
+    def test_jira_issues_searched_in_batches(self):
+        jira = jira_helper.get_jira_connection(self.jira_instance)
+        issues = jira_helper.get_jira_issues_from_jira(jira, range(1, jira_helper.JIRA_SEARCH_BATCH_SIZE + 51))
+        self.assertEqual(2, self.server.requests["/rest/api/2/search"])
+        self.assertEqual(jira_helper.JIRA_SEARCH_BATCH_SIZE + 49, len(issues))
+        self.assertNotIn("13", issues)
+        self.assertEqual("NTEST-42", issues["42"].key)
@@ -0,0 +1,119 @@
+import re
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+from jira.client import ResultList
+from jira.exceptions import JIRAError
+
+from dojo.management.commands.jira_status_reconciliation import jira_status_reconciliation
+from dojo.models import Finding, JIRA_Instance, JIRA_Project, System_Settings
+
+from .dojo_test_case import DojoTestCase
+
+
+def jira_issue(jira_id, resolution=None):
+    return SimpleNamespace(id=jira_id, key=f"NTEST-{jira_id}", fields=SimpleNamespace(
+        assignee=None, resolution=resolution, updated=timezone.now().isoformat()))
+
+
+class TestJiraStatusReconciliation(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        System_Settings.objects.update(enable_jira=True)
+        # finding 5 is linked to the JIRA issue with id 2
+        Finding.objects.filter(id=5).update(active=True, risk_accepted=False, last_status_update=timezone.now() - timedelta(days=1))
+        self.jira = Mock()
+        self.jira.myself.return_value = {"timeZone": "Europe/Berlin"}
+        patcher = patch("dojo.jira_link.helper.get_jira_connection", return_value=self.jira)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def reconcile(self, **kwargs):
+        options = {"mode": "reconcile", "product": None, "engagement": None, "daysback": None, "dryrun": False, "incremental": True}
+        with self.assertLogs("dojo.management.commands.jira_status_reconciliation", "INFO") as logs:
+            jira_status_reconciliation(**(options | kwargs))
+        # the report of each JIRA instance, followed by the report of the whole run
+        return [line for line in logs.output if "jira status reconciliation" in line]
+
+    def test_incremental_reconciliation(self):
+        self.jira.search_issues.return_value = ResultList([jira_issue("2"), jira_issue("1234")], _total=2)
+        logs = self.reconcile()
+        jql = self.jira.search_issues.call_args.args[0]
+        self.assertEqual('project = "NTEST" ORDER BY key ASC', jql)
+        self.assertIn("2 updated issues, 1 findings reconciled", logs[-2])
+        self.assertIn("equal: 1", logs[-1])
+        reconciled_until = JIRA_Instance.objects.get(id=2).reconciled_until
+        self.assertIsNotNone(reconciled_until)
+
+        # the next run only asks for the issues updated since then, with some overlap, in the time zone of the JIRA user
+        JIRA_Instance.objects.filter(id=2).update(reconciled_until=datetime(2026, 1, 15, 10, 3, 30, tzinfo=UTC))
+        self.jira.search_issues.return_value = ResultList([], _total=0)
+        logs = self.reconcile(dryrun=True)
+        jql = self.jira.search_issues.call_args.args[0]
+        self.assertEqual('project = "NTEST" AND updated >= "2026/01/15 10:58" ORDER BY key ASC', jql)
+        self.assertIn("nothing to reconcile", logs[-1])
+
+    def test_incremental_reconciliation_dryrun(self):
+        resolution = SimpleNamespace(id="1", name="Done")
+        self.jira.search_issues.return_value = ResultList([jira_issue("2", resolution)], _total=1)
+        logs = self.reconcile(dryrun=True)
+        self.assertIn("(dryrun)", logs[-1])
+        self.assertIn("import_status_from_jira: 1", logs[-1])
+        self.assertTrue(Finding.objects.get(id=5).active)
+        self.assertIsNone(JIRA_Instance.objects.get(id=2).reconciled_until)
+
+    def test_incremental_reconciliation_in_pages(self):
+        issues = [jira_issue(str(jira_id)) for jira_id in range(1, 6)]
+
+        def search_issues(jql, **kwargs):
+            after = re.search(r'key > "NTEST-(\d+)"', jql)
+            matching = [issue for issue in issues if not after or int(issue.id) > int(after.group(1))]
+            # JIRA returns fewer issues than asked for
+            page = ResultList(matching[:2], _total=len(matching))
+            # the first issue stops matching during the search, which moves the later issues to lower offsets
+            if issues[0].id == "1":
+                issues.pop(0)
+            return page
+
+        self.jira.search_issues.side_effect = search_issues
+        logs = self.reconcile()
+        self.assertEqual([
+            'project = "NTEST" ORDER BY key ASC',
+            'project = "NTEST" AND key > "NTEST-2" ORDER BY key ASC',
+            'project = "NTEST" AND key > "NTEST-4" ORDER BY key ASC',
+        ], [call.args[0] for call in self.jira.search_issues.call_args_list])
+        self.assertIn("5 updated issues, 1 findings reconciled", logs[-2])
+
+    def test_full_reconciliation(self):
+        self.jira.issue.return_value = jira_issue("2")
+        logs = self.reconcile(incremental=False)
+        self.jira.issue.assert_called_once_with("2")
+        self.jira.search_issues.assert_not_called()
+        self.assertIn("of 1 findings done", logs[-1])
+        self.assertIn("equal: 1", logs[-1])
+
+    def test_incremental_reconciliation_scoped(self):
+        self.jira.search_issues.return_value = ResultList([jira_issue("2")], _total=1)
+        logs = self.reconcile(product="Security How-to")
+        self.assertIn("equal: 1", logs[-1])
+        # the findings of the other products are not reconciled, so the next run still has to look at their issues
+        self.assertIsNone(JIRA_Instance.objects.get(id=2).reconciled_until)
+
+    def test_incremental_reconciliation_error(self):
+        JIRA_Project.objects.create(jira_instance_id=3, product_id=3, project_key="OTHER")
+
+        def search_issues(jql, **kwargs):
+            if "NTEST" in jql:
+                raise JIRAError(status_code=500, text="Internal Server Error")
+            return ResultList([], _total=0)
+
+        self.jira.search_issues.side_effect = search_issues
+        logs = self.reconcile()
+        self.assertTrue(logs[0].startswith("ERROR:"))
+        self.assertIn("failed after 0 updated issues", logs[0])
+        # the other JIRA instances are still reconciled
+        self.assertIsNone(JIRA_Instance.objects.get(id=2).reconciled_until)
+        self.assertIsNotNone(JIRA_Instance.objects.get(id=3).reconciled_until)
@@ -1,9 +1,14 @@
 import datetime
+import json
 import logging
+from smtplib import SMTPRecipientsRefused
 from unittest.mock import Mock, patch
 
 from auditlog.context import set_actor
 from crum import impersonate
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
@@ -24,19 +29,24 @@ from dojo.models import (
     Notification_Webhooks,
     Notifications,
     Product,
+    Product_Member,
     Product_Type,
+    Role,
     System_Settings,
     Test,
     Test_Type,
     User,
+    UserContactInfo,
     get_current_datetime,
 )
 from dojo.notifications.helper import (
     AlertNotificationManger,
+    EmailNotificationManger,
     WebhookNotificationManger,
     create_notification,
     webhook_status_cleanup,
 )
+from dojo.user.queries import get_authorized_users_for_product_and_product_type
 
 from .dojo_test_case import DojoTestCase
 
@@ -976,3 +986,142 @@ class TestNotificationWebhooks(DojoTestCase):
                     "url_ui": "http://localhost:8080/finding/239",
                 }],
             })
+
+
+class TestNotificationFanOut(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def run(self, result=None):
+        testuser = User.objects.get(username="admin")
+        testuser.usercontactinfo.block_execution = True
+        testuser.save()
+
+        # run the notification tasks in the foreground, celery can't see the data of the test
+        with impersonate(testuser), patch.object(WebhookNotificationManger, "_generate_request_details", return_value=({}, {})):
+            super().run(result)
+
+    def setUp(self):
+        System_Settings.objects.update(enable_mail_notifications=True, enable_webhooks_notifications=True)
+        Notification_Webhooks.objects.all().delete()
+        self.product = Product.objects.get(id=2)
+        self.users = [self.create_user_to_notify(f"fan_out_{i}") for i in range(3)]
+
+    def create_user_to_notify(self, username):
+        user = Dojo_User.objects.create(username=username, email=f"{username}@example.com")
+        Notifications.objects.update_or_create(user=user, product=None, defaults={"test_added": ("alert", "mail", "webhooks")})
+        Product_Member.objects.create(product=self.product, user=user, role=Role.objects.get(name="Reader"))
+        Notification_Webhooks.objects.create(name=username, url=f"http://{username}.example.com/post", owner=user)
+        return user
+
+    def notify_test_added(self):
+        create_notification(event="test_added", title="fan out test", product=self.product, url="/product/2")
+
+    @patch("requests.request", **{"return_value.status_code": 200})
+    @patch("dojo.notifications.helper.EmailNotificationManger.send_mail_notification")
+    def test_personal_notifications_sent_per_channel(self, mock_send_mail_notification, mock_request):
+        with patch.object(EmailNotificationManger, "send_mail_notifications", autospec=True,
+                side_effect=EmailNotificationManger.send_mail_notifications) as mock_send_mail_notifications:
+            self.notify_test_added()
+
+        # all emails are sent with one call, over one connection
+        mock_send_mail_notification.assert_not_called()
+        mock_send_mail_notifications.assert_called_once()
+        self.assertEqual(
+            sorted(user.email for user in self.users),
+            sorted(email.to[0] for email in mail.outbox if email.to[0].startswith("fan_out")),
+        )
+        for user in self.users:
+            self.assertEqual(1, Alerts.objects.filter(user_id=user, title="fan out test").count())
+        self.assertEqual(
+            sorted(f"http://{user.username}.example.com/post" for user in self.users),
+            sorted(call.kwargs["url"] for call in mock_request.call_args_list),
+        )
+        self.assertFalse(Notification_Webhooks.objects.exclude(status=Notification_Webhooks.Status.STATUS_ACTIVE).exists())
+
+    def test_personal_email_refused(self):
+        refused_user = self.users[1]
+        send_messages = locmem.EmailBackend.send_messages
+
+        def refuse_recipient(backend, messages):
+            if any(refused_user.email in message.to for message in messages):
+                raise SMTPRecipientsRefused({refused_user.email: (550, b"mailbox unavailable")})
+            return send_messages(backend, messages)
+
+        with patch.object(locmem.EmailBackend, "send_messages", autospec=True, side_effect=refuse_recipient):
+            self.notify_test_added()
+
+        # the other users still get their email
+        self.assertEqual(
+            sorted(user.email for user in self.users if user != refused_user),
+            sorted(email.to[0] for email in mail.outbox if email.to[0].startswith("fan_out")),
+        )
+        self.assertTrue(Alerts.objects.filter(source="Email Notification", description__contains=refused_user.email).exists())
+
+    @patch("requests.request", **{"return_value.status_code": 500})
+    def test_personal_webhook_errors(self, mock_request):
+        with patch.object(WebhookNotificationManger, "_webhook_reactivation"):
+            self.notify_test_added()
+        self.assertEqual(3, mock_request.call_count)
+        self.assertEqual(3, Notification_Webhooks.objects.filter(status=Notification_Webhooks.Status.STATUS_INACTIVE_TMP).count())
+
+    @patch("requests.request")
+    def test_personal_slack_notifications(self, mock_request):
+        System_Settings.objects.update(enable_slack_notifications=True, slack_token="token")  # noqa: S106
+        Notifications.objects.filter(user__in=self.users).update(test_added=("slack",))
+        for user in self.users:
+            UserContactInfo.objects.update_or_create(user=user, defaults={"slack_username": user.email})
+
+        def slack_api(method, url, data, timeout):
+            if url.endswith("users.lookupByEmail"):
+                return Mock(text=json.dumps({"user": {"id": f"id_{data['email']}", "profile": {"email": data["email"]}}}))
+            return Mock(text='{"ok": true}')
+
+        mock_request.side_effect = slack_api
+        self.notify_test_added()
+        self.assertEqual(
+            sorted(f"@id_{user.email}" for user in self.users),
+            sorted(call.kwargs["data"]["channel"] for call in mock_request.call_args_list if call.kwargs["url"].endswith("chat.postMessage")),
+        )
+        # the looked up slack ids are saved
+        self.assertEqual(
+            sorted(f"id_{user.email}" for user in self.users),
+            sorted(UserContactInfo.objects.filter(user__in=self.users).values_list("slack_user_id", flat=True)),
+        )
+
+    # the recipients are only cached with a cache that is shared by all processes
+    @override_settings(NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED=True, CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "dojo_test_cache"},
+    })
+    @patch("requests.request", **{"return_value.status_code": 200})
+    @patch("dojo.notifications.helper.get_authorized_users_for_product_and_product_type",
+        wraps=get_authorized_users_for_product_and_product_type)
+    def test_recipients_cached(self, mock_get_authorized_users, mock_request):
+        call_command("createcachetable", verbosity=0)
+        self.notify_test_added()
+        self.notify_test_added()
+        self.assertEqual(1, mock_get_authorized_users.call_count)
+        for user in self.users:
+            self.assertEqual(2, Alerts.objects.filter(user_id=user, title="fan out test").count())
+
+        # new members are notified right away
+        user = self.create_user_to_notify("fan_out_new")
+        self.notify_test_added()
+        self.assertEqual(2, mock_get_authorized_users.call_count)
+        self.assertEqual(1, Alerts.objects.filter(user_id=user, title="fan out test").count())
+
+        # changed notification settings as well
+        notifications = Notifications.objects.get(user=user)
+        notifications.test_added = ()
+        notifications.save()
+        self.notify_test_added()
+        self.assertEqual(3, mock_get_authorized_users.call_count)
+        self.assertEqual(1, Alerts.objects.filter(user_id=user, title="fan out test").count())
+
+    @override_settings(NOTIFICATIONS_RECIPIENTS_CACHE_ENABLED=True)
+    @patch("requests.request", **{"return_value.status_code": 200})
+    @patch("dojo.notifications.helper.get_authorized_users_for_product_and_product_type",
+        wraps=get_authorized_users_for_product_and_product_type)
+    def test_recipients_not_cached_locally(self, mock_get_authorized_users, mock_request):
+        self.notify_test_added()
+        self.notify_test_added()
+        self.assertEqual(2, mock_get_authorized_users.call_count)
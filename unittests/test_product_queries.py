@@ -0,0 +1,155 @@
+from unittest.mock import patch
+
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from dojo.authorization.authorization import AUTHORIZATION_VERSION_KEY, get_authorized_product_ids
+from dojo.authorization.roles_permissions import Permissions
+from dojo.checks import check_configuration_shared_cache
+from dojo.models import (
+    Dojo_Group,
+    Dojo_Group_Member,
+    Dojo_User,
+    Product,
+    Product_Group,
+    Product_Member,
+    Product_Type,
+    Product_Type_Group,
+    Product_Type_Member,
+    Role,
+)
+from dojo.product.queries import get_authorized_products
+
+from .dojo_test_case import DojoTestCase
+
+# The authorization cache is only used with a cache that is shared by all processes
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "dojo_test_cache",
+    },
+}
+LOCAL_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class TestAuthorizedProductIds(DojoTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("createcachetable", verbosity=0)
+
+    def setUp(self):
+        super().setUp()
+        cache.delete(AUTHORIZATION_VERSION_KEY)
+
+        self.product_type_1 = Product_Type.objects.create(name="product_type_1")
+        self.product_type_2 = Product_Type.objects.create(name="product_type_2")
+        self.product_1 = Product.objects.create(name="product_1", prod_type=self.product_type_1)
+        self.product_2 = Product.objects.create(name="product_2", prod_type=self.product_type_1)
+        self.product_3 = Product.objects.create(name="product_3", prod_type=self.product_type_2)
+        self.product_4 = Product.objects.create(name="product_4", prod_type=self.product_type_2)
+
+        self.user = Dojo_User.objects.create(username="authorized_products_user")
+        self.group = Dojo_Group.objects.create(name="authorized_products_group")
+        self.reader = Role.objects.get(name="Reader")
+        self.maintainer = Role.objects.get(name="Maintainer")
+
+        Product_Member.objects.create(user=self.user, product=self.product_1, role=self.maintainer)
+        Product_Type_Member.objects.create(user=self.user, product_type=self.product_type_2, role=self.reader)
+        Dojo_Group_Member.objects.create(user=self.user, group=self.group, role=self.reader)
+        Product_Group.objects.create(group=self.group, product=self.product_2, role=self.reader)
+
+    def tearDown(self):
+        cache.delete(AUTHORIZATION_VERSION_KEY)
+        super().tearDown()
+
+    def assertAuthorizedProducts(self, permission, expected_products):
+        self.assertEqual(
+            sorted(Product.objects.filter(id__in=get_authorized_product_ids(permission, self.user)).values_list("id", flat=True)),
+            sorted(product.id for product in expected_products),
+        )
+        self.assertQuerySetEqual(
+            get_authorized_products(permission, user=self.user),
+            sorted(expected_products, key=lambda product: product.name),
+        )
+
+    def test_authorized_product_ids(self):
+        for cache_enabled in [False, True]:
+            with self.subTest(cache_enabled=cache_enabled), override_settings(AUTHORIZATION_CACHE_ENABLED=cache_enabled):
+                self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_2, self.product_3, self.product_4])
+                self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1])
+
+    def test_authorized_product_ids_product_type_group(self):
+        Product_Type_Group.objects.create(group=self.group, product_type=self.product_type_1, role=self.maintainer)
+        for cache_enabled in [False, True]:
+            with self.subTest(cache_enabled=cache_enabled), override_settings(AUTHORIZATION_CACHE_ENABLED=cache_enabled):
+                self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1, self.product_2])
+
+    @override_settings(AUTHORIZATION_CACHE_ENABLED=True)
+    def test_authorized_product_ids_cached(self):
+        self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_2, self.product_3, self.product_4])
+        with CaptureQueriesContext(connection) as queries:
+            get_authorized_product_ids(Permissions.Product_View, self.user)
+            get_authorized_product_ids(Permissions.Product_Edit, self.user)
+        # only the lookups of the database cache
+        self.assertTrue(all('FROM "dojo_test_cache"' in query["sql"] for query in queries))
+
+    @override_settings(AUTHORIZATION_CACHE_ENABLED=True)
+    def test_authorized_product_ids_invalidated(self):
+        self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1])
+
+        product_member = Product_Member.objects.create(user=self.user, product=self.product_3, role=self.maintainer)
+        self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1, self.product_3])
+
+        product_member.delete()
+        self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1])
+
+        # new products inherit the members of the product type
+        product_5 = Product.objects.create(name="product_5", prod_type=self.product_type_2)
+        self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_2, self.product_3, self.product_4, product_5])
+
+        product_5.prod_type = self.product_type_1
+        product_5.save()
+        self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_2, self.product_3, self.product_4])
+
+        Dojo_Group_Member.objects.filter(user=self.user).delete()
+        self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_3, self.product_4])
+
+    @override_settings(AUTHORIZATION_CACHE_ENABLED=True)
+    def test_authorized_product_ids_invalidated_in_other_process(self):
+        # each process has an instance of the cache of its own
+        process_1 = caches.create_connection("default")
+        process_2 = caches.create_connection("default")
+
+        with patch("dojo.authorization.authorization.cache", process_1):
+            self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1])
+
+        with patch("dojo.authorization.authorization.cache", process_2):
+            product_member = Product_Member.objects.create(user=self.user, product=self.product_3, role=self.maintainer)
+        with patch("dojo.authorization.authorization.cache", process_1):
+            self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1, self.product_3])
+
+        with patch("dojo.authorization.authorization.cache", process_2):
+            product_member.delete()
+        with patch("dojo.authorization.authorization.cache", process_1):
+            self.assertAuthorizedProducts(Permissions.Product_Edit, [self.product_1])
+
+    @override_settings(AUTHORIZATION_CACHE_ENABLED=True, CACHES=LOCAL_CACHES)
+    def test_authorized_product_ids_local_cache(self):
+        self.assertEqual([error.id for error in check_configuration_shared_cache(None)], ["dojo.E002"])
+        # not cached, as the other processes would not notice the invalidation
+        self.assertAuthorizedProducts(Permissions.Product_View, [self.product_1, self.product_2, self.product_3, self.product_4])
+        with self.assertNumQueries(1):
+            list(get_authorized_product_ids(Permissions.Product_View, self.user))
+
+    @override_settings(AUTHORIZATION_CACHE_ENABLED=True)
+    def test_shared_cache_check(self):
+        self.assertEqual(check_configuration_shared_cache(None), [])
@@ -0,0 +1,62 @@
+import csv
+import io
+from unittest.mock import patch
+
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from dojo.models import Finding, User
+
+from .dojo_test_case import DojoTestCase
+
+
+class TestFindingsExport(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        self.client.force_login(User.objects.get(username="admin"))
+
+    def get_csv_rows(self, url):
+        response = self.client.get(reverse("csv_export"), {"url": url})
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        self.assertEqual("attachment; filename=findings.csv", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode("utf-8")
+        return list(csv.reader(io.StringIO(content)))
+
+    def get_excel_rows(self, url):
+        response = self.client.get(reverse("excel_export"), {"url": url})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("attachment; filename=findings.xlsx", response["Content-Disposition"])
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        return [list(row) for row in workbook["Findings"].iter_rows(values_only=True)]
+
+    def test_csv_export(self):
+        rows = self.get_csv_rows("/finding")
+        header = rows[0]
+        self.assertIn("title", header)
+        self.assertIn("sla_deadline", header)
+        self.assertEqual(["test", "found_by", "engagement_id", "engagement", "product_id", "product", "endpoints",
+            "vulnerability_ids", "tags"], header[-9:])
+        self.assertNotIn("jira_issue", header)
+        self.assertEqual(Finding.objects.count(), len(rows) - 1)
+        titles = {row[header.index("id")]: row[header.index("title")] for row in rows[1:]}
+        finding = Finding.objects.get(id=2)
+        self.assertEqual(finding.title, titles["2"])
+
+    def test_csv_export_keeps_order_across_chunks(self):
+        rows = self.get_csv_rows("/finding")
+        with patch("dojo.reports.views.EXPORT_CHUNK_SIZE", 2):
+            chunked_rows = self.get_csv_rows("/finding")
+        self.assertEqual(rows, chunked_rows)
+
+    def test_excel_export(self):
+        rows = self.get_excel_rows("/finding")
+        header = rows[0]
+        self.assertEqual(["found_by", "engagement_id", "engagement", "product_id", "product", "endpoints",
+            "vulnerability_ids", "tags"], header[-8:])
+        self.assertEqual(Finding.objects.count(), len(rows) - 1)
+        finding = Finding.objects.get(id=2)
+        row = next(row for row in rows[1:] if row[header.index("id")] == 2)
+        self.assertEqual(finding.title, row[header.index("title")])
+        self.assertEqual(finding.test.engagement.product.name, row[header.index("product")])
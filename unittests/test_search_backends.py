@@ -0,0 +1,82 @@
+from crum import impersonate
+from django.test import override_settings
+from django.urls import reverse
+
+from dojo.apps import get_model_default_fields
+from dojo.authorization.roles_permissions import Permissions
+from dojo.finding.queries import get_authorized_findings
+from dojo.models import Finding, JIRA_Issue, Product, User, Vulnerability_Id
+from dojo.search.backends import PostgresSearchBackend
+from dojo.search.indexes import search_fields
+
+from .dojo_test_case import DojoTestCase
+
+
+class TestPostgresSearchBackend(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        self.backend = PostgresSearchBackend()
+        Finding.objects.filter(id=2).update(title="Reflected Injection in login form", description="")
+        Finding.objects.filter(id=3).update(description="The parameter is vulnerable to injection attacks")
+        Finding.objects.filter(id=7).update(file_path="/src/app/login_handler.py")
+        Vulnerability_Id.objects.create(finding_id=4, vulnerability_id="CVE-2020-1234")
+        Vulnerability_Id.objects.create(finding_id=5, vulnerability_id="CVE-2020-12345")
+
+    def search(self, qs, keywords_query):
+        return list(self.backend.filter(qs, keywords_query).values_list("id", flat=True))
+
+    def test_search_ranked(self):
+        # matches on the title rank above matches on the description, and words match the words they start
+        self.assertEqual([2, 3], self.search(Finding.objects.all(), "inject"))
+        self.assertEqual([2], self.search(Finding.objects.all(), "inject reflected"))
+        self.assertEqual([7], self.search(Finding.objects.all(), "/src/app/login_handler.py"))
+        self.assertEqual([], self.search(Finding.objects.all(), "xss"))
+        self.assertEqual([], self.search(Finding.objects.all(), "'' \""))
+
+    def test_search_related_fields(self):
+        JIRA_Issue.objects.filter(id=2).update(jira_key="NTEST-42")
+        self.assertEqual([5], self.search(Finding.objects.all(), "NTEST-42"))
+        python_findings = list(Finding.objects.filter(test__engagement__product=1).order_by("-id").values_list("id", flat=True))
+        self.assertTrue(python_findings)
+        self.assertEqual(python_findings, self.search(Finding.objects.all(), "python"))
+        # the name of the product type, as opposed to the words of the product
+        self.assertEqual([2], self.search(Product.objects.all(), "ebooks"))
+        self.assertEqual([3, 2], self.search(Product.objects.all(), "security"))
+        # all the words have to be in the same related field, or in the fields of the object
+        self.assertEqual([], self.search(Finding.objects.all(), "python NTEST-42"))
+
+    def test_search_fields_as_watson(self):
+        for model_name, fields in search_fields.items():
+            model = Finding._meta.apps.get_model("dojo", model_name)
+            self.assertEqual(set(get_model_default_fields(model)), {field for field, _ in fields}, model_name)
+
+    def test_search_explicit_order_kept(self):
+        self.assertEqual([2, 3], list(self.backend.filter(Finding.objects.order_by("id"), "injection").values_list("id", flat=True)))
+        self.assertEqual([3, 2], list(self.backend.filter(Finding.objects.order_by("-id"), "injection").values_list("id", flat=True)))
+
+    def test_search_vulnerability_ids(self):
+        self.assertEqual([4], [vulnerability_id.finding_id for vulnerability_id in self.backend.filter(Vulnerability_Id.objects.all(), "'CVE-2020-1234'")])
+
+    def test_search_authorized_in_one_query(self):
+        with impersonate(User.objects.get(username="user2")):
+            findings = get_authorized_findings(Permissions.Finding_View)
+            with self.assertNumQueries(1):
+                self.assertEqual([], self.search(findings, "injection"))
+
+    @override_settings(SEARCH_BACKEND="postgres")
+    def test_simple_search(self):
+        Product.objects.filter(id=3).update(name="Injection Lab")
+        self.client.force_login(User.objects.get(username="admin"))
+        response = self.client.get(reverse("simple_search"), {"query": "injection"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([2, 3], [finding.id for finding in response.context["findings"]])
+        self.assertEqual([3], [product.id for product in response.context["products"]])
+        self.assertIsNone(response.context["generic"])
+
+        # the operators work as with watson
+        response = self.client.get(reverse("simple_search"), {"query": "product:lab"})
+        self.assertIsNone(response.context["findings"])
+        self.assertEqual([3], [product.id for product in response.context["products"]])
+        response = self.client.get(reverse("simple_search"), {"query": "vulnerability_id:CVE-2020-1234"})
+        self.assertEqual([4], [vulnerability_id.finding_id for vulnerability_id in response.context["vulnerability_ids"]])
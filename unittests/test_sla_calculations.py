@@ -1,3 +1,4 @@
+import datetime
 import logging
 from unittest.mock import patch
 
@@ -7,9 +8,11 @@ from django.utils import timezone
 
 from dojo.models import (
     Finding,
+    Product,
     SLA_Configuration,
     Test,
 )
+from dojo.sla_config.helpers import update_sla_expiration_dates_sla_config_sync
 from dojo.templatetags.display_tags import finding_sla
 
 from .dojo_test_case import DojoTestCase
@@ -180,3 +183,43 @@ class TestSLACalculations(DojoTestCase):
             finding = Finding(test=Test.objects.get(id=89), title="Test Finding 3", severity="High")
             finding.date = "2025-04-23T12:00:00+02:00"
             finding.save()
+
+    @patch("dojo.sla_config.helpers.SLA_UPDATE_PRODUCT_BATCH_SIZE", 2)
+    def test_update_sla_expiration_dates_sla_config(self):
+        Finding.objects.filter(id__in=[2, 3]).update(severity="Critical")
+        Finding.objects.filter(id__in=[4, 5]).update(severity="High", sla_start_date=datetime.date(2024, 2, 27))
+        Finding.objects.filter(id=6).update(severity="Info")
+        Finding.objects.filter(id=7).update(severity="Medium")
+        Finding.objects.update(sla_expiration_date=datetime.date(2000, 1, 1))
+        SLA_Configuration.objects.filter(id=self.sla_config.id).update(
+            critical=3, high=29, medium=45, enforce_medium=False, low=400, async_updating=True)
+        Product.objects.update(async_updating=True)
+
+        update_sla_expiration_dates_sla_config_sync(self.sla_config, Product.objects.all())
+
+        findings = Finding.objects.filter(test__engagement__product__sla_configuration=self.sla_config)
+        self.assertTrue(findings.filter(sla_expiration_date__isnull=False).exists())
+        for finding in findings:
+            with self.subTest(finding=finding.id, severity=finding.severity):
+                expected = Finding.objects.get(id=finding.id)
+                expected.set_sla_expiration_date()
+                self.assertEqual(expected.sla_expiration_date, finding.sla_expiration_date)
+
+        self.sla_config.refresh_from_db()
+        self.assertFalse(self.sla_config.async_updating)
+        self.assertEqual(100, self.sla_config.async_updating_progress)
+        self.assertFalse(Product.objects.filter(async_updating=True).exists())
+
+    def test_update_sla_expiration_dates_sla_config_severities(self):
+        Finding.objects.update(sla_expiration_date=datetime.date(2000, 1, 1))
+        SLA_Configuration.objects.filter(id=self.sla_config.id).update(high=29, low=400)
+
+        update_sla_expiration_dates_sla_config_sync(self.sla_config, Product.objects.all(), ("High",))
+
+        findings = Finding.objects.filter(test__engagement__product__sla_configuration=self.sla_config)
+        self.assertFalse(findings.filter(severity="High", sla_expiration_date=datetime.date(2000, 1, 1)).exists())
+        # only the findings of the changed severities are updated
+        self.assertEqual(
+            findings.exclude(severity="High").count(),
+            findings.filter(sla_expiration_date=datetime.date(2000, 1, 1)).count(),
+        )
@@ -0,0 +1,111 @@
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from dojo.models import Finding, JIRA_Instance, JIRA_Issue, JIRA_Project, Product, System_Settings
+from dojo.utils import sla_compute_and_notify
+
+from .dojo_test_case import DojoTestCase
+
+
+@patch("dojo.utils.create_notification")
+class TestSLANotifications(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        System_Settings.objects.update(enable_finding_sla=True, enable_notify_sla_active=True,
+            enable_notify_sla_active_verified=False, enable_notify_sla_jira_only=False,
+            enable_notify_sla_exponential_backoff=False, enable_jira=False)
+        sla_configuration = Product.objects.get(id=2).sla_configuration
+        sla_configuration.enforce_medium = False
+        sla_configuration.save()
+
+        today = timezone.now().date()
+        Finding.objects.update(active=False)
+        for finding_id, severity, days_remaining in (
+            (2, "High", -2),
+            (3, "High", 2),
+            (4, "Critical", 0),
+            # breached for longer than SLA_NOTIFY_POST_BREACH
+            (5, "Medium", -10),
+            (6, "Low", 10),
+            (7, "High", None),
+            (22, "Info", 0),
+            # SLA not enforced
+            (23, "Medium", 1),
+            (24, "High", -3),
+            (124, "High", -5),
+        ):
+            Finding.objects.filter(id=finding_id).update(
+                active=True, is_mitigated=False, duplicate=False, mitigated=None, severity=severity,
+                sla_expiration_date=today + timedelta(days=days_remaining) if days_remaining is not None else None,
+            )
+        # the days remaining of a finding with a mitigation date are counted until that date
+        mitigated = timezone.make_aware(datetime.combine(today - timedelta(days=4), time()))
+        Finding.objects.filter(id=124).update(mitigated=mitigated)
+
+    def get_notifications(self, mock_create_notification):
+        notifications = {}
+        combined_notifications = {}
+        for call in mock_create_notification.call_args_list:
+            if call.kwargs["event"] == "sla_breach":
+                notifications[call.kwargs["finding"].id] = call.kwargs["title"]
+            else:
+                self.assertEqual("sla_breach_combined", call.kwargs["event"])
+                combined_notifications[call.kwargs["breach_kind"]] = (
+                    call.kwargs["title"], call.kwargs["product"].id, sorted(finding.id for finding in call.kwargs["findings"]))
+        return notifications, combined_notifications
+
+    def test_sla_notifications(self, mock_create_notification):
+        # the number of queries does not depend on the number of findings
+        with self.assertNumQueries(4):
+            sla_compute_and_notify()
+        notifications, combined_notifications = self.get_notifications(mock_create_notification)
+        self.assertEqual({
+            2: "Finding 2 - SLA breached by 2 days! Overdue notice",
+            3: "Finding 3 - SLA pre-breach warning - 2 day(s) left",
+            4: "Finding 4 - SLA is breaching today",
+            7: "Finding 7 - SLA is breaching today",
+            24: "Finding 24 - SLA breached by 3 days! Overdue notice",
+            124: "Finding 124 - SLA breached by 1 day! Overdue notice",
+        }, notifications)
+        self.assertEqual({
+            "breached": ("SLA alert (breached): product type 'ebooks', product 'Security How-to'", 2, [2, 24, 124]),
+            "prebreach": ("SLA alert (prebreach): product type 'ebooks', product 'Security How-to'", 2, [3]),
+            "breaching": ("SLA alert (breaching): product type 'ebooks', product 'Security How-to'", 2, [4, 7]),
+        }, combined_notifications)
+
+    def test_sla_notifications_exponential_backoff(self, mock_create_notification):
+        System_Settings.objects.update(enable_notify_sla_exponential_backoff=True)
+        sla_compute_and_notify()
+        notifications, _ = self.get_notifications(mock_create_notification)
+        self.assertEqual([2, 3, 4, 7, 124], sorted(notifications))
+
+    def test_sla_notifications_disabled_for_product(self, mock_create_notification):
+        Product.objects.filter(id=2).update(disable_sla_breach_notifications=True)
+        sla_compute_and_notify()
+        mock_create_notification.assert_not_called()
+
+    @patch("dojo.jira_link.helper.add_simple_jira_comment")
+    def test_sla_notifications_jira(self, mock_add_simple_jira_comment, mock_create_notification):
+        System_Settings.objects.update(enable_jira=True, enable_notify_sla_jira_only=True)
+        JIRA_Project.objects.filter(id=2).update(product_jira_sla_notification=True)
+        JIRA_Issue.objects.filter(id=2).update(finding=2)
+        with self.assertNumQueries(5):
+            sla_compute_and_notify()
+        notifications, _ = self.get_notifications(mock_create_notification)
+        self.assertEqual([2], list(notifications))
+        mock_add_simple_jira_comment.assert_called_once_with(
+            JIRA_Instance.objects.get(id=2), JIRA_Issue.objects.get(id=2), notifications[2])
+
+    @patch("dojo.jira_link.helper.add_simple_jira_comment")
+    def test_sla_notifications_jira_project_without_instance(self, mock_add_simple_jira_comment, mock_create_notification):
+        System_Settings.objects.update(enable_jira=True, enable_notify_sla_jira_only=True)
+        JIRA_Project.objects.filter(id=2).update(product_jira_sla_notification=True, jira_instance=None)
+        JIRA_Issue.objects.filter(id=2).update(finding=2)
+        sla_compute_and_notify()
+        # the finding is notified, but there is no JIRA instance to comment on
+        notifications, _ = self.get_notifications(mock_create_notification)
+        self.assertEqual([2], list(notifications))
+        mock_add_simple_jira_comment.assert_not_called()
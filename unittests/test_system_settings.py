@@ -1,4 +1,9 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from dojo.middleware import DojoSystemSettingsCache
 from dojo.models import System_Settings
+from dojo.utils import get_system_setting
 
 from .dojo_test_case import DojoTestCase
 
@@ -26,3 +31,47 @@ class TestSystemSettings(DojoTestCase):
         system_settings.save()
         system_settings = System_Settings.objects.get(no_cache=True)
         self.assertEqual(system_settings.enable_jira, True)
+
+
+@override_settings(SYSTEM_SETTINGS_CACHE_ENABLED=True, SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL=0)
+class TestSystemSettingsCache(DojoTestCase):
+
+    def setUp(self):
+        cache.delete_many([DojoSystemSettingsCache.version_key, DojoSystemSettingsCache.settings_key])
+        DojoSystemSettingsCache._system_settings = DojoSystemSettingsCache._version = None
+
+    def tearDown(self):
+        self.setUp()
+
+    def test_system_settings_are_cached(self):
+        with self.assertNumQueries(1):
+            self.assertFalse(get_system_setting("enable_jira"))
+        with self.assertNumQueries(0):
+            self.assertFalse(get_system_setting("enable_jira"))
+            # changes to the returned settings do not end up in the cache
+            System_Settings.objects.get().enable_jira = True
+            self.assertFalse(get_system_setting("enable_jira"))
+
+    def test_system_settings_cache_invalidated_on_save(self):
+        self.assertFalse(get_system_setting("enable_jira"))
+        system_settings = System_Settings.objects.get(no_cache=True)
+        system_settings.enable_jira = True
+        with self.captureOnCommitCallbacks(execute=True):
+            system_settings.save()
+        with self.assertNumQueries(1):
+            self.assertTrue(get_system_setting("enable_jira"))
+
+    def test_system_settings_cache_version_from_other_process(self):
+        self.assertFalse(get_system_setting("enable_jira"))
+        # another process saved the settings
+        System_Settings.objects.update(enable_jira=True)
+        cache.set(DojoSystemSettingsCache.version_key, "other")
+        with self.assertNumQueries(1):
+            self.assertTrue(get_system_setting("enable_jira"))
+
+    def test_system_settings_cache_check_interval(self):
+        self.assertFalse(get_system_setting("enable_jira"))
+        System_Settings.objects.update(enable_jira=True)
+        cache.set(DojoSystemSettingsCache.version_key, "other")
+        with override_settings(SYSTEM_SETTINGS_CACHE_CHECK_INTERVAL=3600), self.assertNumQueries(0):
+            self.assertFalse(get_system_setting("enable_jira"))
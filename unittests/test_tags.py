@@ -1,5 +1,6 @@
 import logging
 import random
+from unittest.mock import patch
 
 from dojo.models import Finding, Test
 from dojo.product.helpers import propagate_tags_on_product_sync
@@ -358,3 +359,33 @@ class InheritedTagsTests(DojoAPITestCase):
         self.assertEqual(product_tags_post_addition, self._convert_instance_tags_to_list(objects.get("endpoint")))
         self.assertEqual(product_tags_post_addition, self._convert_instance_tags_to_list(objects.get("test")))
         self.assertEqual(product_tags_post_addition, self._convert_instance_tags_to_list(objects.get("finding")))
+
+    def test_propagate_product_tags_in_bulk(self):
+        objects = self._import_and_return_objects()
+        findings = Finding.objects.filter(test__engagement__product=self.product)
+        objects["finding"].tags.add("finding_only_tag")
+        self.product.tags.remove("inherit")
+        self.product.tags.add("more")
+        # objects are not saved, the changed tags are written directly
+        with patch("dojo.models.Finding.save") as mock_save, patch("dojo.product.helpers.PROPAGATE_TAGS_BATCH_SIZE", 2):
+            propagate_tags_on_product_sync(self.product)
+        mock_save.assert_not_called()
+
+        product_tags = self._convert_instance_tags_to_list(self.product)
+        self.assertEqual(["more", "tags", "these"], product_tags)
+        for finding in findings:
+            expected_tags = ["finding_only_tag", *product_tags] if finding == objects["finding"] else product_tags
+            self.assertEqual(expected_tags, self._convert_instance_tags_to_list(finding))
+            self.assertEqual(product_tags, [tag.name for tag in finding.inherited_tags.all()])
+        for obj in (objects["engagement"], objects["endpoint"], objects["test"]):
+            self.assertEqual(product_tags, self._convert_instance_tags_to_list(obj))
+
+        # the tag counts of tagulous are kept up to date
+        tag_model = Finding.tags.tag_model
+        self.assertEqual(findings.count(), tag_model.objects.get(name="more").count)
+        self.assertFalse(tag_model.objects.filter(name="inherit").exists())
+        self.assertEqual(findings.count(), Finding.inherited_tags.tag_model.objects.get(name="these").count)
+
+        # nothing is written when the tags are already in sync
+        with self.assertNumQueries(13):
+            propagate_tags_on_product_sync(self.product)
@@ -1,7 +1,13 @@
 import logging
 from contextlib import contextmanager
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
+from asteval import Interpreter
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
 from dojo.authorization.roles_permissions import Roles
 from dojo.models import (
     IMPORT_CLOSED_FINDING,
@@ -13,16 +19,29 @@ from dojo.models import (
     Dojo_User,
     Endpoint,
     Engagement,
+    Finding,
     Notifications,
     Product,
     Product_Type,
+    Risk_Acceptance,
     Role,
     System_Settings,
     Test,
     Test_Import,
     Test_Import_Finding_Action,
+    Test_Type,
+)
+from dojo.utils import (
+    PRODUCT_GRADE_PENDING_KEY,
+    calculate_grade,
+    calculate_grade_task,
+    calculate_grades,
+    dojo_crypto_encrypt,
+    evaluate_product_grade,
+    get_open_findings_burndown,
+    prepare_for_view,
+    user_post_save,
 )
-from dojo.utils import dojo_crypto_encrypt, prepare_for_view, user_post_save
 
 from .dojo_test_case import DojoTestCase
 
@@ -178,6 +197,115 @@ class TestUtils(DojoTestCase):
         save_mock_member.save.assert_not_called()
 
 
+class TestOpenFindingsBurndown(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        now = timezone.now()
+        self.product = Product.objects.create(name="Burndown Product", description="Burndown", prod_type=Product_Type.objects.first())
+        engagement = Engagement.objects.create(product=self.product, target_start=now, target_end=now)
+        self.test = Test.objects.create(engagement=engagement, test_type=Test_Type.objects.first(), target_start=now, target_end=now)
+        self.user = Dojo_User.objects.get(username="admin")
+
+    def create_finding(self, severity, days_ago, **kwargs):
+        finding = Finding(test=self.test, title=f"{severity} {days_ago}", severity=severity, reporter=self.user,
+                          date=(timezone.now() - timedelta(days=days_ago)).date(), **kwargs)
+        finding.save(dedupe_option=False, product_grading_option=False, push_to_jira=False)
+        return finding
+
+    def test_open_findings_burndown(self):
+        now = timezone.now()
+        # open since before the window
+        self.create_finding("High", 200, active=True)
+        # closed before the window, never counted
+        self.create_finding("High", 200, active=False, is_mitigated=True, mitigated=now - timedelta(days=150))
+        # opened before the window and mitigated 10 days ago
+        self.create_finding("Critical", 120, active=False, is_mitigated=True, mitigated=now - timedelta(days=10))
+        # opened 30 days ago and risk accepted 5 days ago
+        finding = self.create_finding("Low", 30, active=False, risk_accepted=True)
+        risk_acceptance = Risk_Acceptance.objects.create(name="Burndown", owner=self.user)
+        risk_acceptance.accepted_findings.add(finding)
+        Risk_Acceptance.objects.filter(pk=risk_acceptance.pk).update(created=now - timedelta(days=5))
+        # duplicates are ignored
+        self.create_finding("Medium", 20, active=True, duplicate=True)
+
+        with self.assertNumQueries(4):
+            burndown = get_open_findings_burndown(self.product)
+
+        for severity in ["Critical", "High", "Medium", "Low", "Info"]:
+            self.assertEqual(91, len(burndown[severity]))
+        self.assertEqual([1] * 91, [count for _, count in burndown["High"]])
+        self.assertEqual([1] * 80 + [0] * 11, [count for _, count in burndown["Critical"]])
+        self.assertEqual([0] * 60 + [1] * 25 + [0] * 6, [count for _, count in burndown["Low"]])
+        self.assertEqual([0] * 91, [count for _, count in burndown["Medium"]])
+        self.assertEqual(1, burndown["y_max"])
+        self.assertEqual(0, burndown["y_min"])
+        # one point per day, at midnight
+        self.assertEqual(
+            datetime.combine(datetime.now(), datetime.min.time()).timestamp() * 1000,
+            burndown["High"][-1][0],
+        )
+
+
+class TestProductGrading(DojoTestCase):
+    fixtures = ["dojo_testdata.json"]
+
+    def setUp(self):
+        System_Settings.objects.update(enable_product_grade=True)
+        now = timezone.now()
+        self.product = Product.objects.create(name="Graded Product", description="Graded", prod_type=Product_Type.objects.first())
+        self.other_product = Product.objects.create(name="Ungraded Product", description="Ungraded", prod_type=Product_Type.objects.first())
+        engagement = Engagement.objects.create(product=self.product, target_start=now, target_end=now)
+        self.test = Test.objects.create(engagement=engagement, test_type=Test_Type.objects.first(), target_start=now, target_end=now)
+        self.user = Dojo_User.objects.get(username="admin")
+        for severity in ["Critical", "High", "High", "Info"]:
+            Finding(test=self.test, title=severity, severity=severity, reporter=self.user, active=True, verified=True).save_no_options()
+        # inactive findings do not count
+        Finding(test=self.test, title="Inactive", severity="Critical", reporter=self.user, active=False, verified=True).save_no_options()
+        cache.delete(PRODUCT_GRADE_PENDING_KEY.format(self.product.id))
+
+    def test_calculate_grade(self):
+        calculate_grade(self.product, sync=True)
+        self.product.refresh_from_db()
+        # 40 for the critical finding, minus 3 for the second high finding
+        self.assertEqual(37, self.product.prod_numeric_grade)
+
+    def test_calculate_grades(self):
+        self.assertEqual(Product.objects.count(), calculate_grades())
+        self.product.refresh_from_db()
+        self.other_product.refresh_from_db()
+        self.assertEqual(37, self.product.prod_numeric_grade)
+        self.assertEqual(100, self.other_product.prod_numeric_grade)
+        # nothing is written when no grade changed
+        with self.assertNumQueries(4):
+            self.assertEqual(0, calculate_grades())
+
+    def test_evaluate_product_grade_reuses_interpreter(self):
+        # a definition that has not been evaluated by any other test
+        product_grade = System_Settings.objects.get().product_grade + "\n"
+        with patch("dojo.utils.Interpreter", wraps=Interpreter) as mock_interpreter:
+            self.assertEqual(37, evaluate_product_grade(product_grade, 1, 2, 0, 0))
+            self.assertEqual(100, evaluate_product_grade(product_grade, 0, 0, 0, 0))
+            self.assertEqual(1, mock_interpreter.call_count)
+            self.assertEqual(50, evaluate_product_grade("def grade_product(crit, high, med, low):\n    return 50", 1, 2, 0, 0))
+            self.assertEqual(2, mock_interpreter.call_count)
+
+    @override_settings(PRODUCT_GRADE_DEBOUNCE_SECONDS=30)
+    def test_calculate_grade_debounced(self):
+        with patch("dojo.utils.calculate_grade_task") as mock_calculate_grade_task:
+            for _ in range(3):
+                calculate_grade(self.product)
+            mock_calculate_grade_task.assert_called_once_with(self.product, countdown=30)
+
+        # the task allows the next change to schedule a new calculation
+        calculate_grade_task(self.product, sync=True)
+        self.product.refresh_from_db()
+        self.assertEqual(37, self.product.prod_numeric_grade)
+        with patch("dojo.utils.calculate_grade_task") as mock_calculate_grade_task:
+            calculate_grade(self.product)
+            mock_calculate_grade_task.assert_called_once_with(self.product, countdown=30)
+
+
 class assertNumOfModelsCreated:
     def __init__(self, test_case, queryset, num):
         self.test_case = test_case
@@ -305,3 +305,18 @@ class TestDependencyCheckParser(DojoTestCase):
                 )  # 2016-11-05T14:52:15.748-0400
                 self.assertEqual(1, len(items[0].unsaved_vulnerability_ids))
                 self.assertEqual("CVE-2015-3208", items[0].unsaved_vulnerability_ids[0])
+
+    def test_iter_findings_matches_get_findings(self):
+        parser = DependencyCheckParser()
+        for file_name in ["multiple_vulnerabilities_has_multiple_findings.xml", "PR6439.xml"]:
+            with self.subTest(file_name=file_name), (get_unit_tests_scans_path("dependency_check") / file_name).open("rb") as testfile:
+                findings = parser.get_findings(testfile, Test())
+                testfile.seek(0)
+                streamed_findings = list(parser.iter_findings(testfile, Test()))
+                self.assertEqual(len(findings), len(streamed_findings))
+                for finding, streamed_finding in zip(findings, streamed_findings, strict=True):
+                    self.assertEqual(finding.title, streamed_finding.title)
+                    self.assertEqual(finding.component_name, streamed_finding.component_name)
+                    self.assertEqual(finding.file_path, streamed_finding.file_path)
+                    self.assertEqual(finding.date, streamed_finding.date)
+                    self.assertEqual(finding.mitigation, streamed_finding.mitigation)
@@ -712,3 +712,34 @@ True,11/7/2015,Title,0,http://localhost,Severity,Description,Mitigation,Impact,R
             self.assertEqual(test.description, "The contents of this report is from a tool that gathers vulnerabilities both statically and dynamically")
             self.assertEqual(test.dynamic_tool, True)
             self.assertEqual(test.static_tool, True)
+
+    def test_iter_tests_json_custom_test_with_meta(self):
+        with (get_unit_tests_scans_path("generic") / "generic_custom_test_with_meta.json").open("rb") as file:
+            parser = GenericParser()
+            tests = parser.iter_tests(parser.get_scan_types()[0], file)
+            self.assertEqual(1, len(tests))
+            test = tests[0]
+            self.assertEqual(test.name, "Test 1")
+            self.assertEqual(test.type, "Tool 1")
+            self.assertEqual(test.version, "1.0.0")
+            findings = list(test.findings)
+            self.assertEqual(1, len(findings))
+            self.assertEqual("test title", findings[0].title)
+
+    def test_iter_findings_json_invalid_finding(self):
+        with (get_unit_tests_scans_path("generic") / "generic_invalid.json").open(encoding="utf-8") as file:
+            parser = GenericParser()
+            findings = parser.iter_findings(file, Test())
+            with self.assertRaisesMessage(ValueError,
+                    "Not allowed fields are present: ['invalid_field', 'last_status_update']"):
+                list(findings)
+
+    def test_iter_findings_csv(self):
+        with (get_unit_tests_scans_path("generic") / "generic_report1.csv").open(encoding="utf-8") as file:
+            parser = GenericParser()
+            findings = list(parser.iter_findings(file, self.test))
+            file.seek(0)
+            self.assertEqual(
+                [finding.title for finding in parser.get_findings(file, self.test)],
+                [finding.title for finding in findings],
+            )
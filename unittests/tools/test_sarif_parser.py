@@ -592,3 +592,29 @@ add_core(ptr, offset, val);
             parser = SarifParser()
             findings = parser.get_findings(testfile, Test())
             self.assertEqual(77, len(findings))
+
+    def test_iter_findings_matches_get_findings(self):
+        parser = SarifParser()
+        with (
+            get_unit_tests_scans_path("sarif") / "DefectDojo_django-DefectDojo__2020-12-11_13 42 10__export.sarif"
+        ).open(encoding="utf-8") as testfile:
+            findings = parser.get_findings(testfile, Test())
+            testfile.seek(0)
+            streamed_findings = list(parser.iter_findings(testfile, Test()))
+        self.assertEqual(510, len(streamed_findings))
+        for finding, streamed_finding in zip(findings, streamed_findings, strict=True):
+            self.assertEqual(finding.title, streamed_finding.title)
+            self.assertEqual(finding.description, streamed_finding.description)
+            self.assertEqual(finding.file_path, streamed_finding.file_path)
+            self.assertEqual(finding.line, streamed_finding.line)
+
+    def test_iter_tests_flawfinder(self):
+        with (get_unit_tests_scans_path("sarif") / "flawfinder.sarif").open("rb") as testfile:
+            parser = SarifParser()
+            tests = parser.iter_tests(parser.get_scan_types()[0], testfile)
+            self.assertEqual(1, len(tests))
+            self.assertEqual("Flawfinder", tests[0].type)
+            findings = list(tests[0].findings)
+            self.assertEqual(53, len(findings))
+            for finding in findings:
+                self.common_checks(finding)
@@ -230,3 +230,17 @@ Number  Content
             parser = TrivyParser()
             findings = parser.get_findings(test_file, Test())
             self.assertEqual(len(findings), 37)
+
+    def test_iter_findings_matches_get_findings(self):
+        parser = TrivyParser()
+        for file_name in ["legacy_many_vulns.json", "scheme_2_many_vulns.json", "kubernetes.json"]:
+            with self.subTest(file_name=file_name), sample_path(file_name).open("rb") as test_file:
+                findings = parser.get_findings(test_file, Test())
+                test_file.seek(0)
+                streamed_findings = list(parser.iter_findings(test_file, Test()))
+                self.assertEqual(len(findings), len(streamed_findings))
+                for finding, streamed_finding in zip(findings, streamed_findings, strict=True):
+                    self.assertEqual(finding.title, streamed_finding.title)
+                    self.assertEqual(finding.severity, streamed_finding.severity)
+                    self.assertEqual(finding.description, streamed_finding.description)
+                    self.assertEqual(finding.file_path, streamed_finding.file_path)